@@ -202,7 +202,7 @@ try:
     
     redis_cache_client = redis.from_url(
         redis_cache_url,
-        decode_responses=True,
+        decode_responses=False,  # Query cache stores binary codec payloads
         socket_timeout=2,  # Shorter timeout
         socket_connect_timeout=2,  # Shorter timeout
         retry_on_timeout=False,  # Don't retry on timeout
@@ -0,0 +1,567 @@
+#!/usr/bin/env python3
+"""
+A/B Assignment Engine
+
+In-process assignment path for ABTestFramework and RiskABTestFramework. Each
+test is cached as a snapshot of its status and cumulative variant weights; a
+user is bucketed by hashing (test_id, user_id) into [0, 100) and bisecting the
+cumulative weights, so assigning touches neither the database nor the shared
+`random` module state. New assignments are persisted asynchronously in batches
+(INSERT ... ON CONFLICT DO NOTHING) through a BufferedTelemetryWriter. A full
+buffer drops the row rather than blocking the request (the row is counted and
+the next assign for that user queues it again), and a failed batch forgets its
+users so they are re-queued too. Conversion tracking that cannot find a stored
+assignment calls `persist_now()`, which writes it synchronously.
+
+Snapshots are dropped by `invalidate()`, which the frameworks call whenever they
+change a test, and are otherwise revalidated every `ttl` seconds so changes made
+by other processes are picked up. Callbacks registered with `subscribe()` are
+told about every invalidation.
+
+Assignments stored before this engine (seeded-RNG bucketing) stay sticky: when a
+snapshot loads, stored rows that disagree with the hash are pinned in memory.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import psycopg2.extras
+
+from backend.analytics.telemetry_writer import BufferedTelemetryWriter, DROP_NEWEST
+
+logger = logging.getLogger(__name__)
+
+ASSIGNMENT_TABLE = 'ab_test_assignments'
+ASSIGNMENT_COLUMNS = ('test_id', 'user_id', 'variant_id', 'assigned_at')
+RISK_PARTICIPANT_TABLE = 'risk_ab_test_participants'
+RISK_PARTICIPANT_COLUMNS = ('test_id', 'user_id', 'variant_id', 'risk_score', 'risk_level', 'assigned_at')
+
+# Risk score at which a participant counts towards minimum_risk_users_per_variant
+RISK_USER_THRESHOLD = 0.5
+
+
+def bucket_for(test_id: str, user_id: str) -> float:
+    """Deterministic position of a user in [0, 100) for one test"""
+    digest = hashlib.blake2b(f"{test_id}:{user_id}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') / 2 ** 64 * 100
+
+
+def cumulative_weights(weights: Sequence[float]) -> Tuple[float, ...]:
+    """Running totals of variant weights, used for bisecting a bucket"""
+    total = 0.0
+    cumulative = []
+    for weight in weights:
+        total += max(float(weight or 0), 0.0)
+        cumulative.append(total)
+    return tuple(cumulative)
+
+
+@dataclass
+class AssignmentSnapshot:
+    """Cached view of one test: what the hot path needs to assign a user"""
+    test_id: str
+    status: Optional[str]
+    end_date: Optional[datetime]
+    variant_ids: Tuple[str, ...]
+    cumulative: Tuple[float, ...]
+    pinned: Dict[str, str] = field(default_factory=dict)
+    loaded_at: float = 0.0
+    # Risk tests only: participants with risk_score >= RISK_USER_THRESHOLD per variant
+    risk_counts: Optional[Dict[str, int]] = None
+    min_risk_users: int = 0
+
+    @property
+    def signature(self) -> Tuple[Tuple[str, ...], Tuple[float, ...]]:
+        return self.variant_ids, self.cumulative
+
+    @property
+    def balanced(self) -> bool:
+        """True once every variant has its minimum number of risk users"""
+        if self.risk_counts is None:
+            return True
+        return all(self.risk_counts.get(v, 0) >= self.min_risk_users for v in self.variant_ids)
+
+    def is_open(self, now: Optional[datetime] = None) -> bool:
+        if self.status != 'active' or not self.variant_ids:
+            return False
+        if self.end_date is not None and self.end_date < (now or datetime.now()):
+            return False
+        return True
+
+    def hashed_variant(self, user_id: str) -> Optional[str]:
+        if not self.cumulative or self.cumulative[-1] <= 0:
+            return None
+        position = bucket_for(self.test_id, user_id) / 100 * self.cumulative[-1]
+        index = bisect_right(self.cumulative, position)
+        return self.variant_ids[min(index, len(self.variant_ids) - 1)]
+
+    def variant_for(self, user_id: str) -> Optional[str]:
+        pinned = self.pinned.get(user_id)
+        if pinned is not None:
+            return pinned
+        return self.hashed_variant(user_id)
+
+
+class ABAssignmentEngine:
+    """
+    Cached, hash-bucketed assignment for ab_tests / ab_test_variants
+
+    Args:
+        connection_factory: Returns a DB-API connection (pooled get_pg_connection by default)
+        ttl: Seconds before a cached snapshot is revalidated against the database
+        writer: Writer for assignment rows; defaults to a buffered writer on the shared pool
+        seen_capacity: How many recently persisted (test, user) pairs to remember
+    """
+
+    table = ASSIGNMENT_TABLE
+    columns = ASSIGNMENT_COLUMNS
+
+    def __init__(self, connection_factory: Optional[Callable[[], Any]] = None,
+                 ttl: float = 30.0, writer: Optional[BufferedTelemetryWriter] = None,
+                 seen_capacity: int = 100000):
+        if connection_factory is None:
+            from backend.utils.pg_pool import get_pg_connection
+            connection_factory = get_pg_connection
+        self._connection_factory = connection_factory
+        self.ttl = ttl
+        self._writer = writer or BufferedTelemetryWriter(
+            {self.table: self.columns},
+            connection_factory=connection_factory,
+            capacity=int(os.environ.get('AB_ASSIGNMENT_BUFFER', 20000)),
+            batch_size=int(os.environ.get('AB_ASSIGNMENT_BATCH', 500)),
+            flush_interval=float(os.environ.get('AB_ASSIGNMENT_FLUSH_SECONDS', 1.0)),
+            overflow=DROP_NEWEST,
+            conflict={self.table: 'ON CONFLICT (test_id, user_id) DO NOTHING'},
+            on_failure=self._forget_rows,
+        )
+        self._snapshots: Dict[str, AssignmentSnapshot] = {}
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._seen: "OrderedDict[Tuple[str, str], None]" = OrderedDict()
+        self._seen_capacity = seen_capacity
+        self._listeners: List[Callable[[Optional[str]], None]] = []
+        self._stats = {'assignments': 0, 'persisted': 0, 'dropped': 0, 'write_failures': 0,
+                       'sync_writes': 0, 'snapshot_loads': 0, 'invalidations': 0,
+                       'fallback_lookups': 0}
+
+    # ------------------------------------------------------------------
+    # Snapshot cache
+    # ------------------------------------------------------------------
+
+    def snapshot(self, test_id: str) -> Optional[AssignmentSnapshot]:
+        """Cached snapshot for a test, reloading it if missing or older than ttl"""
+        snapshot = self._snapshots.get(test_id)
+        if snapshot is not None and time.monotonic() - snapshot.loaded_at < self.ttl:
+            return snapshot
+        with self._lock:
+            load_lock = self._load_locks.setdefault(test_id, threading.Lock())
+        with load_lock:
+            # Another thread may have reloaded it while we waited
+            current = self._snapshots.get(test_id)
+            if current is not None and current is not snapshot and \
+                    time.monotonic() - current.loaded_at < self.ttl:
+                return current
+            try:
+                fresh = self._load(test_id, previous=current)
+            except Exception as e:
+                logger.error(f"Error loading A/B test {test_id}: {e}")
+                return current
+            with self._lock:
+                self._stats['snapshot_loads'] += 1
+                if fresh is None:
+                    self._snapshots.pop(test_id, None)
+                else:
+                    self._snapshots[test_id] = fresh
+            return fresh
+
+    def invalidate(self, test_id: Optional[str] = None):
+        """Drop a cached test (or every test) and notify subscribers"""
+        with self._lock:
+            if test_id is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(test_id, None)
+            self._stats['invalidations'] += 1
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(test_id)
+            except Exception as e:
+                logger.error(f"A/B invalidation listener failed: {e}")
+
+    def subscribe(self, listener: Callable[[Optional[str]], None]):
+        """Call `listener(test_id)` on every invalidation (None means all tests)"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def _load(self, test_id: str, previous: Optional[AssignmentSnapshot]) -> Optional[AssignmentSnapshot]:
+        conn = self._connection_factory()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT status, end_date FROM ab_tests WHERE test_id = %s
+            ''', (test_id,))
+            test_info = cursor.fetchone()
+            if not test_info:
+                return None
+
+            cursor.execute('''
+                SELECT variant_id, traffic_percentage FROM ab_test_variants
+                WHERE test_id = %s ORDER BY variant_id
+            ''', (test_id,))
+            variants = cursor.fetchall()
+
+            end_date = test_info['end_date']
+            if isinstance(end_date, str):
+                end_date = datetime.fromisoformat(end_date)
+            snapshot = AssignmentSnapshot(
+                test_id=test_id,
+                status=test_info['status'],
+                end_date=end_date,
+                variant_ids=tuple(v['variant_id'] for v in variants),
+                cumulative=cumulative_weights([v['traffic_percentage'] for v in variants]),
+            )
+            self._attach_pins(cursor, snapshot, previous)
+            conn.commit()
+        finally:
+            conn.close()
+        snapshot.loaded_at = time.monotonic()
+        return snapshot
+
+    def _attach_pins(self, cursor, snapshot: AssignmentSnapshot, previous: Optional[AssignmentSnapshot]):
+        """Pin stored assignments the hash would not reproduce (scanned once per weight change)"""
+        if previous is not None and previous.signature == snapshot.signature:
+            snapshot.pinned = previous.pinned
+            return
+        if not snapshot.is_open():
+            return
+        cursor.execute(f'''
+            SELECT user_id, variant_id FROM {self.table} WHERE test_id = %s
+        ''', (snapshot.test_id,))
+        snapshot.pinned = {
+            row['user_id']: row['variant_id'] for row in cursor.fetchall()
+            if snapshot.hashed_variant(row['user_id']) != row['variant_id']
+        }
+        if snapshot.pinned:
+            logger.info(f"Pinned {len(snapshot.pinned)} stored assignments for test {snapshot.test_id}")
+
+    # ------------------------------------------------------------------
+    # Assignment
+    # ------------------------------------------------------------------
+
+    def assign(self, test_id: str, user_id: str) -> Optional[str]:
+        """
+        Variant for a user, or None if the test is unknown or has no assignable variants.
+
+        Open tests are answered from memory; the assignment row is queued for a
+        batched write. For paused/completed tests only a stored assignment is returned.
+        """
+        snapshot = self.snapshot(test_id)
+        if snapshot is None:
+            return None
+        if not snapshot.is_open():
+            return self._stored_variant(test_id, user_id)
+        variant_id = snapshot.variant_for(user_id)
+        if variant_id is not None:
+            self._stats['assignments'] += 1
+            if user_id not in snapshot.pinned:
+                self._persist(test_id, user_id, (test_id, user_id, variant_id, datetime.now()))
+        return variant_id
+
+    def bulk_assign(self, test_id: str, user_ids: Iterable[str], page_size: int = 1000) -> Dict[str, str]:
+        """
+        Assign many users at once (e.g. nightly pre-assignment)
+
+        Rows are written synchronously in one transaction of multi-row INSERTs.
+
+        Returns:
+            Dict mapping user_id to variant_id; empty if the test is not open
+        """
+        snapshot = self.snapshot(test_id)
+        if snapshot is None or not snapshot.is_open():
+            return {}
+        now = datetime.now()
+        return self._bulk(snapshot, user_ids, lambda user_id, variant_id: (test_id, user_id, variant_id, now),
+                          page_size)
+
+    def _bulk(self, snapshot: AssignmentSnapshot, user_ids: Iterable[str],
+              make_row: Callable[[str, str], tuple], page_size: int) -> Dict[str, str]:
+        assignments: Dict[str, str] = {}
+        rows = []
+        for user_id in user_ids:
+            if user_id in assignments:
+                continue
+            variant_id = snapshot.variant_for(user_id)
+            if variant_id is None:
+                continue
+            assignments[user_id] = variant_id
+            if user_id not in snapshot.pinned:
+                rows.append(make_row(user_id, variant_id))
+
+        if rows:
+            self._write_rows(rows, page_size)
+            with self._lock:
+                for row in rows:
+                    self._remember((snapshot.test_id, row[1]))
+                self._stats['persisted'] += len(rows)
+        self._stats['assignments'] += len(assignments)
+        return assignments
+
+    def _write_rows(self, rows: List[tuple], page_size: int):
+        conn = self._connection_factory()
+        try:
+            cursor = conn.cursor()
+            psycopg2.extras.execute_values(cursor, f'''
+                INSERT INTO {self.table} ({', '.join(self.columns)}) VALUES %s
+                ON CONFLICT (test_id, user_id) DO NOTHING
+            ''', rows, page_size=page_size)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _persist(self, test_id: str, user_id: str, row: tuple):
+        key = (test_id, user_id)
+        with self._lock:
+            if key in self._seen:
+                self._seen.move_to_end(key)
+                return
+            self._remember(key)
+        if self._writer.submit(self.table, row):
+            self._stats['persisted'] += 1
+        else:
+            # Buffer full: never block the request; the next assign re-queues it
+            with self._lock:
+                self._seen.pop(key, None)
+                self._stats['dropped'] += 1
+
+    def _forget_rows(self, table: str, rows: List[tuple]):
+        """Writer failure callback: let the next assign re-queue these users"""
+        with self._lock:
+            for row in rows:
+                self._seen.pop((row[0], row[1]), None)
+            self._stats['write_failures'] += len(rows)
+
+    def persist_now(self, test_id: str, user_id: str) -> Optional[str]:
+        """
+        Store a user's assignment synchronously if it is not stored yet.
+
+        For conversions whose assignment row is still queued, possibly in another
+        process's writer. The variant is the one assign() would return, so the
+        queued row (if any) then hits ON CONFLICT DO NOTHING.
+
+        Returns:
+            The variant written (or already stored), or None if the test is not open
+        """
+        self.flush()
+        snapshot = self.snapshot(test_id)
+        # Risk tests still filling variants only assign through the locked path
+        if snapshot is None or not snapshot.is_open() or not snapshot.balanced:
+            return None
+        variant_id = snapshot.variant_for(user_id)
+        if variant_id is None:
+            return None
+        self._write_rows([self._sync_row(test_id, user_id, variant_id)], page_size=1)
+        with self._lock:
+            self._remember((test_id, user_id))
+            self._stats['sync_writes'] += 1
+        return variant_id
+
+    def _sync_row(self, test_id: str, user_id: str, variant_id: str) -> tuple:
+        return test_id, user_id, variant_id, datetime.now()
+
+    def _remember(self, key: Tuple[str, str]):
+        self._seen[key] = None
+        if len(self._seen) > self._seen_capacity:
+            self._seen.popitem(last=False)
+
+    def _stored_variant(self, test_id: str, user_id: str) -> Optional[str]:
+        self._stats['fallback_lookups'] += 1
+        try:
+            conn = self._connection_factory()
+            try:
+                cursor = conn.cursor()
+                cursor.execute(f'''
+                    SELECT variant_id FROM {self.table}
+                    WHERE test_id = %s AND user_id = %s
+                ''', (test_id, user_id))
+                row = cursor.fetchone()
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.error(f"Error reading stored assignment: {e}")
+            return None
+        return row['variant_id'] if row else None
+
+    # ------------------------------------------------------------------
+    # Lifecycle / metrics
+    # ------------------------------------------------------------------
+
+    def flush(self) -> int:
+        """Write queued assignment rows now; returns rows taken"""
+        return self._writer.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['cached_tests'] = len(self._snapshots)
+            stats['pinned'] = sum(len(s.pinned) for s in self._snapshots.values())
+        stats['writer'] = self._writer.stats()
+        return stats
+
+
+class RiskAssignmentEngine(ABAssignmentEngine):
+    """
+    Cached assignment for risk_ab_test_configs / risk_ab_test_participants
+
+    While some variant is still short of minimum_risk_users_per_variant, new users
+    fill that variant first; those assignments are looked up and written
+    synchronously so every process sees them. Once all variants are filled the
+    test switches to the in-memory hash path with equal weights.
+    """
+
+    table = RISK_PARTICIPANT_TABLE
+    columns = RISK_PARTICIPANT_COLUMNS
+
+    def _load(self, test_id: str, previous: Optional[AssignmentSnapshot]) -> Optional[AssignmentSnapshot]:
+        conn = self._connection_factory()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT variants_config, status, end_date, minimum_risk_users_per_variant
+                FROM risk_ab_test_configs WHERE test_id = %s
+            ''', (test_id,))
+            test_info = cursor.fetchone()
+            if not test_info:
+                return None
+
+            variant_ids = tuple(json.loads(test_info['variants_config']).keys())
+            snapshot = AssignmentSnapshot(
+                test_id=test_id,
+                status=test_info['status'],
+                # Risk tests have always been assignable until their status changes
+                end_date=None,
+                variant_ids=variant_ids,
+                cumulative=cumulative_weights([1.0] * len(variant_ids)),
+                min_risk_users=test_info['minimum_risk_users_per_variant'] or 0,
+            )
+            if snapshot.is_open():
+                cursor.execute('''
+                    SELECT variant_id, COUNT(*) AS risk_users FROM risk_ab_test_participants
+                    WHERE test_id = %s AND risk_score >= %s
+                    GROUP BY variant_id
+                ''', (test_id, RISK_USER_THRESHOLD))
+                snapshot.risk_counts = {row['variant_id']: row['risk_users'] for row in cursor.fetchall()}
+                if snapshot.balanced:
+                    self._attach_pins(cursor, snapshot, previous if previous is not None and previous.balanced else None)
+            conn.commit()
+        finally:
+            conn.close()
+        snapshot.loaded_at = time.monotonic()
+        return snapshot
+
+    def assign(self, test_id: str, user_id: str, risk_score: float = 0.0,
+               risk_level: str = 'low') -> Optional[str]:
+        snapshot = self.snapshot(test_id)
+        if snapshot is None:
+            return None
+        if not snapshot.is_open():
+            return self._stored_variant(test_id, user_id)
+        if not snapshot.balanced:
+            return self._assign_balancing(snapshot, user_id, risk_score, risk_level)
+        variant_id = snapshot.variant_for(user_id)
+        if variant_id is not None:
+            self._stats['assignments'] += 1
+            if user_id not in snapshot.pinned:
+                self._persist(test_id, user_id, (test_id, user_id, variant_id, risk_score,
+                                                 risk_level, datetime.now()))
+        return variant_id
+
+    def bulk_assign(self, test_id: str, user_ids: Iterable[str], page_size: int = 1000,
+                    risk_scores: Optional[Dict[str, float]] = None,
+                    risk_level_for: Optional[Callable[[float], str]] = None) -> Dict[str, str]:
+        """Pre-assign users to a filled risk test; returns {} while it is still balancing"""
+        snapshot = self.snapshot(test_id)
+        if snapshot is None or not snapshot.is_open() or not snapshot.balanced:
+            return {}
+        risk_scores = risk_scores or {}
+        risk_level_for = risk_level_for or (lambda score: 'low')
+        now = datetime.now()
+
+        def make_row(user_id: str, variant_id: str) -> tuple:
+            score = float(risk_scores.get(user_id, 0.0))
+            return test_id, user_id, variant_id, score, risk_level_for(score), now
+
+        return self._bulk(snapshot, user_ids, make_row, page_size)
+
+    def _sync_row(self, test_id: str, user_id: str, variant_id: str) -> tuple:
+        # The risk score travels with assign(); a conversion that beats its queued
+        # row only knows the variant, so it is stored with the default score.
+        return test_id, user_id, variant_id, 0.0, 'low', datetime.now()
+
+    def _assign_balancing(self, snapshot: AssignmentSnapshot, user_id: str, risk_score: float,
+                          risk_level: str) -> Optional[str]:
+        conn = self._connection_factory()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT variant_id FROM risk_ab_test_participants
+                WHERE test_id = %s AND user_id = %s
+            ''', (snapshot.test_id, user_id))
+            existing = cursor.fetchone()
+            if existing:
+                conn.commit()
+                return existing['variant_id']
+
+            counts = snapshot.risk_counts
+            variant_id = next((v for v in snapshot.variant_ids
+                               if counts.get(v, 0) < snapshot.min_risk_users), None)
+            if variant_id is None:
+                variant_id = snapshot.hashed_variant(user_id)
+
+            cursor.execute('''
+                INSERT INTO risk_ab_test_participants
+                (test_id, user_id, variant_id, risk_score, risk_level, assigned_at)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON CONFLICT (test_id, user_id) DO NOTHING
+            ''', (snapshot.test_id, user_id, variant_id, risk_score, risk_level, datetime.now()))
+            conn.commit()
+        finally:
+            conn.close()
+
+        self._stats['assignments'] += 1
+        if risk_score >= RISK_USER_THRESHOLD:
+            with self._lock:
+                counts[variant_id] = counts.get(variant_id, 0) + 1
+            if snapshot.balanced:
+                # Reload so users filled above are pinned before the hash path takes over
+                self.invalidate(snapshot.test_id)
+        return variant_id
+
+
+_engines: Dict[type, ABAssignmentEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_assignment_engine(engine_class: type = ABAssignmentEngine) -> ABAssignmentEngine:
+    """Process-wide engine so every framework instance shares one snapshot cache"""
+    engine = _engines.get(engine_class)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(engine_class)
+            if engine is None:
+                engine = engine_class(ttl=float(os.environ.get('AB_ASSIGNMENT_TTL_SECONDS', 30.0)))
+                _engines[engine_class] = engine
+    return engine
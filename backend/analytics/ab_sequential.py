@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Sequential A/B Statistics
+
+Summary-statistics helpers for ABTestFramework results. Each variant is reduced
+to running sufficient statistics (assigned users, converters, count / sum / sum
+of squares of conversion values), so results are computed in O(variants) without
+reading individual assignment rows.
+
+Significance uses the mixture sequential probability ratio test (mSPRT) with a
+normal mixing distribution over the difference in means. Its p-value is
+"always valid": taking the running minimum across looks keeps the false positive
+rate at alpha no matter how often a dashboard polls, unlike a fixed-horizon
+t-test that is only valid when read once at the planned sample size.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+
+@dataclass
+class VariantSummary:
+    """Running sufficient statistics for one variant and metric"""
+    users: int = 0
+    converters: int = 0
+    value_count: int = 0
+    value_sum: float = 0.0
+    value_sum_sq: float = 0.0
+
+    def add(self, value: float, first_for_user: bool):
+        """Fold in one conversion event"""
+        if first_for_user:
+            self.converters += 1
+        self.value_count += 1
+        self.value_sum += value
+        self.value_sum_sq += value * value
+
+    @property
+    def mean(self) -> float:
+        return self.value_sum / self.value_count if self.value_count else 0.0
+
+    @property
+    def variance(self) -> float:
+        """Unbiased sample variance of conversion values"""
+        n = self.value_count
+        if n < 2:
+            return 0.0
+        return max((self.value_sum_sq - self.value_sum * self.value_sum / n) / (n - 1), 0.0)
+
+    def metrics(self) -> Dict[str, Any]:
+        conversion_rate = (self.converters / self.users * 100) if self.users > 0 else 0
+        average_value = (self.value_sum / self.converters) if self.converters > 0 else 0
+        return {
+            'conversion_rate': round(conversion_rate, 2),
+            'average_value': round(average_value, 2),
+            'total_value': round(self.value_sum, 2),
+            'unique_conversions': self.converters,
+            'value_count': self.value_count,
+            'value_mean': round(self.mean, 4),
+            'value_variance': round(self.variance, 4),
+        }
+
+
+def _difference_variance(control: VariantSummary, treatment: VariantSummary) -> float:
+    return control.variance / control.value_count + treatment.variance / treatment.value_count
+
+
+def default_mixing_variance(control: VariantSummary, treatment: VariantSummary,
+                            success_threshold: Optional[float] = None) -> float:
+    """
+    Variance of the normal mixture over effect sizes (tau squared)
+
+    Centred on the minimum effect worth detecting: success_threshold percent of
+    the control mean, falling back to the pooled standard deviation.
+    """
+    if success_threshold and control.mean:
+        effect = abs(control.mean) * success_threshold / 100
+        if effect > 0:
+            return effect * effect
+    pooled = (control.variance + treatment.variance) / 2
+    return pooled if pooled > 0 else 1.0
+
+
+def msprt_p_value(control: VariantSummary, treatment: VariantSummary, tau_sq: float) -> float:
+    """
+    mSPRT p-value for H0: mean(treatment) == mean(control) at the current look
+
+    Callers keep the running minimum across looks to get the always-valid p-value.
+    """
+    if control.value_count < 2 or treatment.value_count < 2 or tau_sq <= 0:
+        return 1.0
+    v = _difference_variance(control, treatment)
+    if v <= 0:
+        return 1.0 if treatment.mean == control.mean else 0.0
+    theta = treatment.mean - control.mean
+    log_lr = 0.5 * math.log(v / (v + tau_sq)) + theta * theta * tau_sq / (2 * v * (v + tau_sq))
+    if log_lr <= 0:
+        return 1.0
+    return min(1.0, math.exp(-log_lr))
+
+
+def confidence_sequence(control: VariantSummary, treatment: VariantSummary, tau_sq: float,
+                        alpha: float = 0.05) -> Tuple[float, float]:
+    """
+    Always-valid (1 - alpha) interval for mean(control) - mean(treatment)
+
+    Matches the sign convention of the fixed-horizon interval it replaces.
+    """
+    if control.value_count < 2 or treatment.value_count < 2 or tau_sq <= 0:
+        return (0.0, 0.0)
+    v = _difference_variance(control, treatment)
+    difference = control.mean - treatment.mean
+    if v <= 0:
+        return (difference, difference)
+    half_width = math.sqrt(v * (v + tau_sq) / tau_sq * (2 * math.log(1 / alpha) + math.log((v + tau_sq) / v)))
+    return (difference - half_width, difference + half_width)
+
+
+def fixed_horizon_p_value(control: VariantSummary, treatment: VariantSummary) -> float:
+    """Two-sided Welch z-test p-value; only valid when read once at the planned sample size"""
+    if control.value_count < 2 or treatment.value_count < 2:
+        return 1.0
+    v = _difference_variance(control, treatment)
+    if v <= 0:
+        return 1.0 if treatment.mean == control.mean else 0.0
+    z = (treatment.mean - control.mean) / math.sqrt(v)
+    return math.erfc(abs(z) / math.sqrt(2))
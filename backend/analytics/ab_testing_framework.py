@@ -18,18 +18,18 @@ Features:
 
 import psycopg2
 import psycopg2.extras
-import os
 import json
 import logging
 import uuid
-import random
-import hashlib
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
-import statistics
-import math
+from backend.utils.pg_pool import get_pg_connection
+from backend.analytics.ab_assignment_engine import ABAssignmentEngine, get_assignment_engine
+from backend.analytics.ab_sequential import (
+    VariantSummary, confidence_sequence, default_mixing_variance, fixed_horizon_p_value, msprt_p_value
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -99,12 +99,6 @@ class TestResult:
     confidence_interval_upper: float
     statistical_significance: float
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class ABTestFramework:
     """
     Comprehensive A/B testing framework for job recommendation optimization.
@@ -113,16 +107,58 @@ class ABTestFramework:
     analysis to continuously improve recommendation effectiveness.
     """
     
-    def __init__(self, db_path: str = None):
-        """Initialize the A/B testing framework"""
+    def __init__(self, db_path: str = None, assignment_engine: ABAssignmentEngine = None):
+        """
+        Initialize the A/B testing framework
+
+        Args:
+            db_path: Unused (kept for backwards compatibility)
+            assignment_engine: Assignment cache; defaults to the process-wide engine
+        """
+        self.assignment_engine = assignment_engine or get_assignment_engine()
         self._init_database()
         logger.info("ABTestFramework initialized successfully")
     
     def _init_database(self):
-        """Verify PostgreSQL database connection"""
+        """Verify PostgreSQL database connection and create the running-statistics table"""
         try:
             conn = get_pg_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT to_regclass('ab_test_variant_stats') IS NOT NULL AS present")
+            stats_table_existed = cursor.fetchone()['present']
+            
+            # Per-variant sufficient statistics, maintained by track_conversion
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS ab_test_variant_stats (
+                    test_id TEXT NOT NULL,
+                    variant_id TEXT NOT NULL,
+                    metric_name TEXT NOT NULL,
+                    converters INTEGER NOT NULL DEFAULT 0,
+                    value_count INTEGER NOT NULL DEFAULT 0,
+                    value_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+                    value_sum_sq DOUBLE PRECISION NOT NULL DEFAULT 0,
+                    sequential_p_value DOUBLE PRECISION,
+                    mixing_variance DOUBLE PRECISION,
+                    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (test_id, variant_id, metric_name)
+                )
+            ''')
+            
+            backfill_tests = []
+            if not stats_table_existed:
+                cursor.execute('''
+                    SELECT DISTINCT test_id FROM ab_test_assignments
+                    WHERE conversion_events IS NOT NULL
+                ''')
+                backfill_tests = [row['test_id'] for row in cursor.fetchall()]
+            
+            conn.commit()
             conn.close()
+            
+            # One-time backfill for tests tracked before the statistics table existed
+            for test_id in backfill_tests:
+                self.rebuild_variant_stats(test_id)
         except Exception as e:
             logger.error(f"Error initializing database: {e}")
     
@@ -249,6 +285,7 @@ class ABTestFramework:
             conn.commit()
             conn.close()
             
+            self.assignment_engine.invalidate(test_id)
             logger.info(f"Added variant {variant_name} to test {test_id}")
             return variant_id
             
@@ -298,6 +335,7 @@ class ABTestFramework:
             conn.commit()
             conn.close()
             
+            self.assignment_engine.invalidate(test_id)
             logger.info(f"Started A/B test: {test_id}")
             return True
             
@@ -321,86 +359,38 @@ class ABTestFramework:
             variant_id: Assigned variant identifier or None
         """
         try:
-            conn = get_pg_connection()
-            cursor = conn.cursor()
-            
-            # Check if user is already assigned
-            cursor.execute('''
-                SELECT variant_id FROM ab_test_assignments 
-                WHERE test_id = %s AND user_id = %s
-            ''', (test_id, user_id))
-            
-            existing_assignment = cursor.fetchone()
-            if existing_assignment:
-                return existing_assignment['variant_id']
-            
-            # Check if test is active
-            cursor.execute('''
-                SELECT status, end_date FROM ab_tests WHERE test_id = %s
-            ''', (test_id,))
-            
-            test_info = cursor.fetchone()
-            if not test_info or test_info['status'] != TestStatus.ACTIVE.value:
-                return None
-            
-            end_date = test_info['end_date']
-            if end_date:
-                if isinstance(end_date, str):
-                    end_date = datetime.fromisoformat(end_date)
-                if end_date < datetime.now():
-                    return None
-            
-            # Get variants with traffic percentages
-            cursor.execute('''
-                SELECT variant_id, traffic_percentage FROM ab_test_variants 
-                WHERE test_id = %s ORDER BY variant_id
-            ''', (test_id,))
-            
-            variants = cursor.fetchall()
-            if not variants:
-                return None
-            
-            # Assign user to variant based on traffic percentages
-            variant_id = self._assign_variant_by_traffic(user_id, variants)
-            
-            # Record assignment
-            cursor.execute('''
-                INSERT INTO ab_test_assignments (test_id, user_id, variant_id, assigned_at)
-                VALUES (%s, %s, %s, %s)
-            ''', (test_id, user_id, variant_id, datetime.now()))
-            
-            conn.commit()
-            conn.close()
-            
-            logger.debug(f"Assigned user {user_id} to variant {variant_id} in test {test_id}")
+            variant_id = self.assignment_engine.assign(test_id, user_id)
+            if variant_id:
+                logger.debug(f"Assigned user {user_id} to variant {variant_id} in test {test_id}")
             return variant_id
             
         except Exception as e:
             logger.error(f"Error assigning user to test: {e}")
             return None
     
-    def _assign_variant_by_traffic(
+    def bulk_assign(
         self,
-        user_id: str,
-        variants: List[Tuple[str, float]]
-    ) -> str:
-        """Assign user to variant based on traffic percentages using consistent hashing"""
-        # Use user_id hash for consistent assignment
-        user_hash = int(hashlib.md5(user_id.encode()).hexdigest()[:8], 16)
-        random.seed(user_hash)
-        
-        # Generate random number between 0 and 100
-        random_value = random.uniform(0, 100)
-        
-        # Find variant based on cumulative traffic percentage
-        cumulative_percentage = 0
-        for variant in variants:
-            cumulative_percentage += variant['traffic_percentage']
-            if random_value <= cumulative_percentage:
-                return variant['variant_id']
+        test_id: str,
+        user_ids: List[str]
+    ) -> Dict[str, str]:
+        """
+        Assign many users to a test in one pass (e.g. nightly pre-assignment)
         
-        # Fallback to last variant
-        return variants[-1]['variant_id']
+        Args:
+            test_id: Test identifier
+            user_ids: User identifiers
+            
+        Returns:
+            Dict mapping user_id to assigned variant_id (empty if the test is not active)
+        """
+        try:
+            assignments = self.assignment_engine.bulk_assign(test_id, user_ids)
+            logger.info(f"Bulk assigned {len(assignments)} users in test {test_id}")
+            return assignments
+            
+        except Exception as e:
+            logger.error(f"Error bulk assigning users to test: {e}")
+            return {}
     
     def track_conversion(
         self,
@@ -413,6 +403,9 @@ class ABTestFramework:
         """
         Track conversion event for a user in a test
         
+        Also folds the event into the variant's running statistics so results
+        never have to re-read individual assignments.
+        
         Args:
             test_id: Test identifier
             user_id: User identifier
@@ -427,21 +420,31 @@ class ABTestFramework:
             conn = get_pg_connection()
             cursor = conn.cursor()
             
-            # Get user's current conversion events
-            cursor.execute('''
-                SELECT conversion_events FROM ab_test_assignments 
+            # Get user's current conversion events (locked so concurrent events are not lost)
+            select_events = '''
+                SELECT variant_id, conversion_events FROM ab_test_assignments 
                 WHERE test_id = %s AND user_id = %s
-            ''', (test_id, user_id))
+                FOR UPDATE
+            '''
+            cursor.execute(select_events, (test_id, user_id))
             
             result = cursor.fetchone()
+            if not result:
+                # The assignment may still be queued for a batched writer (this
+                # process's or another's): store it synchronously and look again
+                self.assignment_engine.persist_now(test_id, user_id)
+                cursor.execute(select_events, (test_id, user_id))
+                result = cursor.fetchone()
             if not result:
                 logger.warning(f"User {user_id} not assigned to test {test_id}")
+                conn.close()
                 return False
             
             conversion_events = json.loads(result['conversion_events']) if result['conversion_events'] else {}
+            first_for_user = conversion_event not in conversion_events
             
             # Add new conversion event
-            if conversion_event not in conversion_events:
+            if first_for_user:
                 conversion_events[conversion_event] = []
             
             conversion_events[conversion_event].append({
@@ -457,6 +460,23 @@ class ABTestFramework:
                 WHERE test_id = %s AND user_id = %s
             ''', (json.dumps(conversion_events), test_id, user_id))
             
+            # Update the variant's running statistics in the same transaction
+            cursor.execute('''
+                INSERT INTO ab_test_variant_stats (
+                    test_id, variant_id, metric_name, converters,
+                    value_count, value_sum, value_sum_sq, updated_at
+                ) VALUES (%s, %s, %s, %s, 1, %s, %s, %s)
+                ON CONFLICT (test_id, variant_id, metric_name) DO UPDATE SET
+                    converters = ab_test_variant_stats.converters + EXCLUDED.converters,
+                    value_count = ab_test_variant_stats.value_count + 1,
+                    value_sum = ab_test_variant_stats.value_sum + EXCLUDED.value_sum,
+                    value_sum_sq = ab_test_variant_stats.value_sum_sq + EXCLUDED.value_sum_sq,
+                    updated_at = EXCLUDED.updated_at
+            ''', (
+                test_id, result['variant_id'], conversion_event, int(first_for_user),
+                value, value * value, datetime.now()
+            ))
+            
             conn.commit()
             conn.close()
             
@@ -467,6 +487,62 @@ class ABTestFramework:
             logger.error(f"Error tracking conversion: {e}")
             return False
     
+    def rebuild_variant_stats(self, test_id: str) -> bool:
+        """
+        Recompute a test's running statistics from the stored conversion events
+        
+        One full scan of the test's assignments; used to backfill tests that
+        predate ab_test_variant_stats or to repair drift.
+        
+        Args:
+            test_id: Test identifier
+            
+        Returns:
+            bool: Success status
+        """
+        try:
+            conn = get_pg_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT variant_id, conversion_events FROM ab_test_assignments
+                WHERE test_id = %s AND conversion_events IS NOT NULL
+            ''', (test_id,))
+            
+            summaries: Dict[Tuple[str, str], VariantSummary] = {}
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                for row in rows:
+                    for metric, events in json.loads(row['conversion_events']).items():
+                        summary = summaries.setdefault((row['variant_id'], metric), VariantSummary())
+                        for i, event in enumerate(events):
+                            summary.add(event.get('value', 1.0), first_for_user=(i == 0))
+            
+            cursor.execute('DELETE FROM ab_test_variant_stats WHERE test_id = %s', (test_id,))
+            if summaries:
+                psycopg2.extras.execute_values(cursor, '''
+                    INSERT INTO ab_test_variant_stats (
+                        test_id, variant_id, metric_name, converters,
+                        value_count, value_sum, value_sum_sq, updated_at
+                    ) VALUES %s
+                ''', [
+                    (test_id, variant_id, metric, s.converters, s.value_count,
+                     s.value_sum, s.value_sum_sq, datetime.now())
+                    for (variant_id, metric), s in summaries.items()
+                ])
+            
+            conn.commit()
+            conn.close()
+            
+            logger.info(f"Rebuilt variant statistics for test {test_id} ({len(summaries)} rows)")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error rebuilding variant statistics: {e}")
+            return False
+    
     def get_test_results(
         self,
         test_id: str,
@@ -475,6 +551,9 @@ class ABTestFramework:
         """
         Get A/B test results with statistical analysis
         
+        Computed from per-variant running statistics in O(variants). Significance
+        is always-valid (mSPRT), so results can be polled continuously.
+        
         Args:
             test_id: Test identifier
             metric_name: Specific metric to analyze (optional)
@@ -494,12 +573,14 @@ class ABTestFramework:
             
             test_info = cursor.fetchone()
             if not test_info:
+                conn.close()
                 return {'error': 'Test not found'}
             
             test_name = test_info['test_name']
             target_metric = test_info['target_metric']
             success_threshold = test_info['success_threshold']
             minimum_sample_size = test_info['minimum_sample_size']
+            analyzed_metric = metric_name or target_metric
             
             # Get variants
             cursor.execute('''
@@ -510,35 +591,46 @@ class ABTestFramework:
             
             variants = cursor.fetchall()
             
+            # Sample sizes: one grouped count instead of fetching every assignment
+            cursor.execute('''
+                SELECT variant_id, COUNT(*) AS users FROM ab_test_assignments
+                WHERE test_id = %s GROUP BY variant_id
+            ''', (test_id,))
+            users_by_variant = {row['variant_id']: row['users'] for row in cursor.fetchall()}
+            
+            cursor.execute('''
+                SELECT variant_id, converters, value_count, value_sum, value_sum_sq,
+                       sequential_p_value, mixing_variance
+                FROM ab_test_variant_stats
+                WHERE test_id = %s AND metric_name = %s
+            ''', (test_id, analyzed_metric))
+            stats_by_variant = {row['variant_id']: row for row in cursor.fetchall()}
+            
             # Analyze each variant
             variant_results = []
+            summaries: Dict[str, VariantSummary] = {}
             control_variant = None
             
             for variant_row in variants:
                 variant_id = variant_row['variant_id']
-                variant_name = variant_row['variant_name']
                 is_control = variant_row['is_control']
-                traffic_percentage = variant_row['traffic_percentage']
-                # Get conversion data for this variant
-                cursor.execute('''
-                    SELECT conversion_events FROM ab_test_assignments 
-                    WHERE test_id = %s AND variant_id = %s
-                ''', (test_id, variant_id))
-                
-                conversion_data = cursor.fetchall()
-                
-                # Calculate metrics
-                metrics = self._calculate_variant_metrics(
-                    conversion_data, metric_name or target_metric
+                stats = stats_by_variant.get(variant_id) or {}
+                summary = VariantSummary(
+                    users=users_by_variant.get(variant_id, 0),
+                    converters=stats.get('converters') or 0,
+                    value_count=stats.get('value_count') or 0,
+                    value_sum=stats.get('value_sum') or 0.0,
+                    value_sum_sq=stats.get('value_sum_sq') or 0.0
                 )
+                summaries[variant_id] = summary
                 
                 variant_result = {
                     'variant_id': variant_id,
-                    'variant_name': variant_name,
+                    'variant_name': variant_row['variant_name'],
                     'is_control': bool(is_control),
-                    'traffic_percentage': traffic_percentage,
-                    'sample_size': len(conversion_data),
-                    'metrics': metrics
+                    'traffic_percentage': variant_row['traffic_percentage'],
+                    'sample_size': summary.users,
+                    'metrics': summary.metrics()
                 }
                 
                 variant_results.append(variant_result)
@@ -548,16 +640,23 @@ class ABTestFramework:
             
             # Calculate statistical significance
             if control_variant and len(variant_results) > 1:
+                control_summary = summaries[control_variant['variant_id']]
                 for variant_result in variant_results:
                     if not variant_result['is_control']:
+                        variant_id = variant_result['variant_id']
                         significance = self._calculate_statistical_significance(
-                            control_variant, variant_result, target_metric
+                            control_summary, summaries[variant_id],
+                            stats_by_variant.get(variant_id) or {}, success_threshold
                         )
                         variant_result['statistical_significance'] = significance
+                        self._store_sequential_state(
+                            cursor, test_id, variant_id, analyzed_metric, significance
+                        )
             
             # Determine test status
             test_status = self._determine_test_status(variant_results, success_threshold, minimum_sample_size)
             
+            conn.commit()
             conn.close()
             
             return {
@@ -574,74 +673,29 @@ class ABTestFramework:
             logger.error(f"Error getting test results: {e}")
             return {'error': str(e)}
     
-    def _calculate_variant_metrics(
-        self,
-        conversion_data: List[Tuple[str]],
-        metric_name: str
-    ) -> Dict[str, Any]:
-        """Calculate metrics for a variant"""
-        if not conversion_data:
-            return {
-                'conversion_rate': 0.0,
-                'average_value': 0.0,
-                'total_value': 0.0,
-                'unique_conversions': 0
-            }
-        
-        total_users = len(conversion_data)
-        conversions = 0
-        total_value = 0.0
-        values = []
-        
-        for row in conversion_data:
-            conversion_events_json = row['conversion_events']
-            if not conversion_events_json:
-                continue
-                
-            conversion_events = json.loads(conversion_events_json)
-            
-            if metric_name in conversion_events:
-                conversions += 1
-                for event in conversion_events[metric_name]:
-                    value = event.get('value', 1.0)
-                    total_value += value
-                    values.append(value)
-        
-        conversion_rate = (conversions / total_users * 100) if total_users > 0 else 0
-        average_value = (total_value / conversions) if conversions > 0 else 0
-        
-        return {
-            'conversion_rate': round(conversion_rate, 2),
-            'average_value': round(average_value, 2),
-            'total_value': round(total_value, 2),
-            'unique_conversions': conversions,
-            'values': values
-        }
-    
     def _calculate_statistical_significance(
         self,
-        control_variant: Dict[str, Any],
-        test_variant: Dict[str, Any],
-        metric_name: str
+        control: VariantSummary,
+        treatment: VariantSummary,
+        stored_state: Dict[str, Any],
+        success_threshold: Optional[float] = None
     ) -> Dict[str, Any]:
-        """Calculate statistical significance between control and test variant"""
+        """Always-valid significance of a variant against the control"""
         try:
-            control_values = control_variant['metrics'].get('values', [])
-            test_values = test_variant['metrics'].get('values', [])
-            
-            if not control_values or not test_values:
+            if control.value_count < 2 or treatment.value_count < 2:
                 return {'p_value': 1.0, 'is_significant': False, 'confidence_level': 0.0}
             
-            # Perform t-test
-            p_value = self._perform_t_test(control_values, test_values)
-            
-            # Calculate confidence interval
-            control_mean = statistics.mean(control_values)
-            test_mean = statistics.mean(test_values)
-            improvement = ((test_mean - control_mean) / control_mean * 100) if control_mean > 0 else 0
+            # The mixing variance is fixed at the first look so p-values stay comparable
+            tau_sq = stored_state.get('mixing_variance') or default_mixing_variance(
+                control, treatment, success_threshold
+            )
+            p_value = msprt_p_value(control, treatment, tau_sq)
+            previous = stored_state.get('sequential_p_value')
+            if previous is not None:
+                p_value = min(p_value, previous)
             
-            # Calculate confidence interval for the difference
-            ci_lower, ci_upper = self._calculate_confidence_interval(control_values, test_values)
+            improvement = ((treatment.mean - control.mean) / control.mean * 100) if control.mean > 0 else 0
+            ci_lower, ci_upper = confidence_sequence(control, treatment, tau_sq)
             
             return {
                 'p_value': round(p_value, 4),
@@ -649,80 +703,36 @@ class ABTestFramework:
                 'confidence_level': round((1 - p_value) * 100, 2),
                 'improvement_percentage': round(improvement, 2),
                 'confidence_interval_lower': round(ci_lower, 4),
-                'confidence_interval_upper': round(ci_upper, 4)
+                'confidence_interval_upper': round(ci_upper, 4),
+                'fixed_horizon_p_value': round(fixed_horizon_p_value(control, treatment), 4),
+                'sequential_p_value': p_value,
+                'mixing_variance': tau_sq
             }
             
         except Exception as e:
             logger.error(f"Error calculating statistical significance: {e}")
             return {'p_value': 1.0, 'is_significant': False, 'confidence_level': 0.0}
     
-    def _perform_t_test(self, group1: List[float], group2: List[float]) -> float:
-        """Perform two-sample t-test"""
-        try:
-            n1, n2 = len(group1), len(group2)
-            if n1 < 2 or n2 < 2:
-                return 1.0
-            
-            mean1, mean2 = statistics.mean(group1), statistics.mean(group2)
-            var1, var2 = statistics.variance(group1), statistics.variance(group2)
-            
-            # Pooled variance
-            pooled_var = ((n1 - 1) * var1 + (n2 - 1) * var2) / (n1 + n2 - 2)
-            
-            # Standard error
-            se = math.sqrt(pooled_var * (1/n1 + 1/n2))
-            
-            # t-statistic
-            t_stat = (mean1 - mean2) / se
-            
-            # Degrees of freedom
-            df = n1 + n2 - 2
-            
-            # Approximate p-value (simplified)
-            if abs(t_stat) > 2.576:  # 99% confidence
-                return 0.01
-            elif abs(t_stat) > 1.96:  # 95% confidence
-                return 0.05
-            elif abs(t_stat) > 1.645:  # 90% confidence
-                return 0.10
-            else:
-                return 0.20
-                
-        except Exception:
-            return 1.0
-    
-    def _calculate_confidence_interval(
+    def _store_sequential_state(
         self,
-        group1: List[float],
-        group2: List[float],
-        confidence_level: float = 0.95
-    ) -> Tuple[float, float]:
-        """Calculate confidence interval for the difference of means"""
-        try:
-            n1, n2 = len(group1), len(group2)
-            if n1 < 2 or n2 < 2:
-                return (0.0, 0.0)
-            
-            mean1, mean2 = statistics.mean(group1), statistics.mean(group2)
-            var1, var2 = statistics.variance(group1), statistics.variance(group2)
-            
-            # Pooled variance
-            pooled_var = ((n1 - 1) * var1 + (n2 - 1) * var2) / (n1 + n2 - 2)
-            
-            # Standard error
-            se = math.sqrt(pooled_var * (1/n1 + 1/n2))
-            
-            # t-value for confidence level
-            t_value = 1.96 if confidence_level == 0.95 else 2.576  # Simplified
-            
-            # Confidence interval
-            margin_of_error = t_value * se
-            difference = mean1 - mean2
-            
-            return (difference - margin_of_error, difference + margin_of_error)
-            
-        except Exception:
-            return (0.0, 0.0)
+        cursor,
+        test_id: str,
+        variant_id: str,
+        metric_name: str,
+        significance: Dict[str, Any]
+    ):
+        """Persist the running-minimum p-value and mixing variance for the next look"""
+        if 'sequential_p_value' not in significance:
+            return
+        cursor.execute('''
+            UPDATE ab_test_variant_stats
+            SET sequential_p_value = %s, mixing_variance = COALESCE(mixing_variance, %s)
+            WHERE test_id = %s AND variant_id = %s AND metric_name = %s
+              AND (sequential_p_value IS NULL OR sequential_p_value > %s)
+        ''', (
+            significance['sequential_p_value'], significance['mixing_variance'],
+            test_id, variant_id, metric_name, significance['sequential_p_value']
+        ))
     
     def _determine_test_status(
         self,
@@ -794,6 +804,7 @@ class ABTestFramework:
             conn.commit()
             conn.close()
             
+            self.assignment_engine.invalidate(test_id)
             logger.info(f"Completed A/B test: {test_id}")
             if winning_variant_id:
                 logger.info(f"Winning variant: {winning_variant_id}")
@@ -16,9 +16,6 @@ Features:
 - Export capabilities for reports
 """
 
-import psycopg2
-import psycopg2.extras
-import os
 import json
 import logging
 from datetime import datetime, timedelta
@@ -26,6 +23,7 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 import threading
 import time
+from backend.utils.pg_pool import get_pg_connection
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -55,12 +53,6 @@ class Alert:
     resolved: bool = False
     resolved_at: Optional[datetime] = None
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class AdminDashboard:
     """
     Comprehensive admin dashboard for job recommendation analytics.
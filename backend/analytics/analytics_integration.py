@@ -20,9 +20,7 @@ from datetime import datetime
 from typing import Dict, Any, Optional, List
 from contextlib import contextmanager
 
-import psycopg2
-import psycopg2.extras
-import os
+from backend.utils.pg_pool import get_pg_connection
 
 # Import analytics components
 from .user_behavior_analytics import UserBehaviorAnalytics
@@ -464,8 +462,7 @@ class AnalyticsIntegration:
             cutoff_date = datetime.now() - timedelta(days=days_to_keep)
             cleanup_results = {}
             
-            conn = psycopg2.connect(os.environ['DATABASE_URL'])
-            conn.cursor_factory = psycopg2.extras.RealDictCursor
+            conn = get_pg_connection()
             cursor = conn.cursor()
             
             # Clean up old user sessions
@@ -16,8 +16,6 @@ Features:
 - Cost per recommendation analysis
 """
 
-import psycopg2
-import psycopg2.extras
 import os
 import json
 import logging
@@ -30,11 +28,33 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 from contextlib import contextmanager
 import statistics
+from backend.utils.pg_pool import get_pg_connection
+from backend.analytics.telemetry_writer import BufferedTelemetryWriter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Append-only tables written through the buffered telemetry writer
+TELEMETRY_TABLES = {
+    'api_performance': (
+        'endpoint', 'method', 'response_time', 'status_code', 'request_size',
+        'response_size', 'user_id', 'session_id', 'error_message'
+    ),
+    'processing_metrics': (
+        'session_id', 'process_name', 'start_time', 'end_time', 'duration',
+        'memory_usage', 'cpu_usage', 'success', 'error_message', 'metadata'
+    ),
+    'error_logs': (
+        'error_type', 'error_message', 'stack_trace', 'user_id', 'session_id',
+        'endpoint', 'severity'
+    ),
+    'system_resources': (
+        'timestamp', 'cpu_usage', 'memory_usage', 'disk_usage',
+        'active_connections', 'queue_length', 'error_rate', 'response_time_avg'
+    ),
+}
+
 class ErrorSeverity(Enum):
     """Error severity levels"""
     LOW = "low"
@@ -94,17 +114,6 @@ class ErrorLog:
     resolved: bool = False
     resolved_at: Optional[datetime] = None
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    db_url = os.environ.get('DATABASE_URL')
-    if not db_url:
-        raise RuntimeError(
-            "DATABASE_URL is required. SQLite is not supported."
-        )
-    conn = psycopg2.connect(db_url)
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class PerformanceMonitor:
     """
     Comprehensive performance monitoring system for job recommendation engine.
@@ -113,9 +122,21 @@ class PerformanceMonitor:
     to provide insights for system optimization and health monitoring.
     """
     
-    def __init__(self, db_path: str = None):
-        """Initialize the performance monitoring system"""
+    def __init__(self, db_path: str = None, writer: BufferedTelemetryWriter = None):
+        """
+        Initialize the performance monitoring system
+
+        Args:
+            db_path: Unused (kept for backwards compatibility)
+            writer: Telemetry writer; defaults to a buffered writer on the shared pool
+        """
         self._init_database()
+        self._writer = writer or BufferedTelemetryWriter(
+            TELEMETRY_TABLES,
+            capacity=int(os.environ.get('PERF_TELEMETRY_BUFFER', 10000)),
+            batch_size=int(os.environ.get('PERF_TELEMETRY_BATCH', 500)),
+            flush_interval=float(os.environ.get('PERF_TELEMETRY_FLUSH_SECONDS', 2.0)),
+        )
         self._monitoring_active = False
         self._monitor_thread = None
         self._performance_targets = {
@@ -180,28 +201,18 @@ class PerformanceMonitor:
                 error_message=error_message
             )
             
-            conn = get_pg_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO api_performance (
-                    endpoint, method, response_time, status_code, request_size,
-                    response_size, user_id, session_id, error_message
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ''', (
+            # Buffered: written in the background, never a DB round-trip per request
+            accepted = self._writer.submit('api_performance', (
                 performance.endpoint, performance.method, performance.response_time,
                 performance.status_code, performance.request_size, performance.response_size,
                 performance.user_id, performance.session_id, performance.error_message
             ))
             
-            conn.commit()
-            conn.close()
-            
             # Check for performance alerts
             self._check_performance_alerts(performance)
             
             logger.debug(f"Tracked API performance: {endpoint} - {response_time}ms")
-            return True
+            return accepted
             
         except Exception as e:
             logger.error(f"Error tracking API performance: {e}")
@@ -264,24 +275,13 @@ class PerformanceMonitor:
     def _store_processing_metrics(self, metrics: ProcessingMetrics):
         """Store processing metrics in database"""
         try:
-            conn = get_pg_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO processing_metrics (
-                    session_id, process_name, start_time, end_time, duration,
-                    memory_usage, cpu_usage, success, error_message, metadata
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ''', (
+            self._writer.submit('processing_metrics', (
                 metrics.session_id, metrics.process_name, metrics.start_time,
                 metrics.end_time, metrics.duration, metrics.memory_usage,
                 metrics.cpu_usage, metrics.success, metrics.error_message,
                 metrics.metadata
             ))
             
-            conn.commit()
-            conn.close()
-            
             logger.debug(f"Stored processing metrics: {metrics.process_name} - {metrics.duration:.2f}s")
             
         except Exception as e:
@@ -323,28 +323,17 @@ class PerformanceMonitor:
                 severity=severity
             )
             
-            conn = get_pg_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO error_logs (
-                    error_type, error_message, stack_trace, user_id, session_id,
-                    endpoint, severity
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-            ''', (
+            accepted = self._writer.submit('error_logs', (
                 error_log.error_type, error_log.error_message, error_log.stack_trace,
                 error_log.user_id, error_log.session_id, error_log.endpoint,
                 error_log.severity
             ))
             
-            conn.commit()
-            conn.close()
-            
             # Check for error alerts
             self._check_error_alerts(error_log)
             
             logger.warning(f"Logged error: {error_type} - {error_message}")
-            return True
+            return accepted
             
         except Exception as e:
             logger.error(f"Error logging error: {e}")
@@ -375,8 +364,17 @@ class PerformanceMonitor:
         self._monitoring_active = False
         if self._monitor_thread:
             self._monitor_thread.join(timeout=5)
+        self._writer.flush()
         logger.info("Stopped system monitoring")
     
+    def flush_telemetry(self) -> int:
+        """Write all buffered telemetry now; returns the number of rows flushed"""
+        return self._writer.flush()
+    
+    def get_telemetry_stats(self) -> Dict[str, Any]:
+        """Buffer depth, batch sizes, flush latency and dropped-row counts"""
+        return self._writer.stats()
+    
     def _monitor_system_resources(self, interval: int):
         """Monitor system resources continuously"""
         while self._monitoring_active:
@@ -421,23 +419,12 @@ class PerformanceMonitor:
     def _store_system_resources(self, resources: SystemResources):
         """Store system resource metrics"""
         try:
-            conn = get_pg_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO system_resources (
-                    timestamp, cpu_usage, memory_usage, disk_usage,
-                    active_connections, queue_length, error_rate, response_time_avg
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            ''', (
+            self._writer.submit('system_resources', (
                 resources.timestamp, resources.cpu_usage, resources.memory_usage,
                 resources.disk_usage, resources.active_connections, resources.queue_length,
                 resources.error_rate, resources.response_time_avg
             ))
             
-            conn.commit()
-            conn.close()
-            
         except Exception as e:
             logger.error(f"Error storing system resources: {e}")
     
@@ -345,6 +345,23 @@ CREATE TABLE IF NOT EXISTS ab_test_results (
     FOREIGN KEY (variant_id) REFERENCES ab_test_variants (variant_id)
 );
 
+-- A/B test running statistics (per variant and metric, maintained on each conversion)
+CREATE TABLE IF NOT EXISTS ab_test_variant_stats (
+    test_id TEXT NOT NULL,
+    variant_id TEXT NOT NULL,
+    metric_name TEXT NOT NULL,
+    converters INTEGER NOT NULL DEFAULT 0,
+    value_count INTEGER NOT NULL DEFAULT 0,
+    value_sum REAL NOT NULL DEFAULT 0,
+    value_sum_sq REAL NOT NULL DEFAULT 0,
+    sequential_p_value REAL, -- running minimum of the always-valid (mSPRT) p-value
+    mixing_variance REAL, -- mSPRT mixing variance, fixed at the first look
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (test_id, variant_id, metric_name),
+    FOREIGN KEY (test_id) REFERENCES ab_tests (test_id),
+    FOREIGN KEY (variant_id) REFERENCES ab_test_variants (variant_id)
+);
+
 -- =====================================================
 -- 6. DASHBOARD AND REPORTING TABLES
 -- =====================================================
@@ -16,9 +16,6 @@ Features:
 - A/B testing support for recommendation improvements
 """
 
-import psycopg2
-import psycopg2.extras
-import os
 import json
 import logging
 import uuid
@@ -27,6 +24,7 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 import statistics
+from backend.utils.pg_pool import get_pg_connection
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -109,12 +107,6 @@ class UserFeedback:
     feedback_text: str = ""
     recommendation_id: Optional[str] = None
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class RecommendationEffectiveness:
     """
     Comprehensive recommendation effectiveness analytics system.
@@ -17,23 +17,20 @@ Features:
 
 import asyncio
 import logging
-import psycopg2
-import psycopg2.extras
-import os
 import json
 import uuid
 import time
-import random
-import hashlib
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 import statistics
 import math
+from backend.utils.pg_pool import get_pg_connection
 
 # Import existing components
 from .ab_testing_framework import ABTestFramework, TestStatus, TestType
+from .ab_assignment_engine import RiskAssignmentEngine, get_assignment_engine
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -92,17 +89,6 @@ class RiskTestResult:
     confidence_interval_upper: float
     improvement_percentage: float
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    db_url = os.environ.get('DATABASE_URL')
-    if not db_url:
-        raise RuntimeError(
-            "DATABASE_URL is required. SQLite is not supported."
-        )
-    conn = psycopg2.connect(db_url)
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class RiskABTestFramework:
     """
     Comprehensive A/B testing framework for risk-based career protection optimization.
@@ -111,12 +97,13 @@ class RiskABTestFramework:
     including threshold optimization, communication testing, and intervention timing.
     """
     
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, assignment_engine: RiskAssignmentEngine = None):
         """Initialize the risk A/B testing framework"""
         # Import here to avoid circular import
         from .risk_analytics_integration import RiskAnalyticsTracker, RiskBasedSuccessMetrics
         
         self.base_framework = ABTestFramework()
+        self.assignment_engine = assignment_engine or get_assignment_engine(RiskAssignmentEngine)
         self.risk_analytics = RiskAnalyticsTracker()
         self.success_metrics = RiskBasedSuccessMetrics()
         self._init_risk_ab_tables()
@@ -591,68 +578,32 @@ class RiskABTestFramework:
     ) -> Optional[str]:
         """Assign a user to a risk A/B test variant"""
         try:
-            conn = get_pg_connection()
-            with conn:
-                cursor = conn.cursor()
-                
-                # Check if user is already assigned
-                cursor.execute('''
-                    SELECT variant_id FROM risk_ab_test_participants 
-                    WHERE test_id = %s AND user_id = %s
-                ''', (test_id, user_id))
-                
-                existing_assignment = cursor.fetchone()
-                if existing_assignment:
-                    return existing_assignment['variant_id']
-                
-                # Get test configuration
-                cursor.execute('''
-                    SELECT variants_config, status, minimum_risk_users_per_variant
-                    FROM risk_ab_test_configs WHERE test_id = %s
-                ''', (test_id,))
-                
-                test_info = cursor.fetchone()
-                if not test_info or test_info['status'] != 'active':
-                    return None
-                
-                variants_config = json.loads(test_info['variants_config'])
-                min_risk_users = test_info['minimum_risk_users_per_variant']
-                
-                # Check if we have enough risk users for each variant
-                for variant_id in variants_config.keys():
-                    cursor.execute('''
-                        SELECT COUNT(*) FROM risk_ab_test_participants 
-                        WHERE test_id = %s AND variant_id = %s AND risk_score >= 0.5
-                    ''', (test_id, variant_id))
-                    
-                    risk_user_count = list(cursor.fetchone().values())[0]
-                    if risk_user_count < min_risk_users:
-                        # Assign to this variant to balance risk users
-                        variant_id_to_assign = variant_id
-                        break
-                else:
-                    # Use consistent hashing for assignment
-                    variant_id_to_assign = self._assign_variant_by_risk_score(user_id, list(variants_config.keys()))
-                
-                # Determine risk level
-                risk_level = self._determine_risk_level(risk_score)
-                
-                # Record assignment
-                cursor.execute('''
-                    INSERT INTO risk_ab_test_participants 
-                    (test_id, user_id, variant_id, risk_score, risk_level, assigned_at)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                ''', (test_id, user_id, variant_id_to_assign, risk_score, risk_level, datetime.now()))
-                
-                conn.commit()
-                
-                logger.debug(f"Assigned user {user_id} to variant {variant_id_to_assign} in risk test {test_id}")
-                return variant_id_to_assign
+            variant_id = self.assignment_engine.assign(
+                test_id, user_id, risk_score, self._determine_risk_level(risk_score)
+            )
+            if variant_id:
+                logger.debug(f"Assigned user {user_id} to variant {variant_id} in risk test {test_id}")
+            return variant_id
                 
         except Exception as e:
             logger.error(f"Error assigning user to risk test: {e}")
             return None
     
+    async def bulk_assign_risk_test(
+        self,
+        test_id: str,
+        risk_scores: Dict[str, float]
+    ) -> Dict[str, str]:
+        """Pre-assign users (user_id -> risk_score) to a risk A/B test once its variants are filled"""
+        try:
+            return self.assignment_engine.bulk_assign(
+                test_id, list(risk_scores), risk_scores=risk_scores,
+                risk_level_for=self._determine_risk_level
+            )
+        except Exception as e:
+            logger.error(f"Error bulk assigning users to risk test: {e}")
+            return {}
+    
     async def track_risk_test_conversion(
         self,
         test_id: str,
@@ -668,12 +619,19 @@ class RiskABTestFramework:
                 cursor = conn.cursor()
                 
                 # Get user's current conversion events
-                cursor.execute('''
+                select_events = '''
                     SELECT conversion_events FROM risk_ab_test_participants 
                     WHERE test_id = %s AND user_id = %s
-                ''', (test_id, user_id))
+                '''
+                cursor.execute(select_events, (test_id, user_id))
                 
                 result = cursor.fetchone()
+                if not result:
+                    # The assignment may still be queued for a batched writer (this
+                    # process's or another's): store it synchronously and look again
+                    self.assignment_engine.persist_now(test_id, user_id)
+                    cursor.execute(select_events, (test_id, user_id))
+                    result = cursor.fetchone()
                 if not result:
                     logger.warning(f"User {user_id} not assigned to risk test {test_id}")
                     return False
@@ -1011,12 +969,6 @@ class RiskABTestFramework:
         else:
             return 'low'
     
-    def _assign_variant_by_risk_score(self, user_id: str, variants: List[str]) -> str:
-        """Assign user to variant using consistent hashing based on risk score"""
-        user_hash = int(hashlib.md5(user_id.encode()).hexdigest()[:8], 16)
-        random.seed(user_hash)
-        return random.choice(variants)
-    
     def _calculate_risk_success_metrics(self, variant_data: Dict[str, Any], success_criteria: List[str]) -> Dict[str, Any]:
         """Calculate success metrics for a risk test variant"""
         metrics = {}
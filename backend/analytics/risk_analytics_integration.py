@@ -18,15 +18,13 @@ Features:
 
 import asyncio
 import logging
-import psycopg2
-import psycopg2.extras
-import os
 import json
 import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
+from backend.utils.pg_pool import get_pg_connection
 
 # Import existing analytics components
 from .analytics_integration import AnalyticsIntegration
@@ -40,12 +38,6 @@ from .risk_ab_testing_framework import RiskABTestFramework
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class RiskEventType(Enum):
     """Types of risk-related events to track"""
     RISK_ASSESSMENT_COMPLETED = "risk_assessment_completed"
@@ -15,9 +15,6 @@ Features:
 - Real-time risk analytics and alerting
 """
 
-import psycopg2
-import psycopg2.extras
-import os
 import json
 import logging
 from datetime import datetime, timedelta
@@ -25,6 +22,7 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 import statistics
+from backend.utils.pg_pool import get_pg_connection
 
 # Lazy import to avoid NumPy's _mac_os_check FPE at app startup on some macOS/Anaconda setups
 def _np():
@@ -115,17 +113,6 @@ class CareerProtectionOutcome:
     verification_status: str = "unverified"
     verified_date: Optional[datetime] = None
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    db_url = os.environ.get('DATABASE_URL')
-    if not db_url:
-        raise RuntimeError(
-            "DATABASE_URL is required. SQLite is not supported."
-        )
-    conn = psycopg2.connect(db_url)
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class RiskAnalyticsTracker:
     """
     Comprehensive risk analytics tracker for career protection system.
@@ -19,9 +19,6 @@ Date: January 2025
 """
 
 import asyncio
-import psycopg2
-import psycopg2.extras
-import os
 import json
 import logging
 import time
@@ -36,6 +33,7 @@ import psutil
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 from sklearn.model_selection import train_test_split
 import warnings
+from backend.utils.pg_pool import get_pg_connection
 warnings.filterwarnings('ignore')
 
 # Configure logging
@@ -114,12 +112,6 @@ class UserEngagementMetrics:
     engagement_score: float
     timestamp: str
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class RiskModelDriftDetector:
     """Detects and monitors risk model drift"""
     
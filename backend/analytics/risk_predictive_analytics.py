@@ -15,14 +15,12 @@ Features:
 """
 from __future__ import annotations
 
-import psycopg2
-import psycopg2.extras
-import os
 import json
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
+from backend.utils.pg_pool import get_pg_connection
 
 # Lazy ML imports to avoid NumPy's _mac_os_check FPE at app startup on some macOS/Anaconda setups
 np = None
@@ -82,12 +80,6 @@ class RiskPattern:
     first_detected: datetime
     last_updated: datetime
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class RiskPredictiveAnalytics:
     """
     Predictive analytics system for career risk forecasting and pattern detection.
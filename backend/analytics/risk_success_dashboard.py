@@ -16,13 +16,11 @@ Features:
 import asyncio
 import json
 import logging
-import psycopg2
-import psycopg2.extras
-import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
+from backend.utils.pg_pool import get_pg_connection
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -49,12 +47,6 @@ class SuccessStory:
     impact_score: float
     story_text: str
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class RiskSuccessDashboard:
     """
     Success dashboard for risk-based career protection.
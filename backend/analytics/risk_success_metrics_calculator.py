@@ -14,15 +14,13 @@ Key Metrics:
 - proactive_vs_reactive_outcomes: Career outcome comparison based on risk response timing
 """
 
-import psycopg2
-import psycopg2.extras
-import os
 import json
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from backend.utils.pg_pool import get_pg_connection
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -60,12 +58,6 @@ class CareerProtectionOutcome:
     risk_mitigation_effectiveness: float
     outcome_timestamp: datetime
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class RiskSuccessMetricsCalculator:
     """Calculator for risk-based success metrics"""
     
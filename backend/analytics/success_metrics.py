@@ -16,9 +16,6 @@ Features:
 - ROI analysis for recommendations
 """
 
-import psycopg2
-import psycopg2.extras
-import os
 import json
 import logging
 from datetime import datetime, timedelta
@@ -26,6 +23,7 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 import statistics
+from backend.utils.pg_pool import get_pg_connection
 
 # Import risk analytics components
 from .risk_analytics_tracker import RiskAnalyticsTracker
@@ -108,12 +106,6 @@ class GoalAchievement:
     recommendation_contribution: float = 0.0
     success_factors: str = ""
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class SuccessMetrics:
     """
     Comprehensive success metrics system for job recommendation engine.
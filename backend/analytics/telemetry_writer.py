@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Buffered Telemetry Writer
+
+Non-blocking sink for monitoring rows (API timings, error logs, resource samples).
+Request threads append to a bounded in-memory ring buffer and return immediately;
+a background thread drains it in multi-row INSERTs, one transaction per batch,
+whenever the buffer reaches `batch_size` or `flush_interval` seconds have passed.
+Each table's INSERT runs in its own savepoint. If one table's insert fails, that
+table's rows are retried one at a time. Rows that still fail go to a bounded
+dead-letter queue and to the `on_failure` callback, and the rest of the batch
+commits.
+
+When the buffer is full the writer applies backpressure (an optional short wait
+for space) and then drops a record according to the overflow policy. Every drop
+is counted per table so lost telemetry shows up in `stats()` instead of silently.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import psycopg2.extras
+
+logger = logging.getLogger(__name__)
+
+DROP_OLDEST = 'drop_oldest'
+DROP_NEWEST = 'drop_newest'
+
+
+@dataclass
+class WriterStats:
+    """Running counters for one writer"""
+    submitted: int = 0
+    written: int = 0
+    batches: int = 0
+    failed_batches: int = 0
+    rows_failed: int = 0
+    backpressure_waits: int = 0
+    max_depth: int = 0
+    last_batch_size: int = 0
+    last_flush_ms: float = 0.0
+    flush_seconds: float = 0.0
+    dropped: Dict[str, int] = field(default_factory=dict)
+
+
+class BufferedTelemetryWriter:
+    """
+    Background batched writer for append-only telemetry tables
+
+    Args:
+        tables: Column list per table, e.g. {'error_logs': ('error_type', ...)}
+        connection_factory: Returns a DB-API connection (pooled get_pg_connection by default)
+        capacity: Maximum buffered rows across all tables
+        batch_size: Flush as soon as this many rows are buffered
+        flush_interval: Flush buffered rows at least this often (seconds)
+        overflow: 'drop_oldest' (ring buffer) or 'drop_newest' when full
+        max_wait: Seconds a submit may wait for space before dropping (0 never blocks)
+        conflict: Optional clause appended per table, e.g. {'t': 'ON CONFLICT DO NOTHING'}
+        on_failure: Called as on_failure(table, rows) with rows whose write failed
+        dead_letter_capacity: How many failed rows to keep for dead_letters()
+    """
+
+    def __init__(self, tables: Dict[str, Sequence[str]],
+                 connection_factory: Optional[Callable[[], Any]] = None,
+                 capacity: int = 10000, batch_size: int = 500,
+                 flush_interval: float = 2.0, overflow: str = DROP_OLDEST,
+                 max_wait: float = 0.0, conflict: Optional[Dict[str, str]] = None,
+                 on_failure: Optional[Callable[[str, List[tuple]], None]] = None,
+                 dead_letter_capacity: int = 1000):
+        if overflow not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.tables = {table: tuple(columns) for table, columns in tables.items()}
+        self.capacity = capacity
+        self.batch_size = min(batch_size, capacity)
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.max_wait = max_wait
+        self.conflict = dict(conflict or {})
+        self.on_failure = on_failure
+        if connection_factory is None:
+            from backend.utils.pg_pool import get_pg_connection
+            connection_factory = get_pg_connection
+        self._connection_factory = connection_factory
+        self._buffer: Deque[Tuple[str, tuple]] = deque()
+        # Most recent rows that could not be written, newest last
+        self._dead_letters: Deque[Tuple[str, tuple]] = deque(maxlen=dead_letter_capacity)
+        self._cond = threading.Condition()
+        # Serializes batch writes between the background thread and flush()
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._stopping = False
+        self._stats = WriterStats()
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def submit(self, table: str, row: Sequence[Any]) -> bool:
+        """
+        Queue one row without touching the database.
+
+        Returns:
+            bool: False if this row was dropped because the buffer was full
+        """
+        columns = self.tables.get(table)
+        if columns is None:
+            raise ValueError(f"Unknown telemetry table: {table}")
+        if len(row) != len(columns):
+            raise ValueError(f"{table} expects {len(columns)} values, got {len(row)}")
+        self._ensure_thread()
+
+        with self._cond:
+            self._stats.submitted += 1
+            if len(self._buffer) >= self.capacity and self.max_wait > 0:
+                self._stats.backpressure_waits += 1
+                self._cond.notify_all()
+                deadline = time.monotonic() + self.max_wait
+                while len(self._buffer) >= self.capacity:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+            if len(self._buffer) >= self.capacity:
+                if self.overflow == DROP_NEWEST:
+                    self._count_drop(table)
+                    return False
+                dropped_table, _ = self._buffer.popleft()
+                self._count_drop(dropped_table)
+
+            self._buffer.append((table, tuple(row)))
+            depth = len(self._buffer)
+            self._stats.max_depth = max(self._stats.max_depth, depth)
+            if depth >= self.batch_size:
+                self._cond.notify_all()
+            return True
+
+    def _count_drop(self, table: str):
+        dropped = self._stats.dropped
+        dropped[table] = dropped.get(table, 0) + 1
+        total = sum(dropped.values())
+        # Log the first drop and then every thousandth to avoid flooding logs
+        if total == 1 or total % 1000 == 0:
+            logger.warning(f"Telemetry buffer full ({self.capacity} rows); {total} rows dropped so far")
+
+    # ------------------------------------------------------------------
+    # Writer side
+    # ------------------------------------------------------------------
+
+    def _ensure_thread(self):
+        pid = os.getpid()
+        if self._pid is not None and self._pid != pid:
+            # Forked child: the parent's thread (and possibly a held lock) did not
+            # come along, and whatever it had buffered is the parent's to write.
+            self._buffer = deque()
+            self._dead_letters = deque(maxlen=self._dead_letters.maxlen)
+            self._cond = threading.Condition()
+            self._write_lock = threading.Lock()
+            self._stats = WriterStats()
+            self._thread = None
+            self._pid = None
+        if self._thread is not None:
+            return
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._pid = pid
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name='telemetry-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.flush_interval
+                while not self._stopping and len(self._buffer) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._stopping:
+                    return
+            self._drain_once()
+
+    def _take_batch(self) -> List[Tuple[str, tuple]]:
+        with self._cond:
+            count = min(self.batch_size, len(self._buffer))
+            batch = [self._buffer.popleft() for _ in range(count)]
+            if batch:
+                # Wake producers waiting for space
+                self._cond.notify_all()
+            return batch
+
+    def _drain_once(self) -> int:
+        with self._write_lock:
+            batch = self._take_batch()
+            if batch:
+                self._write(batch)
+            return len(batch)
+
+    def _write(self, batch: List[Tuple[str, tuple]]):
+        rows_by_table: Dict[str, List[tuple]] = {}
+        for table, row in batch:
+            rows_by_table.setdefault(table, []).append(row)
+
+        started = time.perf_counter()
+        failed: Dict[str, List[tuple]] = {}
+        conn = None
+        try:
+            conn = self._connection_factory()
+            cursor = conn.cursor()
+            for table, rows in rows_by_table.items():
+                bad_rows = self._insert_table(cursor, table, rows)
+                if bad_rows:
+                    failed[table] = bad_rows
+            conn.commit()
+            succeeded = True
+        except Exception as e:
+            succeeded = False
+            failed = rows_by_table
+            logger.error(f"Error writing {len(batch)} telemetry rows: {e}")
+            if conn is not None:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+        failed_count = sum(len(rows) for rows in failed.values())
+        elapsed = time.perf_counter() - started
+        with self._cond:
+            stats = self._stats
+            stats.last_batch_size = len(batch)
+            stats.last_flush_ms = round(elapsed * 1000, 3)
+            stats.flush_seconds += elapsed
+            if succeeded:
+                stats.batches += 1
+                stats.written += len(batch) - failed_count
+            else:
+                stats.failed_batches += 1
+            stats.rows_failed += failed_count
+            for table, rows in failed.items():
+                self._dead_letters.extend((table, row) for row in rows)
+        for table, rows in failed.items():
+            if self.on_failure is not None:
+                try:
+                    self.on_failure(table, rows)
+                except Exception as e:
+                    logger.error(f"Telemetry failure callback for {table} raised: {e}")
+
+    def _insert_table(self, cursor, table: str, rows: List[tuple]) -> List[tuple]:
+        """
+        One multi-row INSERT for a table inside its own savepoint, so a bad table
+        does not roll back the others. If it fails, the rows are retried one by
+        one and only those that still fail are returned (for the dead-letter queue).
+        """
+        columns = ', '.join(self.tables[table])
+        suffix = f" {self.conflict[table]}" if table in self.conflict else ''
+        sql = f"INSERT INTO {table} ({columns}) VALUES %s{suffix}"
+
+        cursor.execute('SAVEPOINT telemetry_table')
+        try:
+            psycopg2.extras.execute_values(cursor, sql, rows, page_size=len(rows))
+            cursor.execute('RELEASE SAVEPOINT telemetry_table')
+            return []
+        except Exception as e:
+            cursor.execute('ROLLBACK TO SAVEPOINT telemetry_table')
+            logger.warning(f"Batch insert into {table} failed, retrying {len(rows)} rows one by one: {e}")
+
+        bad_rows = []
+        for row in rows:
+            cursor.execute('SAVEPOINT telemetry_row')
+            try:
+                psycopg2.extras.execute_values(cursor, sql, [row], page_size=1)
+                cursor.execute('RELEASE SAVEPOINT telemetry_row')
+            except Exception as e:
+                cursor.execute('ROLLBACK TO SAVEPOINT telemetry_row')
+                logger.error(f"Dead-lettering {table} row: {e}")
+                bad_rows.append(row)
+        return bad_rows
+
+    def flush(self) -> int:
+        """Write everything buffered so far in the calling thread; returns rows taken"""
+        total = 0
+        while True:
+            written = self._drain_once()
+            if not written:
+                return total
+            total += written
+
+    def close(self, timeout: float = 5.0):
+        """Stop the background thread and flush what is left"""
+        thread = self._thread
+        if thread is None or self._pid != os.getpid():
+            return
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        thread.join(timeout=timeout)
+        self._thread = None
+        self.flush()
+
+    def dead_letters(self, clear: bool = False) -> List[Tuple[str, tuple]]:
+        """(table, row) pairs that failed to write, optionally emptying the queue"""
+        with self._cond:
+            rows = list(self._dead_letters)
+            if clear:
+                self._dead_letters.clear()
+            return rows
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = self._stats
+            return {
+                'buffered': len(self._buffer),
+                'capacity': self.capacity,
+                'submitted': stats.submitted,
+                'written': stats.written,
+                'dropped': sum(stats.dropped.values()),
+                'dropped_by_table': dict(stats.dropped),
+                'batches': stats.batches,
+                'failed_batches': stats.failed_batches,
+                'rows_failed': stats.rows_failed,
+                'dead_letters': len(self._dead_letters),
+                'backpressure_waits': stats.backpressure_waits,
+                'max_depth': stats.max_depth,
+                'avg_batch_size': round(stats.written / stats.batches, 1) if stats.batches else 0,
+                'last_batch_size': stats.last_batch_size,
+                'last_flush_ms': stats.last_flush_ms,
+                'avg_flush_ms': round(stats.flush_seconds / (stats.batches + stats.failed_batches) * 1000, 3)
+                if (stats.batches + stats.failed_batches) else 0,
+            }
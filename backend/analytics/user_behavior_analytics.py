@@ -15,9 +15,6 @@ Features:
 - User retention and engagement scoring
 """
 
-import psycopg2
-import psycopg2.extras
-import os
 import json
 import logging
 import uuid
@@ -27,6 +24,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import time
 import hashlib
+from backend.utils.pg_pool import get_pg_connection
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -124,12 +122,6 @@ class FeatureUsage:
     success_rate: float = 0.0
     satisfaction_score: Optional[int] = None
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class UserBehaviorAnalytics:
     """
     Comprehensive user behavior analytics system for job recommendation engine.
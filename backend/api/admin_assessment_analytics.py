@@ -100,13 +100,10 @@ def get_funnel_by_assessment_type():
         .all()
     )
 
-    import os
-    import psycopg2
-    import psycopg2.extras
+    from backend.utils.pg_pool import get_pg_connection
 
     by_type: dict[str, dict[str, int]] = {}
-    conn = psycopg2.connect(os.environ["DATABASE_URL"])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
+    conn = get_pg_connection()
     try:
         cursor = conn.cursor()
         for row in rows:
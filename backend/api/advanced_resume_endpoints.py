@@ -4,14 +4,13 @@ Extends the existing resume parsing with advanced analytics for African American
 """
 
 import os
-import psycopg2
-import psycopg2.extras
+from backend.utils.pg_pool import get_pg_connection
 import json
 import logging
 import hashlib
 from datetime import datetime
 from typing import Dict, List, Any, Optional
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
 from werkzeug.exceptions import BadRequest, InternalServerError
 
 # Import the advanced parser
@@ -19,6 +18,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.advanced_resume_parser import AdvancedResumeParser
 from utils.resume_format_handler import AdvancedResumeParserWithFormats
+from utils.resume_batch_parser import get_batch_parser
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -26,11 +26,14 @@ logger = logging.getLogger(__name__)
 # Create blueprint
 advanced_resume_api = Blueprint('advanced_resume_api', __name__, url_prefix='/api')
 
+# Batch uploads: files per request, and how long a batch may run before the
+# remaining files are returned as deferred (kept below gunicorn's --timeout)
+MAX_BATCH_FILES = int(os.environ.get('RESUME_BATCH_MAX_FILES', '500'))
+BATCH_DEADLINE_SECONDS = float(os.environ.get('RESUME_BATCH_DEADLINE_SECONDS', '100'))
+
 def get_db_connection():
     """Get PostgreSQL database connection"""
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
+    return get_pg_connection()
 
 def validate_csrf_token(token: str) -> bool:
     """Validate CSRF token (simplified for demo)"""
@@ -297,6 +300,70 @@ def parse_resume_file():
         logger.error(f"Error in parse_resume_file: {e}")
         return jsonify({'success': False, 'error': 'Internal server error'}), 500
 
+@advanced_resume_api.route('/resume/parse-batch', methods=['POST'])
+def parse_resume_batch():
+    """
+    Parse many uploaded resume files on the batch parser's process pool.
+
+    Streams NDJSON: one line per file as it completes (in completion order,
+    with its upload ``index``), then a final ``summary`` line. Files not
+    started before the batch deadline come back with ``deferred: true``.
+    """
+    try:
+        # Validate CSRF token
+        csrf_token = request.headers.get('X-CSRF-Token')
+        if not validate_csrf_token(csrf_token):
+            logger.warning("Invalid CSRF token in batch resume parsing")
+            return jsonify({'success': False, 'error': 'Invalid CSRF token'}), 403
+
+        # Rate limiting check
+        client_ip = request.remote_addr
+        if not check_rate_limit(client_ip):
+            logger.warning(f"Rate limit exceeded for IP: {client_ip}")
+            return jsonify({'success': False, 'error': 'Rate limit exceeded'}), 429
+
+        uploads = [file for file in request.files.getlist('files') if file.filename]
+        if not uploads:
+            raise BadRequest("No files uploaded")
+        if len(uploads) > MAX_BATCH_FILES:
+            raise BadRequest(f"Too many files: at most {MAX_BATCH_FILES} per batch")
+
+        location = request.form.get('location', 'New York')
+        files = [(file.filename, file.read()) for file in uploads]
+    except BadRequest as e:
+        logger.warning(f"Bad request in parse_resume_batch: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in parse_resume_batch: {e}")
+        return jsonify({'success': False, 'error': 'Internal server error'}), 500
+
+    def generate():
+        start_time = datetime.utcnow()
+        counts = {'succeeded': 0, 'failed': 0, 'deferred': 0}
+        try:
+            for result in get_batch_parser().parse_batch(files, location, BATCH_DEADLINE_SECONDS):
+                if result.get('deferred'):
+                    counts['deferred'] += 1
+                elif result.get('success', False):
+                    counts['succeeded'] += 1
+                else:
+                    counts['failed'] += 1
+                yield json.dumps(result, default=str) + '\n'
+        except Exception as e:
+            logger.error(f"Error in parse_resume_batch stream: {e}")
+            yield json.dumps({'success': False, 'error': 'Internal server error'}) + '\n'
+            return
+
+        processing_time = (datetime.utcnow() - start_time).total_seconds()
+        logger.info(f"Batch resume parse: {len(files)} files, {counts}, {processing_time:.1f}s")
+        yield json.dumps({'summary': {
+            'total': len(files),
+            **counts,
+            'processing_time': processing_time
+        }}) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @advanced_resume_api.route('/resume/analytics/<resume_id>', methods=['GET'])
 def get_resume_analytics(resume_id):
     """
@@ -20,12 +20,10 @@ from flask_cors import cross_origin
 from backend.auth.decorators import require_auth
 import logging
 import traceback
-import psycopg2
-import psycopg2.extras
-import os
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 from dataclasses import asdict
+from backend.utils.pg_pool import get_pg_connection
 
 # Import analytics modules
 from ..analytics.user_behavior_analytics import UserBehaviorAnalytics
@@ -41,17 +39,6 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    db_url = os.environ.get('DATABASE_URL')
-    if not db_url:
-        raise RuntimeError(
-            "DATABASE_URL is required. SQLite is not supported."
-        )
-    conn = psycopg2.connect(db_url)
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 
 # Create analytics blueprint
 analytics_bp = Blueprint('analytics', __name__, url_prefix='/api/analytics')
@@ -898,8 +885,7 @@ def get_risk_success_stories():
         limit = request.args.get('limit', 10, type=int)
         story_type = request.args.get('story_type')
         
-        conn = psycopg2.connect(os.environ['DATABASE_URL'])
-        conn.cursor_factory = psycopg2.extras.RealDictCursor
+        conn = get_pg_connection()
         cursor = conn.cursor()
         
         query = '''
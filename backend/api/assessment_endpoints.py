@@ -4,8 +4,7 @@ Provides endpoints for handling lead magnet assessments
 """
 
 import os
-import psycopg2
-import psycopg2.extras
+from backend.utils.pg_pool import get_pg_connection
 import json
 import logging
 import hashlib
@@ -61,9 +60,7 @@ _CAREER_COMMITMENT_FIELDS = (
 
 def get_db_connection():
     """Get PostgreSQL database connection"""
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
+    return get_pg_connection()
 
 
 def _resolve_user_id_for_assessment(email: str) -> int | None:
@@ -10,8 +10,6 @@ import secrets
 import uuid
 import jwt
 import hashlib
-import psycopg2
-import psycopg2.extras
 from datetime import datetime, timedelta
 from flask import Blueprint, request, jsonify
 from werkzeug.exceptions import BadRequest
@@ -29,6 +27,7 @@ from backend.models.vibe_checkups import VibeCheckupsLead
 from backend.services import life_ledger_service as life_ledger_svc
 from backend.utils.password import hash_password, check_password, verify_password_strength
 from backend.auth.decorators import require_auth
+from backend.utils.pg_pool import get_pg_connection
 from loguru import logger as loguru_logger
 
  # Simple rate limiting (in-memory)
@@ -110,9 +109,7 @@ JWT_ACCESS_TOKEN_EXPIRE_MINUTES = int(os.environ.get('JWT_ACCESS_TOKEN_EXPIRE_MI
 
 
 def _get_assessment_db_connection():
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
+    return get_pg_connection()
 
 
 def _redeem_assessment_token_on_signup(user: User, data: dict, email: str) -> None:
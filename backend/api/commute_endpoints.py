@@ -6,8 +6,6 @@ Provides endpoints for commute cost calculations, scenario management, and geoco
 
 import json
 import logging
-import psycopg2
-import psycopg2.extras
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
@@ -17,6 +15,8 @@ import requests
 import os
 from functools import wraps
 
+from backend.utils.pg_pool import get_pg_connection
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -55,8 +55,7 @@ def init_commute_database():
         db_url = os.environ.get('DATABASE_URL')
         if not db_url:
             raise RuntimeError("DATABASE_URL is required.")
-        conn = psycopg2.connect(os.environ['DATABASE_URL'])
-        conn.cursor_factory = psycopg2.extras.RealDictCursor
+        conn = get_pg_connection()
         cursor = conn.cursor()
         
         # Create scenarios table
@@ -124,8 +123,7 @@ def get_scenarios():
         db_url = os.environ.get('DATABASE_URL')
         if not db_url:
             raise RuntimeError("DATABASE_URL is required.")
-        conn = psycopg2.connect(os.environ['DATABASE_URL'])
-        conn.cursor_factory = psycopg2.extras.RealDictCursor
+        conn = get_pg_connection()
         cursor = conn.cursor()
         
         # In a real implementation, you would filter by user_id
@@ -191,8 +189,7 @@ def save_scenario():
         db_url = os.environ.get('DATABASE_URL')
         if not db_url:
             raise RuntimeError("DATABASE_URL is required.")
-        conn = psycopg2.connect(os.environ['DATABASE_URL'])
-        conn.cursor_factory = psycopg2.extras.RealDictCursor
+        conn = get_pg_connection()
         cursor = conn.cursor()
         
         # Insert or update scenario
@@ -246,8 +243,7 @@ def delete_scenario(scenario_id):
         db_url = os.environ.get('DATABASE_URL')
         if not db_url:
             raise RuntimeError("DATABASE_URL is required.")
-        conn = psycopg2.connect(os.environ['DATABASE_URL'])
-        conn.cursor_factory = psycopg2.extras.RealDictCursor
+        conn = get_pg_connection()
         cursor = conn.cursor()
         
         cursor.execute('DELETE FROM commute_scenarios WHERE id = %s', (scenario_id,))
@@ -283,8 +279,7 @@ def get_vehicles():
         db_url = os.environ.get('DATABASE_URL')
         if not db_url:
             raise RuntimeError("DATABASE_URL is required.")
-        conn = psycopg2.connect(os.environ['DATABASE_URL'])
-        conn.cursor_factory = psycopg2.extras.RealDictCursor
+        conn = get_pg_connection()
         cursor = conn.cursor()
         
         # In a real implementation, you would filter by user_id
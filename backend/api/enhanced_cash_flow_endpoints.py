@@ -11,7 +11,7 @@ from sqlalchemy import func
 from werkzeug.exceptions import BadRequest, InternalServerError
 
 from ..models.user_models import User
-from ..services.cash_forecast_service import build_forecast_for_user
+from ..services.forecast_store import forecast_store
 from ..services.enhanced_cash_flow_forecast_engine import (
     EnhancedCashFlowForecastEngine,
 )
@@ -73,7 +73,7 @@ def get_enhanced_cash_flow_forecast(user_email):
             func.lower(User.email) == user_email.strip().lower()
         ).first()
         if mingus_user:
-            forecast_result = build_forecast_for_user(mingus_user.user_id, days=90)
+            forecast_result = forecast_store.get_forecast(mingus_user.user_id, days=90)
             daily_cashflow, monthly_summaries, relationship_cost_breakdown = forecast_result
             balance_set = forecast_result.balance_set
         else:
@@ -366,7 +366,7 @@ def get_backward_compatible_forecast(user_email):
             func.lower(User.email) == user_email.strip().lower()
         ).first()
         if mingus_user:
-            forecast_result = build_forecast_for_user(mingus_user.user_id, days=90)
+            forecast_result = forecast_store.get_forecast(mingus_user.user_id, days=90)
             daily_cashflow, monthly_summaries, relationship_cost_breakdown = forecast_result
             balance_set = forecast_result.balance_set
         else:
@@ -15,6 +15,7 @@ from backend.auth.decorators import require_auth, require_csrf
 from backend.models.database import db
 from backend.models.financial_setup import RecurringExpense, UserIncome
 from backend.models.user_models import User
+from backend.services.forecast_store import forecast_store
 
 financial_setup_bp = Blueprint(
     "financial_setup",
@@ -283,6 +284,7 @@ def financial_setup_expenses():
         logger.error("financial_setup_expenses POST failed for user {}: {}", user.id, e)
         return jsonify({"error": "Internal server error"}), 500
 
+    forecast_store.invalidate(user.user_id)
     return jsonify({"success": True, "expenses_saved": len(expenses)}), 200
 
 
@@ -13,8 +13,8 @@ from typing import Dict, List, Any
 import asyncio
 import sys
 import os
-import psycopg2
-import psycopg2.extras
+from backend.utils.pg_pool import get_pg_connection
+from backend.utils.job_postings_store import get_job_postings_store
 
 # Add backend utils to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'utils'))
@@ -26,17 +26,6 @@ from income_boost_job_matcher import (
 from job_board_apis import JobBoardAPIManager, CompanyDataAPIManager
 
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    db_url = os.environ.get('DATABASE_URL')
-    if not db_url:
-        raise RuntimeError(
-            "DATABASE_URL is required. SQLite is not supported."
-        )
-    conn = psycopg2.connect(db_url)
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 
 # Create blueprint
 job_matching_api = Blueprint('job_matching_api', __name__)
@@ -44,6 +33,16 @@ job_matching_api = Blueprint('job_matching_api', __name__)
 # Configure logging
 logger = logging.getLogger(__name__)
 
+_matcher = None
+
+
+def _get_matcher() -> IncomeBoostJobMatcher:
+    """Matcher shared by every endpoint; it keeps no per-request state"""
+    global _matcher
+    if _matcher is None:
+        _matcher = IncomeBoostJobMatcher()
+    return _matcher
+
 
 @job_matching_api.route('/api/jobs/recommendations', methods=['POST'])
 @cross_origin()
@@ -109,7 +108,7 @@ def search_jobs():
         )
         
         # Perform search
-        matcher = IncomeBoostJobMatcher()
+        matcher = _get_matcher()
         
         # Run async search
         loop = asyncio.new_event_loop()
@@ -183,7 +182,7 @@ def get_company_profile(company_name):
     - company_name: Name of the company
     """
     try:
-        matcher = IncomeBoostJobMatcher()
+        matcher = _get_matcher()
         profile = matcher.company_quality_assessment(company_name)
         
         return jsonify({
@@ -226,7 +225,7 @@ def get_field_strategies(field):
     - field: Career field (technology, finance, healthcare, etc.)
     """
     try:
-        matcher = IncomeBoostJobMatcher()
+        matcher = _get_matcher()
         
         try:
             career_field = CareerField(field)
@@ -309,7 +308,7 @@ def apply_msa_targeting():
             jobs.append(job)
         
         # Apply MSA targeting
-        matcher = IncomeBoostJobMatcher()
+        matcher = _get_matcher()
         preferred_msas = data.get('preferred_msas', [])
         targeted_jobs = matcher.msa_targeting(jobs, preferred_msas)
         
@@ -418,7 +417,7 @@ def detect_remote_opportunities():
             jobs.append(job)
         
         # Apply remote detection
-        matcher = IncomeBoostJobMatcher()
+        matcher = _get_matcher()
         remote_jobs = matcher.remote_opportunity_detection(jobs)
         
         # Convert back to JSON-serializable format
@@ -477,11 +476,10 @@ def get_job_matching_analytics():
     Get analytics and insights from job matching data
     """
     try:
-        matcher = IncomeBoostJobMatcher()
+        matcher = _get_matcher()
         
         # Get analytics from database
-        conn = psycopg2.connect(os.environ['DATABASE_URL'])
-        conn.cursor_factory = psycopg2.extras.RealDictCursor
+        conn = get_pg_connection()
         cursor = conn.cursor()
         
         # Get job count by field
@@ -551,11 +549,10 @@ def health_check():
     Health check endpoint for job matching service
     """
     try:
-        matcher = IncomeBoostJobMatcher()
+        matcher = _get_matcher()
         
         # Check database connection
-        conn = psycopg2.connect(os.environ['DATABASE_URL'])
-        conn.cursor_factory = psycopg2.extras.RealDictCursor
+        conn = get_pg_connection()
         cursor = conn.cursor()
         cursor.execute('SELECT COUNT(*) as count FROM job_opportunities')
         job_count = cursor.fetchone()['count']
@@ -565,6 +562,7 @@ def health_check():
             'success': True,
             'status': 'healthy',
             'job_count': job_count,
+            'job_postings_cache': get_job_postings_store().stats(),
             'timestamp': datetime.now().isoformat()
         })
         
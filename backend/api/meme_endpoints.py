@@ -6,12 +6,12 @@ Provides endpoints for fetching user memes and tracking analytics
 import os
 import json
 import logging
-import psycopg2
-import psycopg2.extras
 from datetime import datetime
 from flask import Blueprint, request, jsonify, current_app
 from werkzeug.exceptions import BadRequest, InternalServerError
 
+from backend.utils.pg_pool import get_pg_connection
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -19,15 +19,8 @@ logger = logging.getLogger(__name__)
 meme_api = Blueprint('meme_api', __name__, url_prefix='/api')
 
 def get_db_connection():
-    """Get PostgreSQL database connection"""
-    db_url = os.environ.get('DATABASE_URL')
-    if not db_url:
-        raise RuntimeError(
-            "DATABASE_URL is required. SQLite is not supported."
-        )
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
+    """Get PostgreSQL database connection (pooled; close() returns it to the pool)"""
+    return get_pg_connection()
 
 
 def infer_media_type_from_url(url):
@@ -217,10 +210,9 @@ def track_meme_analytics_endpoint():
         # Sync vote to user_mood_data for correlation analysis
         if data.get('action') == 'vote' and data.get('vote') and user_id:
             try:
-                import psycopg2
                 database_url = os.environ.get('DATABASE_URL')
                 if database_url:
-                    pg_conn = psycopg2.connect(database_url)
+                    pg_conn = get_pg_connection()
                     pg_cursor = pg_conn.cursor()
                     # Convert thumbs up/down to mood score (up=4, down=2)
                     mood_score = 4 if data.get('vote') == 'up' else 2
@@ -413,8 +405,8 @@ def get_mood_analytics():
         database_url = os.environ.get('DATABASE_URL')
         if not database_url:
             return jsonify({'error': 'Database not configured'}), 500
-        conn = psycopg2.connect(database_url)
-        cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        conn = get_pg_connection()
+        cursor = conn.cursor()
         # Get mood trends (for MoodChart)
         cursor.execute("""
             SELECT DATE(timestamp) as date, ROUND(AVG(mood_score)::numeric, 2) as avg_mood, COUNT(*) as count
@@ -461,7 +453,7 @@ def calculate_mood_spending_correlation(user_id):
         database_url = os.environ.get('DATABASE_URL')
         if not database_url:
             return {'correlation_coefficient': 0.0, 'pattern': 'no_database', 'confidence': 'low'}
-        conn = psycopg2.connect(database_url)
+        conn = get_pg_connection()
         cursor = conn.cursor()
         # Get mood data
         cursor.execute('''
@@ -484,7 +476,7 @@ def calculate_mood_spending_correlation(user_id):
                 'data_points': len(mood_data), 'confidence': 'low',
                 'recommendation': 'Keep doing daily vibe checks to build your mood profile'
             }
-        avg_mood = sum(row[1] for row in mood_data) / len(mood_data)
+        avg_mood = sum(row['avg_mood'] for row in mood_data) / len(mood_data)
         if avg_mood >= 3.5:
             pattern = {'type': 'positive_trend', 'description': 'Your vibes have been good!',
                        'risk_level': 'low', 'insight': 'Good mood can lead to reward spending'}
@@ -159,44 +159,45 @@ def get_balance_score_optimized(user_id: int):
     - Performance monitoring
     """
     try:
-        # Check cache first
-        cached_score = cache_manager.get(CacheStrategy.USER_BALANCE_SCORE, str(user_id))
-        if cached_score:
+        computed = {}
+        
+        def compute_score():
+            start_time = time.time()
+            
+            balance_score, individual_scores = daily_outlook_service.calculate_balance_score(user_id)
+            
+            score_data = {
+                'balance_score': balance_score,
+                'individual_scores': individual_scores.to_dict(),
+                'calculated_at': datetime.now().isoformat()
+            }
+            
+            # Record performance metrics
+            computed['calculation_time'] = time.time() - start_time
+            performance_monitor = get_performance_monitor()
+            if performance_monitor:
+                performance_monitor.record_balance_score_calculation(computed['calculation_time'], user_id)
+            return score_data
+        
+        # Cache-first; concurrent misses for this user share one calculation
+        score_data = cache_manager.get_or_compute(CacheStrategy.USER_BALANCE_SCORE, str(user_id), compute_score)
+        
+        if not computed:
             logger.info(f"Cache hit for balance score user {user_id}")
             return jsonify({
                 'success': True,
-                'data': cached_score,
+                'data': score_data,
                 'cached': True,
                 'timestamp': datetime.now().isoformat()
             })
         
-        # Calculate balance score
-        start_time = time.time()
-        
-        balance_score, individual_scores = daily_outlook_service.calculate_balance_score(user_id)
-        
-        score_data = {
-            'balance_score': balance_score,
-            'individual_scores': individual_scores.to_dict(),
-            'calculated_at': datetime.now().isoformat()
-        }
-        
-        # Cache the result
-        cache_manager.set(CacheStrategy.USER_BALANCE_SCORE, str(user_id), score_data)
-        
-        # Record performance metrics
-        calculation_time = time.time() - start_time
-        performance_monitor = get_performance_monitor()
-        if performance_monitor:
-            performance_monitor.record_balance_score_calculation(calculation_time, user_id)
-        
-        logger.info(f"Calculated balance score for user {user_id} in {calculation_time:.3f}s")
+        logger.info(f"Calculated balance score for user {user_id} in {computed['calculation_time']:.3f}s")
         
         return jsonify({
             'success': True,
             'data': score_data,
             'cached': False,
-            'calculation_time': calculation_time,
+            'calculation_time': computed['calculation_time'],
             'timestamp': datetime.now().isoformat()
         })
         
@@ -2,9 +2,7 @@
 Profile API endpoints for user profile and financial data
 """
 
-import os
-import psycopg2
-import psycopg2.extras
+from backend.utils.pg_pool import get_pg_connection
 import json
 import logging
 import hashlib
@@ -20,6 +18,7 @@ from ..models.user_models import User
 from ..constants.onboarding import MODULE_ORDER
 from ..models.database import db
 from ..models.onboarding_progress import OnboardingProgress
+from ..services.forecast_store import forecast_store
 from loguru import logger as loguru_logger
 
 # Configure logging
@@ -81,14 +80,7 @@ profile_api = Blueprint('profile_api', __name__, url_prefix='/api')
 
 def get_db_connection():
     """Get PostgreSQL database connection"""
-    db_url = os.environ.get('DATABASE_URL')
-    if not db_url:
-        raise RuntimeError(
-            "DATABASE_URL is required. SQLite is not supported."
-        )
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
+    return get_pg_connection()
 
 def init_profile_database():
     """Initialize profile database with tables"""
@@ -268,6 +260,7 @@ def save_profile():
         
         conn.commit()
         conn.close()
+        forecast_store.invalidate_email(sanitized_data['email'])
         
         logger.info(f"Profile saved successfully: {profile_id}")
         
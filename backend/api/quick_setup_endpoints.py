@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify, g
 import psycopg2
 import psycopg2.extras
+from backend.utils.pg_pool import get_pg_connection
 from datetime import datetime
 import os
 from loguru import logger
@@ -59,8 +60,7 @@ def quick_setup():
         db_url = os.environ.get('DATABASE_URL')
         if not db_url:
             return jsonify({'error': 'Database not configured'}), 500
-        conn = psycopg2.connect(db_url)
-        conn.cursor_factory = psycopg2.extras.RealDictCursor
+        conn = get_pg_connection()
         cursor = conn.cursor()
 
         cursor.execute('''
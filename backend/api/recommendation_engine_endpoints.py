@@ -15,9 +15,7 @@ from datetime import datetime
 from flask import Blueprint, request, jsonify
 from flask_cors import cross_origin
 from werkzeug.exceptions import BadRequest, InternalServerError
-import os
-import psycopg2
-import psycopg2.extras
+from backend.utils.pg_pool import get_pg_connection
 
 from backend.auth.decorators import get_current_jwt_user, require_auth
 from backend.models.career_profile import CareerProfile
@@ -37,17 +35,6 @@ from ..utils.mingus_job_recommendation_engine import MingusJobRecommendationEngi
 logger = logging.getLogger(__name__)
 
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    db_url = os.environ.get('DATABASE_URL')
-    if not db_url:
-        raise RuntimeError(
-            "DATABASE_URL is required. SQLite is not supported."
-        )
-    conn = psycopg2.connect(db_url)
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 
 # Create blueprint
 recommendation_engine_api = Blueprint('recommendation_engine_api', __name__)
@@ -15,8 +15,7 @@ from flask_cors import cross_origin
 from werkzeug.utils import secure_filename
 from werkzeug.exceptions import BadRequest, Forbidden, NotFound
 import asyncio
-import psycopg2
-import psycopg2.extras
+from backend.utils.pg_pool import get_pg_connection
 
 # Add backend modules to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -33,17 +32,6 @@ from backend.utils.mingus_job_recommendation_engine import MingusJobRecommendati
 # Configure logging
 logger = logging.getLogger(__name__)
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    db_url = os.environ.get('DATABASE_URL')
-    if not db_url:
-        raise RuntimeError(
-            "DATABASE_URL is required. SQLite is not supported."
-        )
-    conn = psycopg2.connect(db_url)
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 # Create blueprint
 referral_gated_api = Blueprint('referral_gated_api', __name__)
 
@@ -2,9 +2,6 @@
 Resume Parsing API endpoints for extracting and analyzing resume data
 """
 
-import os
-import psycopg2
-import psycopg2.extras
 import json
 import logging
 import re
@@ -16,6 +13,7 @@ from typing import Dict, List, Any, Optional
 from flask import Blueprint, request, jsonify, current_app
 from werkzeug.exceptions import BadRequest, InternalServerError
 from ..utils.validation import APIValidator
+from backend.utils.pg_pool import get_pg_connection
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -24,15 +22,8 @@ logger = logging.getLogger(__name__)
 resume_api = Blueprint('resume_api', __name__, url_prefix='/api')
 
 def get_db_connection():
-    """Get PostgreSQL database connection"""
-    db_url = os.environ.get('DATABASE_URL')
-    if not db_url:
-        raise RuntimeError(
-            "DATABASE_URL is required. SQLite is not supported."
-        )
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
+    """Get PostgreSQL database connection (pooled; close() returns it to the pool)"""
+    return get_pg_connection()
 
 def init_resume_database():
     """Initialize resume parsing database with tables"""
@@ -19,7 +19,6 @@ Features:
 import asyncio
 import json
 import logging
-import os
 import time
 import uuid
 from datetime import datetime, timedelta
@@ -31,8 +30,7 @@ from flask import Blueprint, request, jsonify, current_app, g
 from flask_cors import cross_origin
 from backend.auth.decorators import require_auth, require_admin
 from functools import wraps
-import psycopg2
-import psycopg2.extras
+from backend.utils.pg_pool import get_pg_connection
 
 # Import existing risk analytics components
 from ..analytics.risk_analytics_integration import (
@@ -92,7 +90,7 @@ class RiskAnalyticsAPI:
     def _init_database(self):
         """Verify PostgreSQL database connection"""
         try:
-            conn = psycopg2.connect(os.environ['DATABASE_URL'])
+            conn = get_pg_connection()
             conn.close()
         except Exception as e:
             logger.error(f"Error initializing database: {e}")
@@ -15,6 +15,7 @@ from backend.auth.decorators import require_auth, get_current_user_id, get_curre
 from backend.api.profile_endpoints import get_db_connection
 from backend.models.career_profile import CareerProfile
 from backend.models.database import db
+from backend.services.forecast_store import forecast_store
 from backend.services.module_access_service import get_user_modules
 
 VALID_EMPLOYER_TYPES = frozenset({
@@ -387,6 +388,17 @@ def get_user_profile():
         return jsonify({'success': True, 'profile': {}}), 200
 
 
+def _invalidate_cash_forecast():
+    """Drop the cached cash forecast after a raw-SQL write to its profile inputs."""
+    user_id = get_current_user_id()
+    if user_id is None:
+        return
+    try:
+        forecast_store.invalidate(str(user_id))
+    except Exception as e:
+        logger.warning(f"Cash forecast invalidation failed for {user_id}: {e}")
+
+
 def patch_user_profile():
     """Patch user profile fields (important_dates, first_name, last_name, zip_code)."""
     user_email = getattr(g, 'current_user_email', None)
@@ -520,6 +532,7 @@ def patch_user_profile():
             saved_row = cursor.fetchone()
             conn.commit()
             conn.close()
+            _invalidate_cash_forecast()
 
             saved_dates = _parse_important_dates(
                 saved_row.get('important_dates') if saved_row else imp_json
@@ -608,6 +621,8 @@ def patch_user_profile():
 
         conn.commit()
         conn.close()
+        if has_important_dates:
+            _invalidate_cash_forecast()
 
         if has_important_dates:
             saved_dates = _parse_important_dates(
@@ -682,6 +697,7 @@ def patch_user_balance():
         conn.close()
         if not row:
             return jsonify({'error': 'Profile not found.'}), 404
+        _invalidate_cash_forecast()
 
         ts = row['balance_last_updated']
         return jsonify({
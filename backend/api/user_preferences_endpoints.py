@@ -3,9 +3,7 @@ User Preferences API endpoints for the React frontend
 Provides endpoints for managing user meme preferences and settings
 """
 
-import os
-import psycopg2
-import psycopg2.extras
+from backend.utils.pg_pool import get_pg_connection
 import json
 import logging
 from datetime import datetime
@@ -20,9 +18,7 @@ user_preferences_api = Blueprint('user_preferences_api', __name__, url_prefix='/
 
 def get_db_connection():
     """Get PostgreSQL database connection"""
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
+    return get_pg_connection()
 
 def ensure_user_preferences_table():
     """Ensure the user_meme_preferences table exists"""
@@ -3,9 +3,7 @@ Weekly Check-in API endpoints for the React frontend
 Provides endpoints for submitting and retrieving weekly check-in data
 """
 
-import os
-import psycopg2
-import psycopg2.extras
+from backend.utils.pg_pool import get_pg_connection
 import json
 import logging
 from datetime import datetime, timedelta
@@ -20,9 +18,7 @@ weekly_checkin_api = Blueprint('weekly_checkin_api', __name__, url_prefix='/api'
 
 def get_db_connection():
     """Get PostgreSQL database connection"""
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
+    return get_pg_connection()
 
 def get_week_start_date(check_in_date):
     """Get the start of the week (Monday) for a given date"""
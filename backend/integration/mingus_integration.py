@@ -11,8 +11,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import sqlite3
-import psycopg2
-import psycopg2.extras
+from backend.utils.pg_pool import get_pg_connection
 
 # Add backend modules to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -511,8 +510,7 @@ class MingusIntegrationManager:
     def _calculate_time_to_unlock(self, user_id: str) -> Optional[str]:
         """Calculate time taken to unlock feature"""
         try:
-            conn = psycopg2.connect(os.environ['DATABASE_URL'])
-            conn.cursor_factory = psycopg2.extras.RealDictCursor
+            conn = get_pg_connection()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -538,8 +536,7 @@ class MingusIntegrationManager:
     def _save_analytics_event(self, event_type: str, data: Dict):
         """Save analytics event to database"""
         try:
-            conn = psycopg2.connect(os.environ['DATABASE_URL'])
-            conn.cursor_factory = psycopg2.extras.RealDictCursor
+            conn = get_pg_connection()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -565,8 +562,7 @@ class MingusIntegrationManager:
     def _update_engagement_metrics(self, user_id: str, event_type: str):
         """Update user engagement metrics"""
         try:
-            conn = psycopg2.connect(os.environ['DATABASE_URL'])
-            conn.cursor_factory = psycopg2.extras.RealDictCursor
+            conn = get_pg_connection()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -6,18 +6,26 @@ Prioritizes income advancement opportunities based on resume analysis and demogr
 import re
 import json
 import logging
-from typing import Dict, List, Optional, Tuple, Any, Set
+from typing import Dict, List, Optional, Tuple, Any, Set, Sequence, Union
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 import numpy as np
 from collections import defaultdict, Counter
 import requests
+from operator import attrgetter
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 
 from .resume_parser import AdvancedResumeParser, FieldType, ExperienceLevel
-from ..job_security_predictor import JobSecurityPredictor
+from backend.utils.content_cache import ContentCache
+
+try:
+    from ..job_security_predictor import JobSecurityPredictor
+    JOB_SECURITY_PREDICTOR_AVAILABLE = True
+except ImportError:
+    JobSecurityPredictor = None
+    JOB_SECURITY_PREDICTOR_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -103,6 +111,122 @@ class JobScore:
     recommendations: List[str]
     risk_factors: List[str]
 
+# JobPosting fields read by the columnar scorer, in unpacking order
+_SCORED_JOB_FIELDS = attrgetter(
+    'salary_range', 'requirements', 'title', 'company_tier', 'glassdoor_rating',
+    'company_size', 'location', 'remote_work', 'field'
+)
+
+# Salary improvement score by increase over current salary, highest threshold first
+_SALARY_INCREASE_SCORES = (
+    (0.45, 1.0),  # 45%+ increase
+    (0.35, 0.9),  # 35%+ increase
+    (0.25, 0.8),  # 25%+ increase
+    (0.15, 0.7),  # 15%+ increase
+    (0.10, 0.6),  # 10%+ increase
+    (0.05, 0.5),  # 5%+ increase
+)
+_SALARY_BELOW_THRESHOLDS_SCORE = 0.3  # Below 5% increase
+_UNKNOWN_SALARY_SCORE = 0.5  # Neutral score for unknown salary
+
+@dataclass
+class DistinctColumn:
+    """One job field stored as its distinct values plus a code per job"""
+    values: List[Any]
+    codes: np.ndarray
+    
+    @classmethod
+    def encode(cls, values: Sequence[Any]) -> 'DistinctColumn':
+        index: Dict[Any, int] = {}
+        codes = np.fromiter((index.setdefault(value, len(index)) for value in values),
+                            dtype=np.intp, count=len(values))
+        return cls(values=list(index), codes=codes)
+    
+    @classmethod
+    def group(cls, jobs: List[JobPosting], *columns: 'DistinctColumn') -> 'DistinctColumn':
+        """Jobs grouped by their combination of values across columns, the first job of each group as its value"""
+        combined = np.zeros(len(jobs), dtype=np.int64)
+        for column in columns:
+            combined = combined * max(1, len(column.values)) + column.codes
+        _, first, codes = np.unique(combined, return_index=True, return_inverse=True)
+        return cls(values=[jobs[i] for i in first], codes=codes.reshape(-1))
+    
+    def score(self, score_fn) -> np.ndarray:
+        """score_fn applied once per distinct value, as floats per job; NaN where it raises"""
+        table = np.empty(len(self.values))
+        for i, value in enumerate(self.values):
+            try:
+                table[i] = float(score_fn(value))
+            except Exception as e:
+                logger.error(f"Error scoring job value {value!r}: {str(e)}")
+                table[i] = np.nan
+        return table[self.codes]
+
+@dataclass
+class JobCandidateColumns:
+    """
+    The search-independent columns of one candidate set.
+    
+    Built once per set of postings (see _search_job_candidates). Each group
+    column holds jobs keyed by exactly the fields one _calculate_*_score
+    method reads, so scoring the set for a search calls that method once per
+    group; salary is NumPy arithmetic over the whole set.
+    """
+    jobs: List[JobPosting]
+    has_salary: np.ndarray
+    salary_midpoint: np.ndarray
+    remote_work: np.ndarray
+    requirements: DistinctColumn  # skills alignment
+    titles: DistinctColumn  # career progression
+    companies: DistinctColumn  # company stability: tier, Glassdoor rating, size
+    locations: DistinctColumn  # location compatibility: location, remote work
+    growth_profiles: DistinctColumn  # growth potential: tier, field, remote work
+    
+    @classmethod
+    def build(cls, jobs: List[JobPosting]) -> 'JobCandidateColumns':
+        (salary_ranges, requirements, titles, company_tiers, glassdoor_ratings, company_sizes,
+         locations, remote_flags, fields) = zip(*map(_SCORED_JOB_FIELDS, jobs)) if jobs else ((),) * 9
+        tiers = DistinctColumn.encode(company_tiers)
+        remote = DistinctColumn.encode(remote_flags)
+        return cls(
+            jobs=jobs,
+            has_salary=np.array([salary_range is not None for salary_range in salary_ranges], dtype=bool),
+            # SalaryRange.midpoint, without a property call per job
+            salary_midpoint=np.array(
+                [salary_range.min_salary + salary_range.max_salary if salary_range else 0
+                 for salary_range in salary_ranges],
+                dtype=np.int64
+            ) // 2,
+            remote_work=np.array(remote_flags, dtype=bool),
+            requirements=DistinctColumn.group(
+                jobs, DistinctColumn.encode([tuple(reqs or ()) for reqs in requirements])
+            ),
+            titles=DistinctColumn.group(jobs, DistinctColumn.encode(titles)),
+            companies=DistinctColumn.group(
+                jobs, tiers, DistinctColumn.encode(glassdoor_ratings), DistinctColumn.encode(company_sizes)
+            ),
+            locations=DistinctColumn.group(jobs, DistinctColumn.encode(locations), remote),
+            growth_profiles=DistinctColumn.group(jobs, tiers, DistinctColumn.encode(fields), remote),
+        )
+
+@dataclass
+class JobScoreColumns:
+    """Scores for a whole candidate set, one array entry per job in ``jobs``"""
+    jobs: List[JobPosting]
+    salary_improvement: np.ndarray
+    skills_alignment: np.ndarray
+    career_progression: np.ndarray
+    company_stability: np.ndarray
+    location_compatibility: np.ndarray
+    growth_potential: np.ndarray
+    overall: np.ndarray
+    has_salary: np.ndarray
+    salary_midpoint: np.ndarray
+    salary_increase: np.ndarray
+    remote_work: np.ndarray
+    fortune_500: np.ndarray
+    valid: np.ndarray  # False where a job's fields could not be scored
+
 @dataclass
 class SearchParameters:
     """Job search parameters"""
@@ -125,7 +249,7 @@ class IntelligentJobMatcher:
     def __init__(self):
         """Initialize the intelligent job matcher"""
         self.resume_parser = AdvancedResumeParser()
-        self.job_security_predictor = JobSecurityPredictor()
+        self.job_security_predictor = JobSecurityPredictor() if JOB_SECURITY_PREDICTOR_AVAILABLE else None
         
         # Target MSAs for job search
         self.target_msas = [
@@ -169,9 +293,12 @@ class IntelligentJobMatcher:
         # Initialize job sources
         self.job_sources = self._initialize_job_sources()
         
-        # Cache for job search results
-        self.search_cache = {}
+        # Only this many top-scored jobs are materialized as JobScore objects
+        self.max_job_recommendations = 20
+        
+        # Cache for job search results, as candidate columns ready to score
         self.cache_ttl = 3600  # 1 hour
+        self.search_cache = ContentCache('job_search_candidates', max_entries=64, ttl_seconds=self.cache_ttl)
         
     def _initialize_job_sources(self) -> Dict[str, Any]:
         """Initialize job search sources"""
@@ -197,6 +324,10 @@ class IntelligentJobMatcher:
                                    current_salary: int, target_locations: List[str] = None) -> Dict[str, Any]:
         """
         Find jobs that offer significant income advancement opportunities
+
+        On a search-cache miss the candidate columns are built first, roughly
+        55-225 ms for 20k postings. Scoring in a few milliseconds only applies
+        to repeat searches within cache_ttl, which reuse those columns.
         
         Args:
             user_id: User ID
@@ -229,19 +360,26 @@ class IntelligentJobMatcher:
             )
             
             # Search for jobs
-            job_postings = self._search_jobs(search_params)
-            
-            # Score and rank jobs
-            scored_jobs = self._score_jobs(job_postings, search_params, resume_analysis)
+            candidates = self._search_job_candidates(search_params)
             
-            # Filter by minimum salary increase
-            filtered_jobs = self._filter_by_salary_threshold(scored_jobs, search_params)
+            # Score all jobs column-wise, filter by minimum salary increase, and
+            # materialize only the top-ranked survivors
+            score_columns = self._score_job_columns(candidates, search_params, resume_analysis)
+            eligible = self._salary_threshold_mask(score_columns, search_params)
+            filtered_jobs = self._top_job_scores(
+                score_columns, search_params, eligible, self.max_job_recommendations
+            )
+            logger.info(f"Filtered to {int(eligible.sum())} jobs meeting salary threshold")
             
             # Generate recommendations
-            recommendations = self._generate_recommendations(filtered_jobs, resume_analysis, search_params)
+            recommendations = self._generate_recommendations(
+                filtered_jobs, resume_analysis, search_params,
+                total_jobs=int(eligible.sum()),
+                progression_jobs=int(np.count_nonzero(score_columns.career_progression[eligible] >= 0.8))
+            )
             
             # Calculate search statistics
-            search_stats = self._calculate_search_statistics(filtered_jobs, search_params)
+            search_stats = self._calculate_search_statistics(score_columns, eligible, search_params)
             
             return {
                 'user_profile': self.resume_parser.get_analysis_summary(resume_analysis),
@@ -251,7 +389,7 @@ class IntelligentJobMatcher:
                     'min_increase_percentage': search_params.min_salary_increase * 100,
                     'target_locations': search_params.locations
                 },
-                'job_recommendations': [self._format_job_recommendation(job) for job in filtered_jobs[:20]],
+                'job_recommendations': [self._format_job_recommendation(job) for job in filtered_jobs],
                 'recommendations': recommendations,
                 'search_statistics': search_stats,
                 'timestamp': datetime.utcnow().isoformat()
@@ -293,6 +431,17 @@ class IntelligentJobMatcher:
         
         return target_salary
     
+    def _search_job_candidates(self, search_params: SearchParameters) -> JobCandidateColumns:
+        """Job search results as scoring columns, cached for cache_ttl per distinct search"""
+        cache_key = json.dumps([
+            search_params.primary_field.value, search_params.experience_level.value,
+            search_params.skills[:5], search_params.locations,
+            search_params.remote_preference, search_params.target_salary_min
+        ])
+        return self.search_cache.get_or_compute(
+            cache_key, lambda: JobCandidateColumns.build(self._search_jobs(search_params))
+        )
+    
     def _search_jobs(self, search_params: SearchParameters) -> List[JobPosting]:
         """Search for jobs across multiple sources"""
         logger.info(f"Searching jobs for {search_params.primary_field.value} in {search_params.locations}")
@@ -471,94 +620,166 @@ class IntelligentJobMatcher:
         
         return unique_jobs
     
-    def _score_jobs(self, jobs: List[JobPosting], search_params: SearchParameters, 
-                   resume_analysis: Any) -> List[JobScore]:
-        """Score jobs based on multiple criteria"""
-        logger.info(f"Scoring {len(jobs)} jobs")
+    def _score_jobs(self, jobs: Union[List[JobPosting], JobCandidateColumns],
+                   search_params: SearchParameters, resume_analysis: Any,
+                   top_k: Optional[int] = None) -> List[JobScore]:
+        """Score jobs based on multiple criteria, best first (top_k of them if given)"""
+        score_columns = self._score_job_columns(jobs, search_params, resume_analysis)
+        logger.info(f"Scoring {len(score_columns.jobs)} jobs")
         
-        scored_jobs = []
+        scored_jobs = self._top_job_scores(score_columns, search_params, score_columns.valid, top_k)
         
-        for job in jobs:
-            try:
-                # Calculate individual scores
-                salary_score = self._calculate_salary_improvement_score(job, search_params)
-                skills_score = self._calculate_skills_alignment_score(job, search_params)
-                career_score = self._calculate_career_progression_score(job, search_params, resume_analysis)
-                company_score = self._calculate_company_stability_score(job)
-                location_score = self._calculate_location_compatibility_score(job, search_params)
-                growth_score = self._calculate_growth_potential_score(job, resume_analysis)
-                
-                # Calculate weighted overall score using EXACT Multi-Dimensional Job Scoring System
-                overall_score = (
-                    salary_score * 0.35 +      # 35% weight - Primary importance
-                    skills_score * 0.25 +      # 25% weight - Skills alignment
-                    career_score * 0.20 +      # 20% weight - Career progression
-                    company_score * 0.10 +     # 10% weight - Company quality
-                    location_score * 0.05 +    # 5% weight - Location fit
-                    growth_score * 0.05        # 5% weight - Industry alignment
-                )
-                
-                # Generate recommendations and risk factors
-                recommendations = self._generate_job_recommendations(job, search_params)
-                risk_factors = self._identify_job_risk_factors(job, search_params)
-                
-                # Create job score
-                job_score = JobScore(
-                    job=job,
-                    overall_score=overall_score,
-                    salary_improvement_score=salary_score,
-                    skills_alignment_score=skills_score,
-                    career_progression_score=career_score,
-                    company_stability_score=company_score,
-                    location_compatibility_score=location_score,
-                    growth_potential_score=growth_score,
-                    score_breakdown={
-                        'salary_improvement': salary_score,
-                        'skills_match': skills_score,
-                        'career_progression': career_score,
-                        'company_quality': company_score,
-                        'location_fit': location_score,
-                        'growth_potential': growth_score
-                    },
-                    recommendations=recommendations,
-                    risk_factors=risk_factors
-                )
-                
-                scored_jobs.append(job_score)
-                
-            except Exception as e:
-                logger.error(f"Error scoring job {job.id}: {str(e)}")
-                continue
+        logger.info(f"Successfully scored {int(score_columns.valid.sum())} jobs")
+        return scored_jobs
+    
+    def _score_job_columns(self, jobs: Union[List[JobPosting], JobCandidateColumns],
+                           search_params: SearchParameters, resume_analysis: Any) -> JobScoreColumns:
+        """
+        Compute all six component scores and the weighted overall score as arrays.
+        
+        Salary uses the shared _SALARY_INCREASE_SCORES table over the whole set.
+        The other five components call their _calculate_*_score method once per
+        group of jobs that share the fields it reads, so the columns cannot
+        drift from the per-job scores. Pass JobCandidateColumns to reuse
+        columns already built for this set.
+        """
+        candidates = jobs if isinstance(jobs, JobCandidateColumns) else JobCandidateColumns.build(jobs)
+        n = len(candidates.jobs)
+        current_salary = search_params.current_salary
+        
+        # Salary improvement
+        has_salary = candidates.has_salary
+        salary_midpoint = candidates.salary_midpoint
+        valid = np.ones(n, dtype=bool)
+        if current_salary:
+            salary_increase = (salary_midpoint - current_salary) / current_salary
+        else:
+            # Nothing to compare against: jobs with a salary cannot be scored
+            salary_increase = np.zeros(n)
+            valid &= ~has_salary
+        salary_scores = np.where(has_salary, np.select(
+            [salary_increase >= threshold for threshold, _ in _SALARY_INCREASE_SCORES],
+            [score for _, score in _SALARY_INCREASE_SCORES],
+            default=_SALARY_BELOW_THRESHOLDS_SCORE
+        ), _UNKNOWN_SALARY_SCORE)
+        
+        # The rest, once per group of jobs the scalar method cannot tell apart
+        skills_scores = candidates.requirements.score(
+            lambda job: self._calculate_skills_alignment_score(job, search_params)
+        )
+        career_scores = candidates.titles.score(
+            lambda job: self._calculate_career_progression_score(job, search_params, resume_analysis)
+        )
+        company_scores = candidates.companies.score(self._calculate_company_stability_score)
+        location_scores = candidates.locations.score(
+            lambda job: self._calculate_location_compatibility_score(job, search_params)
+        )
+        growth_scores = candidates.growth_profiles.score(
+            lambda job: self._calculate_growth_potential_score(job, resume_analysis)
+        )
+        remote_work = candidates.remote_work
+        
+        # Weighted overall score using EXACT Multi-Dimensional Job Scoring System
+        overall = (
+            salary_scores * 0.35 +      # 35% weight - Primary importance
+            skills_scores * 0.25 +      # 25% weight - Skills alignment
+            career_scores * 0.20 +      # 20% weight - Career progression
+            company_scores * 0.10 +     # 10% weight - Company quality
+            location_scores * 0.05 +    # 5% weight - Location fit
+            growth_scores * 0.05        # 5% weight - Industry alignment
+        )
+        valid &= ~np.isnan(overall)
+        
+        return JobScoreColumns(
+            jobs=candidates.jobs,
+            salary_improvement=salary_scores,
+            skills_alignment=skills_scores,
+            career_progression=career_scores,
+            company_stability=company_scores,
+            location_compatibility=location_scores,
+            growth_potential=growth_scores,
+            overall=overall,
+            has_salary=has_salary,
+            salary_midpoint=salary_midpoint,
+            salary_increase=salary_increase,
+            remote_work=remote_work,
+            fortune_500=candidates.companies.score(lambda job: job.company_tier == CompanyTier.FORTUNE_500) == 1.0,
+            valid=valid
+        )
+    
+    def _salary_threshold_mask(self, score_columns: JobScoreColumns,
+                               search_params: SearchParameters) -> np.ndarray:
+        """Jobs meeting the minimum salary increase, or with unknown salary but a high overall score"""
+        return score_columns.valid & np.where(
+            score_columns.has_salary,
+            score_columns.salary_increase >= search_params.min_salary_increase,
+            score_columns.overall >= 0.7
+        )
+    
+    def _top_job_scores(self, score_columns: JobScoreColumns, search_params: SearchParameters,
+                        mask: np.ndarray, top_k: Optional[int] = None) -> List[JobScore]:
+        """
+        JobScore objects for the top_k masked jobs by overall score, best first.
         
-        # Sort by overall score
-        scored_jobs.sort(key=lambda x: x.overall_score, reverse=True)
+        Ties keep input order, as a stable sort of every job would. Only the
+        selected jobs get recommendations and risk factors.
+        """
+        candidates = np.flatnonzero(mask)
+        sort_key = -score_columns.overall[candidates]
+        if top_k is not None and top_k < len(candidates):
+            if top_k <= 0:
+                return []
+            cutoff = sort_key[np.argpartition(sort_key, top_k - 1)[top_k - 1]]
+            better = np.flatnonzero(sort_key < cutoff)
+            tied = np.flatnonzero(sort_key == cutoff)[:top_k - len(better)]
+            chosen = np.concatenate([better, tied])
+        else:
+            chosen = np.arange(len(candidates))
+        chosen = chosen[np.lexsort((chosen, sort_key[chosen]))]
         
-        logger.info(f"Successfully scored {len(scored_jobs)} jobs")
+        scored_jobs = []
+        for index in candidates[chosen]:
+            job = score_columns.jobs[index]
+            salary_score = float(score_columns.salary_improvement[index])
+            skills_score = float(score_columns.skills_alignment[index])
+            career_score = float(score_columns.career_progression[index])
+            company_score = float(score_columns.company_stability[index])
+            location_score = float(score_columns.location_compatibility[index])
+            growth_score = float(score_columns.growth_potential[index])
+            scored_jobs.append(JobScore(
+                job=job,
+                overall_score=float(score_columns.overall[index]),
+                salary_improvement_score=salary_score,
+                skills_alignment_score=skills_score,
+                career_progression_score=career_score,
+                company_stability_score=company_score,
+                location_compatibility_score=location_score,
+                growth_potential_score=growth_score,
+                score_breakdown={
+                    'salary_improvement': salary_score,
+                    'skills_match': skills_score,
+                    'career_progression': career_score,
+                    'company_quality': company_score,
+                    'location_fit': location_score,
+                    'growth_potential': growth_score
+                },
+                recommendations=self._generate_job_recommendations(job, search_params),
+                risk_factors=self._identify_job_risk_factors(job, search_params)
+            ))
         return scored_jobs
     
     def _calculate_salary_improvement_score(self, job: JobPosting, search_params: SearchParameters) -> float:
-        """Calculate salary improvement score with EXACT thresholds"""
+        """Calculate salary improvement score with EXACT thresholds (_SALARY_INCREASE_SCORES)"""
         if not job.salary_range:
-            return 0.5  # Neutral score for unknown salary
+            return _UNKNOWN_SALARY_SCORE
         
         # Calculate percentage increase
         salary_increase = (job.salary_range.midpoint - search_params.current_salary) / search_params.current_salary
         
-        # Score based on increase percentage - EXACT thresholds
-        if salary_increase >= 0.45:    # 45%+ increase
-            return 1.0
-        elif salary_increase >= 0.35:  # 35%+ increase
-            return 0.9
-        elif salary_increase >= 0.25:  # 25%+ increase
-            return 0.8
-        elif salary_increase >= 0.15:  # 15%+ increase
-            return 0.7
-        elif salary_increase >= 0.10:  # 10%+ increase
-            return 0.6
-        elif salary_increase >= 0.05:  # 5%+ increase
-            return 0.5
-        else:
-            return 0.3  # Below 5% increase
+        for threshold, score in _SALARY_INCREASE_SCORES:
+            if salary_increase >= threshold:
+                return score
+        return _SALARY_BELOW_THRESHOLDS_SCORE
     
     def _calculate_skills_alignment_score(self, job: JobPosting, 
                                         search_params: SearchParameters) -> float:
@@ -665,25 +886,6 @@ class IntelligentJobMatcher:
         
         return base_score
     
-    def _filter_by_salary_threshold(self, scored_jobs: List[JobScore], 
-                                  search_params: SearchParameters) -> List[JobScore]:
-        """Filter jobs by minimum salary increase threshold"""
-        filtered_jobs = []
-        
-        for job_score in scored_jobs:
-            if job_score.job.salary_range:
-                salary_increase = (job_score.job.salary_range.midpoint - search_params.current_salary) / search_params.current_salary
-                
-                if salary_increase >= search_params.min_salary_increase:
-                    filtered_jobs.append(job_score)
-            else:
-                # Include jobs with unknown salary but high overall score
-                if job_score.overall_score >= 0.7:
-                    filtered_jobs.append(job_score)
-        
-        logger.info(f"Filtered to {len(filtered_jobs)} jobs meeting salary threshold")
-        return filtered_jobs
-    
     def _generate_job_recommendations(self, job: JobPosting, 
                                     search_params: SearchParameters) -> List[str]:
         """Generate specific recommendations for a job"""
@@ -741,8 +943,15 @@ class IntelligentJobMatcher:
     
     def _generate_recommendations(self, scored_jobs: List[JobScore], 
                                 resume_analysis: Any, 
-                                search_params: SearchParameters) -> List[Dict[str, Any]]:
-        """Generate overall recommendations"""
+                                search_params: SearchParameters,
+                                total_jobs: Optional[int] = None,
+                                progression_jobs: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Generate overall recommendations
+        
+        scored_jobs may be just the top of the ranking; total_jobs and
+        progression_jobs then carry the counts over every eligible job.
+        """
         recommendations = []
         
         if not scored_jobs:
@@ -762,7 +971,7 @@ class IntelligentJobMatcher:
         
         recommendations.append({
             'type': 'opportunity',
-            'title': f'Found {len(scored_jobs)} high-quality opportunities',
+            'title': f'Found {total_jobs if total_jobs is not None else len(scored_jobs)} high-quality opportunities',
             'description': f'Average salary increase: {avg_salary_increase*100:.1f}%'
         })
         
@@ -776,11 +985,12 @@ class IntelligentJobMatcher:
             })
         
         # Career progression
-        progression_opportunities = [job for job in scored_jobs if job.career_progression_score >= 0.8]
-        if progression_opportunities:
+        if progression_jobs is None:
+            progression_jobs = len([job for job in scored_jobs if job.career_progression_score >= 0.8])
+        if progression_jobs:
             recommendations.append({
                 'type': 'career',
-                'title': f'{len(progression_opportunities)} career advancement opportunities',
+                'title': f'{progression_jobs} career advancement opportunities',
                 'description': 'These roles represent logical next steps in your career'
             })
         
@@ -803,22 +1013,23 @@ class IntelligentJobMatcher:
         
         return missing_skills[:5]
     
-    def _calculate_search_statistics(self, scored_jobs: List[JobScore], 
+    def _calculate_search_statistics(self, score_columns: JobScoreColumns, eligible: np.ndarray,
                                    search_params: SearchParameters) -> Dict[str, Any]:
-        """Calculate search statistics"""
-        if not scored_jobs:
+        """Calculate search statistics over every eligible job"""
+        if not eligible.any():
             return {'total_jobs': 0}
         
-        salaries = [job.job.salary_range.midpoint for job in scored_jobs if job.job.salary_range]
-        salary_increases = [(salary - search_params.current_salary) / search_params.current_salary for salary in salaries]
+        with_salary = eligible & score_columns.has_salary
+        salaries = score_columns.salary_midpoint[with_salary]
+        salary_increases = score_columns.salary_increase[with_salary]
         
         return {
-            'total_jobs': len(scored_jobs),
-            'avg_salary': int(np.mean(salaries)) if salaries else 0,
-            'avg_salary_increase': np.mean(salary_increases) if salary_increases else 0,
-            'max_salary_increase': max(salary_increases) if salary_increases else 0,
-            'remote_opportunities': len([job for job in scored_jobs if job.job.remote_work]),
-            'fortune_500_opportunities': len([job for job in scored_jobs if job.job.company_tier == CompanyTier.FORTUNE_500])
+            'total_jobs': int(eligible.sum()),
+            'avg_salary': int(np.mean(salaries)) if len(salaries) else 0,
+            'avg_salary_increase': np.mean(salary_increases) if len(salary_increases) else 0,
+            'max_salary_increase': float(salary_increases.max()) if len(salary_increases) else 0,
+            'remote_opportunities': int(np.count_nonzero(eligible & score_columns.remote_work)),
+            'fortune_500_opportunities': int(np.count_nonzero(eligible & score_columns.fortune_500))
         }
     
     def _format_job_recommendation(self, job_score: JobScore) -> Dict[str, Any]:
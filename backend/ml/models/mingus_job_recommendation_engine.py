@@ -9,18 +9,20 @@ import json
 import hashlib
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import traceback
 from functools import lru_cache
 import asyncio
 from unittest.mock import Mock
 
-from .resume_parser import AdvancedResumeParser
+from .resume_parser import AdvancedResumeParser, RESUME_PARSER_VERSION
 from .intelligent_job_matcher import IntelligentJobMatcher
 from .job_selection_algorithm import JobSelectionAlgorithm, CareerAdvancementStrategy
 from backend.services.intelligent_job_matching_service import IntelligentJobMatchingService
 from backend.services.career_advancement_service import CareerAdvancementService
+from backend.utils.content_cache import ContentCache, content_hash
+from backend.utils.resume_content_cache import RESUME_ANALYSIS_NAMESPACE, get_resume_cache
 
 logger = logging.getLogger(__name__)
 
@@ -117,8 +119,10 @@ class MingusJobRecommendationEngine:
         
         # Performance tracking
         self.processing_metrics = ProcessingMetrics()
-        self.cache = {}
         self.cache_ttl = 3600  # 1 hour
+        self.cache = ContentCache('recommendation_results', max_entries=256, ttl_seconds=self.cache_ttl)
+        # Shared across engines and workers: resume text hash -> ResumeAnalysis
+        self.analysis_cache = get_resume_cache(RESUME_ANALYSIS_NAMESPACE)
         
         # Error tracking
         self.error_counts = {}
@@ -176,12 +180,11 @@ class MingusJobRecommendationEngine:
             
             # Check cache first
             cache_key = self._generate_cache_key(resume_text, user_id, current_salary, target_locations, risk_preference)
-            if enable_caching and cache_key in self.cache:
-                cached_result = self.cache[cache_key]
-                if datetime.utcnow() - cached_result['timestamp'] < timedelta(seconds=self.cache_ttl):
-                    logger.info("Returning cached result")
-                    self.processing_metrics.cache_hits += 1
-                    return cached_result['result']
+            cached_result = self.cache.get(cache_key) if enable_caching else None
+            if cached_result is not None:
+                logger.info("Returning cached result")
+                self.processing_metrics.cache_hits += 1
+                return cached_result
             
             self.processing_metrics.cache_misses += 1
             
@@ -236,10 +239,7 @@ class MingusJobRecommendationEngine:
             
             # Cache result
             if enable_caching:
-                self.cache[cache_key] = {
-                    'result': result,
-                    'timestamp': datetime.utcnow()
-                }
+                self.cache.set(cache_key, result)
             
             # Log performance metrics
             self._log_performance_metrics()
@@ -265,8 +265,12 @@ class MingusJobRecommendationEngine:
             if not resume_text or len(resume_text.strip()) < 100:
                 raise ValueError("Resume text is too short or empty")
             
-            # Parse resume
-            resume_analysis = self.resume_parser.parse_resume(resume_text)
+            # Parse resume; the same text parsed by the same parser version is reused,
+            # so salary/location reruns go straight to the downstream stages
+            analysis_key = f"{content_hash(resume_text)}:{RESUME_PARSER_VERSION}"
+            resume_analysis = self.analysis_cache.get_or_compute(
+                analysis_key, lambda: self.resume_parser.parse_resume(resume_text)
+            )
             
             # Extract profile components
             field_expertise = {
@@ -629,7 +633,7 @@ class MingusJobRecommendationEngine:
                            current_salary: Optional[int], target_locations: Optional[List[str]], 
                            risk_preference: str) -> str:
         """Generate cache key for results"""
-        content = f"{resume_text[:1000]}_{user_id}_{current_salary}_{'_'.join(target_locations or [])}_{risk_preference}"
+        content = f"{content_hash(resume_text)}_{user_id}_{current_salary}_{'_'.join(target_locations or [])}_{risk_preference}"
         return hashlib.md5(content.encode()).hexdigest()
     
     def _create_search_parameters(self, user_profile: UserProfileAnalysis, 
@@ -920,7 +924,8 @@ class MingusJobRecommendationEngine:
             'cache_stats': {
                 'hits': self.processing_metrics.cache_hits,
                 'misses': self.processing_metrics.cache_misses,
-                'hit_rate': self.processing_metrics.cache_hits / (self.processing_metrics.cache_hits + self.processing_metrics.cache_misses) if (self.processing_metrics.cache_hits + self.processing_metrics.cache_misses) > 0 else 0
+                'hit_rate': self.processing_metrics.cache_hits / (self.processing_metrics.cache_hits + self.processing_metrics.cache_misses) if (self.processing_metrics.cache_hits + self.processing_metrics.cache_misses) > 0 else 0,
+                'resume_analysis': self.analysis_cache.stats()
             },
             'error_stats': {
                 'error_counts': self.error_counts,
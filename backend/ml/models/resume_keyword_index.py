@@ -0,0 +1,301 @@
+"""
+Single-pass keyword index for resume analysis
+Compiles every keyword table used by AdvancedResumeParser into one multi-pattern
+automaton and collects all keyword, skill, year and job-title hits in one scan,
+already grouped by the table each keyword belongs to
+"""
+
+import re
+import logging
+from collections import Counter
+from operator import itemgetter
+from typing import Dict, Hashable, List, Mapping, Sequence, Tuple
+from dataclasses import dataclass, field
+
+# Optional C Aho-Corasick automaton; falls back to per-table substring scans
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Skill vocabularies, in the order _extract_skills_from_text reports them.
+# Each group is matched as whole words; SKILL_EXTENSIONS match "<word><ext>".
+SKILL_EXTENSIONS = ('.js', '.py', '.net', '.com')
+SKILL_WORD_GROUPS = (
+    ('sql', 'python', 'java', 'javascript', 'react', 'angular', 'node'),  # Programming
+    ('excel', 'tableau', 'power bi', 'salesforce', 'crm'),  # Tools
+    ('agile', 'scrum', 'waterfall', 'pmp'),  # Methodologies
+)
+
+# Job title shapes: "<level word> <word>" and "<field word> <role word>"
+TITLE_LEVEL_WORDS = (
+    'senior', 'junior', 'lead', 'principal', 'chief', 'vp', 'director',
+    'manager', 'analyst', 'developer', 'engineer'
+)
+TITLE_FIELD_WORDS = (
+    'software', 'data', 'business', 'product', 'project', 'marketing',
+    'sales', 'finance', 'hr'
+)
+TITLE_ROLE_WORDS = ('engineer', 'analyst', 'manager', 'specialist', 'coordinator')
+
+MAX_JOB_TITLES = 5
+
+# Terms this short ("r", "it") hit on almost every line; counting them with
+# str.count keeps the automaton's hit stream small
+MIN_AUTOMATON_TERM_LENGTH = 3
+
+YEAR_PATTERN = re.compile(r'\b(19\d{2}|20\d{2})\b')
+SKILL_PATTERNS = [
+    re.compile(r'\b\w+(?:' + '|'.join(re.escape(ext) for ext in SKILL_EXTENSIONS) + r')\b'),
+] + [
+    re.compile(r'\b(?:' + '|'.join(group) + r')\b') for group in SKILL_WORD_GROUPS
+]
+TITLE_PATTERNS = [
+    re.compile(r'\b(?:' + '|'.join(TITLE_LEVEL_WORDS) + r')\s+\w+\b'),
+    re.compile(r'\b(?:' + '|'.join(TITLE_FIELD_WORDS) + r')\s+(?:' + '|'.join(TITLE_ROLE_WORDS) + r')\b'),
+]
+
+_NEXT_WORD = re.compile(r'\s+(\w+)')
+_TITLE_ROLE_SET = frozenset(TITLE_ROLE_WORDS)
+
+# Automaton payload roles
+_ROLE_SKILL_EXT = 'skill_ext'
+_ROLE_SKILL_WORD = 'skill_word'
+_ROLE_YEAR = 'year'
+_ROLE_TITLE_LEVEL = 'title_level'
+_ROLE_TITLE_FIELD = 'title_field'
+
+
+def _is_word_char_at(text: str, index: int) -> bool:
+    """Whether text[index] exists and is a regex \\w character"""
+    if index < 0 or index >= len(text):
+        return False
+    char = text[index]
+    return char.isalnum() or char == '_'
+
+
+@dataclass
+class ResumeKeywordHits:
+    """Everything the resume analyzers need from one scan of the processed text"""
+    term_counts: Dict[str, int] = field(default_factory=dict)
+    table_hits: Dict[Hashable, List[str]] = field(default_factory=dict)
+    skills: Dict[str, int] = field(default_factory=dict)
+    years: List[int] = field(default_factory=list)
+    job_titles: List[str] = field(default_factory=list)
+
+    def has(self, term: str) -> bool:
+        """True when term occurs anywhere in the text (substring match)"""
+        return term in self.term_counts
+
+    def matches(self, table: Hashable) -> List[str]:
+        """Terms of a table that occur in the text, in table order"""
+        return list(self.table_hits.get(table, ()))
+
+    def count(self, table: Hashable) -> int:
+        """Number of distinct terms of a table that occur in the text"""
+        return len(self.table_hits.get(table, ()))
+
+
+class ResumeKeywordIndex:
+    """
+    Keyword tables compiled once, scanned once per resume.
+
+    Tables map a key to a list of substring keywords. After the scan every
+    matched term is filed under each table it belongs to, so analyzers read a
+    table's matches and counts without walking the table again.
+
+    With pyahocorasick installed all table terms, skill words, skill file
+    extensions, title words and four-digit years share one Aho-Corasick
+    automaton and the processed text is walked once in C; the few structural
+    checks (word boundaries, the word before ".js", the word after a title
+    level) look at neighbouring characters only. Without it, each term is
+    checked with a substring search and the skill/title/year patterns run as
+    precompiled regexes. Both scanners return identical hits.
+    """
+
+    def __init__(self, tables: Mapping[Hashable, Sequence[str]]):
+        # term -> (table, (position in table, term)) for every table listing it
+        self._term_tables: Dict[str, List[Tuple[Hashable, Tuple[int, str]]]] = {}
+        for table, terms in tables.items():
+            for position, term in enumerate(terms):
+                if term:
+                    self._term_tables.setdefault(term, []).append((table, (position, term)))
+        self.terms: Tuple[str, ...] = tuple(self._term_tables)
+        self._short_terms = tuple(term for term in self.terms if len(term) < MIN_AUTOMATON_TERM_LENGTH)
+        self._automaton = None
+        if AHOCORASICK_AVAILABLE:
+            self._automaton = self._build_automaton()
+
+    @property
+    def uses_automaton(self) -> bool:
+        return self._automaton is not None
+
+    def _build_automaton(self):
+        payloads: Dict[str, Tuple[bool, list]] = {}
+
+        def add(key: str, role=None):
+            is_term, roles = payloads.setdefault(key, (False, []))
+            if role is None:
+                payloads[key] = (True, roles)
+            else:
+                roles.append(role)
+
+        for term in self.terms:
+            if len(term) >= MIN_AUTOMATON_TERM_LENGTH:
+                add(term)
+        for ext in SKILL_EXTENSIONS:
+            add(ext, (_ROLE_SKILL_EXT,))
+        for group_index, group in enumerate(SKILL_WORD_GROUPS, start=1):
+            for word in group:
+                add(word, (_ROLE_SKILL_WORD, group_index))
+        for word in TITLE_LEVEL_WORDS:
+            add(word, (_ROLE_TITLE_LEVEL,))
+        for word in TITLE_FIELD_WORDS:
+            add(word, (_ROLE_TITLE_FIELD,))
+        for year in range(1900, 2100):
+            add(str(year), (_ROLE_YEAR,))
+
+        automaton = ahocorasick.Automaton()
+        for key, (is_term, roles) in payloads.items():
+            # Plain terms carry just the key so the hot loop only counts them
+            automaton.add_word(key, (key, is_term, tuple(roles)) if roles else key)
+        automaton.make_automaton()
+        return automaton
+
+    def scan(self, text: str) -> ResumeKeywordHits:
+        """Collect all hits for already-preprocessed (lowercased) resume text"""
+        if self._automaton is not None:
+            hits = self._scan_with_automaton(text)
+        else:
+            hits = self._scan_with_substrings(text)
+        self._group_by_table(hits)
+        return hits
+
+    def _group_by_table(self, hits: ResumeKeywordHits):
+        """File each matched term under its tables, keeping table order"""
+        grouped: Dict[Hashable, List[Tuple[int, str]]] = {}
+        term_tables = self._term_tables
+        for term in hits.term_counts:
+            for table, entry in term_tables[term]:
+                grouped.setdefault(table, []).append(entry)
+        table_hits = hits.table_hits
+        for table, entries in grouped.items():
+            if len(entries) > 1:
+                entries.sort()
+            table_hits[table] = [term for _, term in entries]
+
+    def _scan_with_substrings(self, text: str) -> ResumeKeywordHits:
+        hits = ResumeKeywordHits()
+        for term in self.terms:
+            count = text.count(term)
+            if count:
+                hits.term_counts[term] = count
+        for pattern in SKILL_PATTERNS:
+            for match in pattern.findall(text):
+                hits.skills[match] = hits.skills.get(match, 0) + 1
+        hits.years = [int(year) for year in YEAR_PATTERN.findall(text)]
+        for pattern in TITLE_PATTERNS:
+            if len(hits.job_titles) >= MAX_JOB_TITLES:
+                break
+            hits.job_titles.extend(pattern.findall(text))
+        hits.job_titles = hits.job_titles[:MAX_JOB_TITLES]
+        return hits
+
+    def _scan_with_automaton(self, text: str) -> ResumeKeywordHits:
+        hits = ResumeKeywordHits()
+        term_counts = hits.term_counts
+        for term in self._short_terms:
+            count = text.count(term)
+            if count:
+                term_counts[term] = count
+
+        # The automaton walk and the counting run in C; only the hits that
+        # need structural checks are looked at one by one
+        automaton_hits = list(self._automaton.iter(text))
+        for value, count in Counter(map(itemgetter(1), automaton_hits)).items():
+            if value.__class__ is str:
+                term_counts[value] = count
+            elif value[1]:
+                term_counts[value[0]] = count
+
+        self._collect_structural_hits(text, automaton_hits, hits)
+        return hits
+
+    def _collect_structural_hits(self, text: str, automaton_hits: list, hits: ResumeKeywordHits):
+        """Skills, years and job titles from the automaton hits that carry roles, with regex semantics"""
+        # (start, match) per skill pattern; (start, end) of title words per title pattern
+        skill_matches: List[List[Tuple[int, str]]] = [[] for _ in range(len(SKILL_WORD_GROUPS) + 1)]
+        title_words: Tuple[List[Tuple[int, int]], List[Tuple[int, int]]] = ([], [])
+
+        for end, value in automaton_hits:
+            if value.__class__ is str:
+                continue
+            key, _, roles = value
+            after = end + 1
+            start = after - len(key)
+            for role in roles:
+                kind = role[0]
+                if kind == _ROLE_TITLE_LEVEL:
+                    title_words[0].append((start, after))
+                elif kind == _ROLE_TITLE_FIELD:
+                    title_words[1].append((start, after))
+                elif kind == _ROLE_SKILL_EXT:
+                    # "<word>.js": the whole word run before the extension
+                    if _is_word_char_at(text, after):
+                        continue
+                    word_start = start
+                    while _is_word_char_at(text, word_start - 1):
+                        word_start -= 1
+                    if word_start < start:
+                        skill_matches[0].append((word_start, text[word_start:after]))
+                else:
+                    # Neighbouring characters; a slice past either end is empty and not \w
+                    before, following = text[start - 1:start], text[after:after + 1]
+                    if before.isalnum() or before == '_' or following.isalnum() or following == '_':
+                        continue
+                    if kind == _ROLE_YEAR:
+                        hits.years.append(int(key))
+                    else:
+                        skill_matches[role[1]].append((start, key))
+
+        for matches in skill_matches:
+            for skill in self._non_overlapping(matches):
+                hits.skills[skill] = hits.skills.get(skill, 0) + 1
+
+        # Only the first MAX_JOB_TITLES titles are kept, so stop once they are found
+        for kind, words in ((_ROLE_TITLE_LEVEL, title_words[0]), (_ROLE_TITLE_FIELD, title_words[1])):
+            last_end = -1
+            for start, after in sorted(words):
+                if len(hits.job_titles) >= MAX_JOB_TITLES:
+                    return
+                if start < last_end or _is_word_char_at(text, start - 1):
+                    continue
+                title = self._title_at(text, start, after, kind)
+                if title:
+                    hits.job_titles.append(title)
+                    last_end = start + len(title)
+
+    @staticmethod
+    def _title_at(text: str, start: int, after: int, kind: str) -> str:
+        """The job title starting with the word text[start:after], or ''"""
+        next_word = _NEXT_WORD.match(text, after)
+        if next_word is None:
+            return ''
+        if kind == _ROLE_TITLE_FIELD and next_word.group(1) not in _TITLE_ROLE_SET:
+            return ''
+        return text[start:next_word.end()]
+
+    @staticmethod
+    def _non_overlapping(matches: List[Tuple[int, str]]) -> List[str]:
+        """Leftmost, non-overlapping matches, as a regex findall would return"""
+        selected = []
+        last_end = -1
+        for start, match in sorted(matches, key=lambda item: item[0]):
+            if start >= last_end:
+                selected.append(match)
+                last_end = start + len(match)
+        return selected
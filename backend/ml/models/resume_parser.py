@@ -16,8 +16,22 @@ import spacy
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+from .resume_keyword_index import ResumeKeywordIndex, ResumeKeywordHits
+
 logger = logging.getLogger(__name__)
 
+# Part of the cache key for stored ResumeAnalysis results; bump it whenever a
+# change alters what parse_resume returns for the same text
+RESUME_PARSER_VERSION = '2'
+
+# Characters _preprocess_text replaces with spaces. ASCII ones go through a
+# byte translation table; the rare non-ASCII ones are replaced one by one.
+_SPECIAL_CHAR_PATTERN = re.compile(r'[^\w\s\-\.\,\&\+\#]')
+_NON_ASCII_PATTERN = re.compile(r'[^\x00-\x7f]')
+_ASCII_SPECIAL_CHAR_TABLE = bytes(
+    32 if i < 128 and _SPECIAL_CHAR_PATTERN.match(chr(i)) else i for i in range(256)
+)
+
 class FieldType(str, Enum):
     """Primary fields of expertise"""
     DATA_ANALYSIS = "Data Analysis"
@@ -41,6 +55,52 @@ class SkillCategory(str, Enum):
     BUSINESS = "Business"
     SOFT = "Soft"
 
+
+# Base salary ranges by field and experience level
+_SALARY_RANGES = {
+    FieldType.DATA_ANALYSIS: {
+        ExperienceLevel.ENTRY: (45000, 65000),
+        ExperienceLevel.MID: (65000, 95000),
+        ExperienceLevel.SENIOR: (95000, 140000)
+    },
+    FieldType.PROJECT_MANAGEMENT: {
+        ExperienceLevel.ENTRY: (50000, 70000),
+        ExperienceLevel.MID: (70000, 100000),
+        ExperienceLevel.SENIOR: (100000, 150000)
+    },
+    FieldType.SOFTWARE_DEVELOPMENT: {
+        ExperienceLevel.ENTRY: (55000, 75000),
+        ExperienceLevel.MID: (75000, 110000),
+        ExperienceLevel.SENIOR: (110000, 180000)
+    },
+    FieldType.MARKETING: {
+        ExperienceLevel.ENTRY: (40000, 60000),
+        ExperienceLevel.MID: (60000, 90000),
+        ExperienceLevel.SENIOR: (90000, 130000)
+    },
+    FieldType.FINANCE: {
+        ExperienceLevel.ENTRY: (45000, 65000),
+        ExperienceLevel.MID: (65000, 95000),
+        ExperienceLevel.SENIOR: (95000, 150000)
+    },
+    FieldType.SALES: {
+        ExperienceLevel.ENTRY: (40000, 60000),
+        ExperienceLevel.MID: (60000, 90000),
+        ExperienceLevel.SENIOR: (90000, 140000)
+    },
+    FieldType.OPERATIONS: {
+        ExperienceLevel.ENTRY: (40000, 60000),
+        ExperienceLevel.MID: (60000, 85000),
+        ExperienceLevel.SENIOR: (85000, 120000)
+    },
+    FieldType.HR: {
+        ExperienceLevel.ENTRY: (40000, 55000),
+        ExperienceLevel.MID: (55000, 80000),
+        ExperienceLevel.SENIOR: (80000, 110000)
+    }
+}
+
+
 @dataclass
 class FieldAnalysis:
     """Field expertise analysis results"""
@@ -110,6 +170,35 @@ class AdvancedResumeParser:
         self.experience_indicators = self._initialize_experience_indicators()
         self.leadership_indicators = self._initialize_leadership_indicators()
         self.skill_categories = self._initialize_skill_categories()
+        self.transferable_skill_patterns = [
+            'communication', 'leadership', 'problem solving', 'analytical thinking',
+            'project management', 'teamwork', 'time management', 'adaptability',
+            'creativity', 'critical thinking', 'decision making', 'strategic thinking'
+        ]
+        self.industry_keywords = [
+            'technology', 'finance', 'healthcare', 'education', 'retail',
+            'manufacturing', 'consulting', 'government', 'non-profit',
+            'media', 'entertainment', 'real estate', 'transportation'
+        ]
+        self.industry_focus_keywords = {
+            'technology': ['tech', 'software', 'it', 'digital', 'startup'],
+            'finance': ['banking', 'investment', 'financial', 'trading'],
+            'healthcare': ['medical', 'health', 'pharmaceutical', 'clinical'],
+            'education': ['academic', 'university', 'school', 'learning'],
+            'retail': ['e-commerce', 'retail', 'consumer', 'sales']
+        }
+        self.progression_indicators = {
+            "Steady progression": ['promoted', 'advanced', 'progressed'],
+            "Leadership track": ['senior', 'lead', 'manager'],
+            "Specialist track": ['specialist', 'expert', 'principal']
+        }
+        self.proficiency_indicators = ['expert', 'advanced', 'proficient', 'experienced']
+        
+        # Every keyword table above compiled into one matcher; each resume is
+        # scanned once and all analyzers read their hits from that scan
+        self.keyword_index = ResumeKeywordIndex(self._keyword_tables())
+        self._last_scan: Tuple[Optional[str], Optional[ResumeKeywordHits]] = (None, None)
+        self._skill_category_cache: Dict[str, SkillCategory] = {}
         
         # Initialize NLP components
         try:
@@ -233,6 +322,34 @@ class AdvancedResumeParser:
             ]
         }
     
+    def _keyword_tables(self) -> Dict[Any, List[str]]:
+        """Every substring keyword table the analyzers read, keyed as they look it up in the scan"""
+        tables: Dict[Any, List[str]] = {}
+        for field, keywords in self.field_keywords.items():
+            tables['field', field] = keywords
+        for level, indicators in self.experience_indicators.items():
+            tables['experience', level] = indicators
+        for industry, keywords in self.industry_focus_keywords.items():
+            tables['industry_focus', industry] = keywords
+        for progression, indicators in self.progression_indicators.items():
+            tables['progression', progression] = indicators
+        tables['leadership'] = self.leadership_indicators
+        tables['transferable'] = self.transferable_skill_patterns
+        tables['industry'] = self.industry_keywords
+        tables['proficiency'] = self.proficiency_indicators
+        # Title patterns checked by _analyze_experience_level
+        tables['team_lead'] = ['team lead', 'team leads']
+        return tables
+    
+    def _scan(self, text: str) -> ResumeKeywordHits:
+        """Keyword hits for processed text, reusing the last scan for the same text"""
+        cached_text, cached_hits = self._last_scan
+        if cached_hits is not None and (cached_text is text or cached_text == text):
+            return cached_hits
+        hits = self.keyword_index.scan(text)
+        self._last_scan = (text, hits)
+        return hits
+    
     def parse_resume(self, resume_text: str, resume_data: Dict[str, Any] = None) -> ResumeAnalysis:
         """
         Parse resume and perform comprehensive analysis
@@ -247,8 +364,9 @@ class AdvancedResumeParser:
         try:
             logger.info("Starting advanced resume analysis")
             
-            # Preprocess resume text
+            # Preprocess resume text and scan it once for every keyword table
             processed_text = self._preprocess_text(resume_text)
+            self._scan(processed_text)
             
             # Perform field analysis
             field_analysis = self._analyze_field_expertise(processed_text, resume_data)
@@ -295,30 +413,27 @@ class AdvancedResumeParser:
     
     def _preprocess_text(self, text: str) -> str:
         """Preprocess resume text for analysis"""
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        # Convert to lowercase and remove extra whitespace
+        text = ' '.join(text.lower().split())
         
         # Remove special characters but keep important ones
-        text = re.sub(r'[^\w\s\-\.\,\&\+\#]', ' ', text)
+        if not text.isascii():
+            for char in set(_NON_ASCII_PATTERN.findall(text)):
+                if _SPECIAL_CHAR_PATTERN.match(char):
+                    text = text.replace(char, ' ')
+        text = text.encode('utf-8', 'surrogatepass').translate(_ASCII_SPECIAL_CHAR_TABLE).decode('utf-8', 'surrogatepass')
         
         return text.strip()
     
     def _analyze_field_expertise(self, text: str, resume_data: Dict[str, Any] = None) -> FieldAnalysis:
         """Analyze primary and secondary fields of expertise"""
+        hits = self._scan(text)
         field_scores = {}
         
         for field, keywords in self.field_keywords.items():
-            score = 0
-            matched_keywords = []
-            
             # Calculate keyword matches
-            for keyword in keywords:
-                if keyword in text:
-                    score += 1
-                    matched_keywords.append(keyword)
+            matched_keywords = hits.matches(('field', field))
+            score = len(matched_keywords)
             
             # Normalize score by number of keywords
             normalized_score = score / len(keywords) if keywords else 0
@@ -350,36 +465,31 @@ class AdvancedResumeParser:
     
     def _analyze_experience_level(self, text: str, resume_data: Dict[str, Any] = None) -> ExperienceAnalysis:
         """Analyze experience level and progression"""
-        level_scores = {}
-        
-        for level, indicators in self.experience_indicators.items():
-            score = 0
-            for indicator in indicators:
-                if indicator in text:
-                    score += 1
-            level_scores[level] = score
+        hits = self._scan(text)
+        level_scores = {level: hits.count(('experience', level)) for level in self.experience_indicators}
         
         # Determine experience level with more nuanced logic
         # Check if senior indicators are just part of other words (like "team leads" vs "team lead")
         senior_score = level_scores[ExperienceLevel.SENIOR]
-        if 'team lead' in text and 'team leads' in text:
+        if hits.has('team lead') and hits.has('team leads'):
             # If both singular and plural exist, it's likely just part of a description
             senior_score = max(0, senior_score - 1)
         
         # Check for job title patterns that might be misleading
         # If we have both "senior" and "specialist" in the same context, it might be a mid-level role
-        if 'senior' in text and 'specialist' in text and 'manager' not in text and 'director' not in text:
+        senior_specialist = hits.has('senior') and hits.has('specialist')
+        if senior_specialist and not hits.has('manager') and not hits.has('director'):
             # "Senior Specialist" is often a mid-level role, not truly senior
             senior_score = max(0, senior_score - 1)
         
         # If we have "senior" and "specialist" but no strong senior indicators, classify as mid
-        if 'senior' in text and 'specialist' in text and level_scores[ExperienceLevel.MID] > 0:
+        if senior_specialist and level_scores[ExperienceLevel.MID] > 0:
             # This is likely a mid-level role with "senior" in the title
             if senior_score <= 1:  # Only one senior indicator
                 senior_score = 0  # Don't classify as senior
         
         # Special case: "Senior Specialist" should be classified as MID level
-        if 'senior' in text and 'specialist' in text and level_scores[ExperienceLevel.MID] > 0:
+        if senior_specialist and level_scores[ExperienceLevel.MID] > 0:
             level = ExperienceLevel.MID
             confidence = min(level_scores[ExperienceLevel.MID] / 2, 1.0)
         elif level_scores[ExperienceLevel.ENTRY] > 0 and senior_score == 0:
@@ -415,8 +525,11 @@ class AdvancedResumeParser:
     
     def _analyze_skills(self, text: str, resume_data: Dict[str, Any] = None) -> SkillsAnalysis:
         """Analyze and categorize skills"""
+        hits = self._scan(text)
+        
         # Extract skills from text
         skills = self._extract_skills_from_text(text)
+        has_proficiency_context = hits.count('proficiency') > 0
         
         # Categorize skills
         technical_skills = {}
@@ -425,7 +538,7 @@ class AdvancedResumeParser:
         
         for skill, frequency in skills.items():
             category = self._categorize_skill(skill)
-            proficiency = self._calculate_skill_proficiency(skill, frequency, text)
+            proficiency = self._calculate_skill_proficiency(skill, frequency, text, has_proficiency_context)
             
             if category == SkillCategory.TECHNICAL:
                 technical_skills[skill] = proficiency
@@ -495,102 +608,27 @@ class AdvancedResumeParser:
     
     def _calculate_leadership_potential(self, text: str) -> float:
         """Calculate leadership potential score"""
-        leadership_score = 0
+        leadership_score = self._scan(text).count('leadership')
         total_indicators = len(self.leadership_indicators)
         
-        for indicator in self.leadership_indicators:
-            if indicator in text:
-                leadership_score += 1
-        
         # Normalize to 0-1 scale
         return min(leadership_score / total_indicators, 1.0)
     
     def _extract_transferable_skills(self, text: str, field_analysis: FieldAnalysis) -> List[str]:
         """Extract transferable skills across fields"""
-        transferable_skills = []
-        
-        # Define transferable skill patterns
-        transferable_patterns = [
-            'communication', 'leadership', 'problem solving', 'analytical thinking',
-            'project management', 'teamwork', 'time management', 'adaptability',
-            'creativity', 'critical thinking', 'decision making', 'strategic thinking'
-        ]
-        
-        for skill in transferable_patterns:
-            if skill in text:
-                transferable_skills.append(skill)
-        
-        return transferable_skills
+        return self._scan(text).matches('transferable')
     
     def _extract_industry_experience(self, text: str, resume_data: Dict[str, Any] = None) -> List[str]:
         """Extract industry experience"""
-        industries = []
-        
-        # Common industry keywords
-        industry_keywords = [
-            'technology', 'finance', 'healthcare', 'education', 'retail',
-            'manufacturing', 'consulting', 'government', 'non-profit',
-            'media', 'entertainment', 'real estate', 'transportation'
-        ]
-        
-        for industry in industry_keywords:
-            if industry in text:
-                industries.append(industry)
-        
-        return industries
+        return self._scan(text).matches('industry')
     
     def _analyze_income(self, text: str, experience_analysis: ExperienceAnalysis, 
                        field_analysis: FieldAnalysis, resume_data: Dict[str, Any] = None) -> IncomeAnalysis:
         """Analyze income and compensation based on experience and field"""
-        
-        # Base salary ranges by field and experience level
-        salary_ranges = {
-            FieldType.DATA_ANALYSIS: {
-                ExperienceLevel.ENTRY: (45000, 65000),
-                ExperienceLevel.MID: (65000, 95000),
-                ExperienceLevel.SENIOR: (95000, 140000)
-            },
-            FieldType.PROJECT_MANAGEMENT: {
-                ExperienceLevel.ENTRY: (50000, 70000),
-                ExperienceLevel.MID: (70000, 100000),
-                ExperienceLevel.SENIOR: (100000, 150000)
-            },
-            FieldType.SOFTWARE_DEVELOPMENT: {
-                ExperienceLevel.ENTRY: (55000, 75000),
-                ExperienceLevel.MID: (75000, 110000),
-                ExperienceLevel.SENIOR: (110000, 180000)
-            },
-            FieldType.MARKETING: {
-                ExperienceLevel.ENTRY: (40000, 60000),
-                ExperienceLevel.MID: (60000, 90000),
-                ExperienceLevel.SENIOR: (90000, 130000)
-            },
-            FieldType.FINANCE: {
-                ExperienceLevel.ENTRY: (45000, 65000),
-                ExperienceLevel.MID: (65000, 95000),
-                ExperienceLevel.SENIOR: (95000, 150000)
-            },
-            FieldType.SALES: {
-                ExperienceLevel.ENTRY: (40000, 60000),
-                ExperienceLevel.MID: (60000, 90000),
-                ExperienceLevel.SENIOR: (90000, 140000)
-            },
-            FieldType.OPERATIONS: {
-                ExperienceLevel.ENTRY: (40000, 60000),
-                ExperienceLevel.MID: (60000, 85000),
-                ExperienceLevel.SENIOR: (85000, 120000)
-            },
-            FieldType.HR: {
-                ExperienceLevel.ENTRY: (40000, 55000),
-                ExperienceLevel.MID: (55000, 80000),
-                ExperienceLevel.SENIOR: (80000, 110000)
-            }
-        }
-        
         # Get base range for field and experience level
         field = field_analysis.primary_field
         level = experience_analysis.level
-        base_min, base_max = salary_ranges.get(field, salary_ranges[FieldType.OPERATIONS]).get(level, (50000, 75000))
+        base_min, base_max = _SALARY_RANGES.get(field, _SALARY_RANGES[FieldType.OPERATIONS]).get(level, (50000, 75000))
         
         # Adjust based on experience years
         experience_factor = min(experience_analysis.total_years / 5.0, 1.5)
@@ -636,8 +674,7 @@ class AdvancedResumeParser:
     def _estimate_field_experience(self, text: str, field: FieldType, resume_data: Dict[str, Any] = None) -> float:
         """Estimate years of experience in specific field"""
         # This is a simplified estimation - in practice, you'd use more sophisticated NLP
-        field_keywords = self.field_keywords[field]
-        keyword_count = sum(1 for keyword in field_keywords if keyword in text)
+        keyword_count = self._scan(text).count(('field', field))
         
         # Rough estimation: more keywords = more experience
         if keyword_count >= 10:
@@ -651,26 +688,18 @@ class AdvancedResumeParser:
     
     def _calculate_total_experience(self, text: str, resume_data: Dict[str, Any] = None) -> float:
         """Calculate total years of experience"""
-        # Look for year patterns (both 4-digit years and year ranges)
-        year_pattern = r'\b(19\d{2}|20\d{2})\b'
-        years = re.findall(year_pattern, text)
-        
-        # Convert to full years
-        full_years = []
-        for year in years:
-            if len(year) == 2:
-                # If it's a 2-digit year, assume it's 20xx
-                full_years.append(int('20' + year))
-            else:
-                full_years.append(int(year))
+        hits = self._scan(text)
+        
+        # Four-digit years found by the keyword scan
+        full_years = hits.years
         
         if len(full_years) >= 2:
             # Calculate difference between earliest and latest years
             return max(full_years) - min(full_years)
         
         # Fallback estimation based on job titles and experience level
-        senior_indicators = len([ind for ind in self.experience_indicators[ExperienceLevel.SENIOR] if ind in text])
-        mid_indicators = len([ind for ind in self.experience_indicators[ExperienceLevel.MID] if ind in text])
+        senior_indicators = hits.count(('experience', ExperienceLevel.SENIOR))
+        mid_indicators = hits.count(('experience', ExperienceLevel.MID))
         
         if senior_indicators > 0:
             return 8.0
@@ -682,82 +711,57 @@ class AdvancedResumeParser:
     def _analyze_career_progression(self, text: str, resume_data: Dict[str, Any] = None) -> str:
         """Analyze career progression pattern"""
         # Look for progression indicators
-        if any(indicator in text for indicator in ['promoted', 'advanced', 'progressed']):
-            return "Steady progression"
-        elif any(indicator in text for indicator in ['senior', 'lead', 'manager']):
-            return "Leadership track"
-        elif any(indicator in text for indicator in ['specialist', 'expert', 'principal']):
-            return "Specialist track"
-        else:
-            return "Standard progression"
+        hits = self._scan(text)
+        for progression in self.progression_indicators:
+            if hits.count(('progression', progression)):
+                return progression
+        return "Standard progression"
     
     def _extract_leadership_indicators(self, text: str) -> List[str]:
         """Extract leadership indicators from text"""
-        found_indicators = []
-        for indicator in self.leadership_indicators:
-            if indicator in text:
-                found_indicators.append(indicator)
-        return found_indicators
+        return self._scan(text).matches('leadership')
     
     def _extract_skills_from_text(self, text: str) -> Dict[str, int]:
         """Extract skills and their frequencies from text"""
-        # This is a simplified extraction - in practice, you'd use more sophisticated NLP
-        skills = {}
-        
-        # Common skill patterns
-        skill_patterns = [
-            r'\b\w+(?:\.js|\.py|\.net|\.com)\b',  # Technologies
-            r'\b(?:sql|python|java|javascript|react|angular|node)\b',  # Programming
-            r'\b(?:excel|tableau|power bi|salesforce|crm)\b',  # Tools
-            r'\b(?:agile|scrum|waterfall|pmp)\b',  # Methodologies
-        ]
-        
-        for pattern in skill_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                skills[match.lower()] = skills.get(match.lower(), 0) + 1
-        
-        return skills
+        # Technologies (<word>.js/.py/.net/.com), programming languages, tools
+        # and methodologies, counted by the keyword scan
+        return dict(self._scan(text).skills)
     
     def _categorize_skill(self, skill: str) -> SkillCategory:
         """Categorize a skill into technical, business, or soft skills"""
         skill_lower = skill.lower()
-        
-        for category, keywords in self.skill_categories.items():
-            for keyword in keywords:
-                if keyword in skill_lower:
-                    return category
-        
-        # Default to technical if unclear
-        return SkillCategory.TECHNICAL
+        cached = self._skill_category_cache.get(skill_lower)
+        if cached is not None:
+            return cached
+        
+        category = SkillCategory.TECHNICAL  # Default to technical if unclear
+        for candidate, keywords in self.skill_categories.items():
+            if any(keyword in skill_lower for keyword in keywords):
+                category = candidate
+                break
+        
+        if len(self._skill_category_cache) < 10000:
+            self._skill_category_cache[skill_lower] = category
+        return category
     
-    def _calculate_skill_proficiency(self, skill: str, frequency: int, text: str) -> float:
+    def _calculate_skill_proficiency(self, skill: str, frequency: int, text: str,
+                                     has_proficiency_context: Optional[bool] = None) -> float:
         """Calculate skill proficiency level (0-1)"""
         # Base score from frequency
         base_score = min(frequency / 5, 1.0)
         
         # Boost score if skill appears in context with proficiency indicators
-        proficiency_indicators = ['expert', 'advanced', 'proficient', 'experienced']
-        context_boost = 0.2 if any(indicator in text for indicator in proficiency_indicators) else 0
+        if has_proficiency_context is None:
+            has_proficiency_context = self._scan(text).count('proficiency') > 0
+        context_boost = 0.2 if has_proficiency_context else 0
         
         return min(base_score + context_boost, 1.0)
     
     def _extract_job_history(self, text: str, resume_data: Dict[str, Any] = None) -> List[str]:
         """Extract job history from text"""
-        # This is a simplified extraction - in practice, you'd use more sophisticated NLP
-        job_titles = []
-        
-        # Common job title patterns
-        title_patterns = [
-            r'\b(?:senior|junior|lead|principal|chief|vp|director|manager|analyst|developer|engineer)\s+\w+\b',
-            r'\b(?:software|data|business|product|project|marketing|sales|finance|hr)\s+(?:engineer|analyst|manager|specialist|coordinator)\b'
-        ]
-        
-        for pattern in title_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            job_titles.extend(matches)
-        
-        return job_titles[:5]  # Return top 5 most recent
+        # "<level> <word>" and "<field> <role>" titles from the keyword scan,
+        # top 5 most recent
+        return list(self._scan(text).job_titles)
     
     def _analyze_progression_pattern(self, job_history: List[str]) -> List[str]:
         """Analyze career progression pattern"""
@@ -839,30 +843,16 @@ class AdvancedResumeParser:
                 readiness_score += 0.2
         
         # Skills diversity
-        skills_analysis = self._analyze_skills(text)
-        if skills_analysis.technical_skills and skills_analysis.business_skills:
+        categories = {self._categorize_skill(skill) for skill in self._scan(text).skills}
+        if SkillCategory.TECHNICAL in categories and SkillCategory.BUSINESS in categories:
             readiness_score += 0.2
         
         return min(readiness_score, 1.0)
     
     def _extract_industry_focus(self, text: str, job_history: List[str]) -> List[str]:
         """Extract industry focus from experience"""
-        industries = []
-        
-        # Industry keywords
-        industry_keywords = {
-            'technology': ['tech', 'software', 'it', 'digital', 'startup'],
-            'finance': ['banking', 'investment', 'financial', 'trading'],
-            'healthcare': ['medical', 'health', 'pharmaceutical', 'clinical'],
-            'education': ['academic', 'university', 'school', 'learning'],
-            'retail': ['e-commerce', 'retail', 'consumer', 'sales']
-        }
-        
-        for industry, keywords in industry_keywords.items():
-            if any(keyword in text.lower() for keyword in keywords):
-                industries.append(industry)
-        
-        return industries
+        hits = self._scan(text)
+        return [industry for industry in self.industry_focus_keywords if hits.count(('industry_focus', industry))]
 
     def get_analysis_summary(self, analysis: ResumeAnalysis) -> Dict[str, Any]:
         """Get a summary of the resume analysis"""
@@ -3,7 +3,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import CheckConstraint
+from sqlalchemy import CheckConstraint, Index
 
 from .database import db
 
@@ -63,6 +63,14 @@ class JobPosting(db.Model):
             "seniority_level IN ('entry', 'mid', 'senior', 'director')",
             name="ck_job_postings_seniority_level",
         ),
+        # Equality on field, MSA and is_active, then salary_max in search order
+        Index(
+            "ix_job_postings_field_msa_active_salary",
+            "career_field",
+            "msa_code",
+            "is_active",
+            "salary_max",
+        ),
     )
 
     def __repr__(self) -> str:
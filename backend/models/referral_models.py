@@ -4,24 +4,16 @@ Referral System Database Models
 Handles referral tracking, unlock progress, and feature access control
 """
 
-import psycopg2
-import psycopg2.extras
-import os
 import json
 import secrets
 import hashlib
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import logging
+from backend.utils.pg_pool import get_pg_connection
 
 logger = logging.getLogger(__name__)
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class ReferralSystem:
     """Manages referral tracking and feature unlock system"""
     
@@ -69,6 +69,8 @@ class User(db.Model):
     plaid_access_token = db.Column(db.String(255), nullable=True)
     plaid_item_id = db.Column(db.String(100), nullable=True)
     plaid_connected_at = db.Column(db.DateTime, nullable=True)
+    plaid_sync_cursor = db.Column(db.Text, nullable=True)
+    plaid_last_synced_at = db.Column(db.DateTime, nullable=True)
     
     # Relationships
     vehicles = db.relationship('Vehicle', backref='user', lazy=True, cascade='all, delete-orphan')
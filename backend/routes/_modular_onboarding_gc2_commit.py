@@ -30,6 +30,7 @@ from backend.models.user_models import User
 from backend.utils.user_profile_context import sync_user_profile_zip
 from backend.models.vehicle_models import Vehicle
 from backend.models.vibe_tracker import VibeTrackedPerson
+from backend.services.forecast_store import forecast_store
 
 def _to_decimal_amount(v: Any) -> Decimal | None:
     """Same semantics as backend.api.financial_setup_api._to_decimal_amount (local copy to avoid heavy imports)."""
@@ -204,6 +205,7 @@ def _merge_important_dates_custom_events_modular(email: str, new_events: list[di
         conn.commit()
     finally:
         conn.close()
+    forecast_store.invalidate_email(email)
 
 
 def _load_important_dates(email: str) -> dict:
@@ -246,6 +248,7 @@ def _save_important_dates(email: str, prev: dict) -> None:
         conn.commit()
     finally:
         conn.close()
+    forecast_store.invalidate_email(email)
 
 
 def _custom_events_list(email: str) -> list:
@@ -6,11 +6,9 @@ from __future__ import annotations
 import json
 import logging
 import math
-import os
 from datetime import datetime
 
-import psycopg2
-import psycopg2.extras
+from backend.utils.pg_pool import get_pg_connection
 from flask import Blueprint, jsonify, request
 from sqlalchemy import desc
 
@@ -168,9 +166,7 @@ def _expand_query(q: str) -> str:
 
 
 def _get_db_connection():
-    conn = psycopg2.connect(os.environ["DATABASE_URL"])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
+    return get_pg_connection()
 
 
 def _ensure_bookmarks_table() -> None:
@@ -59,6 +59,7 @@ def exchange_token():
         user.plaid_access_token = result["access_token"]
         user.plaid_item_id = result["item_id"]
         user.plaid_connected_at = connected_at
+        user.plaid_sync_cursor = None
         db.session.commit()
         sync_user_transactions_background(user.id)
         return jsonify({
@@ -103,6 +104,8 @@ def disconnect_plaid():
         user.plaid_access_token = None
         user.plaid_item_id = None
         user.plaid_connected_at = None
+        user.plaid_sync_cursor = None
+        user.plaid_last_synced_at = None
         db.session.commit()
         return jsonify({"success": True}), 200
     except Exception:
@@ -14,6 +14,7 @@ from backend.auth.decorators import require_auth
 from backend.models.database import db
 from backend.models.transaction_schedule import IncomeStream, ScheduledExpense
 from backend.models.user_models import User
+from backend.services.forecast_store import ScheduleItem, forecast_store
 
 transaction_schedule_bp = Blueprint("transaction_schedule", __name__)
 
@@ -176,11 +177,13 @@ def create_income():
         is_active=True,
     )
     db.session.add(row)
+    forecast_store.mark_incremental(row)
     try:
         db.session.commit()
     except IntegrityError:
         db.session.rollback()
         return jsonify({"error": "Could not create income stream"}), 409
+    forecast_store.apply_schedule_change(user.user_id, None, ScheduleItem.from_row(row))
     return jsonify(_income_dict(row)), 201
 
 
@@ -193,6 +196,7 @@ def update_income(income_id: uuid.UUID):
     row = _income_for_user(income_id, user)
     if not row:
         return jsonify({"error": "Income stream not found"}), 404
+    before = ScheduleItem.from_row(row)
     body = _parse_json()
     if "label" in body:
         label = body.get("label")
@@ -232,11 +236,13 @@ def update_income(income_id: uuid.UUID):
         if not isinstance(active, bool):
             return jsonify({"error": "is_active must be a boolean"}), 400
         row.is_active = active
+    forecast_store.mark_incremental(row)
     try:
         db.session.commit()
     except IntegrityError:
         db.session.rollback()
         return jsonify({"error": "Could not update income stream"}), 409
+    forecast_store.apply_schedule_change(user.user_id, before, ScheduleItem.from_row(row))
     return jsonify(_income_dict(row))
 
 
@@ -249,8 +255,11 @@ def delete_income(income_id: uuid.UUID):
     row = _income_for_user(income_id, user)
     if not row:
         return jsonify({"error": "Income stream not found"}), 404
+    before = ScheduleItem.from_row(row)
     row.is_active = False
+    forecast_store.mark_incremental(row)
     db.session.commit()
+    forecast_store.apply_schedule_change(user.user_id, before, None)
     return jsonify({"ok": True, "id": str(row.id)})
 
 
@@ -314,11 +323,13 @@ def create_expense():
         is_active=True,
     )
     db.session.add(row)
+    forecast_store.mark_incremental(row)
     try:
         db.session.commit()
     except IntegrityError:
         db.session.rollback()
         return jsonify({"error": "Could not create recurring expense"}), 409
+    forecast_store.apply_schedule_change(user.user_id, None, ScheduleItem.from_row(row))
     return jsonify(_expense_dict(row)), 201
 
 
@@ -331,6 +342,7 @@ def update_expense(expense_id: uuid.UUID):
     row = _expense_for_user(expense_id, user)
     if not row:
         return jsonify({"error": "Recurring expense not found"}), 404
+    before = ScheduleItem.from_row(row)
     body = _parse_json()
     if "label" in body:
         label = body.get("label")
@@ -375,11 +387,13 @@ def update_expense(expense_id: uuid.UUID):
         if not isinstance(active, bool):
             return jsonify({"error": "is_active must be a boolean"}), 400
         row.is_active = active
+    forecast_store.mark_incremental(row)
     try:
         db.session.commit()
     except IntegrityError:
         db.session.rollback()
         return jsonify({"error": "Could not update recurring expense"}), 409
+    forecast_store.apply_schedule_change(user.user_id, before, ScheduleItem.from_row(row))
     return jsonify(_expense_dict(row))
 
 
@@ -392,6 +406,9 @@ def delete_expense(expense_id: uuid.UUID):
     row = _expense_for_user(expense_id, user)
     if not row:
         return jsonify({"error": "Recurring expense not found"}), 404
+    before = ScheduleItem.from_row(row)
     row.is_active = False
+    forecast_store.mark_incremental(row)
     db.session.commit()
+    forecast_store.apply_schedule_change(user.user_id, before, None)
     return jsonify({"ok": True, "id": str(row.id)})
@@ -9,22 +9,14 @@ import hmac
 import time
 import re
 import logging
-import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from functools import wraps
-import psycopg2
-import psycopg2.extras
 import ipaddress
+from backend.utils.pg_pool import get_pg_connection
 
 logger = logging.getLogger(__name__)
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class ReferralSecurityManager:
     """Manages security for referral system and feature access"""
     
@@ -5,13 +5,13 @@ from __future__ import annotations
 
 import json
 import logging
-import os
 import re
 from typing import Any
 
 import anthropic
 import psycopg2
 import psycopg2.extras
+from backend.utils.pg_pool import get_pg_connection
 
 logger = logging.getLogger(__name__)
 
@@ -30,9 +30,7 @@ _table_ready = False
 
 
 def _get_db_connection():
-    conn = psycopg2.connect(os.environ["DATABASE_URL"])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
+    return get_pg_connection()
 
 
 def _ensure_table() -> None:
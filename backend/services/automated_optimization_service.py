@@ -21,11 +21,9 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from enum import Enum
-import psycopg2
-import psycopg2.extras
-import os
 from sqlalchemy import and_, or_, desc, func
 from sqlalchemy.orm import sessionmaker
+from backend.utils.pg_pool import get_pg_connection
 
 from backend.models.database import db
 from backend.models.content_optimization_models import (
@@ -81,17 +79,6 @@ class OptimizationRecommendation:
     risk_level: str
     created_at: datetime
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    db_url = os.environ.get('DATABASE_URL')
-    if not db_url:
-        raise RuntimeError(
-            "DATABASE_URL is required. SQLite is not supported."
-        )
-    conn = psycopg2.connect(db_url)
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class AutomatedOptimizationService:
     """
     Automated content optimization service with real-time monitoring
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Mingus Application - Cache Payload Codecs
+Compact, self-describing serialization for cached payloads
+
+Encoded payloads start with a three-byte header: a zero marker, the serializer ID
+and the compressor ID. Legacy entries (plain JSON, pickle, or gzip of either) never
+start with a zero byte, so they still decode until they expire.
+
+msgpack, zstandard and lz4 are optional; without them the codec falls back to
+JSON and gzip, which are always readable.
+
+msgpack stands in for JSON, so it has to read back what JSON would. Non-string
+map keys (ints, floats, bools, None) come back as JSON's key strings ("1",
+"true", "null"). Otherwise a cache hit could carry int keys while a freshly
+computed value, or the JSON fallback, carries strings.
+"""
+
+import gzip
+import json
+import logging
+import pickle
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+logger = logging.getLogger(__name__)
+
+CODEC_MARKER = 0x00
+
+SERIALIZERS = {"json": 1, "msgpack": 2, "pickle": 3}
+COMPRESSORS = {"none": 0, "gzip": 1, "zstd": 2, "lz4": 3}
+_SERIALIZER_NAMES = {v: k for k, v in SERIALIZERS.items()}
+_COMPRESSOR_NAMES = {v: k for k, v in COMPRESSORS.items()}
+
+DEFAULT_COMPRESS_THRESHOLD = 1024
+ZSTD_LEVEL = 3
+
+
+def _msgpack_default(value: Any) -> str:
+    # Mirror json.dumps(default=str) so dates, Decimals etc. read back identically
+    return str(value)
+
+
+def _json_key(key: Any) -> Any:
+    """The string json.dumps would write for a dict key"""
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, float):
+        return json.dumps(key)
+    return str(key)
+
+
+def _msgpack_map(pairs) -> Dict[Any, Any]:
+    result = dict(pairs)
+    if all(type(key) is str for key in result):
+        return result
+    return {_json_key(key): value for key, value in pairs}
+
+
+def best_serializer(method: str) -> str:
+    """Pick the wire serializer for a configured serialize_method"""
+    if method == "pickle":
+        return "pickle"
+    if method == "json":
+        return "msgpack" if msgpack is not None else "json"
+    raise ValueError(f"Unknown serialize method: {method}")
+
+
+def best_compressor() -> str:
+    """Fastest available compressor with a good ratio"""
+    if zstandard is not None:
+        return "zstd"
+    if lz4_frame is not None:
+        return "lz4"
+    return "gzip"
+
+
+@dataclass
+class CodecStats:
+    """Running size and throughput counters for one codec user (e.g. a strategy)"""
+    encodes: int = 0
+    decodes: int = 0
+    raw_bytes: int = 0
+    stored_bytes: int = 0
+    compressed_payloads: int = 0
+    encode_seconds: float = 0.0
+    decode_seconds: float = 0.0
+    decoded_bytes: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "encodes": self.encodes,
+            "decodes": self.decodes,
+            "raw_bytes": self.raw_bytes,
+            "stored_bytes": self.stored_bytes,
+            "compression_ratio": round(self.raw_bytes / self.stored_bytes, 3) if self.stored_bytes else 0,
+            "compressed_payloads": self.compressed_payloads,
+            "encode_mb_per_s": round(self.raw_bytes / self.encode_seconds / 1e6, 2) if self.encode_seconds else 0,
+            "decode_mb_per_s": round(self.decoded_bytes / self.decode_seconds / 1e6, 2) if self.decode_seconds else 0,
+            "avg_stored_bytes": round(self.stored_bytes / self.encodes, 1) if self.encodes else 0,
+        }
+
+
+class PayloadCodec:
+    """
+    Serialize + optionally compress cache payloads behind a codec header
+
+    Args:
+        serializer: "msgpack", "json" or "pickle"
+        compressor: "zstd", "lz4", "gzip" or "none"
+        compress_threshold: Only compress payloads larger than this many bytes
+        legacy_serializer: How to read header-less entries written before codecs
+    """
+
+    def __init__(self, serializer: str = "json", compressor: str = "none",
+                 compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+                 legacy_serializer: str = "json"):
+        if serializer == "msgpack" and msgpack is None:
+            serializer = "json"
+        if (compressor == "zstd" and zstandard is None) or (compressor == "lz4" and lz4_frame is None):
+            compressor = "gzip"
+        self.serializer = serializer
+        self.compressor = compressor
+        self.compress_threshold = compress_threshold
+        self.legacy_serializer = legacy_serializer
+        self.stats = CodecStats()
+        self._stats_lock = threading.Lock()
+        # zstd contexts are not thread-safe; keep one per thread
+        self._local = threading.local()
+
+    @classmethod
+    def for_config(cls, serialize_method: str, compression: bool) -> "PayloadCodec":
+        """Codec for a CacheConfig-style (serialize_method, compression) pair"""
+        return cls(
+            serializer=best_serializer(serialize_method),
+            compressor=best_compressor() if compression else "none",
+            legacy_serializer=serialize_method,
+        )
+
+    # ------------------------------------------------------------------
+    # Encoding
+    # ------------------------------------------------------------------
+
+    def _serialize(self, data: Any) -> bytes:
+        if self.serializer == "msgpack":
+            return msgpack.packb(data, default=_msgpack_default, use_bin_type=True)
+        if self.serializer == "json":
+            return json.dumps(data, default=str, separators=(",", ":")).encode("utf-8")
+        return pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _compress(self, raw: bytes) -> bytes:
+        if self.compressor == "zstd":
+            compressor = getattr(self._local, "zstd_c", None)
+            if compressor is None:
+                compressor = self._local.zstd_c = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+            return compressor.compress(raw)
+        if self.compressor == "lz4":
+            return lz4_frame.compress(raw)
+        return gzip.compress(raw, compresslevel=6)
+
+    def encode(self, data: Any) -> bytes:
+        started = time.perf_counter()
+        raw = self._serialize(data)
+        compressor = "none"
+        body = raw
+        if self.compressor != "none" and len(raw) > self.compress_threshold:
+            compressed = self._compress(raw)
+            if len(compressed) < len(raw):
+                compressor, body = self.compressor, compressed
+        payload = bytes((CODEC_MARKER, SERIALIZERS[self.serializer], COMPRESSORS[compressor])) + body
+        elapsed = time.perf_counter() - started
+
+        with self._stats_lock:
+            self.stats.encodes += 1
+            self.stats.raw_bytes += len(raw)
+            self.stats.stored_bytes += len(payload)
+            self.stats.encode_seconds += elapsed
+            if compressor != "none":
+                self.stats.compressed_payloads += 1
+        return payload
+
+    # ------------------------------------------------------------------
+    # Decoding
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _deserialize(serializer: str, raw: bytes) -> Any:
+        if serializer == "msgpack":
+            if msgpack is None:
+                raise RuntimeError("msgpack payload found but msgpack is not installed")
+            return msgpack.unpackb(raw, raw=False, strict_map_key=False, object_pairs_hook=_msgpack_map)
+        if serializer == "json":
+            return json.loads(raw)
+        return pickle.loads(raw)
+
+    def _decompress(self, compressor: str, body: bytes) -> bytes:
+        if compressor == "none":
+            return body
+        if compressor == "zstd":
+            if zstandard is None:
+                raise RuntimeError("zstd payload found but zstandard is not installed")
+            decompressor = getattr(self._local, "zstd_d", None)
+            if decompressor is None:
+                decompressor = self._local.zstd_d = zstandard.ZstdDecompressor()
+            return decompressor.decompress(body)
+        if compressor == "lz4":
+            if lz4_frame is None:
+                raise RuntimeError("lz4 payload found but lz4 is not installed")
+            return lz4_frame.decompress(body)
+        return gzip.decompress(body)
+
+    def _decode_legacy(self, payload: bytes) -> Any:
+        try:
+            payload = gzip.decompress(payload)
+        except (gzip.BadGzipFile, OSError):
+            # Data wasn't compressed, use as-is
+            pass
+        return self._deserialize(self.legacy_serializer, payload)
+
+    def decode(self, payload: Any) -> Any:
+        started = time.perf_counter()
+        if isinstance(payload, str):
+            # Text-mode Redis clients can only ever hold legacy JSON
+            data = json.loads(payload)
+        elif payload[:1] == b"\x00" and len(payload) >= 3:
+            serializer = _SERIALIZER_NAMES[payload[1]]
+            compressor = _COMPRESSOR_NAMES[payload[2]]
+            data = self._deserialize(serializer, self._decompress(compressor, payload[3:]))
+        else:
+            data = self._decode_legacy(payload)
+        elapsed = time.perf_counter() - started
+
+        with self._stats_lock:
+            self.stats.decodes += 1
+            self.stats.decoded_bytes += len(payload)
+            self.stats.decode_seconds += elapsed
+        return data
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "serializer": self.serializer,
+            "compressor": self.compressor,
+            "compress_threshold": self.compress_threshold,
+            **self.stats.to_dict(),
+        }
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self.stats = CodecStats()
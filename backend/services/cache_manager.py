@@ -7,14 +7,21 @@ Comprehensive Redis-based caching system for Daily Outlook performance optimizat
 import json
 import logging
 import hashlib
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, date
-from typing import Dict, Any, Optional, List, Union
+from fnmatch import fnmatchcase
+from typing import Dict, Any, Optional, List, Union, Callable, Tuple, Iterable
 from dataclasses import dataclass
 from enum import Enum
 import redis
-from redis.exceptions import RedisError, ConnectionError
-import pickle
-import gzip
+from redis.exceptions import RedisError, ConnectionError, LockError
+
+from backend.services.cache_codecs import PayloadCodec
+from backend.services.cache_tags import CacheTagIndex, unstamp
 from functools import wraps
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
@@ -36,9 +43,75 @@ class CacheConfig:
     """Cache configuration for different data types"""
     ttl_seconds: int
     compression: bool = True
-    serialize_method: str = "json"  # json, pickle
+    serialize_method: str = "json"  # json (msgpack on the wire when available), pickle
     warm_on_startup: bool = False
     invalidation_triggers: List[str] = None
+    l1_ttl_seconds: int = 0  # In-process LRU lifetime; 0 keeps the strategy Redis-only
+    early_refresh_beta: float = 0.0  # Probabilistic early refresh strength; 0 disables
+
+# Sentinel for "not cached" so that a cached None is still a hit
+_MISSING = object()
+
+
+class LocalLRUCache:
+    """
+    Size-bounded in-process LRU with per-entry expiry (the L1 tier).
+    
+    Values are shared between callers and must be treated as read-only.
+    """
+    
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any, frozenset]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Any:
+        """Return the cached value or _MISSING"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value, _ = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any, ttl_seconds: float, tags: Iterable[str] = ()):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value, frozenset(tags))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+    
+    def delete_matching(self, pattern: str) -> int:
+        """Drop entries whose key matches a Redis-style glob pattern"""
+        with self._lock:
+            doomed = [key for key in self._entries if fnmatchcase(key, pattern)]
+            for key in doomed:
+                del self._entries[key]
+            return len(doomed)
+    
+    def delete_tagged(self, tags: Iterable[str]) -> int:
+        """Drop entries carrying any of the given tags"""
+        tags = set(tags)
+        with self._lock:
+            doomed = [key for key, entry in self._entries.items() if entry[2] & tags]
+            for key in doomed:
+                del self._entries[key]
+            return len(doomed)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
 
 class CacheManager:
     """
@@ -46,13 +119,22 @@ class CacheManager:
     
     Features:
     - Multi-tier caching with different TTL strategies
-    - Smart invalidation based on data dependencies
-    - Compression for large data structures
+    - Optional in-process LRU (L1) in front of Redis for hot strategies
+    - Single-flight recompute and probabilistic early refresh (get_or_compute)
+    - Tag-based invalidation (user:<id>, strategy:<name>) in O(1) per tag
+    - Compact msgpack payloads with zstd/lz4 compression for large entries
     - Cache warming and pre-computation
     - Performance metrics and monitoring
     - Graceful fallback when Redis is unavailable
     """
     
+    # Strategies whose identifier is a user ID; their entries carry a user:<id> tag
+    USER_SCOPED_STRATEGIES = frozenset({
+        CacheStrategy.DAILY_OUTLOOK,
+        CacheStrategy.USER_BALANCE_SCORE,
+        CacheStrategy.USER_AGGREGATION
+    })
+    
     # Cache configurations for different data types
     CACHE_CONFIGS = {
         CacheStrategy.DAILY_OUTLOOK: CacheConfig(
@@ -60,21 +142,26 @@ class CacheManager:
             compression=True,
             serialize_method="json",
             warm_on_startup=True,
-            invalidation_triggers=["user_profile_update", "relationship_status_change"]
+            invalidation_triggers=["user_profile_update", "relationship_status_change"],
+            l1_ttl_seconds=60,
+            early_refresh_beta=1.0
         ),
         CacheStrategy.USER_BALANCE_SCORE: CacheConfig(
             ttl_seconds=3600,  # 1 hour
             compression=False,
             serialize_method="json",
             warm_on_startup=False,
-            invalidation_triggers=["financial_data_update", "wellness_data_update", "career_data_update", "relationship_data_update"]
+            invalidation_triggers=["financial_data_update", "wellness_data_update", "career_data_update", "relationship_data_update"],
+            l1_ttl_seconds=30,
+            early_refresh_beta=1.0
         ),
         CacheStrategy.CONTENT_TEMPLATE: CacheConfig(
             ttl_seconds=604800,  # 7 days
             compression=True,
             serialize_method="pickle",
             warm_on_startup=True,
-            invalidation_triggers=["template_update"]
+            invalidation_triggers=["template_update"],
+            l1_ttl_seconds=300
         ),
         CacheStrategy.PEER_COMPARISON: CacheConfig(
             ttl_seconds=1800,  # 30 minutes
@@ -102,7 +189,9 @@ class CacheManager:
     def __init__(self, redis_url: str = "redis://localhost:6379/0", 
                  max_connections: int = 20, 
                  socket_timeout: int = 5,
-                 retry_on_timeout: bool = True):
+                 retry_on_timeout: bool = True,
+                 l1_max_entries: int = 2048,
+                 lock_timeout: float = 10.0):
         """
         Initialize CacheManager with Redis connection
         
@@ -111,11 +200,32 @@ class CacheManager:
             max_connections: Maximum number of connections in pool
             socket_timeout: Socket timeout in seconds
             retry_on_timeout: Whether to retry on timeout
+            l1_max_entries: In-process LRU size bound (0 disables the L1 tier)
+            lock_timeout: Recompute lock lifetime and the longest a caller waits on it
         """
         self.redis_url = redis_url
         self.max_connections = max_connections
         self.socket_timeout = socket_timeout
         self.retry_on_timeout = retry_on_timeout
+        self.lock_timeout = lock_timeout
+        
+        # L1 tier; other processes' copies may lag a Redis write by up to l1_ttl_seconds
+        self.l1_cache = LocalLRUCache(l1_max_entries) if l1_max_entries > 0 else None
+        
+        # Single-flight bookkeeping: key -> [lock, waiters]
+        self._inflight: Dict[str, list] = {}
+        self._inflight_guard = threading.Lock()
+        
+        self._tag_index: Optional[CacheTagIndex] = None
+        
+        # One codec per strategy so size/throughput stats are reported per strategy
+        self.codecs: Dict[CacheStrategy, PayloadCodec] = {
+            strategy: PayloadCodec.for_config(config.serialize_method, config.compression)
+            for strategy, config in self.CACHE_CONFIGS.items()
+        }
+        
+        # Smoothed recompute time per strategy, drives early refresh
+        self._recompute_seconds: Dict[CacheStrategy, float] = {}
         
         # Initialize Redis connection pool
         self.redis_pool = None
@@ -123,13 +233,7 @@ class CacheManager:
         self._initialize_redis()
         
         # Performance metrics
-        self.metrics = {
-            'hits': 0,
-            'misses': 0,
-            'errors': 0,
-            'compression_savings': 0,
-            'cache_size_bytes': 0
-        }
+        self.metrics = self._empty_metrics()
         
         # Thread pool for async operations
         self.executor = ThreadPoolExecutor(max_workers=4)
@@ -197,22 +301,13 @@ class CacheManager:
         Returns:
             Serialized data as bytes
         """
-        config = self.CACHE_CONFIGS[strategy]
-        
-        if config.serialize_method == "json":
-            serialized = json.dumps(data, default=str).encode('utf-8')
-        elif config.serialize_method == "pickle":
-            serialized = pickle.dumps(data)
-        else:
-            raise ValueError(f"Unknown serialize method: {config.serialize_method}")
-        
-        # Apply compression if configured
-        if config.compression and len(serialized) > 1024:  # Only compress if > 1KB
-            compressed = gzip.compress(serialized)
-            if len(compressed) < len(serialized):
-                self.metrics['compression_savings'] += len(serialized) - len(compressed)
-                return compressed
-        
+        codec = self.codecs[strategy]
+        raw_before = codec.stats.raw_bytes
+        stored_before = codec.stats.stored_bytes
+        serialized = codec.encode(data)
+        saved = (codec.stats.raw_bytes - raw_before) - (codec.stats.stored_bytes - stored_before)
+        if saved > 0:
+            self.metrics['compression_savings'] += saved
         return serialized
     
     def _deserialize_data(self, data: bytes, strategy: CacheStrategy) -> Any:
@@ -220,33 +315,18 @@ class CacheManager:
         Deserialize data based on strategy configuration
         
         Args:
-            data: Serialized data
+            data: Serialized data (codec-tagged, or a legacy JSON/pickle/gzip blob)
             strategy: Cache strategy
             
         Returns:
             Deserialized data
         """
-        config = self.CACHE_CONFIGS[strategy]
-        
-        # Decompress if needed
-        try:
-            decompressed = gzip.decompress(data)
-            data = decompressed
-        except (gzip.BadGzipFile, OSError):
-            # Data wasn't compressed, use as-is
-            pass
-        
-        if config.serialize_method == "json":
-            return json.loads(data.decode('utf-8'))
-        elif config.serialize_method == "pickle":
-            return pickle.loads(data)
-        else:
-            raise ValueError(f"Unknown serialize method: {config.serialize_method}")
+        return self.codecs[strategy].decode(data)
     
     def get(self, strategy: CacheStrategy, identifier: str, 
             additional_params: Dict[str, Any] = None) -> Optional[Any]:
         """
-        Get data from cache
+        Get data from cache (L1 first, then Redis)
         
         Args:
             strategy: Cache strategy type
@@ -256,29 +336,272 @@ class CacheManager:
         Returns:
             Cached data or None if not found
         """
+        key = self._generate_cache_key(strategy, identifier, additional_params)
+        config = self.CACHE_CONFIGS[strategy]
+        
+        data = self._l1_get(key, config)
+        if data is not _MISSING:
+            self.metrics['hits'] += 1
+            return data
+        
         if not self.redis_client:
             return None
         
-        try:
-            key = self._generate_cache_key(strategy, identifier, additional_params)
-            cached_data = self.redis_client.get(key)
-            
-            if cached_data is None:
-                self.metrics['misses'] += 1
-                return None
+        tags = self._entry_tags(strategy, identifier)
+        data, _ = self._redis_get(key, strategy, tags)
+        if data is _MISSING:
+            self.metrics['misses'] += 1
+            return None
+        
+        self.metrics['hits'] += 1
+        self._l1_set(key, data, config, tags)
+        return data
+    
+    def get_or_compute(self, strategy: CacheStrategy, identifier: str,
+                       compute_function: Callable[[], Any],
+                       additional_params: Dict[str, Any] = None,
+                       custom_ttl: Optional[int] = None,
+                       tags: Optional[List[str]] = None) -> Any:
+        """
+        Return the cached value, computing and caching it on a miss.
+        
+        Concurrent misses for the same key collapse into one recompute: callers in
+        this process share a lock, and other processes wait on a short Redis lock
+        for the holder's result. Strategies with early_refresh_beta > 0 also
+        recompute a hit ahead of expiry with a probability that rises as the TTL
+        runs out (scaled by how long recomputes take), so hot keys refresh in the
+        background of one request instead of expiring under load.
+        
+        Args:
+            strategy: Cache strategy type
+            identifier: Primary identifier
+            compute_function: Zero-argument callable producing the value
+            additional_params: Additional parameters for key generation
+            custom_ttl: Custom TTL override
+            tags: Extra invalidation tags for a freshly computed entry
             
-            data = self._deserialize_data(cached_data, strategy)
+        Returns:
+            Cached or freshly computed value
+        """
+        key = self._generate_cache_key(strategy, identifier, additional_params)
+        config = self.CACHE_CONFIGS[strategy]
+        
+        data = self._l1_get(key, config)
+        if data is not _MISSING:
             self.metrics['hits'] += 1
             return data
+        
+        if self.redis_client:
+            entry_tags = self._entry_tags(strategy, identifier)
+            data, ttl_ms = self._redis_get(key, strategy, entry_tags, with_ttl=True)
+            if data is not _MISSING:
+                self.metrics['hits'] += 1
+                if not self._should_refresh_early(strategy, config, ttl_ms):
+                    self._l1_set(key, data, config, entry_tags)
+                    return data
+                
+                # Only the lock winner refreshes; everyone else keeps serving the live value
+                lock = self._acquire_recompute_lock(key, blocking=False)
+                if lock is None:
+                    return data
+                try:
+                    self.metrics['early_refreshes'] += 1
+                    return self._compute_and_store(strategy, identifier, compute_function,
+                                                   additional_params, custom_ttl, tags)
+                finally:
+                    self._release_recompute_lock(lock)
+        
+        self.metrics['misses'] += 1
+        data, _ = self._single_flight(strategy, identifier, key, compute_function,
+                                      additional_params, custom_ttl, tags)
+        return data
+    
+    # ------------------------------------------------------------------
+    # Tier helpers
+    # ------------------------------------------------------------------
+    
+    def _l1_get(self, key: str, config: CacheConfig) -> Any:
+        if self.l1_cache is None or not config.l1_ttl_seconds:
+            return _MISSING
+        started = time.perf_counter()
+        data = self.l1_cache.get(key)
+        self.metrics['l1_latency_seconds'] += time.perf_counter() - started
+        if data is _MISSING:
+            self.metrics['l1_misses'] += 1
+        else:
+            self.metrics['l1_hits'] += 1
+        return data
+    
+    def _l1_set(self, key: str, data: Any, config: CacheConfig, tags: Iterable[str] = ()):
+        if self.l1_cache is not None and config.l1_ttl_seconds:
+            self.l1_cache.set(key, data, config.l1_ttl_seconds, tags)
+    
+    def _redis_get(self, key: str, strategy: CacheStrategy, tags: List[str],
+                   with_ttl: bool = False) -> Tuple[Any, Optional[int]]:
+        """
+        Fetch, tag-check and decode one key in a single round trip.
+        
+        Returns (data or _MISSING, remaining TTL in ms when with_ttl).
+        """
+        started = time.perf_counter()
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.get(key)
+            if with_ttl:
+                pipe.pttl(key)
+            pipe.mget([self.tag_index.tag_key(tag) for tag in tags])
+            replies = pipe.execute()
+            cached_data = replies[0]
+            ttl_ms = replies[1] if with_ttl else None
+            known_versions = {tag: int(value or 0) for tag, value in zip(tags, replies[-1])}
             
+            stamped = None
+            if cached_data is not None:
+                stamped, cached_data = unstamp(cached_data)
+                if not self.tag_index.is_current(stamped, known_versions):
+                    self.metrics['tag_invalidated'] += 1
+                    cached_data = None
         except Exception as e:
             logger.error(f"Cache get error for key {key}: {e}")
             self.metrics['errors'] += 1
+            return _MISSING, None
+        finally:
+            self.metrics['redis_latency_seconds'] += time.perf_counter() - started
+        
+        if cached_data is None:
+            self.metrics['redis_misses'] += 1
+            return _MISSING, None
+        
+        try:
+            data = self._deserialize_data(cached_data, strategy)
+        except Exception as e:
+            logger.error(f"Cache decode error for key {key}: {e}")
+            self.metrics['errors'] += 1
+            return _MISSING, None
+        self.metrics['redis_hits'] += 1
+        return data, ttl_ms
+    
+    # ------------------------------------------------------------------
+    # Recompute coordination
+    # ------------------------------------------------------------------
+    
+    def _should_refresh_early(self, strategy: CacheStrategy, config: CacheConfig,
+                              ttl_ms: Optional[int]) -> bool:
+        """XFetch: refresh when -delta * beta * ln(U) reaches the remaining TTL"""
+        if config.early_refresh_beta <= 0 or ttl_ms is None or ttl_ms < 0:
+            return False
+        delta = self._recompute_seconds.get(strategy)
+        if not delta:
+            return False
+        gap = -delta * config.early_refresh_beta * math.log(1.0 - random.random())
+        return gap >= ttl_ms / 1000.0
+    
+    def _acquire_recompute_lock(self, key: str, blocking: bool):
+        """Cross-process recompute lock; None when another worker holds it"""
+        if not self.redis_client:
+            return None
+        try:
+            lock = self.redis_client.lock(f"lock:{key}", timeout=self.lock_timeout,
+                                          blocking=blocking,
+                                          blocking_timeout=self.lock_timeout if blocking else None)
+            return lock if lock.acquire() else None
+        except RedisError as e:
+            logger.warning(f"Recompute lock unavailable for key {key}: {e}")
             return None
     
+    def _release_recompute_lock(self, lock):
+        try:
+            lock.release()
+        except (LockError, RedisError):
+            # Expired while we computed; the value was still written
+            pass
+    
+    def _single_flight(self, strategy: CacheStrategy, identifier: str, key: str,
+                       compute_function: Callable[[], Any],
+                       additional_params: Dict[str, Any] = None,
+                       custom_ttl: Optional[int] = None,
+                       tags: Optional[List[str]] = None,
+                       force: bool = False) -> Tuple[Any, bool]:
+        """
+        Compute a key at most once at a time; returns (value, stored_in_redis).
+        
+        Unless forced, a value written by whoever held the lock before us is reused.
+        """
+        with self._inflight_guard:
+            slot = self._inflight.setdefault(key, [threading.Lock(), 0])
+            slot[1] += 1
+        try:
+            with slot[0]:
+                config = self.CACHE_CONFIGS[strategy]
+                entry_tags = self._entry_tags(strategy, identifier, tags)
+                if not force:
+                    data = self._l1_get(key, config)
+                    if data is not _MISSING:
+                        return data, True
+                
+                if not self.redis_client:
+                    data = self._timed_compute(strategy, compute_function)
+                    self._l1_set(key, data, config, entry_tags)
+                    return data, False
+                
+                if not force:
+                    data, _ = self._redis_get(key, strategy, entry_tags)
+                    if data is not _MISSING:
+                        self._l1_set(key, data, config, entry_tags)
+                        return data, True
+                
+                lock = self._acquire_recompute_lock(key, blocking=False)
+                if lock is None:
+                    # Another worker is computing this key; wait for its result
+                    self.metrics['lock_waits'] += 1
+                    lock = self._acquire_recompute_lock(key, blocking=True)
+                    if lock is not None:
+                        data, _ = self._redis_get(key, strategy, entry_tags)
+                        if data is not _MISSING:
+                            self._release_recompute_lock(lock)
+                            self._l1_set(key, data, config, entry_tags)
+                            return data, True
+                    # Holder failed or is too slow: compute it ourselves
+                try:
+                    versions = self._current_tag_versions(entry_tags)
+                    data = self._timed_compute(strategy, compute_function)
+                    stored = self.set(strategy, identifier, data, additional_params, custom_ttl,
+                                      tags=tags, tag_versions=versions)
+                    return data, stored
+                finally:
+                    if lock is not None:
+                        self._release_recompute_lock(lock)
+        finally:
+            with self._inflight_guard:
+                slot[1] -= 1
+                if slot[1] == 0:
+                    self._inflight.pop(key, None)
+    
+    def _compute_and_store(self, strategy: CacheStrategy, identifier: str,
+                           compute_function: Callable[[], Any],
+                           additional_params: Dict[str, Any] = None,
+                           custom_ttl: Optional[int] = None,
+                           tags: Optional[List[str]] = None) -> Any:
+        versions = self._current_tag_versions(self._entry_tags(strategy, identifier, tags))
+        data = self._timed_compute(strategy, compute_function)
+        self.set(strategy, identifier, data, additional_params, custom_ttl,
+                 tags=tags, tag_versions=versions)
+        return data
+    
+    def _timed_compute(self, strategy: CacheStrategy, compute_function: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        data = compute_function()
+        elapsed = time.perf_counter() - started
+        previous = self._recompute_seconds.get(strategy)
+        self._recompute_seconds[strategy] = elapsed if previous is None else 0.8 * previous + 0.2 * elapsed
+        self.metrics['recomputes'] += 1
+        return data
+    
     def set(self, strategy: CacheStrategy, identifier: str, data: Any,
             additional_params: Dict[str, Any] = None, 
-            custom_ttl: Optional[int] = None) -> bool:
+            custom_ttl: Optional[int] = None,
+            tags: Optional[List[str]] = None,
+            tag_versions: Optional[Dict[str, int]] = None) -> bool:
         """
         Set data in cache
         
@@ -288,24 +611,33 @@ class CacheManager:
             data: Data to cache
             additional_params: Additional parameters for key generation
             custom_ttl: Custom TTL override
+            tags: Extra invalidation tags (strategy and user tags are implied)
+            tag_versions: Tag generations read before data was computed, so an
+                invalidation that lands mid-compute leaves this write stale
             
         Returns:
             True if successful, False otherwise
         """
+        key = self._generate_cache_key(strategy, identifier, additional_params)
         if not self.redis_client:
             return False
         
         try:
-            key = self._generate_cache_key(strategy, identifier, additional_params)
             serialized_data = self._serialize_data(data, strategy)
             
             config = self.CACHE_CONFIGS[strategy]
             ttl = custom_ttl if custom_ttl is not None else config.ttl_seconds
             
-            self.redis_client.setex(key, ttl, serialized_data)
+            entry_tags = self._entry_tags(strategy, identifier, tags)
+            stamped_data = self.tag_index.stamp(serialized_data, entry_tags, tag_versions)
+            self.redis_client.setex(key, ttl, stamped_data)
             
             # Update cache size metric
-            self.metrics['cache_size_bytes'] += len(serialized_data)
+            self.metrics['cache_size_bytes'] += len(stamped_data)
+            
+            # L1 holds the decoded form so hits match what Redis readers see
+            if self.l1_cache is not None and config.l1_ttl_seconds:
+                self._l1_set(key, self._deserialize_data(serialized_data, strategy), config, entry_tags)
             
             return True
             
@@ -327,11 +659,14 @@ class CacheManager:
         Returns:
             True if successful, False otherwise
         """
+        key = self._generate_cache_key(strategy, identifier, additional_params)
+        if self.l1_cache is not None:
+            self.l1_cache.delete(key)
+        
         if not self.redis_client:
             return False
         
         try:
-            key = self._generate_cache_key(strategy, identifier, additional_params)
             result = self.redis_client.delete(key)
             return result > 0
             
@@ -340,24 +675,95 @@ class CacheManager:
             self.metrics['errors'] += 1
             return False
     
+    # ------------------------------------------------------------------
+    # Tags
+    # ------------------------------------------------------------------
+    
+    @property
+    def tag_index(self) -> CacheTagIndex:
+        """Tag generations live in the same Redis as the entries they guard"""
+        if self._tag_index is None or self._tag_index.redis is not self.redis_client:
+            self._tag_index = CacheTagIndex(self.redis_client)
+        return self._tag_index
+    
+    def _entry_tags(self, strategy: CacheStrategy, identifier: str,
+                    extra_tags: Optional[Iterable[str]] = None) -> List[str]:
+        tags = [f"strategy:{strategy.value}"]
+        if strategy in self.USER_SCOPED_STRATEGIES and str(identifier).isdigit():
+            tags.append(f"user:{identifier}")
+        if extra_tags:
+            tags.extend(extra_tags)
+        return tags
+    
+    def _current_tag_versions(self, tags: List[str]) -> Optional[Dict[str, int]]:
+        if not self.redis_client:
+            return None
+        try:
+            return self.tag_index.current_versions(tags)
+        except Exception as e:
+            logger.warning(f"Could not read cache tag versions {tags}: {e}")
+            return None
+    
+    def invalidate_tags(self, *tags: str) -> int:
+        """
+        Invalidate every entry carrying any of the given tags
+        
+        Each tag costs one INCR regardless of how many entries carry it; orphaned
+        entries miss on their next read and expire with their TTL.
+        
+        Args:
+            *tags: Tags such as "user:123" or "strategy:daily_outlook"
+            
+        Returns:
+            Number of tags invalidated
+        """
+        if self.l1_cache is not None:
+            self.l1_cache.delete_tagged(tags)
+        
+        if not self.redis_client:
+            return 0
+        
+        try:
+            return self.tag_index.invalidate(*tags)
+        except Exception as e:
+            logger.error(f"Cache tag invalidation error for tags {tags}: {e}")
+            self.metrics['errors'] += 1
+            return 0
+    
+    def invalidate_strategy(self, strategy: CacheStrategy) -> int:
+        """Invalidate every entry of one strategy"""
+        return self.invalidate_tags(f"strategy:{strategy.value}")
+    
     def invalidate_by_pattern(self, pattern: str) -> int:
         """
         Invalidate cache entries matching a pattern
         
+        Walks the keyspace with SCAN; prefer invalidate_tags for anything on a
+        request or batch path.
+        
         Args:
             pattern: Redis key pattern (supports wildcards)
             
         Returns:
             Number of keys deleted
         """
+        if self.l1_cache is not None:
+            self.l1_cache.delete_matching(pattern)
+        
         if not self.redis_client:
             return 0
         
         try:
-            keys = self.redis_client.keys(pattern)
-            if keys:
-                return self.redis_client.delete(*keys)
-            return 0
+            deleted = 0
+            batch = []
+            for key in self.redis_client.scan_iter(match=pattern, count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    deleted += self.redis_client.delete(*batch)
+                    batch = []
+            if batch:
+                deleted += self.redis_client.delete(*batch)
+            return deleted
             
         except Exception as e:
             logger.error(f"Cache pattern invalidation error for pattern {pattern}: {e}")
@@ -371,26 +777,19 @@ class CacheManager:
         Args:
             user_id: User ID to invalidate
             trigger: Invalidation trigger (optional)
+            
+        Returns:
+            Number of tags invalidated
         """
-        patterns = [
-            f"daily_outlook:{user_id}:*",
-            f"user_balance_score:{user_id}:*",
-            f"user_aggregation:{user_id}:*",
-            f"peer_comparison:*:{user_id}:*"
-        ]
-        
-        total_deleted = 0
-        for pattern in patterns:
-            deleted = self.invalidate_by_pattern(pattern)
-            total_deleted += deleted
+        invalidated = self.invalidate_tags(f"user:{user_id}")
         
-        logger.info(f"Invalidated {total_deleted} cache entries for user {user_id} (trigger: {trigger})")
-        return total_deleted
+        logger.info(f"Invalidated cache tag user:{user_id} (trigger: {trigger})")
+        return invalidated
     
     def warm_cache(self, strategy: CacheStrategy, warm_function: callable, 
                    identifiers: List[str], **kwargs) -> Dict[str, bool]:
         """
-        Warm cache with pre-computed data
+        Warm cache with pre-computed data (always recomputes)
         
         Args:
             strategy: Cache strategy type
@@ -405,11 +804,14 @@ class CacheManager:
         
         for identifier in identifiers:
             try:
-                # Generate data using warm function
-                data = warm_function(identifier, **kwargs)
-                
-                # Cache the data
-                success = self.set(strategy, identifier, data)
+                # Recompute under the key's lock so concurrent warmers and readers
+                # don't generate the same entry twice
+                key = self._generate_cache_key(strategy, identifier)
+                _, success = self._single_flight(
+                    strategy, identifier, key,
+                    lambda: warm_function(identifier, **kwargs),
+                    force=True
+                )
                 results[identifier] = success
                 
             except Exception as e:
@@ -435,17 +837,57 @@ class CacheManager:
             'hit_rate_percent': round(hit_rate, 2),
             'compression_savings_bytes': self.metrics['compression_savings'],
             'cache_size_bytes': self.metrics['cache_size_bytes'],
-            'redis_connected': self.redis_client is not None
+            'redis_connected': self.redis_client is not None,
+            'tiers': {
+                'l1': self._tier_metrics('l1', entries=len(self.l1_cache) if self.l1_cache is not None else 0),
+                'redis': self._tier_metrics('redis')
+            },
+            'recomputes': self.metrics['recomputes'],
+            'early_refreshes': self.metrics['early_refreshes'],
+            'lock_waits': self.metrics['lock_waits'],
+            'tag_invalidated_reads': self.metrics['tag_invalidated'],
+            'codecs': {
+                strategy.value: codec.describe() for strategy, codec in self.codecs.items()
+            }
+        }
+    
+    def _tier_metrics(self, tier: str, **extra) -> Dict[str, Any]:
+        hits = self.metrics[f'{tier}_hits']
+        misses = self.metrics[f'{tier}_misses']
+        lookups = hits + misses
+        latency = self.metrics[f'{tier}_latency_seconds']
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate_percent': round(hits / lookups * 100, 2) if lookups else 0,
+            'avg_latency_ms': round(latency / lookups * 1000, 4) if lookups else 0,
+            **extra
         }
     
     def clear_metrics(self):
         """Reset performance metrics"""
-        self.metrics = {
+        self.metrics = self._empty_metrics()
+        for codec in self.codecs.values():
+            codec.reset_stats()
+    
+    @staticmethod
+    def _empty_metrics() -> Dict[str, Any]:
+        return {
             'hits': 0,
             'misses': 0,
             'errors': 0,
             'compression_savings': 0,
-            'cache_size_bytes': 0
+            'cache_size_bytes': 0,
+            'l1_hits': 0,
+            'l1_misses': 0,
+            'l1_latency_seconds': 0.0,
+            'redis_hits': 0,
+            'redis_misses': 0,
+            'redis_latency_seconds': 0.0,
+            'recomputes': 0,
+            'early_refreshes': 0,
+            'lock_waits': 0,
+            'tag_invalidated': 0
         }
     
     def health_check(self) -> Dict[str, Any]:
@@ -520,23 +962,19 @@ def cached(strategy: CacheStrategy, ttl_override: Optional[int] = None):
     def decorator(func):
         @wraps(func)
         def wrapper(self, *args, **kwargs):
-            # Generate cache key from function name and arguments
-            cache_key = f"{func.__name__}:{hash(str(args) + str(sorted(kwargs.items())))}"
-            
-            # Try to get from cache first
             cache_manager = getattr(self, 'cache_manager', None)
-            if cache_manager:
-                cached_result = cache_manager.get(strategy, cache_key)
-                if cached_result is not None:
-                    return cached_result
+            if not cache_manager:
+                return func(self, *args, **kwargs)
             
-            # Execute function and cache result
-            result = func(self, *args, **kwargs)
+            # Stable across processes (built-in hash() of str is salted per interpreter)
+            arg_digest = hashlib.md5(repr((args, sorted(kwargs.items()))).encode()).hexdigest()
+            cache_key = f"{func.__name__}:{arg_digest}"
             
-            if cache_manager:
-                cache_manager.set(strategy, cache_key, result, custom_ttl=ttl_override)
-            
-            return result
+            return cache_manager.get_or_compute(
+                strategy, cache_key,
+                lambda: func(self, *args, **kwargs),
+                custom_ttl=ttl_override
+            )
         return wrapper
     return decorator
 
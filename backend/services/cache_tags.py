@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Mingus Application - Cache Tag Index
+Generation-counter tags for O(1) cache invalidation
+
+Every tag ("user:123", "strategy:daily_outlook") owns an integer generation in
+Redis. Entries are written with the current generations of their tags stamped in a
+short header, and a read only accepts the entry if those generations still match.
+Invalidating a tag is a single INCR no matter how many entries carry it; entries
+it orphans are never scanned or deleted, they just miss and age out via their TTL.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+TAG_KEY_PREFIX = "cache_tag:"
+
+# Header layout: "tg1:" + "tag=generation,tag=generation" + "|" + payload
+_HEADER = "tg1:"
+_HEADER_END = "|"
+_RESERVED = set("=,|")
+
+Payload = Union[bytes, str]
+
+
+def _validate_tag(tag: str) -> str:
+    if not tag or _RESERVED & set(tag):
+        raise ValueError(f"Invalid cache tag {tag!r}: must be non-empty without '=', ',' or '|'")
+    return tag
+
+
+def unstamp(raw: Payload) -> Tuple[Optional[Dict[str, int]], Payload]:
+    """Split a stored value into (stamped generations or None if untagged, payload)"""
+    is_bytes = isinstance(raw, bytes)
+    header = _HEADER.encode() if is_bytes else _HEADER
+    if not raw.startswith(header):
+        return None, raw
+    end = raw.find(_HEADER_END.encode() if is_bytes else _HEADER_END, len(header))
+    if end < 0:
+        return None, raw
+    stamp = raw[len(header):end]
+    if is_bytes:
+        stamp = stamp.decode("utf-8")
+    versions = {}
+    for pair in filter(None, stamp.split(",")):
+        tag, _, generation = pair.rpartition("=")
+        versions[tag] = int(generation)
+    return versions, raw[end + 1:]
+
+
+class CacheTagIndex:
+    """
+    Tag generations stored in Redis next to the cache entries they guard
+
+    Works with clients created with or without decode_responses; payloads keep
+    the type they were given (bytes or str).
+    """
+
+    def __init__(self, redis_client, prefix: str = TAG_KEY_PREFIX):
+        self.redis = redis_client
+        self.prefix = prefix
+
+    def tag_key(self, tag: str) -> str:
+        return f"{self.prefix}{tag}"
+
+    def current_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        """Current generation per tag (0 for tags never invalidated)"""
+        tags = sorted(set(tags))
+        if not tags:
+            return {}
+        values = self.redis.mget([self.tag_key(tag) for tag in tags])
+        return {tag: int(value or 0) for tag, value in zip(tags, values)}
+
+    def invalidate(self, *tags: str) -> int:
+        """Bump each tag's generation; returns the number of tags invalidated"""
+        tags = sorted({_validate_tag(tag) for tag in tags})
+        if not tags:
+            return 0
+        # Generation keys never expire: an expired counter restarting from 0 could
+        # line up with an old stamp and revive a stale entry.
+        pipe = self.redis.pipeline(transaction=False)
+        for tag in tags:
+            pipe.incr(self.tag_key(tag))
+        pipe.execute()
+        return len(tags)
+
+    def stamp(self, payload: Payload, tags: Iterable[str],
+              versions: Optional[Dict[str, int]] = None) -> Payload:
+        """
+        Prefix payload with the generations of its tags.
+
+        Pass versions read *before* computing the value so an invalidation that
+        lands mid-compute makes the write stale instead of silently current.
+        """
+        tags = sorted({_validate_tag(tag) for tag in tags})
+        if not tags:
+            return payload
+        if versions is None:
+            versions = self.current_versions(tags)
+        header = _HEADER + ",".join(f"{tag}={versions.get(tag, 0)}" for tag in tags) + _HEADER_END
+        if isinstance(payload, bytes):
+            return header.encode("utf-8") + payload
+        return header + payload
+
+    def is_current(self, stamped: Optional[Dict[str, int]],
+                   known_versions: Optional[Dict[str, int]] = None) -> bool:
+        """Whether every stamped generation still matches (untagged values always do)"""
+        if not stamped:
+            return True
+        known = dict(known_versions or {})
+        missing = [tag for tag in stamped if tag not in known]
+        if missing:
+            known.update(self.current_versions(missing))
+        return all(known[tag] == generation for tag, generation in stamped.items())
+
+    def fetch(self, key: str, tags: Iterable[str] = ()) -> Optional[Payload]:
+        """
+        GET key and the generations of its expected tags in one round trip.
+
+        Returns the payload with its header removed, or None when the key is
+        missing or any of its tags has been invalidated since it was written.
+        """
+        tags: List[str] = sorted(set(tags))
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.get(key)
+        if tags:
+            pipe.mget([self.tag_key(tag) for tag in tags])
+        results = pipe.execute()
+        raw = results[0]
+        if raw is None:
+            return None
+        known = {tag: int(value or 0) for tag, value in zip(tags, results[1])} if tags else {}
+        stamped, payload = unstamp(raw)
+        if not self.is_current(stamped, known):
+            return None
+        return payload
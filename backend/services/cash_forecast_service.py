@@ -23,6 +23,11 @@ try:
 except ImportError:  # pragma: no cover - optional in minimal dev envs
     psycopg2 = None  # type: ignore[misc, assignment]
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - batch path falls back to per-user forecasts
+    np = None  # type: ignore[assignment]
+
 from backend.models.database import db
 from backend.models.financial_setup import RecurringExpense
 from backend.models.transaction_schedule import IncomeStream, ScheduledExpense
@@ -30,10 +35,13 @@ from backend.models.user_models import User
 from backend.models.vehicle_models import Vehicle
 from backend.models.vibe_checkups import VibeCheckupsLead
 from backend.models.vibe_tracker import VibePersonAssessment, VibeTrackedPerson
+from backend.utils.pg_pool import get_pool
 
 logger = logging.getLogger(__name__)
 
 Q2 = Decimal("0.01")
+# Users per vectorized block in build_forecasts_for_users (bounds the cents matrix size).
+FORECAST_BATCH_BLOCK_SIZE = 500
 STATUS_RANK = {"danger": 3, "warning": 2, "healthy": 1}
 
 
@@ -59,9 +67,8 @@ def _get_pg_conn():
     db_url = os.environ.get("DATABASE_URL") or os.environ.get("TEST_DATABASE_URL")
     if not db_url:
         return None
-    conn = psycopg2.connect(db_url)
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
+    # Pooled like get_pg_connection(), but honouring the TEST_DATABASE_URL fallback
+    return get_pool(db_url).getconn(cursor_factory=psycopg2.extras.RealDictCursor)
 
 
 @dataclass(frozen=True)
@@ -103,14 +110,7 @@ def _load_profile_balance_and_dates(
         bal = row.get("current_balance")
         current = Decimal("0") if bal is None else _d(bal)
         balance_set = bal is not None
-        raw = row.get("important_dates")
-        if raw is None or raw == "":
-            return current, {}, balance_set
-        if isinstance(raw, dict):
-            dates_obj = raw
-        else:
-            dates_obj = json.loads(raw)
-        return current, dates_obj if isinstance(dates_obj, dict) else {}, balance_set
+        return current, _parse_important_dates(row.get("important_dates")), balance_set
     except Exception as e:
         logger.warning("cash_forecast profile load failed for %s: %s", email, e)
         return Decimal("0"), {}, False
@@ -118,6 +118,54 @@ def _load_profile_balance_and_dates(
         conn.close()
 
 
+def _parse_important_dates(raw: Any) -> dict[str, Any]:
+    if raw is None or raw == "":
+        return {}
+    dates_obj = raw if isinstance(raw, dict) else json.loads(raw)
+    return dates_obj if isinstance(dates_obj, dict) else {}
+
+
+def _load_profiles_for_emails(
+    emails: list[str],
+) -> dict[str, tuple[Decimal, dict[str, Any], bool]]:
+    """Batch variant of ``_load_profile_balance_and_dates``: one query for many emails."""
+    emails = sorted({(e or "").strip().lower() for e in emails if e})
+    if not emails:
+        return {}
+    conn = _get_pg_conn()
+    if not conn:
+        return {}
+    out: dict[str, tuple[Decimal, dict[str, Any], bool]] = {}
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT email, current_balance, important_dates
+            FROM user_profiles
+            WHERE email = ANY(%s)
+            """,
+            (emails,),
+        )
+        for row in cursor.fetchall():
+            email = (row.get("email") or "").strip().lower()
+            bal = row.get("current_balance")
+            current = Decimal("0") if bal is None else _d(bal)
+            try:
+                dates_obj = _parse_important_dates(row.get("important_dates"))
+            except (TypeError, ValueError) as e:
+                # Same outcome as the single-user loader, which bails out entirely.
+                logger.warning("cash_forecast profile load failed for %s: %s", email, e)
+                out[email] = (Decimal("0"), {}, False)
+                continue
+            out[email] = (current, dates_obj, bal is not None)
+    except Exception as e:
+        logger.warning("cash_forecast batch profile load failed (%d emails): %s", len(emails), e)
+        return {}
+    finally:
+        conn.close()
+    return out
+
+
 def _add_months(d: date, months: int) -> date:
     m0 = d.month - 1 + months
     y = d.year + m0 // 12
@@ -531,6 +579,30 @@ def _monthly_from_checkup_lead(lead: VibeCheckupsLead) -> Decimal:
     return _money(_d(Decimal(ann) / Decimal(12)))
 
 
+def _relationship_row(
+    person: VibeTrackedPerson,
+    lead: VibeCheckupsLead | None,
+    important_dates: dict[str, Any],
+) -> dict[str, Any]:
+    """Monthly cost row for one tracked person given its latest checkup lead (if any)."""
+    monthly = Decimal("0")
+    if person.estimated_monthly_cost is not None and person.estimated_monthly_cost > 0:
+        monthly = _money(Decimal(str(person.estimated_monthly_cost)))
+    else:
+        if lead is not None:
+            monthly = _monthly_from_checkup_lead(lead)
+        if monthly <= 0:
+            monthly = _linked_thirty_day_cost_total(person.nickname, important_dates)
+    monthly = _money(monthly)
+    return {
+        "nickname": person.nickname,
+        "monthly_cost": _money_float(monthly),
+        "monthly_dec": monthly,
+        "card_type": (person.card_type or "person").strip() or "person",
+        "emoji": (person.emoji or "").strip() or None,
+    }
+
+
 def _relationship_cost_rows_for_user(
     user_id: int, important_dates: dict[str, Any]
 ) -> list[dict[str, Any]]:
@@ -545,11 +617,8 @@ def _relationship_cost_rows_for_user(
     )
     rows: list[dict[str, Any]] = []
     for person in people:
-        monthly = Decimal("0")
-
-        if person.estimated_monthly_cost is not None and person.estimated_monthly_cost > 0:
-            monthly = _money(Decimal(str(person.estimated_monthly_cost)))
-        else:
+        lead = None
+        if not (person.estimated_monthly_cost is not None and person.estimated_monthly_cost > 0):
             assn = (
                 VibePersonAssessment.query.filter(
                     VibePersonAssessment.tracked_person_id == person.id,
@@ -560,22 +629,34 @@ def _relationship_cost_rows_for_user(
             )
             if assn is not None and assn.lead_id is not None:
                 lead = db.session.get(VibeCheckupsLead, assn.lead_id)
-                if lead is not None:
-                    monthly = _monthly_from_checkup_lead(lead)
-            if monthly <= 0:
-                monthly = _linked_thirty_day_cost_total(person.nickname, important_dates)
-        monthly = _money(monthly)
-        rows.append(
+        rows.append(_relationship_row(person, lead, important_dates))
+    rows.sort(key=lambda r: r["monthly_dec"], reverse=True)
+    return rows
+
+
+def _relationship_cost_breakdown(
+    rel_rows: list[dict[str, Any]], sum_out_all_days: Decimal, days: int
+) -> list[dict[str, Any]]:
+    """Attach each person's share of the forecast's monthly expense run rate."""
+    avg_daily_out = _money(sum_out_all_days / Decimal(days)) if days else Decimal("0")
+    monthly_expense_run_rate = _money(avg_daily_out * Decimal("30"))
+
+    breakdown: list[dict[str, Any]] = []
+    for r in rel_rows:
+        mdec = r["monthly_dec"]
+        pct = 0.0
+        if monthly_expense_run_rate > 0 and mdec > 0:
+            pct = float(_money((mdec / monthly_expense_run_rate) * Decimal("100")))
+        breakdown.append(
             {
-                "nickname": person.nickname,
-                "monthly_cost": _money_float(monthly),
-                "monthly_dec": monthly,
-                "card_type": (person.card_type or "person").strip() or "person",
-                "emoji": (person.emoji or "").strip() or None,
+                "nickname": r["nickname"],
+                "monthly_cost": r["monthly_cost"],
+                "card_type": r["card_type"],
+                "emoji": r["emoji"],
+                "pct_of_total_expenses": round(pct, 1),
             }
         )
-    rows.sort(key=lambda r: r["monthly_dec"], reverse=True)
-    return rows
+    return breakdown
 
 
 def classify_status(closing: Decimal) -> str:
@@ -738,24 +819,9 @@ def _forecast_bundle(
         )
         prev_close = closing
 
-    avg_daily_out = _money(sum_out_all_days / Decimal(days)) if days else Decimal("0")
-    monthly_expense_run_rate = _money(avg_daily_out * Decimal("30"))
-
-    relationship_cost_breakdown: list[dict[str, Any]] = []
-    for r in rel_rows:
-        mdec = r["monthly_dec"]
-        pct = 0.0
-        if monthly_expense_run_rate > 0 and mdec > 0:
-            pct = float(_money((mdec / monthly_expense_run_rate) * Decimal("100")))
-        relationship_cost_breakdown.append(
-            {
-                "nickname": r["nickname"],
-                "monthly_cost": r["monthly_cost"],
-                "card_type": r["card_type"],
-                "emoji": r["emoji"],
-                "pct_of_total_expenses": round(pct, 1),
-            }
-        )
+    relationship_cost_breakdown = _relationship_cost_breakdown(
+        rel_rows, sum_out_all_days, days
+    )
 
     return result, dict(month_in), dict(month_out), relationship_cost_breakdown, balance_set
 
@@ -771,6 +837,253 @@ def build_forecast_for_user(
     return ForecastResult(daily, summaries, rel_bd, balance_set)
 
 
+def _cents(x: Decimal) -> int:
+    return int(_money(x) * 100)
+
+
+def _relationship_cost_rows_for_users(
+    uids: list[int], important_by_uid: dict[int, dict[str, Any]]
+) -> dict[int, list[dict[str, Any]]]:
+    """Batch variant of ``_relationship_cost_rows_for_user`` (three queries per block)."""
+    people = (
+        VibeTrackedPerson.query.filter(VibeTrackedPerson.user_id.in_(uids))
+        .filter_by(is_archived=False)
+        .order_by(VibeTrackedPerson.created_at.asc())
+        .all()
+    )
+    needs_lead = [
+        p.id
+        for p in people
+        if not (p.estimated_monthly_cost is not None and p.estimated_monthly_cost > 0)
+    ]
+    lead_id_by_person: dict[Any, Any] = {}
+    if needs_lead:
+        assessments = (
+            VibePersonAssessment.query.filter(
+                VibePersonAssessment.tracked_person_id.in_(needs_lead),
+                VibePersonAssessment.lead_id.isnot(None),
+            )
+            .order_by(VibePersonAssessment.completed_at.desc())
+            .all()
+        )
+        for assn in assessments:
+            lead_id_by_person.setdefault(assn.tracked_person_id, assn.lead_id)
+    leads_by_id: dict[Any, VibeCheckupsLead] = {}
+    if lead_id_by_person:
+        leads = VibeCheckupsLead.query.filter(
+            VibeCheckupsLead.id.in_(set(lead_id_by_person.values()))
+        ).all()
+        leads_by_id = {lead.id: lead for lead in leads}
+
+    rows_by_uid: dict[int, list[dict[str, Any]]] = defaultdict(list)
+    for person in people:
+        lead = leads_by_id.get(lead_id_by_person.get(person.id))
+        rows_by_uid[person.user_id].append(
+            _relationship_row(person, lead, important_by_uid.get(person.user_id, {}))
+        )
+    for rows in rows_by_uid.values():
+        rows.sort(key=lambda r: r["monthly_dec"], reverse=True)
+    return rows_by_uid
+
+
+def _forecast_block(
+    users: list[User], days: int, today: date
+) -> dict[str, ForecastResult]:
+    """
+    Vectorized forecast for one block of users.
+
+    Flows are accumulated into (users × days) int64 matrices of cents, so the
+    opening/closing walk is a single ``cumsum`` over the block instead of a
+    per-user Decimal day loop. Integer cents keep the result identical to
+    ``_forecast_bundle``.
+    """
+    window_start = today
+    window_end = today + timedelta(days=days - 1)
+    uids = [u.id for u in users]
+    row_of = {uid: i for i, uid in enumerate(uids)}
+
+    profiles = _load_profiles_for_emails([u.email for u in users])
+    balance_cents = np.zeros(len(users), dtype=np.int64)
+    balance_set_by_uid: dict[int, bool] = {}
+    important_by_uid: dict[int, dict[str, Any]] = {}
+    for i, u in enumerate(users):
+        bal, important, bal_set = profiles.get(
+            (u.email or "").strip().lower(), (Decimal("0"), {}, False)
+        )
+        balance_cents[i] = _cents(bal)
+        important_by_uid[u.id] = important
+        balance_set_by_uid[u.id] = bal_set
+
+    in_rows: list[int] = []
+    in_cols: list[int] = []
+    in_amts: list[int] = []
+    out_rows: list[int] = []
+    out_cols: list[int] = []
+    out_amts: list[int] = []
+
+    def _add(rows: list[int], cols: list[int], amts: list[int], r: int, dates: list[date], cents: int) -> None:
+        for d0 in dates:
+            rows.append(r)
+            cols.append((d0 - window_start).days)
+            amts.append(cents)
+
+    streams = (
+        IncomeStream.query.filter(IncomeStream.user_id.in_(uids))
+        .filter_by(is_active=True)
+        .all()
+    )
+    for s in streams:
+        amt = _money(_d(s.amount))
+        if amt > 0:
+            _add(
+                in_rows, in_cols, in_amts, row_of[s.user_id],
+                expand_income_stream_dates(s.frequency, s.next_date, window_start, window_end),
+                _cents(amt),
+            )
+
+    expenses = (
+        RecurringExpense.query.filter(RecurringExpense.user_id.in_(uids))
+        .filter_by(is_active=True)
+        .all()
+    )
+    for e in expenses:
+        amt = _money(_d(e.amount))
+        if amt > 0:
+            _add(
+                out_rows, out_cols, out_amts, row_of[e.user_id],
+                expand_recurring_expense_dates(e, window_start, window_end),
+                _cents(amt),
+            )
+
+    scheduled = (
+        ScheduledExpense.query.filter(ScheduledExpense.user_id.in_(uids))
+        .filter_by(is_active=True)
+        .all()
+    )
+    for se in scheduled:
+        amt = _money(_d(se.amount))
+        if amt > 0:
+            _add(
+                out_rows, out_cols, out_amts, row_of[se.user_id],
+                expand_scheduled_expense_dates(se, window_start, window_end),
+                _cents(amt),
+            )
+
+    for uid, important in important_by_uid.items():
+        for evd, cost in iter_special_date_outflows(important, window_start, window_end):
+            _add(out_rows, out_cols, out_amts, row_of[uid], [evd], _cents(cost))
+
+    daily_out_cents = np.zeros(len(users), dtype=np.int64)
+    vehicle_payment_dates = _month_starts_in_window(window_start, window_end)
+    fuel_by_uid: dict[int, Decimal] = defaultdict(lambda: Decimal("0"))
+    for vehicle in Vehicle.query.filter(Vehicle.user_id.in_(uids)).all():
+        payment = _money(_d(vehicle.monthly_payment))
+        if payment > 0:
+            _add(
+                out_rows, out_cols, out_amts, row_of[vehicle.user_id],
+                vehicle_payment_dates, _cents(payment),
+            )
+        fuel = _money(_d(vehicle.monthly_fuel_cost))
+        if fuel > 0:
+            fuel_by_uid[vehicle.user_id] += _money(fuel / Decimal("30"))
+    for uid, fuel_per_day in fuel_by_uid.items():
+        daily_out_cents[row_of[uid]] += _cents(fuel_per_day)
+
+    rel_rows_by_uid = _relationship_cost_rows_for_users(uids, important_by_uid)
+    for uid, rel_rows in rel_rows_by_uid.items():
+        rel_per_day = Decimal("0")
+        for r in rel_rows:
+            if r["monthly_dec"] > 0:
+                rel_per_day += _money(r["monthly_dec"] / Decimal("30"))
+        daily_out_cents[row_of[uid]] += _cents(rel_per_day)
+
+    inflow = np.zeros((len(users), days), dtype=np.int64)
+    outflow = np.zeros((len(users), days), dtype=np.int64)
+    if in_amts:
+        np.add.at(inflow, (np.asarray(in_rows), np.asarray(in_cols)), np.asarray(in_amts, dtype=np.int64))
+    if out_amts:
+        np.add.at(outflow, (np.asarray(out_rows), np.asarray(out_cols)), np.asarray(out_amts, dtype=np.int64))
+    outflow += daily_out_cents[:, None]
+
+    net = inflow - outflow
+    closing = balance_cents[:, None] + np.cumsum(net, axis=1)
+    opening = closing - net
+    status_idx = np.where(closing >= 100000, 0, np.where(closing >= 20000, 1, 2))
+
+    day_keys = [(today + timedelta(days=i)).isoformat() for i in range(days)]
+    month_starts = [i for i in range(days) if i == 0 or day_keys[i][:7] != day_keys[i - 1][:7]]
+    month_keys = [day_keys[i][:7] for i in month_starts]
+    month_in = np.add.reduceat(inflow, month_starts, axis=1)
+    month_out = np.add.reduceat(outflow, month_starts, axis=1)
+    sum_out = outflow.sum(axis=1)
+
+    statuses = ("healthy", "warning", "danger")
+    results: dict[str, ForecastResult] = {}
+    for i, u in enumerate(users):
+        opening_l = opening[i].tolist()
+        closing_l = closing[i].tolist()
+        net_l = net[i].tolist()
+        status_l = status_idx[i].tolist()
+        daily = [
+            {
+                "date": day_keys[j],
+                "opening_balance": opening_l[j] / 100,
+                "closing_balance": closing_l[j] / 100,
+                "net_change": net_l[j] / 100,
+                "balance_status": statuses[status_l[j]],
+            }
+            for j in range(days)
+        ]
+        mi = {k: Decimal(int(c)).scaleb(-2) for k, c in zip(month_keys, month_in[i].tolist())}
+        mo = {k: Decimal(int(c)).scaleb(-2) for k, c in zip(month_keys, month_out[i].tolist())}
+        rel_bd = _relationship_cost_breakdown(
+            rel_rows_by_uid.get(u.id, []), Decimal(int(sum_out[i])).scaleb(-2), days
+        )
+        summaries = generate_monthly_summaries(
+            daily, month_income_by_month=mi, month_expense_by_month=mo
+        )
+        results[u.user_id] = ForecastResult(daily, summaries, rel_bd, balance_set_by_uid[u.id])
+    return results
+
+
+def build_forecasts_for_users(
+    user_ids: list[str], days: int = 90
+) -> dict[str, ForecastResult]:
+    """
+    Batch counterpart of ``build_forecast_for_user`` for nightly precompute and cold caches.
+
+    Users are processed in blocks of ``FORECAST_BATCH_BLOCK_SIZE``: each block loads
+    schedules with one query per table and projects every balance with NumPy integer
+    cents, so results match ``build_forecast_for_user`` to the cent.
+
+    Args:
+        user_ids: External user identifiers (``User.user_id``, UUID strings).
+
+    Returns:
+        Mapping of user_id -> ForecastResult; unknown users get an empty result,
+        same as the single-user path.
+    """
+    empty = ForecastResult([], [], [], False)
+    ordered = list(dict.fromkeys(user_ids))
+    if days < 1:
+        return {uid: empty for uid in ordered}
+    if np is None:
+        logger.warning("cash_forecast: numpy unavailable, falling back to per-user forecasts")
+        return {uid: build_forecast_for_user(uid, days) for uid in ordered}
+
+    today = date.today()
+    results: dict[str, ForecastResult] = {}
+    for start in range(0, len(ordered), FORECAST_BATCH_BLOCK_SIZE):
+        block_ids = ordered[start:start + FORECAST_BATCH_BLOCK_SIZE]
+        users = db.session.query(User).filter(User.user_id.in_(block_ids)).all()
+        results.update(_forecast_block(users, days, today))
+    for uid in ordered:
+        if uid not in results:
+            logger.warning("cash_forecast: no user row for user_id=%r", uid)
+            results[uid] = empty
+    return {uid: results[uid] for uid in ordered}
+
+
 def generate_daily_forecast(user_id: str, days: int = 90) -> list[dict[str, Any]]:
     """
     Build per-day opening/closing balance from scheduled inflows/outflows.
@@ -23,28 +23,15 @@ from datetime import datetime, date, timedelta
 from typing import Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
-import psycopg2
-import psycopg2.extras
-import os
 from scipy import stats
 import numpy as np
+from backend.utils.pg_pool import get_pg_connection
 
 from backend.services.feature_flag_service import FeatureTier
 from backend.services.daily_outlook_content_service import DailyOutlookContentService
 
 logger = logging.getLogger(__name__)
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    db_url = os.environ.get('DATABASE_URL')
-    if not db_url:
-        raise RuntimeError(
-            "DATABASE_URL is required. SQLite is not supported."
-        )
-    conn = psycopg2.connect(db_url)
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class TestStatus(Enum):
     DRAFT = "draft"
     ACTIVE = "active"
@@ -7,13 +7,13 @@ Generates personalized daily content based on user tier, activity, and engagemen
 import logging
 import psycopg2
 import psycopg2.extras
-import os
 import json
 import random
 from datetime import datetime, date, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from backend.utils.pg_pool import get_pg_connection
 
 from backend.models.daily_outlook import TemplateTier, TemplateCategory, DailyOutlook
 from backend.services.daily_outlook_service import DailyOutlookService
@@ -50,17 +50,6 @@ class ContentTemplate:
     cultural_relevance: bool
     city_specific: Optional[str]
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    db_url = os.environ.get('DATABASE_URL')
-    if not db_url:
-        raise RuntimeError(
-            "DATABASE_URL is required. SQLite is not supported."
-        )
-    conn = psycopg2.connect(db_url)
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class DailyOutlookContentService:
     """
     Service for generating personalized daily outlook content
@@ -94,12 +83,13 @@ class DailyOutlookContentService:
         
         logger.info("DailyOutlookContentService initialized successfully")
     
-    def generate_daily_outlook(self, user_id: int) -> Dict[str, Any]:
+    def generate_daily_outlook(self, user_id: int, save: bool = True) -> Dict[str, Any]:
         """
         Generate personalized daily content for a user
         
         Args:
             user_id: User ID to generate content for
+            save: Persist the outlook immediately (batch callers bulk-save instead)
             
         Returns:
             Dictionary containing all daily outlook content
@@ -146,7 +136,8 @@ class DailyOutlookContentService:
             }
             
             # Save to database
-            self._save_daily_outlook(daily_outlook)
+            if save:
+                self._save_daily_outlook(daily_outlook)
             
             logger.info(f"Generated daily outlook for user {user_id}")
             return daily_outlook
@@ -440,16 +431,8 @@ class DailyOutlookContentService:
             # Get individual scores
             _, individual_scores = self.daily_outlook_service.calculate_balance_score(user_id)
             
-            # Get streak count
-            cursor.execute("""
-                SELECT streak_count FROM daily_outlooks 
-                WHERE user_id = %s 
-                ORDER BY date DESC 
-                LIMIT 1
-            """, (user_id,))
-            
-            streak_result = cursor.fetchone()
-            streak_count = streak_result['streak_count'] if streak_result else 0
+            # Streak from the batch prefetch when primed, else one windowed query
+            streak_count = self.daily_outlook_service.get_outlook_streak(user_id, date.today())
             
             conn.close()
             
@@ -873,46 +856,106 @@ class DailyOutlookContentService:
             'city_specific': False
         }
     
+    _UPSERT_DAILY_OUTLOOK_SQL = """
+        INSERT INTO daily_outlooks 
+        (user_id, date, balance_score, financial_weight, wellness_weight, 
+         relationship_weight, career_weight, primary_insight, quick_actions,
+         encouragement_message, surprise_element, streak_count, created_at)
+        VALUES %s
+        ON CONFLICT (user_id, date) DO UPDATE SET
+            balance_score = EXCLUDED.balance_score,
+            financial_weight = EXCLUDED.financial_weight,
+            wellness_weight = EXCLUDED.wellness_weight,
+            relationship_weight = EXCLUDED.relationship_weight,
+            career_weight = EXCLUDED.career_weight,
+            primary_insight = EXCLUDED.primary_insight,
+            quick_actions = EXCLUDED.quick_actions,
+            encouragement_message = EXCLUDED.encouragement_message,
+            surprise_element = EXCLUDED.surprise_element,
+            streak_count = EXCLUDED.streak_count,
+            created_at = EXCLUDED.created_at
+    """
+    
+    @staticmethod
+    def _daily_outlook_row(o: Dict[str, Any], created_at: datetime) -> tuple:
+        return (
+            o['user_id'],
+            o['date'],
+            o['balance_score'],
+            o['financial_weight'],
+            o['wellness_weight'],
+            o['relationship_weight'],
+            o['career_weight'],
+            o['primary_insight'],
+            json.dumps(o['quick_actions']),
+            o['encouragement_message'],
+            o['surprise_element'],
+            o['streak_count'],
+            created_at,
+        )
+    
+    def _save_daily_outlooks_bulk(self, daily_outlooks: List[Dict[str, Any]]) -> int:
+        """
+        Save many daily outlooks with one multi-row upsert on a single connection.
+
+        Used by the sharded nightly batch. If the bulk upsert fails, the rows
+        are retried one at a time under savepoints on the same connection, so
+        one bad outlook only loses itself. Returns the number of rows written.
+        """
+        if not daily_outlooks:
+            return 0
+        created_at = datetime.utcnow()
+        conn = None
+        try:
+            conn = get_pg_connection()
+            cursor = conn.cursor()
+            try:
+                rows = [self._daily_outlook_row(o, created_at) for o in daily_outlooks]
+                psycopg2.extras.execute_values(
+                    cursor, self._UPSERT_DAILY_OUTLOOK_SQL, rows, page_size=len(rows)
+                )
+                conn.commit()
+                logger.info(f"Saved {len(rows)} daily outlooks in bulk")
+                return len(rows)
+            except Exception as e:
+                conn.rollback()
+                logger.warning(f"Bulk save of {len(daily_outlooks)} daily outlooks failed, "
+                               f"saving row by row: {e}")
+            
+            saved = 0
+            for o in daily_outlooks:
+                cursor.execute("SAVEPOINT daily_outlook_row")
+                try:
+                    psycopg2.extras.execute_values(
+                        cursor, self._UPSERT_DAILY_OUTLOOK_SQL, [self._daily_outlook_row(o, created_at)]
+                    )
+                    cursor.execute("RELEASE SAVEPOINT daily_outlook_row")
+                    saved += 1
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT daily_outlook_row")
+                    logger.error(f"Error saving daily outlook for user {o.get('user_id')}: {e}")
+            conn.commit()
+            logger.info(f"Saved {saved}/{len(daily_outlooks)} daily outlooks row by row")
+            return saved
+        except Exception as e:
+            if conn is not None:
+                conn.rollback()
+            logger.error(f"Error bulk saving {len(daily_outlooks)} daily outlooks: {e}")
+            return 0
+        finally:
+            if conn is not None:
+                conn.close()
+    
     def _save_daily_outlook(self, daily_outlook: Dict[str, Any]) -> bool:
         """Save daily outlook to database"""
         try:
             conn = get_pg_connection()
             cursor = conn.cursor()
             
-            # Insert daily outlook
-            cursor.execute("""
-                INSERT INTO daily_outlooks 
-                (user_id, date, balance_score, financial_weight, wellness_weight, 
-                 relationship_weight, career_weight, primary_insight, quick_actions,
-                 encouragement_message, surprise_element, streak_count, created_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (user_id, date) DO UPDATE SET
-                    balance_score = EXCLUDED.balance_score,
-                    financial_weight = EXCLUDED.financial_weight,
-                    wellness_weight = EXCLUDED.wellness_weight,
-                    relationship_weight = EXCLUDED.relationship_weight,
-                    career_weight = EXCLUDED.career_weight,
-                    primary_insight = EXCLUDED.primary_insight,
-                    quick_actions = EXCLUDED.quick_actions,
-                    encouragement_message = EXCLUDED.encouragement_message,
-                    surprise_element = EXCLUDED.surprise_element,
-                    streak_count = EXCLUDED.streak_count,
-                    created_at = EXCLUDED.created_at
-            """, (
-                daily_outlook['user_id'],
-                daily_outlook['date'],
-                daily_outlook['balance_score'],
-                daily_outlook['financial_weight'],
-                daily_outlook['wellness_weight'],
-                daily_outlook['relationship_weight'],
-                daily_outlook['career_weight'],
-                daily_outlook['primary_insight'],
-                json.dumps(daily_outlook['quick_actions']),
-                daily_outlook['encouragement_message'],
-                daily_outlook['surprise_element'],
-                daily_outlook['streak_count'],
-                datetime.utcnow()
-            ))
+            psycopg2.extras.execute_values(
+                cursor, self._UPSERT_DAILY_OUTLOOK_SQL,
+                [self._daily_outlook_row(daily_outlook, datetime.utcnow())]
+            )
             
             conn.commit()
             conn.close()
@@ -4,16 +4,15 @@ Mingus Application - Daily Outlook Service
 Service for implementing dynamic weighting algorithm for Daily Outlook feature
 """
 
+import json
 import logging
-import psycopg2
-import psycopg2.extras
-import os
 from datetime import datetime, date, timedelta
 from decimal import Decimal
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
+from backend.utils.pg_pool import get_pg_connection
 
-from ..models.daily_outlook import RelationshipStatus, UserRelationshipStatus, DailyOutlook
+from ..models.daily_outlook import RelationshipStatus, UserRelationshipStatus
 from ..models.user_models import User
 from ..models.database import db
 
@@ -54,17 +53,6 @@ class BalanceScores:
             'career_score': self.career_score
         }
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    db_url = os.environ.get('DATABASE_URL')
-    if not db_url:
-        raise RuntimeError(
-            "DATABASE_URL is required. SQLite is not supported."
-        )
-    conn = psycopg2.connect(db_url)
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class DailyOutlookService:
     """
     Service for implementing dynamic weighting algorithm for Daily Outlook feature
@@ -130,6 +118,8 @@ class DailyOutlookService:
     
     def __init__(self, profile_db_path: str = None):
         """Initialize the Daily Outlook service"""
+        # Batch-prefetched results keyed by user_id (see prime_balance_scores)
+        self._prefetched: Dict[int, Dict[str, Any]] = {}
 
         logger.info("DailyOutlookService initialized successfully")
     
@@ -143,6 +133,10 @@ class DailyOutlookService:
         Returns:
             Dictionary with weight percentages for each category
         """
+        prefetched = self._prefetched.get(user_id)
+        if prefetched is not None:
+            return dict(prefetched['weights'])
+        
         try:
             # Get user's current relationship status
             relationship_status = self.get_user_relationship_status(user_id)
@@ -177,6 +171,10 @@ class DailyOutlookService:
         Returns:
             Tuple of (overall_balance_score, individual_scores)
         """
+        prefetched = self._prefetched.get(user_id)
+        if prefetched is not None:
+            return prefetched['balance_score'], prefetched['individual_scores']
+        
         try:
             # Get dynamic weights
             weights = self.calculate_dynamic_weights(user_id)
@@ -362,62 +360,7 @@ class DailyOutlookService:
             result = cursor.fetchone()
             conn.close()
             
-            if result and result['financial_info']:
-                import json
-                financial_info = json.loads(result['financial_info'])
-                
-                # Calculate score based on financial health indicators
-                score = 50.0  # Base score
-                
-                # Check for emergency fund
-                current_savings = financial_info.get('currentSavings', 0)
-                monthly_income = financial_info.get('monthlyIncome', 0)
-                if monthly_income > 0:
-                    emergency_fund_months = current_savings / monthly_income
-                    if emergency_fund_months >= 6:
-                        score += 20
-                    elif emergency_fund_months >= 3:
-                        score += 10
-                
-                # Check debt-to-income ratio
-                annual_income = financial_info.get('annualIncome', 0)
-                student_loans = financial_info.get('studentLoans', 0)
-                credit_card_debt = financial_info.get('creditCardDebt', 0)
-                total_debt = student_loans + credit_card_debt
-                
-                if annual_income > 0:
-                    debt_to_income = total_debt / annual_income
-                    if debt_to_income < 0.2:
-                        score += 15
-                    elif debt_to_income < 0.4:
-                        score += 5
-                    else:
-                        score -= 10
-                
-                # Check savings rate
-                monthly_expenses = financial_info.get('monthlyExpenses', {})
-                total_expenses = sum([
-                    monthly_expenses.get('rent', 0),
-                    monthly_expenses.get('carPayment', 0),
-                    monthly_expenses.get('insurance', 0),
-                    monthly_expenses.get('groceries', 0),
-                    monthly_expenses.get('utilities', 0),
-                    monthly_expenses.get('studentLoanPayment', 0),
-                    monthly_expenses.get('creditCardMinimum', 0)
-                ])
-                
-                if monthly_income > 0:
-                    savings_rate = (monthly_income - total_expenses) / monthly_income
-                    if savings_rate > 0.2:
-                        score += 15
-                    elif savings_rate > 0.1:
-                        score += 5
-                    else:
-                        score -= 5
-                
-                return max(0, min(100, score))
-            
-            return 50.0
+            return self._score_financial(result['financial_info'] if result else None)
             
         except Exception as e:
             logger.error(f"Error calculating financial score for user {user_id}: {e}")
@@ -437,7 +380,6 @@ class DailyOutlookService:
             """, (user_id,))
             
             mood_result = cursor.fetchone()
-            mood_score = mood_result['avg_mood'] if mood_result['avg_mood'] else 3.0  # Default neutral
             
             # Get wellness data from weekly check-ins
             cursor.execute("""
@@ -452,36 +394,7 @@ class DailyOutlookService:
             wellness_result = cursor.fetchone()
             conn.close()
             
-            # Calculate wellness score
-            score = 50.0  # Base score
-            
-            # Mood contribution (1-5 scale, convert to 0-100)
-            mood_contribution = (mood_score - 1) * 25  # Convert 1-5 to 0-100
-            score += (mood_contribution - 50) * 0.4  # 40% weight
-            
-            if wellness_result and wellness_result['avg_physical']:
-                # Physical activity contribution
-                physical_activity = wellness_result['avg_physical'] or 0
-                if physical_activity >= 3:
-                    score += 15
-                elif physical_activity >= 1:
-                    score += 5
-                
-                # Meditation contribution
-                meditation_minutes = wellness_result['avg_meditation'] or 0
-                if meditation_minutes >= 60:
-                    score += 10
-                elif meditation_minutes >= 30:
-                    score += 5
-                
-                # Relationship satisfaction contribution
-                relationship_satisfaction = wellness_result['avg_relationship'] or 5
-                if relationship_satisfaction >= 8:
-                    score += 10
-                elif relationship_satisfaction >= 6:
-                    score += 5
-            
-            return max(0, min(100, score))
+            return self._score_wellness(mood_result['avg_mood'], wellness_result)
             
         except Exception as e:
             logger.error(f"Error calculating wellness score for user {user_id}: {e}")
@@ -503,22 +416,7 @@ class DailyOutlookService:
             result = cursor.fetchone()
             conn.close()
             
-            if result:
-                satisfaction_score = result['satisfaction_score']
-                status = result['status']
-                
-                # Base score from satisfaction (1-10 scale, convert to 0-100)
-                score = (satisfaction_score - 1) * 11.11  # Convert 1-10 to 0-100
-                
-                # Adjust based on relationship status
-                if status in ['married', 'engaged', 'committed']:
-                    score += 10  # Bonus for committed relationships
-                elif status in ['dating', 'early_relationship']:
-                    score += 5   # Small bonus for developing relationships
-                
-                return max(0, min(100, score))
-            
-            return 50.0  # Default score if no relationship data
+            return self._score_relationship(result)
             
         except Exception as e:
             logger.error(f"Error calculating relationship score for user {user_id}: {e}")
@@ -539,35 +437,162 @@ class DailyOutlookService:
             result = cursor.fetchone()
             conn.close()
             
-            if result and result['goals']:
-                import json
-                goals = json.loads(result['goals'])
-                
-                score = 50.0  # Base score
-                
-                # Check for career-related goals
-                career_goals = goals.get('careerGoals', [])
-                if career_goals:
-                    score += 20  # Bonus for having career goals
-                
-                # Check for skill development goals
-                skill_goals = goals.get('skillDevelopment', [])
-                if skill_goals:
-                    score += 15  # Bonus for skill development
-                
-                # Check for education goals
-                education_goals = goals.get('education', [])
-                if education_goals:
-                    score += 10  # Bonus for education goals
-                
-                return max(0, min(100, score))
-            
-            return 50.0  # Default score if no career data
+            return self._score_career(result['goals'] if result else None)
             
         except Exception as e:
             logger.error(f"Error calculating career score for user {user_id}: {e}")
             return 50.0
     
+    # ------------------------------------------------------------------
+    # Pillar scoring from already-loaded inputs (shared by per-user and batch paths)
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _load_json(raw: Any) -> Dict[str, Any]:
+        """Profile JSON columns arrive as text or as already-decoded JSONB dicts"""
+        if not raw:
+            return {}
+        if isinstance(raw, dict):
+            return raw
+        return json.loads(raw)
+    
+    @classmethod
+    def _score_financial(cls, financial_info_raw: Any) -> float:
+        """Financial health score (0-100) from user_profiles.financial_info"""
+        financial_info = cls._load_json(financial_info_raw)
+        if not financial_info:
+            return 50.0
+        
+        # Calculate score based on financial health indicators
+        score = 50.0  # Base score
+        
+        # Check for emergency fund
+        current_savings = financial_info.get('currentSavings', 0)
+        monthly_income = financial_info.get('monthlyIncome', 0)
+        if monthly_income > 0:
+            emergency_fund_months = current_savings / monthly_income
+            if emergency_fund_months >= 6:
+                score += 20
+            elif emergency_fund_months >= 3:
+                score += 10
+        
+        # Check debt-to-income ratio
+        annual_income = financial_info.get('annualIncome', 0)
+        student_loans = financial_info.get('studentLoans', 0)
+        credit_card_debt = financial_info.get('creditCardDebt', 0)
+        total_debt = student_loans + credit_card_debt
+        
+        if annual_income > 0:
+            debt_to_income = total_debt / annual_income
+            if debt_to_income < 0.2:
+                score += 15
+            elif debt_to_income < 0.4:
+                score += 5
+            else:
+                score -= 10
+        
+        # Check savings rate
+        monthly_expenses = financial_info.get('monthlyExpenses', {})
+        total_expenses = sum([
+            monthly_expenses.get('rent', 0),
+            monthly_expenses.get('carPayment', 0),
+            monthly_expenses.get('insurance', 0),
+            monthly_expenses.get('groceries', 0),
+            monthly_expenses.get('utilities', 0),
+            monthly_expenses.get('studentLoanPayment', 0),
+            monthly_expenses.get('creditCardMinimum', 0)
+        ])
+        
+        if monthly_income > 0:
+            savings_rate = (monthly_income - total_expenses) / monthly_income
+            if savings_rate > 0.2:
+                score += 15
+            elif savings_rate > 0.1:
+                score += 5
+            else:
+                score -= 5
+        
+        return max(0, min(100, score))
+    
+    @staticmethod
+    def _score_wellness(avg_mood: Any, wellness_result: Optional[Dict[str, Any]]) -> float:
+        """Wellness score (0-100) from 30-day mood average and weekly check-in averages"""
+        # AVG() comes back as Decimal; keep the arithmetic in float
+        mood_score = float(avg_mood) if avg_mood else 3.0  # Default neutral
+        
+        score = 50.0  # Base score
+        
+        # Mood contribution (1-5 scale, convert to 0-100)
+        mood_contribution = (mood_score - 1) * 25  # Convert 1-5 to 0-100
+        score += (mood_contribution - 50) * 0.4  # 40% weight
+        
+        if wellness_result and wellness_result['avg_physical']:
+            # Physical activity contribution
+            physical_activity = float(wellness_result['avg_physical'] or 0)
+            if physical_activity >= 3:
+                score += 15
+            elif physical_activity >= 1:
+                score += 5
+            
+            # Meditation contribution
+            meditation_minutes = float(wellness_result['avg_meditation'] or 0)
+            if meditation_minutes >= 60:
+                score += 10
+            elif meditation_minutes >= 30:
+                score += 5
+            
+            # Relationship satisfaction contribution
+            relationship_satisfaction = float(wellness_result['avg_relationship'] or 5)
+            if relationship_satisfaction >= 8:
+                score += 10
+            elif relationship_satisfaction >= 6:
+                score += 5
+        
+        return max(0, min(100, score))
+    
+    @staticmethod
+    def _score_relationship(result: Optional[Dict[str, Any]]) -> float:
+        """Relationship score (0-100) from the latest user_relationship_status row"""
+        if not result:
+            return 50.0  # Default score if no relationship data
+        
+        satisfaction_score = result['satisfaction_score']
+        status = result['status']
+        
+        # Base score from satisfaction (1-10 scale, convert to 0-100)
+        score = (satisfaction_score - 1) * 11.11  # Convert 1-10 to 0-100
+        
+        # Adjust based on relationship status
+        if status in ['married', 'engaged', 'committed']:
+            score += 10  # Bonus for committed relationships
+        elif status in ['dating', 'early_relationship']:
+            score += 5   # Small bonus for developing relationships
+        
+        return max(0, min(100, score))
+    
+    @classmethod
+    def _score_career(cls, goals_raw: Any) -> float:
+        """Career score (0-100) from user_profiles.goals"""
+        goals = cls._load_json(goals_raw)
+        if not goals:
+            return 50.0  # Default score if no career data
+        
+        score = 50.0  # Base score
+        
+        # Check for career-related goals
+        if goals.get('careerGoals', []):
+            score += 20  # Bonus for having career goals
+        
+        # Check for skill development goals
+        if goals.get('skillDevelopment', []):
+            score += 15  # Bonus for skill development
+        
+        # Check for education goals
+        if goals.get('education', []):
+            score += 10  # Bonus for education goals
+        
+        return max(0, min(100, score))
+    
     def calculate_streak_count(self, user_id: int, target_date: date) -> int:
         """
         Calculate streak count for a user up to a target date
@@ -580,30 +605,179 @@ class DailyOutlookService:
             Number of consecutive days with daily outlooks
         """
         try:
-            # Get all daily outlooks for the user, ordered by date descending
-            outlooks = DailyOutlook.query.filter_by(user_id=user_id)\
-                .filter(DailyOutlook.date <= target_date)\
-                .order_by(DailyOutlook.date.desc())\
-                .all()
+            return self.calculate_streak_counts([user_id], target_date).get(int(user_id), 0)
+        except Exception as e:
+            logger.error(f"Error calculating streak count for user {user_id}: {e}")
+            return 0
+    
+    def calculate_streak_counts(self, user_ids: List[int], target_date: date) -> Dict[int, int]:
+        """
+        Streaks ending on target_date for a block of users, in one query
+        
+        Returns:
+            {user_id: consecutive days with daily outlooks}; users without a streak are omitted
+        """
+        user_ids = list(dict.fromkeys(int(uid) for uid in user_ids))
+        if not user_ids:
+            return {}
+        conn = get_pg_connection()
+        try:
+            return self._query_streak_counts(conn.cursor(), user_ids, target_date)
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _query_streak_counts(cursor, user_ids: List[int], target_date: date) -> Dict[int, int]:
+        # Gaps-and-islands: with dates ranked newest first, a row belongs to the
+        # streak ending on target_date exactly when date + (rank - 1) == target_date.
+        cursor.execute("""
+            SELECT user_id, COUNT(*) AS streak_count
+            FROM (
+                SELECT user_id, date,
+                       ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY date DESC) AS rn
+                FROM daily_outlooks
+                WHERE user_id = ANY(%s) AND date <= %s
+            ) ranked
+            WHERE ranked.date + (ranked.rn - 1)::int = %s
+            GROUP BY user_id
+        """, (user_ids, target_date, target_date))
+        return {row['user_id']: int(row['streak_count']) for row in cursor.fetchall()}
+    
+    def get_outlook_streak(self, user_id: int, outlook_date: date) -> int:
+        """
+        Streak an outlook dated outlook_date extends: consecutive outlook days
+        up to the day before. Answered from prime_balance_scores when primed.
+        """
+        prefetched = self._prefetched.get(user_id)
+        if prefetched is not None:
+            return prefetched['streak_count']
+        return self.calculate_streak_count(user_id, outlook_date - timedelta(days=1))
+    
+    def calculate_balance_scores_for_users(self, user_ids: List[int],
+                                           target_date: Optional[date] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Balance scores, weights and streaks for a block of users in set-based queries.
+        
+        Loads profiles, mood, weekly check-ins and relationship status for every
+        user at once (one query per pillar) and computes streaks with a window
+        function, instead of O(users x pillars) queries plus a per-day streak walk.
+        
+        Args:
+            user_ids: Internal user IDs
+            target_date: Outlook date (defaults to today); streaks run up to the day before
             
-            if not outlooks:
-                return 0
+        Returns:
+            {user_id: {'balance_score', 'individual_scores', 'weights', 'streak_count'}}
+        """
+        target_date = target_date or date.today()
+        user_ids = list(dict.fromkeys(int(uid) for uid in user_ids))
+        if not user_ids:
+            return {}
+        
+        profiles: Dict[int, Dict[str, Any]] = {}
+        moods: Dict[int, Any] = {}
+        checkins: Dict[int, Dict[str, Any]] = {}
+        relationships: Dict[int, Dict[str, Any]] = {}
+        streaks: Dict[int, int] = {}
+        conn = get_pg_connection()
+        try:
+            cursor = conn.cursor()
             
-            streak_count = 0
-            current_date = target_date
+            cursor.execute("""
+                SELECT u.id AS user_id, p.financial_info, p.goals
+                FROM users u
+                LEFT JOIN user_profiles p ON p.email = u.email
+                WHERE u.id = ANY(%s)
+            """, (user_ids,))
+            for row in cursor.fetchall():
+                profiles[row['user_id']] = row
+            
+            cursor.execute("""
+                SELECT user_id, AVG(mood_score) AS avg_mood FROM user_mood_data
+                WHERE user_id = ANY(%s)
+                AND timestamp >= NOW() - INTERVAL '30 days'
+                GROUP BY user_id
+            """, (user_ids,))
+            moods = {row['user_id']: row['avg_mood'] for row in cursor.fetchall()}
             
-            for outlook in outlooks:
-                if outlook.date == current_date:
-                    streak_count += 1
-                    current_date = current_date - timedelta(days=1)
-                else:
-                    break
+            cursor.execute("""
+                SELECT user_id,
+                       AVG(physical_activity) AS avg_physical,
+                       AVG(meditation_minutes) AS avg_meditation,
+                       AVG(relationship_satisfaction) AS avg_relationship
+                FROM weekly_checkins
+                WHERE user_id = ANY(%s)
+                AND check_in_date >= NOW() - INTERVAL '30 days'
+                GROUP BY user_id
+            """, (user_ids,))
+            checkins = {row['user_id']: row for row in cursor.fetchall()}
             
-            return streak_count
+            cursor.execute("""
+                SELECT DISTINCT ON (user_id) user_id, status, satisfaction_score
+                FROM user_relationship_status
+                WHERE user_id = ANY(%s)
+                ORDER BY user_id, updated_at DESC
+            """, (user_ids,))
+            relationships = {row['user_id']: row for row in cursor.fetchall()}
+            
+            streaks = self._query_streak_counts(cursor, user_ids, target_date - timedelta(days=1))
+        finally:
+            conn.close()
+        
+        default_weights = self.WEIGHT_CONFIGURATIONS[RelationshipStatus.SINGLE_CAREER_FOCUSED]
+        results: Dict[int, Dict[str, Any]] = {}
+        for user_id in user_ids:
+            profile = profiles.get(user_id) or {}
+            relationship = relationships.get(user_id)
+            
+            weights = default_weights
+            if relationship:
+                try:
+                    weights = self.WEIGHT_CONFIGURATIONS.get(
+                        RelationshipStatus(relationship['status']), default_weights
+                    )
+                except ValueError:
+                    logger.error(f"Invalid relationship status value: {relationship['status']}")
             
+            individual_scores = BalanceScores(
+                financial_score=self._safe_score(self._score_financial, profile.get('financial_info')),
+                wellness_score=self._safe_score(self._score_wellness, moods.get(user_id), checkins.get(user_id)),
+                relationship_score=self._safe_score(self._score_relationship, relationship),
+                career_score=self._safe_score(self._score_career, profile.get('goals')),
+            )
+            weighted_score = (
+                individual_scores.financial_score * weights.financial +
+                individual_scores.wellness_score * weights.wellness +
+                individual_scores.relationship_score * weights.relationship +
+                individual_scores.career_score * weights.career
+            )
+            results[user_id] = {
+                'balance_score': max(0, min(100, int(round(weighted_score)))),
+                'individual_scores': individual_scores,
+                'weights': weights.to_dict(),
+                'streak_count': streaks.get(user_id, 0),
+            }
+        
+        logger.info(f"Calculated balance scores for {len(results)} users in batch")
+        return results
+    
+    @staticmethod
+    def _safe_score(scorer, *inputs) -> float:
+        try:
+            return scorer(*inputs)
         except Exception as e:
-            logger.error(f"Error calculating streak count for user {user_id}: {e}")
-            return 0
+            logger.error(f"Error calculating {scorer.__name__} in batch: {e}")
+            return 50.0
+    
+    def prime_balance_scores(self, user_ids: List[int], target_date: Optional[date] = None) -> None:
+        """
+        Prefetch batch scores so calculate_balance_score / calculate_dynamic_weights
+        answer from memory for these users (used by the nightly outlook chunks).
+        """
+        self._prefetched.update(self.calculate_balance_scores_for_users(user_ids, target_date))
+    
+    def clear_prefetched_scores(self) -> None:
+        self._prefetched.clear()
     
     def update_user_relationship_status(self, user_id: int, status: str, 
                                       satisfaction_score: int, financial_impact_score: int) -> bool:
@@ -13,13 +13,11 @@ Features:
 """
 
 import logging
-import psycopg2
-import psycopg2.extras
-import os
 from datetime import datetime, timedelta, date
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 import json
+from backend.utils.pg_pool import get_pg_connection
 
 # Import the existing maintenance prediction engine
 from .maintenance_prediction_engine import MaintenancePredictionEngine
@@ -80,17 +78,6 @@ class EnhancedCashFlowForecast:
     generated_date: datetime
     opening_balance: float = 5000.0
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    db_url = os.environ.get('DATABASE_URL')
-    if not db_url:
-        raise RuntimeError(
-            "DATABASE_URL is required. SQLite is not supported."
-        )
-    conn = psycopg2.connect(db_url)
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class EnhancedCashFlowForecastEngine:
     """
     Enhanced Cash Flow Forecast Engine that integrates vehicle maintenance
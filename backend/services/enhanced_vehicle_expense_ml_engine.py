@@ -14,15 +14,13 @@ Features:
 
 import logging
 import re
-import psycopg2
-import psycopg2.extras
-import os
 import json
 import math
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
+from backend.utils.pg_pool import get_pg_connection
 
 # Lazy ML imports to avoid NumPy's _mac_os_check FPE at app startup on some macOS/Anaconda setups
 np = None
@@ -106,17 +104,6 @@ class VehicleExpenseInsight:
     ml_confidence: float
     supporting_data: Dict[str, Any]
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    db_url = os.environ.get('DATABASE_URL')
-    if not db_url:
-        raise RuntimeError(
-            "DATABASE_URL is required. SQLite is not supported."
-        )
-    conn = psycopg2.connect(db_url)
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class EnhancedVehicleExpenseMLEngine:
     """
     Enhanced ML-powered vehicle expense categorization and analysis engine
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Incremental cash forecast store.
+
+Keeps each user's projected daily net flows and closing balances (integer cents) in
+process so a single IncomeStream / RecurringExpense / ScheduledExpense edit is applied
+as a delta: only that item's occurrences are re-expanded and closing balances are
+re-propagated from the first affected day onward, in O(days_remaining).
+
+A per-user generation counter in Redis keeps gunicorn workers coherent: a worker that
+applies an edit bumps the counter and moves its own entry forward, while every other
+worker sees a newer generation on its next read and rebuilds from the database.
+
+Writers that do not go through apply_schedule_change are caught by session listeners:
+any committed insert, update or delete of a forecast input row (schedules, vehicles,
+vibe tracker people and assessments, quick spends) invalidates its owner. Entries also
+expire after FORECAST_STORE_TTL_SECONDS, so a writer the listeners cannot see (raw SQL
+on user_profiles, another service) can only leave a forecast stale for that long.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from itertools import chain
+from typing import Any
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session, object_session
+
+from backend.models.database import db
+from backend.models.financial_setup import RecurringExpense
+from backend.models.quick_spend import QuickSpendEntry
+from backend.models.transaction_schedule import IncomeStream, ScheduledExpense
+from backend.models.user_models import User
+from backend.models.vehicle_models import Vehicle
+from backend.models.vibe_tracker import VibePersonAssessment, VibeTrackedPerson
+from backend.services import cash_forecast_service
+from backend.services.cash_forecast_service import (
+    ForecastResult,
+    _d,
+    _money,
+    _relationship_cost_breakdown,
+    build_forecast_for_user,
+    classify_status,
+    expand_income_stream_dates,
+    expand_recurring_expense_dates,
+    expand_scheduled_expense_dates,
+    generate_monthly_summaries,
+)
+
+logger = logging.getLogger(__name__)
+
+FORECAST_STORE_TTL_SECONDS = int(os.environ.get("FORECAST_STORE_TTL_SECONDS", "300"))
+FORECAST_STORE_MAX_USERS = 5000
+_GEN_KEY_PREFIX = "forecast_store:gen:"
+_GEN_KEY_TTL = 60 * 60 * 24 * 2
+
+# Forecast inputs that carry the owner's users.id directly
+_USER_OWNED_INPUTS = (
+    IncomeStream,
+    RecurringExpense,
+    ScheduledExpense,
+    Vehicle,
+    VibeTrackedPerson,
+    QuickSpendEntry,
+)
+# Session.info keys: rows already applied as deltas, and owners awaiting invalidation
+_INCREMENTAL_ROWS_KEY = "forecast_store_incremental_rows"
+_PENDING_USERS_KEY = "forecast_store_pending_users"
+
+
+def _to_cents(value: float) -> int:
+    return int(round(float(value) * 100))
+
+
+def _from_cents(cents: int) -> Decimal:
+    return Decimal(int(cents)).scaleb(-2)
+
+
+@dataclass(frozen=True)
+class ScheduleItem:
+    """
+    Immutable snapshot of one forecast schedule row.
+
+    Taken before and after an edit so the store can subtract the old occurrences
+    and add the new ones without re-reading the user's other schedules.
+    """
+
+    kind: str  # "income" | "recurring_expense" | "scheduled_expense"
+    amount: Decimal
+    frequency: str
+    next_date: date | None = None
+    due_day: int | None = None
+    created_at: datetime | None = None
+
+    @classmethod
+    def from_row(
+        cls, row: IncomeStream | RecurringExpense | ScheduledExpense | None
+    ) -> ScheduleItem | None:
+        """Snapshot a model row; inactive or non-positive rows contribute nothing (None)."""
+        if row is None or not row.is_active:
+            return None
+        amount = _money(_d(row.amount))
+        if amount <= 0:
+            return None
+        if isinstance(row, IncomeStream):
+            kind = "income"
+        elif isinstance(row, ScheduledExpense):
+            kind = "scheduled_expense"
+        else:
+            kind = "recurring_expense"
+        return cls(
+            kind=kind,
+            amount=amount,
+            frequency=row.frequency,
+            next_date=getattr(row, "next_date", None),
+            due_day=getattr(row, "due_day", None),
+            created_at=row.created_at,
+        )
+
+    @property
+    def is_income(self) -> bool:
+        return self.kind == "income"
+
+    def dates_in(self, window_start: date, window_end: date) -> list[date]:
+        if self.kind == "income":
+            return expand_income_stream_dates(
+                self.frequency, self.next_date, window_start, window_end
+            )
+        if self.kind == "scheduled_expense":
+            return expand_scheduled_expense_dates(self, window_start, window_end)
+        return expand_recurring_expense_dates(self, window_start, window_end)
+
+
+@dataclass
+class _UserForecast:
+    window_start: date
+    generation: int | None
+    loaded_at: float
+    opening_cents: int
+    net: list[int]
+    closing: list[int]
+    month_in: dict[str, int]
+    month_out: dict[str, int]
+    relationship_rows: list[dict[str, Any]]
+    balance_set: bool
+    day_keys: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_result(
+        cls, result: ForecastResult, window_start: date, generation: int | None
+    ) -> _UserForecast:
+        daily = result.daily_cashflow
+        opening = _to_cents(daily[0]["opening_balance"]) if daily else 0
+        return cls(
+            window_start=window_start,
+            generation=generation,
+            loaded_at=time.monotonic(),
+            opening_cents=opening,
+            net=[_to_cents(r["net_change"]) for r in daily],
+            closing=[_to_cents(r["closing_balance"]) for r in daily],
+            month_in={m["month"]: _to_cents(m["total_income"]) for m in result.monthly_summaries},
+            month_out={m["month"]: _to_cents(m["total_expenses"]) for m in result.monthly_summaries},
+            relationship_rows=[
+                {
+                    "nickname": r["nickname"],
+                    "monthly_cost": r["monthly_cost"],
+                    "monthly_dec": _money(_d(r["monthly_cost"])),
+                    "card_type": r["card_type"],
+                    "emoji": r["emoji"],
+                }
+                for r in result.relationship_cost_breakdown
+            ],
+            balance_set=result.balance_set,
+            day_keys=[r["date"] for r in daily],
+        )
+
+    def apply(self, deltas: dict[int, int], income: dict[str, int], expense: dict[str, int]) -> None:
+        """Fold per-day net deltas in, then re-propagate closings from the first touched day."""
+        if not deltas:
+            return
+        for idx, cents in deltas.items():
+            self.net[idx] += cents
+        for month, cents in income.items():
+            self.month_in[month] = self.month_in.get(month, 0) + cents
+        for month, cents in expense.items():
+            self.month_out[month] = self.month_out.get(month, 0) + cents
+        start = min(deltas)
+        prev = self.closing[start - 1] if start > 0 else self.opening_cents
+        for i in range(start, len(self.net)):
+            prev += self.net[i]
+            self.closing[i] = prev
+
+    def to_result(self) -> ForecastResult:
+        daily: list[dict[str, Any]] = []
+        prev = self.opening_cents
+        for key, net, close in zip(self.day_keys, self.net, self.closing):
+            daily.append(
+                {
+                    "date": key,
+                    "opening_balance": prev / 100,
+                    "closing_balance": close / 100,
+                    "net_change": net / 100,
+                    "balance_status": classify_status(_from_cents(close)),
+                }
+            )
+            prev = close
+        summaries = generate_monthly_summaries(
+            daily,
+            month_income_by_month={k: _from_cents(v) for k, v in self.month_in.items()},
+            month_expense_by_month={k: _from_cents(v) for k, v in self.month_out.items()},
+        )
+        breakdown = _relationship_cost_breakdown(
+            self.relationship_rows,
+            _from_cents(sum(self.month_out.values())),
+            len(self.day_keys),
+        )
+        return ForecastResult(daily, summaries, breakdown, self.balance_set)
+
+
+class ForecastStore:
+    """Process-wide LRU of per-user forecasts that absorbs schedule edits incrementally."""
+
+    def __init__(
+        self,
+        ttl_seconds: int = FORECAST_STORE_TTL_SECONDS,
+        max_users: int = FORECAST_STORE_MAX_USERS,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._entries: OrderedDict[str, dict[int, _UserForecast]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        self._redis_checked = False
+        self.stats = {"hits": 0, "misses": 0, "deltas_applied": 0, "invalidations": 0}
+
+    # -- generation counter -------------------------------------------------
+
+    def _redis_client(self):
+        if not self._redis_checked:
+            self._redis_checked = True
+            try:
+                import redis
+
+                self._redis = redis.Redis.from_url(
+                    os.environ.get("REDIS_URL", "redis://localhost:6379/0"),
+                    decode_responses=True,
+                    socket_timeout=1,
+                )
+            except Exception as e:
+                logger.info("forecast_store: redis unavailable, using local entries only: %s", e)
+                self._redis = None
+        return self._redis
+
+    def _current_generation(self, user_id: str) -> int | None:
+        client = self._redis_client()
+        if client is None:
+            return None
+        try:
+            raw = client.get(f"{_GEN_KEY_PREFIX}{user_id}")
+            return int(raw) if raw is not None else 0
+        except Exception as e:
+            logger.warning("forecast_store: generation read failed for %s: %s", user_id, e)
+            return None
+
+    def _bump_generation(self, user_id: str) -> int | None:
+        client = self._redis_client()
+        if client is None:
+            return None
+        key = f"{_GEN_KEY_PREFIX}{user_id}"
+        try:
+            pipe = client.pipeline()
+            pipe.incr(key)
+            pipe.expire(key, _GEN_KEY_TTL)
+            return int(pipe.execute()[0])
+        except Exception as e:
+            logger.warning("forecast_store: generation bump failed for %s: %s", user_id, e)
+            return None
+
+    # -- public API ---------------------------------------------------------
+
+    def _is_fresh(self, entry: _UserForecast, today: date, generation: int | None) -> bool:
+        if entry.window_start != today:
+            return False
+        # The TTL bounds staleness from writers that neither apply deltas nor invalidate
+        if time.monotonic() - entry.loaded_at >= self.ttl_seconds:
+            return False
+        return generation is None or entry.generation == generation
+
+    def get_forecast(self, user_id: str, days: int = 90) -> ForecastResult:
+        """Return the user's forecast, rebuilding from the database only when stale."""
+        today = cash_forecast_service.date.today()
+        generation = self._current_generation(user_id)
+        with self._lock:
+            entry = self._entries.get(user_id, {}).get(days)
+            if entry is not None and self._is_fresh(entry, today, generation):
+                self._entries.move_to_end(user_id)
+                self.stats["hits"] += 1
+                return entry.to_result()
+        self.stats["misses"] += 1
+
+        result = build_forecast_for_user(user_id, days)
+        if not result.daily_cashflow:
+            return result
+        with self._lock:
+            self._entries.setdefault(user_id, {})[days] = _UserForecast.from_result(
+                result, today, generation
+            )
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+        return result
+
+    def apply_schedule_change(
+        self,
+        user_id: str,
+        before: ScheduleItem | None,
+        after: ScheduleItem | None,
+    ) -> None:
+        """
+        Apply one committed schedule edit to every cached window for ``user_id``.
+
+        ``before``/``after`` are snapshots taken around the edit (None for create or
+        deactivate). Other workers are told to rebuild via the generation counter.
+        """
+        if before == after:
+            return
+        generation = self._bump_generation(user_id)
+        with self._lock:
+            windows = self._entries.get(user_id)
+            if not windows:
+                return
+            if generation is not None and any(
+                e.generation is None or e.generation + 1 != generation for e in windows.values()
+            ):
+                # Another worker edited in between; our base is no longer trustworthy.
+                self._entries.pop(user_id, None)
+                self.stats["invalidations"] += 1
+                return
+            for entry in windows.values():
+                deltas, income, expense = self._item_deltas(entry, before, after)
+                entry.apply(deltas, income, expense)
+                entry.generation = generation
+            self.stats["deltas_applied"] += 1
+
+    def mark_incremental(self, row: Any) -> None:
+        """
+        Exempt a pending row from commit-time invalidation.
+
+        Call before committing an edit that will be passed to apply_schedule_change,
+        so the session listeners do not throw away the entry the delta applies to.
+        """
+        session = object_session(row)
+        if session is not None:
+            session.info.setdefault(_INCREMENTAL_ROWS_KEY, weakref.WeakSet()).add(row)
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop the user's cached windows here and in every other worker."""
+        self._bump_generation(user_id)
+        with self._lock:
+            self._entries.pop(user_id, None)
+        self.stats["invalidations"] += 1
+
+    def invalidate_email(self, email: str) -> None:
+        """invalidate() for the user owning ``email``; for raw-SQL user_profiles writers."""
+        if not email:
+            return
+        try:
+            with db.session.no_autoflush:
+                user_id = db.session.execute(
+                    select(User.user_id).where(func.lower(User.email) == email.strip().lower())
+                ).scalar()
+        except Exception as e:
+            logger.warning("forecast_store: user lookup failed for %s: %s", email, e)
+            return
+        if user_id is not None:
+            self.invalidate(str(user_id))
+
+    @staticmethod
+    def _item_deltas(
+        entry: _UserForecast, before: ScheduleItem | None, after: ScheduleItem | None
+    ) -> tuple[dict[int, int], dict[str, int], dict[str, int]]:
+        days = len(entry.day_keys)
+        window_end = entry.window_start + timedelta(days=days - 1)
+        deltas: dict[int, int] = {}
+        income: dict[str, int] = {}
+        expense: dict[str, int] = {}
+        for item, sign in ((before, -1), (after, 1)):
+            if item is None:
+                continue
+            cents = int(item.amount * 100) * sign
+            bucket = income if item.is_income else expense
+            for d0 in item.dates_in(entry.window_start, window_end):
+                idx = (d0 - entry.window_start).days
+                deltas[idx] = deltas.get(idx, 0) + (cents if item.is_income else -cents)
+                month = entry.day_keys[idx][:7]
+                bucket[month] = bucket.get(month, 0) + cents
+        return {k: v for k, v in deltas.items() if v}, income, expense
+
+
+forecast_store = ForecastStore()
+
+
+def _owner_db_ids(session: Session) -> set[int]:
+    """users.id of every forecast input row changed in the flush being processed"""
+    incremental = session.info.get(_INCREMENTAL_ROWS_KEY, ())
+    db_ids: set[int] = set()
+    person_ids: set[Any] = set()
+    modified = [obj for obj in session.dirty if session.is_modified(obj)]
+    for obj in chain(session.new, modified, session.deleted):
+        if obj in incremental:
+            continue
+        if isinstance(obj, _USER_OWNED_INPUTS):
+            if obj.user_id is not None:
+                db_ids.add(obj.user_id)
+        elif isinstance(obj, VibePersonAssessment) and obj.tracked_person_id is not None:
+            person_ids.add(obj.tracked_person_id)
+    if person_ids:
+        db_ids.update(
+            session.connection().execute(
+                select(VibeTrackedPerson.user_id).where(VibeTrackedPerson.id.in_(person_ids))
+            ).scalars()
+        )
+    return db_ids
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_forecast_writes(session: Session, flush_context) -> None:
+    db_ids = _owner_db_ids(session)
+    if not db_ids:
+        return
+    user_ids = session.connection().execute(
+        select(User.user_id).where(User.id.in_(db_ids))
+    ).scalars()
+    session.info.setdefault(_PENDING_USERS_KEY, set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_writes(session: Session) -> None:
+    session.info.pop(_INCREMENTAL_ROWS_KEY, None)
+    for user_id in session.info.pop(_PENDING_USERS_KEY, ()):
+        try:
+            forecast_store.invalidate(str(user_id))
+        except Exception as e:
+            logger.warning("forecast_store: invalidation failed for %s: %s", user_id, e)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back_writes(session: Session, previous_transaction) -> None:
+    if previous_transaction.nested:
+        return  # a savepoint; the outer transaction may still commit its writes
+    session.info.pop(_INCREMENTAL_ROWS_KEY, None)
+    session.info.pop(_PENDING_USERS_KEY, None)
@@ -16,14 +16,12 @@ Features:
 
 import logging
 import math
-import psycopg2
-import psycopg2.extras
-import os
 from datetime import datetime, timedelta, date
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 import json
+from backend.utils.pg_pool import get_pg_connection
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -81,17 +79,6 @@ class MaintenancePrediction:
     base_cost: float
     regional_adjustment: float
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    db_url = os.environ.get('DATABASE_URL')
-    if not db_url:
-        raise RuntimeError(
-            "DATABASE_URL is required. SQLite is not supported."
-        )
-    conn = psycopg2.connect(db_url)
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class MaintenancePredictionEngine:
     """
     Maintenance Prediction Engine for vehicle maintenance forecasting
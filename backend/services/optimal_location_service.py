@@ -14,9 +14,6 @@ Features:
 """
 
 import logging
-import psycopg2
-import psycopg2.extras
-import os
 import json
 import requests
 from datetime import datetime, timedelta
@@ -24,6 +21,7 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 import math
+from backend.utils.pg_pool import get_pg_connection
 
 # Import existing services
 from backend.services.vehicle_analytics_service import VehicleAnalyticsService
@@ -35,17 +33,6 @@ from backend.utils.location_utils import LocationValidator, LocationData
 # Configure logging
 logger = logging.getLogger(__name__)
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    db_url = os.environ.get('DATABASE_URL')
-    if not db_url:
-        raise RuntimeError(
-            "DATABASE_URL is required. SQLite is not supported."
-        )
-    conn = psycopg2.connect(db_url)
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class AffordabilityTier(Enum):
     """Affordability scoring tiers"""
     EXCELLENT = "excellent"
@@ -3,13 +3,15 @@
 
 from __future__ import annotations
 
+import json
 import logging
 import os
+from dataclasses import dataclass
 from datetime import date, timedelta
-from typing import Any
+from typing import Any, Iterator
 
 from dotenv import load_dotenv
-from plaid import Configuration, Environment
+from plaid import ApiException, Configuration, Environment
 from plaid.api import plaid_api
 from plaid.api_client import ApiClient
 from plaid.model.country_code import CountryCode
@@ -19,11 +21,35 @@ from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUse
 from plaid.model.products import Products
 from plaid.model.transactions_get_request import TransactionsGetRequest
 from plaid.model.transactions_get_request_options import TransactionsGetRequestOptions
+from plaid.model.transactions_sync_request import TransactionsSyncRequest
+from plaid.model.transactions_sync_request_options import TransactionsSyncRequestOptions
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+SYNC_PAGE_SIZE = 500
+SYNC_MAX_RESTARTS = 3
+_SYNC_MUTATION_ERROR = "TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION"
+
+
+@dataclass(frozen=True)
+class TransactionSyncPage:
+    """One /transactions/sync page; ``added``/``modified`` use the get_transactions row shape."""
+
+    added: list[dict[str, Any]]
+    modified: list[dict[str, Any]]
+    removed: list[str]
+    next_cursor: str
+    has_more: bool
+
+
+def _plaid_error_code(exc: ApiException) -> str | None:
+    try:
+        return json.loads(exc.body or "{}").get("error_code")
+    except (TypeError, ValueError):
+        return None
+
 
 def _resolve_plaid_environment() -> str:
     raw = (os.environ.get("PLAID_ENV") or "").strip().lower()
@@ -101,6 +127,53 @@ class PlaidService:
             logger.exception("Plaid get_transactions failed")
             raise
 
+    def iter_transaction_sync_pages(
+        self,
+        access_token: str,
+        cursor: str | None = None,
+        page_size: int = SYNC_PAGE_SIZE,
+    ) -> Iterator[TransactionSyncPage]:
+        """
+        Stream /transactions/sync pages from ``cursor`` (None = full history).
+
+        Pages are yielded one at a time so large histories never sit in memory.
+        If Plaid reports a mutation during pagination, the walk restarts from the
+        starting cursor; consumers must apply pages idempotently (upsert/delete).
+        """
+        start_cursor = cursor
+        restarts = 0
+        while True:
+            kwargs: dict[str, Any] = {
+                "access_token": access_token,
+                "count": page_size,
+                "options": TransactionsSyncRequestOptions(
+                    include_personal_finance_category=True
+                ),
+            }
+            if cursor:
+                kwargs["cursor"] = cursor
+            try:
+                response = self._client.transactions_sync(TransactionsSyncRequest(**kwargs))
+            except ApiException as exc:
+                if _plaid_error_code(exc) == _SYNC_MUTATION_ERROR and restarts < SYNC_MAX_RESTARTS:
+                    restarts += 1
+                    logger.info("Plaid sync mutated during pagination; restarting (%s)", restarts)
+                    cursor = start_cursor
+                    continue
+                logger.exception("Plaid transactions_sync failed")
+                raise
+            page = TransactionSyncPage(
+                added=[self._map_transaction(txn) for txn in response.added],
+                modified=[self._map_transaction(txn) for txn in response.modified],
+                removed=[r.transaction_id for r in response.removed],
+                next_cursor=response.next_cursor,
+                has_more=bool(response.has_more),
+            )
+            yield page
+            cursor = page.next_cursor
+            if not page.has_more:
+                return
+
     @staticmethod
     def _map_transaction(txn: Any) -> dict[str, Any]:
         amount = float(txn.amount)
@@ -7,11 +7,14 @@ Caches database query results to reduce database load
 import json
 import hashlib
 import logging
-from typing import Any, Optional, Callable
+from typing import Any, Optional, Callable, List
 from functools import wraps
 import redis
 from datetime import timedelta
 
+from backend.services.cache_codecs import PayloadCodec
+from backend.services.cache_tags import CacheTagIndex
+
 logger = logging.getLogger(__name__)
 
 class QueryCacheManager:
@@ -21,7 +24,7 @@ class QueryCacheManager:
     Features:
     - Automatic cache key generation
     - TTL-based expiration
-    - Cache invalidation patterns
+    - Tag-based invalidation (O(1) per tag)
     - Performance metrics
     """
     
@@ -36,6 +39,13 @@ class QueryCacheManager:
         self.redis = redis_client
         self.default_ttl = default_ttl
         self.cache_prefix = "query_cache:"
+        self.tags = CacheTagIndex(redis_client)
+        
+        # Binary clients get compact msgpack/zstd payloads; text-mode clients
+        # (decode_responses=True) can only carry JSON strings
+        pool = getattr(redis_client, 'connection_pool', None)
+        text_mode = bool(pool and pool.connection_kwargs.get('decode_responses'))
+        self.codec = None if text_mode else PayloadCodec.for_config("json", compression=True)
         
         # Metrics
         self.hits = 0
@@ -63,31 +73,33 @@ class QueryCacheManager:
         
         return f"{self.cache_prefix}{cache_hash}"
     
-    def get_cached_result(self, query_str: str, params: dict = None) -> Optional[Any]:
+    def get_cached_result(self, query_str: str, params: dict = None,
+                          tags: List[str] = None) -> Optional[Any]:
         """
         Get cached query result
         
         Args:
             query_str: SQL query string or function identifier
             params: Query parameters
+            tags: Tags the result was cached with (checked in the same round trip)
             
         Returns:
-            Cached result or None if not found
+            Cached result or None if not found or invalidated
         """
         try:
             cache_key = self._generate_cache_key(query_str, params)
-            cached = self.redis.get(cache_key)
+            cached = self.tags.fetch(cache_key, tags or ())
             
             if cached:
                 self.hits += 1
                 logger.debug(f"Cache HIT for query: {query_str[:100]}")
-                return json.loads(cached)
+                return self.decode(cached)
             else:
                 self.misses += 1
                 logger.debug(f"Cache MISS for query: {query_str[:100]}")
                 return None
                 
-        except json.JSONDecodeError as e:
+        except (ValueError, UnicodeDecodeError) as e:
             logger.warning(f"Error decoding cached result: {e}")
             self.misses += 1
             return None
@@ -101,7 +113,8 @@ class QueryCacheManager:
         query_str: str, 
         result: Any, 
         params: dict = None,
-        ttl: int = None
+        ttl: int = None,
+        tags: List[str] = None
     ):
         """
         Cache query result
@@ -111,16 +124,17 @@ class QueryCacheManager:
             result: Query result to cache
             params: Query parameters
             ttl: Time-to-live in seconds (uses default if not provided)
+            tags: Invalidation tags, e.g. ["user:123"]
         """
         try:
             cache_key = self._generate_cache_key(query_str, params)
             ttl = ttl or self.default_ttl
             
             # Serialize result
-            serialized = json.dumps(result, default=str)
+            serialized = self.encode(result)
             
             # Cache with TTL
-            self.redis.setex(cache_key, ttl, serialized)
+            self.redis.setex(cache_key, ttl, self.tags.stamp(serialized, tags or ()))
             
             logger.debug(f"Cached query result (TTL: {ttl}s): {query_str[:100]}")
             
@@ -129,16 +143,32 @@ class QueryCacheManager:
         except Exception as e:
             logger.error(f"Error caching result: {e}")
     
+    def invalidate_tags(self, *tags: str):
+        """
+        Invalidate every cached result carrying any of the given tags
+        
+        Args:
+            *tags: Tags such as 'user:123' or 'query:user_profile'
+        """
+        try:
+            self.tags.invalidate(*tags)
+            logger.info(f"Invalidated cache tags: {', '.join(tags)}")
+        except Exception as e:
+            logger.error(f"Error invalidating cache tags: {e}")
+    
     def invalidate_pattern(self, pattern: str):
         """
         Invalidate cache entries matching pattern
         
+        Keys are hashed, so this only matches raw key fragments and walks the
+        keyspace with SCAN; tag results and use invalidate_tags instead.
+        
         Args:
             pattern: Pattern to match (e.g., 'user_profile:*')
         """
         try:
             full_pattern = f"{self.cache_prefix}*{pattern}*"
-            keys = self.redis.keys(full_pattern)
+            keys = list(self.redis.scan_iter(match=full_pattern, count=500))
             
             if keys:
                 deleted = self.redis.delete(*keys)
@@ -170,6 +200,18 @@ class QueryCacheManager:
         except Exception as e:
             logger.error(f"Error clearing cache: {e}")
     
+    def encode(self, result: Any):
+        """Serialize a result for storage (codec payload, or JSON text in text mode)"""
+        if self.codec is None:
+            return json.dumps(result, default=str)
+        return self.codec.encode(result)
+    
+    def decode(self, cached: Any) -> Any:
+        """Inverse of encode; also reads JSON entries written before codecs"""
+        if self.codec is None:
+            return json.loads(cached)
+        return self.codec.decode(cached)
+    
     def get_stats(self) -> dict:
         """Get cache statistics"""
         total = self.hits + self.misses
@@ -179,7 +221,8 @@ class QueryCacheManager:
             'hits': self.hits,
             'misses': self.misses,
             'total': total,
-            'hit_rate': round(hit_rate, 2)
+            'hit_rate': round(hit_rate, 2),
+            'codec': self.codec.describe() if self.codec else {'serializer': 'json', 'compressor': 'none'}
         }
 
 
@@ -187,6 +230,9 @@ def cache_query(ttl: int = 300, key_prefix: str = ""):
     """
     Decorator to cache function results (typically database queries)
     
+    Results are tagged "query:<key_prefix or function name>", so
+    query_cache_manager.invalidate_tags("query:user_profile") drops them all.
+    
     Args:
         ttl: Time-to-live in seconds
         key_prefix: Prefix for cache key
@@ -211,13 +257,14 @@ def cache_query(ttl: int = 300, key_prefix: str = ""):
                 cache_key_data = f"{key_prefix}:{func.__name__}:{str(args)}:{str(kwargs)}"
                 cache_hash = hashlib.sha256(cache_key_data.encode()).hexdigest()
                 full_key = f"query_cache:{cache_hash}"
+                tags = [f"query:{key_prefix or func.__name__}"]
                 
                 # Try to get from cache
                 try:
-                    cached = cache_manager.redis.get(full_key)
+                    cached = cache_manager.tags.fetch(full_key, tags)
                     if cached:
                         logger.debug(f"Cache HIT for {func.__name__}")
-                        return json.loads(cached)
+                        return cache_manager.decode(cached)
                 except Exception as e:
                     logger.warning(f"Cache read error: {e}")
                 
@@ -226,8 +273,8 @@ def cache_query(ttl: int = 300, key_prefix: str = ""):
                 
                 # Cache result
                 try:
-                    serialized = json.dumps(result, default=str)
-                    cache_manager.redis.setex(full_key, ttl, serialized)
+                    serialized = cache_manager.encode(result)
+                    cache_manager.redis.setex(full_key, ttl, cache_manager.tags.stamp(serialized, tags))
                     logger.debug(f"Cached result for {func.__name__} (TTL: {ttl}s)")
                 except Exception as e:
                     logger.warning(f"Cache write error: {e}")
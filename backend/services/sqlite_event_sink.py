@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Batched writer for the business_intelligence.db SQLite event log.
+
+One sink per database file per process. Callers enqueue rows and return at once;
+a single writer thread owns a long-lived WAL-mode connection, runs schema setup
+once when it opens, and commits queued rows in batches. Because only that thread
+writes, concurrent request/worker threads never contend on the SQLite file lock
+for individual events.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_FLUSH_INTERVAL = 0.5
+DEFAULT_CAPACITY = 50000
+
+
+class SQLiteEventSink:
+    """
+    Queue + writer thread in front of one SQLite database file
+
+    Args:
+        path: Database file
+        schema: DDL statements run once on the writer's connection
+        batch_size: Commit as soon as this many rows are queued
+        flush_interval: Commit queued rows at least this often (seconds)
+        capacity: Maximum queued rows; further rows are dropped and counted
+    """
+
+    def __init__(self, path: str, schema: Iterable[str] = (),
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 capacity: int = DEFAULT_CAPACITY):
+        self.path = path
+        self.schema: List[str] = list(schema)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.capacity = capacity
+        self._queue: Deque[Tuple[str, tuple]] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._stopping = False
+        # Sequence numbers let flush() wait for exactly what was enqueued before it
+        self._enqueued_seq = 0
+        self._done_seq = 0
+        self._flush_waiters = 0
+        self._stats = self._new_stats()
+
+    @staticmethod
+    def _new_stats() -> Dict[str, Any]:
+        return {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "failed": 0,
+            "batches": 0,
+            "max_queue_depth": 0,
+            "last_batch_size": 0,
+            "last_commit_ms": 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def add_schema(self, *statements: str):
+        """Register DDL; applied by the writer before the next batch"""
+        with self._cond:
+            for statement in statements:
+                if statement not in self.schema:
+                    self.schema.append(statement)
+
+    def enqueue(self, sql: str, params: Sequence[Any]) -> bool:
+        """Queue one parameterized INSERT; False if dropped because the queue is full"""
+        self._ensure_thread()
+        with self._cond:
+            if len(self._queue) >= self.capacity:
+                self._stats["dropped"] += 1
+                if self._stats["dropped"] == 1 or self._stats["dropped"] % 1000 == 0:
+                    logger.warning(
+                        f"SQLite event queue full for {self.path}; {self._stats['dropped']} events dropped"
+                    )
+                return False
+            self._queue.append((sql, tuple(params)))
+            self._enqueued_seq += 1
+            self._stats["enqueued"] += 1
+            depth = len(self._queue)
+            if depth > self._stats["max_queue_depth"]:
+                self._stats["max_queue_depth"] = depth
+            if depth >= self.batch_size:
+                self._cond.notify_all()
+            return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything enqueued so far is committed; False on timeout"""
+        if self._thread is None or self._pid != os.getpid():
+            return True
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            target = self._enqueued_seq
+            self._flush_waiters += 1
+            self._cond.notify_all()
+            try:
+                while self._done_seq < target:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or self._thread is None:
+                        return False
+                    self._cond.wait(remaining)
+                return True
+            finally:
+                self._flush_waiters -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "path": self.path,
+                "queue_depth": len(self._queue),
+                **self._stats,
+            }
+
+    def close(self, timeout: float = 5.0):
+        """Commit what is queued and stop the writer thread"""
+        thread = self._thread
+        if thread is None or self._pid != os.getpid():
+            return
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        thread.join(timeout=timeout)
+
+    # ------------------------------------------------------------------
+    # Writer side
+    # ------------------------------------------------------------------
+
+    def _ensure_thread(self):
+        pid = os.getpid()
+        if self._pid is not None and self._pid != pid:
+            # Forked child: the writer thread and its connection stayed in the parent,
+            # and so do the counts of what the parent wrote
+            self._queue = deque()
+            self._cond = threading.Condition()
+            self._thread = None
+            self._enqueued_seq = self._done_seq = self._flush_waiters = 0
+            self._stats = self._new_stats()
+        if self._thread is not None:
+            return
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._pid = pid
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run, name="sqlite-event-sink", daemon=True
+            )
+            self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        # WAL lets admin/report readers run while the writer appends
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _run(self):
+        conn = None
+        schema_applied = 0
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.flush_interval
+                while (not self._stopping and len(self._queue) < self.batch_size
+                       and not (self._flush_waiters and self._queue)):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                stopping = self._stopping and not self._queue
+                schema = list(self.schema)
+
+            if batch:
+                try:
+                    if conn is None:
+                        conn = self._connect()
+                        schema_applied = 0
+                    if schema_applied < len(schema):
+                        # Schema setup runs once per connection, not per event
+                        with conn:
+                            for statement in schema[schema_applied:]:
+                                conn.execute(statement)
+                        schema_applied = len(schema)
+                    self._write(conn, batch)
+                except Exception as exc:
+                    logger.warning(f"SQLite event sink write to {self.path} failed: {exc}")
+                    with self._cond:
+                        self._stats["failed"] += len(batch)
+                    if conn is not None:
+                        try:
+                            conn.close()
+                        except Exception:
+                            pass
+                    conn = None
+                with self._cond:
+                    self._done_seq += len(batch)
+                    self._cond.notify_all()
+
+            if stopping:
+                if conn is not None:
+                    conn.close()
+                with self._cond:
+                    self._thread = None
+                    self._cond.notify_all()
+                return
+
+    def _write(self, conn: sqlite3.Connection, batch: List[Tuple[str, tuple]]):
+        """
+        Commit the batch in one transaction. If it fails, the rows are retried one
+        transaction each and only the rows that still fail are dropped and counted.
+        """
+        started = time.perf_counter()
+        try:
+            self._write_batch(conn, batch)
+            failed = 0
+        except sqlite3.Error as exc:
+            logger.warning(
+                f"SQLite event batch of {len(batch)} for {self.path} failed, retrying rows one by one: {exc}"
+            )
+            failed = 0
+            for sql, params in batch:
+                try:
+                    with conn:
+                        conn.execute(sql, params)
+                except sqlite3.Error as row_exc:
+                    logger.error(f"Dropping SQLite event for {self.path}: {row_exc}")
+                    failed += 1
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._cond:
+            self._stats["written"] += len(batch) - failed
+            self._stats["failed"] += failed
+            self._stats["batches"] += 1
+            self._stats["last_batch_size"] = len(batch)
+            self._stats["last_commit_ms"] = round(elapsed_ms, 3)
+
+    @staticmethod
+    def _write_batch(conn: sqlite3.Connection, batch: List[Tuple[str, tuple]]):
+        # Consecutive rows for the same statement go through one executemany
+        run_sql, run_params = None, []
+        with conn:
+            for sql, params in batch:
+                if sql != run_sql and run_params:
+                    conn.executemany(run_sql, run_params)
+                    run_params = []
+                run_sql = sql
+                run_params.append(params)
+            if run_params:
+                conn.executemany(run_sql, run_params)
+
+
+_sinks: Dict[str, SQLiteEventSink] = {}
+_sinks_lock = threading.Lock()
+
+
+def get_event_sink(path: str) -> SQLiteEventSink:
+    """The process-wide sink for a database file"""
+    path = os.path.abspath(path)
+    sink = _sinks.get(path)
+    if sink is not None:
+        return sink
+    with _sinks_lock:
+        sink = _sinks.get(path)
+        if sink is None:
+            sink = _sinks[path] = SQLiteEventSink(
+                path,
+                batch_size=int(os.environ.get("BI_EVENT_BATCH_SIZE", DEFAULT_BATCH_SIZE)),
+                flush_interval=float(os.environ.get("BI_EVENT_FLUSH_SECONDS", DEFAULT_FLUSH_INTERVAL)),
+            )
+        return sink
+
+
+def flush_all(timeout: float = 5.0) -> bool:
+    """Commit everything queued in every sink of this process"""
+    return all([sink.flush(timeout) for sink in list(_sinks.values())])
+
+
+def sink_stats() -> Dict[str, Dict[str, Any]]:
+    return {path: sink.stats() for path, sink in list(_sinks.items())}
+
+
+@atexit.register
+def _close_all():
+    for sink in list(_sinks.values()):
+        sink.close()
@@ -5,11 +5,12 @@ from __future__ import annotations
 
 import json
 import os
-import sqlite3
 from datetime import datetime, timezone
 
 from loguru import logger
 
+from backend.services.sqlite_event_sink import get_event_sink
+
 TRACKED_FEATURES = [
     "wellness_finance_correlation",
     "vehicle_analytics_dashboard",
@@ -29,6 +30,28 @@ TRACKED_FEATURES = [
 ]
 
 
+FEATURE_EVENTS_DDL = """
+    CREATE TABLE IF NOT EXISTS feature_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id TEXT,
+        event_type TEXT,
+        feature_name TEXT,
+        user_tier TEXT,
+        metadata TEXT,
+        session_id TEXT,
+        timestamp TEXT
+    )
+"""
+
+_INSERT_FEATURE_EVENT = """
+    INSERT INTO feature_events (
+        user_id, event_type, feature_name, user_tier,
+        metadata, session_id, timestamp
+    )
+    VALUES (?, ?, ?, ?, ?, NULL, ?)
+"""
+
+
 def _bi_db_path() -> str:
     root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     data_dir = os.path.join(root, "data")
@@ -36,11 +59,18 @@ def _bi_db_path() -> str:
     return os.path.join(data_dir, "business_intelligence.db")
 
 
+def _sink():
+    sink = get_event_sink(_bi_db_path())
+    sink.add_schema(FEATURE_EVENTS_DDL)
+    return sink
+
+
 class TelemetryService:
     @staticmethod
     def log_event(user_id, event_type, feature_name, metadata=None, user_tier=None):
         """
-        Insert a feature_events row. Never raises: failures are logged at warning.
+        Queue a feature_events row for the batched SQLite writer.
+        Never raises: failures are logged at warning.
         """
         try:
             meta_json = json.dumps(metadata) if metadata is not None else None
@@ -48,35 +78,19 @@ class TelemetryService:
             uid = str(user_id) if user_id is not None else None
             tier = str(user_tier) if user_tier is not None else None
 
-            path = _bi_db_path()
-            conn = sqlite3.connect(path)
-            try:
-                conn.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS feature_events (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id TEXT,
-                        event_type TEXT,
-                        feature_name TEXT,
-                        user_tier TEXT,
-                        metadata TEXT,
-                        session_id TEXT,
-                        timestamp TEXT
-                    )
-                    """
-                )
-                conn.execute(
-                    """
-                    INSERT INTO feature_events (
-                        user_id, event_type, feature_name, user_tier,
-                        metadata, session_id, timestamp
-                    )
-                    VALUES (?, ?, ?, ?, ?, NULL, ?)
-                    """,
-                    (uid, event_type, feature_name, tier, meta_json, ts),
-                )
-                conn.commit()
-            finally:
-                conn.close()
+            _sink().enqueue(
+                _INSERT_FEATURE_EVENT,
+                (uid, event_type, feature_name, tier, meta_json, ts),
+            )
         except Exception as exc:
             logger.warning("TelemetryService.log_event failed: {}", exc)
+
+    @staticmethod
+    def flush(timeout: float = 5.0) -> bool:
+        """Wait until queued events are committed (tests, shutdown hooks, reports)"""
+        return _sink().flush(timeout)
+
+    @staticmethod
+    def stats() -> dict:
+        """Queue depth, batch sizes, commit latency and dropped/failed counts"""
+        return _sink().stats()
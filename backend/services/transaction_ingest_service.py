@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Set-based ingestion of Plaid transaction rows into ``transactions``.
+
+Supports both the fixed-window pull (``bulk_upsert_transactions``) and cursor-based
+incremental sync (``sync_transactions_incremental``) against /transactions/sync.
+
+Rows (as returned by ``PlaidService.get_transactions``) are staged in batches; each
+batch costs one SELECT to classify rows against what is stored and one
+``INSERT ... ON CONFLICT (plaid_transaction_id) DO UPDATE`` for the rows that are new
+or changed. PostgreSQL is the production path; SQLite uses the same upsert syntax so
+tests exercise identical SQL semantics.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any, Iterable
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from backend.models.database import db
+from backend.models.transaction import Transaction
+
+if TYPE_CHECKING:
+    from backend.services.plaid_service import PlaidService
+
+logger = logging.getLogger(__name__)
+
+UPSERT_BATCH_SIZE = 500
+
+# Columns Plaid owns; user tags and created_at are never overwritten by a sync.
+_SYNCED_FIELDS = (
+    "amount",
+    "merchant",
+    "category",
+    "subcategory",
+    "date",
+    "is_debit",
+    "account_id",
+    "pending",
+)
+
+
+@dataclass
+class UpsertStats:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    pages: int = 0
+    changed_dates: set[date] = field(default_factory=set)
+
+    @property
+    def upserted(self) -> int:
+        return self.inserted + self.updated + self.unchanged
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "removed": self.removed,
+            "pages": self.pages,
+            "changed_dates": sorted(d.isoformat() for d in self.changed_dates),
+        }
+
+
+def _as_date(value: Any) -> date:
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _stage_row(user_id: int, row: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "plaid_transaction_id": row["plaid_transaction_id"],
+        "amount": row["amount"],
+        "merchant": row.get("merchant"),
+        "category": row.get("category"),
+        "subcategory": row.get("subcategory"),
+        "date": _as_date(row["date"]),
+        "is_debit": row["is_debit"],
+        "account_id": row.get("account_id"),
+        "pending": row.get("pending", False),
+    }
+
+
+def _insert_for_dialect():
+    name = db.session.get_bind().dialect.name
+    if name == "postgresql":
+        return pg_insert
+    if name == "sqlite":
+        return sqlite_insert
+    raise NotImplementedError(f"bulk transaction upsert not supported on {name!r}")
+
+
+def _upsert_batch(staged: list[dict[str, Any]]) -> None:
+    insert = _insert_for_dialect()
+    tbl = Transaction.__table__
+    stmt = insert(tbl).values(staged)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[tbl.c.plaid_transaction_id],
+        set_={name: stmt.excluded[name] for name in _SYNCED_FIELDS},
+    )
+    db.session.execute(stmt)
+
+
+def bulk_upsert_transactions(
+    user_id: int,
+    rows: Iterable[dict[str, Any]],
+    batch_size: int = UPSERT_BATCH_SIZE,
+) -> UpsertStats:
+    """
+    Insert or update Plaid rows for ``user_id`` with one upsert statement per batch.
+
+    Rows identical to what is stored are skipped. ``changed_dates`` holds every date
+    whose totals moved: the date of new rows, and both old and new dates of updated rows.
+    The caller owns the transaction (commit/rollback).
+    """
+    # Later duplicates of the same plaid_transaction_id win, as with the per-row loop.
+    staged_by_id: dict[str, dict[str, Any]] = {}
+    for row in rows:
+        staged = _stage_row(user_id, row)
+        staged_by_id[staged["plaid_transaction_id"]] = staged
+    staged_rows = list(staged_by_id.values())
+
+    stats = UpsertStats()
+    for start in range(0, len(staged_rows), batch_size):
+        batch = staged_rows[start:start + batch_size]
+        ids = [r["plaid_transaction_id"] for r in batch]
+        existing = {
+            r.plaid_transaction_id: r
+            for r in db.session.query(
+                Transaction.plaid_transaction_id,
+                *(getattr(Transaction, name) for name in _SYNCED_FIELDS),
+            )
+            .filter(Transaction.plaid_transaction_id.in_(ids))
+            .all()
+        }
+
+        pending: list[dict[str, Any]] = []
+        for staged in batch:
+            current = existing.get(staged["plaid_transaction_id"])
+            if current is None:
+                stats.inserted += 1
+                stats.changed_dates.add(staged["date"])
+                pending.append(staged)
+            elif any(getattr(current, name) != staged[name] for name in _SYNCED_FIELDS):
+                stats.updated += 1
+                stats.changed_dates.add(staged["date"])
+                stats.changed_dates.add(current.date)
+                pending.append(staged)
+            else:
+                stats.unchanged += 1
+
+        if pending:
+            _upsert_batch(pending)
+
+    logger.info(
+        "bulk_upsert_transactions user_id=%s inserted=%s updated=%s unchanged=%s",
+        user_id,
+        stats.inserted,
+        stats.updated,
+        stats.unchanged,
+    )
+    return stats
+
+
+def delete_removed_transactions(
+    user_id: int, plaid_transaction_ids: list[str]
+) -> tuple[int, set[date]]:
+    """Delete rows Plaid reported as removed; return (rows deleted, dates they were on)."""
+    if not plaid_transaction_ids:
+        return 0, set()
+    query = Transaction.query.filter(
+        Transaction.user_id == user_id,
+        Transaction.plaid_transaction_id.in_(plaid_transaction_ids),
+    )
+    dates = [row.date for row in query.with_entities(Transaction.date).all()]
+    if dates:
+        query.delete(synchronize_session=False)
+    return len(dates), set(dates)
+
+
+def sync_transactions_incremental(user: Any, service: PlaidService) -> UpsertStats:
+    """
+    Cursor-based sync: apply only what changed since ``user.plaid_sync_cursor``.
+
+    Each page's upserts, deletions and the advanced cursor commit together, so a
+    crash resumes from the last fully applied page. Replayed pages are harmless
+    because upserts and deletions are idempotent.
+    """
+    stats = UpsertStats()
+    for page in service.iter_transaction_sync_pages(
+        user.plaid_access_token, cursor=user.plaid_sync_cursor
+    ):
+        page_stats = bulk_upsert_transactions(user.id, page.added + page.modified)
+        removed, removed_dates = delete_removed_transactions(user.id, page.removed)
+        user.plaid_sync_cursor = page.next_cursor
+        user.plaid_last_synced_at = datetime.utcnow()
+        db.session.commit()
+
+        stats.pages += 1
+        stats.inserted += page_stats.inserted
+        stats.updated += page_stats.updated
+        stats.unchanged += page_stats.unchanged
+        stats.removed += removed
+        stats.changed_dates |= page_stats.changed_dates | removed_dates
+
+    logger.info(
+        "sync_transactions_incremental user_id=%s pages=%s %s",
+        user.id,
+        stats.pages,
+        stats.to_dict(),
+    )
+    return stats
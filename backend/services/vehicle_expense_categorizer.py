@@ -13,15 +13,13 @@ Features:
 
 import logging
 import re
-import psycopg2
-import psycopg2.extras
-import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 import json
 import math
+from backend.utils.pg_pool import get_pg_connection
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -63,17 +61,6 @@ class MaintenanceComparison:
     prediction_accuracy: str
     recommendation: str
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    db_url = os.environ.get('DATABASE_URL')
-    if not db_url:
-        raise RuntimeError(
-            "DATABASE_URL is required. SQLite is not supported."
-        )
-    conn = psycopg2.connect(db_url)
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class VehicleExpenseCategorizer:
     """
     Advanced vehicle expense categorization system using ML and pattern matching
@@ -13,13 +13,11 @@ Features:
 """
 
 import logging
-import psycopg2
-import psycopg2.extras
-import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 import json
+from backend.utils.pg_pool import get_pg_connection
 
 # Import all the services
 from backend.services.enhanced_vehicle_expense_ml_engine import EnhancedVehicleExpenseMLEngine
@@ -60,17 +58,6 @@ class VehicleExpenseRecommendation:
     timeline: str
     supporting_data: Dict[str, Any]
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    db_url = os.environ.get('DATABASE_URL')
-    if not db_url:
-        raise RuntimeError(
-            "DATABASE_URL is required. SQLite is not supported."
-        )
-    conn = psycopg2.connect(db_url)
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class VehicleExpenseIntegrationService:
     """
     Integration service that combines all vehicle expense functionality
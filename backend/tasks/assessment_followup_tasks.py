@@ -40,11 +40,9 @@ def _minimal_task_app():
 
 
 def _fetch_assessment_context(assessment_id: int) -> dict | None:
-    import psycopg2
-    import psycopg2.extras
+    from backend.utils.pg_pool import get_pg_connection
 
-    conn = psycopg2.connect(os.environ["DATABASE_URL"])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
+    conn = get_pg_connection()
     try:
         with conn.cursor() as cur:
             cur.execute(
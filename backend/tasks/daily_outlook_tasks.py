@@ -25,7 +25,7 @@ import pytz
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 # Celery imports
-from celery import Celery
+from celery import Celery, chord
 from celery.exceptions import Retry
 from celery.utils.log import get_task_logger
 
@@ -33,6 +33,7 @@ from celery.utils.log import get_task_logger
 from backend.services.daily_outlook_content_service import DailyOutlookContentService
 from backend.services.daily_outlook_service import DailyOutlookService
 from backend.models.daily_outlook import DailyOutlook
+from backend.models.database import db
 from backend.models.user_models import User
 
 # Configure logging
@@ -78,18 +79,34 @@ def make_celery(app=None):
 # Create Celery app
 celery_app = make_celery()
 
+# Nightly batch fan-out: users per chunk task, and whether to shard at all.
+OUTLOOK_CHUNK_SIZE = int(os.environ.get('DAILY_OUTLOOK_CHUNK_SIZE', '200'))
+OUTLOOK_FAN_OUT = os.environ.get('DAILY_OUTLOOK_FAN_OUT', 'true').lower() in ('1', 'true', 'yes')
+# Cap on per-user error strings carried back through the chord result.
+OUTLOOK_MAX_ERRORS = 50
+
 @celery_app.task(bind=True, max_retries=3, default_retry_delay=300)
-def generate_daily_outlooks_batch(self, target_date: str = None, force_regenerate: bool = False):
+def generate_daily_outlooks_batch(self, target_date: str = None, force_regenerate: bool = False,
+                                  fan_out: Optional[bool] = None, chunk_size: Optional[int] = None):
     """
     Pre-generate daily outlooks for all active users.
     Runs every night at 5:00 AM UTC.
     
+    With fan-out enabled (default), users that already have an outlook are
+    excluded with one query and the rest are split into chunks of
+    ``chunk_size`` user IDs, dispatched as a Celery chord of
+    ``generate_daily_outlook_chunk`` tasks whose stats are aggregated by
+    ``aggregate_daily_outlook_chunks``. Otherwise users are processed serially
+    in this task.
+    
     Args:
         target_date: Date to generate outlooks for (YYYY-MM-DD format, defaults to tomorrow)
         force_regenerate: If True, regenerate even if outlooks already exist
+        fan_out: Shard across workers (defaults to DAILY_OUTLOOK_FAN_OUT)
+        chunk_size: User IDs per chunk task (defaults to DAILY_OUTLOOK_CHUNK_SIZE)
         
     Returns:
-        Dict containing generation results and statistics
+        Dict containing generation results and statistics (dispatch summary when fanned out)
     """
     task_id = self.request.id
     celery_logger.info(f"Starting daily outlook batch generation task {task_id}")
@@ -101,6 +118,11 @@ def generate_daily_outlooks_batch(self, target_date: str = None, force_regenerat
         else:
             target_date_obj = date.today() + timedelta(days=1)  # Tomorrow
         
+        if OUTLOOK_FAN_OUT if fan_out is None else fan_out:
+            return _dispatch_outlook_chunks(
+                task_id, target_date_obj, force_regenerate, chunk_size or OUTLOOK_CHUNK_SIZE
+            )
+        
         # Initialize services
         content_service = DailyOutlookContentService()
         outlook_service = DailyOutlookService()
@@ -191,6 +213,129 @@ def generate_daily_outlooks_batch(self, target_date: str = None, force_regenerat
             'target_date': target_date_obj.isoformat() if 'target_date_obj' in locals() else None
         }
 
+def _dispatch_outlook_chunks(task_id: str, target_date_obj: date, force_regenerate: bool,
+                             chunk_size: int) -> Dict[str, Any]:
+    """Split pending users into chunks and fan them out as a chord."""
+    active_user_ids = _get_active_user_ids()
+    if force_regenerate:
+        existing_ids = set()
+    else:
+        # One query for everyone who already has an outlook, instead of one per user
+        existing_ids = {
+            row.user_id for row in db.session.query(DailyOutlook.user_id).filter(
+                DailyOutlook.date == target_date_obj
+            ).all()
+        }
+    pending_ids = [uid for uid in active_user_ids if uid not in existing_ids]
+    chunk_size = max(1, chunk_size)
+    chunks = [pending_ids[i:i + chunk_size] for i in range(0, len(pending_ids), chunk_size)]
+    
+    summary = {
+        'success': True,
+        'target_date': target_date_obj.isoformat(),
+        'task_id': task_id,
+        'total_users': len(active_user_ids),
+        'skipped_count': len(active_user_ids) - len(pending_ids),
+        'pending_count': len(pending_ids),
+        'chunk_count': len(chunks),
+        'chunk_size': chunk_size,
+    }
+    if not chunks:
+        summary['generated_count'] = 0
+        summary['failed_count'] = 0
+        return summary
+    
+    target = target_date_obj.isoformat()
+    result = chord(
+        generate_daily_outlook_chunk.s(chunk, target) for chunk in chunks
+    )(aggregate_daily_outlook_chunks.s(summary))
+    summary['aggregate_task_id'] = result.id
+    celery_logger.info(f"Dispatched {len(pending_ids)} users in {len(chunks)} outlook chunks "
+                       f"({summary['skipped_count']} already had outlooks)")
+    return summary
+
+@celery_app.task(bind=True, max_retries=2, default_retry_delay=60)
+def generate_daily_outlook_chunk(self, user_ids: List[int], target_date: str):
+    """
+    Generate outlooks for one chunk of users and bulk-insert them.
+    
+    A chunk that cannot save anything (database unreachable) is retried with
+    exponential backoff; once retries are exhausted it reports every user as
+    failed instead of raising, so the chord callback still runs.
+    
+    Returns:
+        Per-chunk stats: generated_count, failed_count, errors, duration_seconds
+    """
+    started = datetime.utcnow()
+    try:
+        target_date_obj = datetime.strptime(target_date, '%Y-%m-%d').date()
+        content_service = DailyOutlookContentService()
+        
+        outlooks: List[Dict[str, Any]] = []
+        errors: List[str] = []
+        try:
+            # One set-based pass for every user's pillar scores and weights
+            content_service.daily_outlook_service.prime_balance_scores(user_ids, target_date_obj)
+        except Exception as e:
+            celery_logger.warning(f"Batch balance scoring failed, falling back to per-user queries: {e}")
+        for user_id in user_ids:
+            try:
+                outlook_data = content_service.generate_daily_outlook(user_id, save=False)
+                outlook_data['date'] = target_date_obj
+                outlook_data['user_id'] = user_id
+                outlooks.append(outlook_data)
+            except Exception as e:
+                errors.append(f"Error generating outlook for user {user_id}: {str(e)}")
+        
+        saved = content_service._save_daily_outlooks_bulk(outlooks)
+        if outlooks and saved == 0:
+            raise RuntimeError(f"Failed to save any of {len(outlooks)} outlooks")
+        if saved < len(outlooks):
+            errors.append(f"Failed to save {len(outlooks) - saved} of {len(outlooks)} outlooks")
+        
+    except Exception as exc:
+        celery_logger.error(f"Outlook chunk of {len(user_ids)} users failed: {exc}")
+        
+        # Retry logic
+        if self.request.retries < self.max_retries:
+            celery_logger.info(f"Retrying outlook chunk (attempt {self.request.retries + 1})")
+            raise self.retry(countdown=60 * (2 ** self.request.retries))  # Exponential backoff
+        
+        # Final failure
+        saved = 0
+        errors = [f"Outlook chunk failed after {self.request.retries} retries: {exc}"]
+    
+    stats = {
+        'chunk_users': len(user_ids),
+        'generated_count': saved,
+        'failed_count': len(user_ids) - saved,
+        'errors': errors[:OUTLOOK_MAX_ERRORS],
+        'duration_seconds': (datetime.utcnow() - started).total_seconds(),
+    }
+    celery_logger.info(f"Outlook chunk done: {saved}/{len(user_ids)} generated "
+                       f"in {stats['duration_seconds']:.1f}s")
+    return stats
+
+@celery_app.task
+def aggregate_daily_outlook_chunks(chunk_results: List[Dict[str, Any]], summary: Dict[str, Any]):
+    """Chord callback: fold per-chunk stats into the batch result."""
+    results = dict(summary)
+    results['generated_count'] = sum(r.get('generated_count', 0) for r in chunk_results)
+    results['failed_count'] = sum(r.get('failed_count', 0) for r in chunk_results)
+    durations = [r.get('duration_seconds', 0.0) for r in chunk_results]
+    results['max_chunk_seconds'] = max(durations) if durations else 0.0
+    results['total_chunk_seconds'] = sum(durations)
+    errors: List[str] = []
+    for r in chunk_results:
+        errors.extend(r.get('errors', []))
+    results['errors'] = errors[:OUTLOOK_MAX_ERRORS]
+    results['success'] = results['failed_count'] == 0
+    
+    celery_logger.info(f"Daily outlook generation completed: {results['generated_count']} generated, "
+                       f"{results['skipped_count']} skipped, {results['failed_count']} failed "
+                       f"across {len(chunk_results)} chunks")
+    return results
+
 @celery_app.task(bind=True, max_retries=2, default_retry_delay=60)
 def send_daily_outlook_notifications(self, target_date: str = None):
     """
@@ -385,6 +530,19 @@ def _get_active_users() -> List[User]:
         celery_logger.error(f"Error getting active users: {e}")
         return []
 
+def _get_active_user_ids() -> List[int]:
+    """IDs of active users (same criteria as _get_active_users, without loading rows)"""
+    try:
+        cutoff_date = datetime.utcnow() - timedelta(days=30)
+        return [
+            row.id for row in db.session.query(User.id).filter(
+                User.last_activity >= cutoff_date
+            ).order_by(User.id).all()
+        ]
+    except Exception as e:
+        celery_logger.error(f"Error getting active user ids: {e}")
+        return []
+
 def _get_users_for_notification(target_date: date) -> List[Dict[str, Any]]:
     """Get users who should receive notifications for the target date"""
     try:
@@ -728,16 +886,29 @@ def generate_daily_outlooks(self, target_date: str = None, force_regenerate: boo
         result = generate_daily_outlooks_batch(target_date, force_regenerate)
         
         celery_logger.info(f"Daily outlook generation task {task_id} completed successfully")
-        return {
+        response = {
             'status': 'success',
             'task_id': task_id,
-            'generated_count': result.get('generated_count', 0),
             'skipped_count': result.get('skipped_count', 0),
-            'error_count': result.get('error_count', 0),
             'target_date': target_date or (date.today() + timedelta(days=1)).isoformat(),
             'completion_time': datetime.utcnow().isoformat(),
             'task_type': 'generate_daily_outlooks'
         }
+        if result.get('chunk_count'):
+            # Fanned out: the chunks are still running, so report what was
+            # dispatched; the chord callback carries the final counts
+            response.update({
+                'status': 'dispatched',
+                'dispatched_chunks': result.get('chunk_count', 0),
+                'scheduled_users': result.get('pending_count', 0),
+                'aggregate_task_id': result.get('aggregate_task_id'),
+            })
+        else:
+            response.update({
+                'generated_count': result.get('generated_count', 0),
+                'error_count': result.get('error_count', 0),
+            })
+        return response
         
     except Exception as exc:
         celery_logger.error(f"Daily outlook generation task {task_id} failed: {exc}")
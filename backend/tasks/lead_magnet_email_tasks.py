@@ -5,10 +5,8 @@ from __future__ import annotations
 
 import hashlib
 import json
-import os
 
-import psycopg2
-import psycopg2.extras
+from backend.utils.pg_pool import get_pg_connection
 from loguru import logger
 
 from backend.celery import celery
@@ -40,9 +38,7 @@ def _minimal_task_app():
 
 
 def _get_db_connection():
-    conn = psycopg2.connect(os.environ["DATABASE_URL"])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
+    return get_pg_connection()
 
 
 def _is_duplicate_submission(email: str, assessment_type: str) -> bool:
@@ -4,55 +4,58 @@
 from __future__ import annotations
 
 import logging
+import os
 
 from loguru import logger
 
 from backend.celery import celery
 from backend.models.database import db
-from backend.models.transaction import Transaction
 from backend.models.user_models import User
 from backend.services.plaid_service import plaid_service
+from backend.services.transaction_ingest_service import (
+    bulk_upsert_transactions,
+    sync_transactions_incremental,
+)
 
 _log = logging.getLogger(__name__)
 
+# "cursor" (default): /transactions/sync from the stored per-user cursor.
+# "window": legacy fixed 30-day re-download via /transactions/get.
+PLAID_SYNC_MODE = os.environ.get("PLAID_SYNC_MODE", "cursor").strip().lower()
+
 
 def _upsert_transactions(user_id: int, access_token: str) -> int:
     if plaid_service is None:
         return 0
 
     rows = plaid_service.get_transactions(access_token, days_back=30)
-    upserted = 0
-    for row in rows:
-        existing = Transaction.query.filter_by(
-            plaid_transaction_id=row["plaid_transaction_id"]
-        ).first()
-        if existing is not None:
-            existing.amount = row["amount"]
-            existing.merchant = row.get("merchant")
-            existing.category = row.get("category")
-            existing.subcategory = row.get("subcategory")
-            existing.date = row["date"]
-            existing.is_debit = row["is_debit"]
-            existing.account_id = row.get("account_id")
-            existing.pending = row.get("pending", False)
-        else:
-            db.session.add(
-                Transaction(
-                    user_id=user_id,
-                    plaid_transaction_id=row["plaid_transaction_id"],
-                    amount=row["amount"],
-                    merchant=row.get("merchant"),
-                    category=row.get("category"),
-                    subcategory=row.get("subcategory"),
-                    date=row["date"],
-                    is_debit=row["is_debit"],
-                    account_id=row.get("account_id"),
-                    pending=row.get("pending", False),
-                )
-            )
-        upserted += 1
+    stats = bulk_upsert_transactions(user_id, rows)
     db.session.commit()
-    return upserted
+    _enqueue_balance_recompute(user_id, stats.changed_dates)
+    return stats.upserted
+
+
+def _enqueue_balance_recompute(user_id: int, dates) -> None:
+    """Recompute daily balances only for dates whose transactions actually changed."""
+    for d in sorted(dates):
+        try:
+            recompute_daily_balance.delay(user_id, d.isoformat())
+        except Exception as exc:
+            _log.warning(
+                "recompute_daily_balance dispatch failed user_id=%s date=%s: %s",
+                user_id,
+                d,
+                exc,
+            )
+
+
+def _sync_transactions_incremental(user: User) -> int:
+    if plaid_service is None:
+        return 0
+
+    stats = sync_transactions_incremental(user, plaid_service)
+    _enqueue_balance_recompute(user.id, stats.changed_dates)
+    return stats.upserted + stats.removed
 
 
 def _sync_transactions_worker(user_id: int) -> None:
@@ -60,7 +63,10 @@ def _sync_transactions_worker(user_id: int) -> None:
     if user is None or not user.plaid_access_token:
         return
     try:
-        _upsert_transactions(user_id, user.plaid_access_token)
+        if PLAID_SYNC_MODE == "window":
+            _upsert_transactions(user_id, user.plaid_access_token)
+        else:
+            _sync_transactions_incremental(user)
     except Exception:
         db.session.rollback()
         logger.exception("sync_user_transactions failed user_id=%s", user_id)
@@ -69,7 +75,7 @@ def _sync_transactions_worker(user_id: int) -> None:
 
 @celery.task(name="sync_user_transactions")
 def sync_user_transactions(user_id: int) -> None:
-    """Fetch last 30 days of Plaid transactions and upsert into Transaction table."""
+    """Sync Plaid transactions since the user's stored cursor into the Transaction table."""
     try:
         from backend.tasks.spirit_reminder import _minimal_task_app; flask_app = _minimal_task_app()
 
@@ -114,7 +120,9 @@ def recompute_daily_balance(self, user_id: int, date_str: str):
     Sums all quick_spend_entries for user on date_str.
     Looks up that date in daily_cashflow (if the table exists).
     Subtracts quick spend total from closing_balance for that day.
-    Writes updated value back.
+    Writes updated value back and shifts opening/closing of every later
+    day by the same delta (one set-based UPDATE), so later days never
+    keep a stale closing balance.
 
     If daily_cashflow table does not exist or has no row for
     this date: log info and return without error.
@@ -157,7 +165,7 @@ def _recompute_daily_balance_impl(user_id: int, date_str: str) -> None:
         row = db.session.execute(
             text(
                 """
-                SELECT id, closing_balance
+                SELECT id, opening_balance, closing_balance
                 FROM daily_cashflow
                 WHERE user_id = :uid AND date = :dt
                 LIMIT 1
@@ -184,6 +192,9 @@ def _recompute_daily_balance_impl(user_id: int, date_str: str) -> None:
         )
         return
 
+    new_closing = float(row.opening_balance or 0) - quick_spend_total
+    carry = round(new_closing - float(row.closing_balance or 0), 2)
+
     db.session.execute(
         text(
             """
@@ -194,11 +205,25 @@ def _recompute_daily_balance_impl(user_id: int, date_str: str) -> None:
         ),
         {"spent": quick_spend_total, "row_id": row.id},
     )
+    if carry:
+        db.session.execute(
+            text(
+                """
+                UPDATE daily_cashflow
+                SET opening_balance = opening_balance + :carry,
+                    closing_balance = closing_balance + :carry
+                WHERE user_id = :uid AND date > :dt
+                """
+            ),
+            {"carry": carry, "uid": user_id, "dt": target_date},
+        )
     db.session.commit()
 
     current_app.logger.info(
-        "recompute_daily_balance: user %s date %s quick_spend_total=%s applied",
+        "recompute_daily_balance: user %s date %s quick_spend_total=%s "
+        "carried %s forward",
         user_id,
         date_str,
         quick_spend_total,
+        carry,
     )
@@ -7,7 +7,9 @@ import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from celery import Celery
+from celery.signals import worker_process_shutdown
 
+from backend.services.sqlite_event_sink import flush_all
 from backend.services.telemetry_service import TelemetryService
 
 
@@ -38,8 +40,15 @@ def make_celery(app=None):
 celery_app = make_celery()
 
 
-@celery_app.task(name="log_telemetry_event")
+@celery_app.task(name="log_telemetry_event", ignore_result=True)
 def log_telemetry_event(user_id, event_type, feature_name, metadata, user_tier):
+    # Queues onto the worker process's batched SQLite sink; no per-event commit
     TelemetryService.log_event(
         user_id, event_type, feature_name, metadata=metadata, user_tier=user_tier
     )
+
+
+@worker_process_shutdown.connect
+def _flush_telemetry_sink(**kwargs):
+    # Prefork children can exit without running atexit handlers
+    flush_all()
@@ -8,8 +8,7 @@ import os
 import uuid
 from typing import Any
 
-import psycopg2
-import psycopg2.extras
+from backend.utils.pg_pool import get_pg_connection
 from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
 from loguru import logger
 
@@ -19,12 +18,7 @@ from backend.services.email_service import EmailService
 
 def _get_db_connection():
     """PostgreSQL connection (same pattern as backend/api/resume_endpoints.py)."""
-    db_url = os.environ.get("DATABASE_URL")
-    if not db_url:
-        raise RuntimeError("DATABASE_URL is required. SQLite is not supported.")
-    conn = psycopg2.connect(db_url)
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
+    return get_pg_connection()
 
 
 def _lead_id_uuid(lead_id: str) -> uuid.UUID | None:
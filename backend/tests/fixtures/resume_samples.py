@@ -0,0 +1,130 @@
+"""
+Sample resume texts for resume parser equivalence tests and benchmarks.
+"""
+
+import random
+
+SAMPLE_RESUMES = [
+    """
+    JORDAN ELLIS
+    Senior Software Engineer | Atlanta, GA
+
+    EXPERIENCE
+    Senior Software Engineer, Fintech Co (2019 - Present)
+    - Led a team of 6 developers building React and Node.js services
+    - Architected payment APIs in Python and Java; managed AWS infrastructure
+    - Mentored junior engineers and drove agile / scrum ceremonies
+
+    Software Engineer, Retail Corp (2015 - 2019)
+    - Built data pipelines with SQL, Spark and Tableau dashboards
+    - Implemented CI/CD with Docker and Kubernetes
+
+    EDUCATION
+    B.S. Computer Science, Georgia Tech, 2015
+    SKILLS: python, javascript, sql, react, node, docker, aws, excel, power bi
+    """,
+    """
+    Data Analyst with 4 years of experience in healthcare analytics.
+    Data Analyst - Regional Health (2020-2024): built excel and tableau reports,
+    sql queries against the claims warehouse, r and python for statistical analysis.
+    Business Analyst - Consulting LLC (2018-2020): requirements, process improvement,
+    stakeholder communication, crm administration in salesforce.
+    Education: M.S. Statistics 2018. Certifications: pmp (2021).
+    """,
+    """
+    Marketing Manager | Brand strategy, digital campaigns, content marketing
+    Marketing Manager, Beauty Brand (2017–Present): managed a $2M budget, led a team of 8,
+    launched e-commerce campaigns, grew revenue 35%.
+    Marketing Coordinator, Agency (2013–2017): social media, seo, google analytics,
+    collaborated with sales and product teams. Presentation and negotiation skills.
+    Volunteer: mentoring program director, 2019.
+    """,
+    """
+    Director of Operations — Nonprofit Sector
+    Director, Community Programs (2012 - 2022): strategic planning, budget management,
+    board relations, grant writing; oversaw a staff of 25 and chief of staff duties.
+    Project Manager (2008 - 2012): waterfall and agile delivery, vendor management.
+    Finance specialist background; hr coordinator for onboarding. Ph.D. Public Policy, 2008.
+    """,
+    """
+    entry-level developer, bootcamp graduate 2023. projects: todo.js app, portfolio at
+    jordan.dev, api.py scripts, asp.net intro. internship: junior developer (summer 2022).
+    skills: javascript, html, css, git, sql. eager to learn, strong communication.
+    """,
+]
+
+# Building blocks for full-length resumes; realistic_resumes() assembles them
+_SUMMARIES = [
+    "Results-driven professional with a track record of leading cross-functional teams, "
+    "improving processes and delivering measurable business outcomes.",
+    "Analytical problem solver experienced in stakeholder communication, strategic thinking "
+    "and turning data into decisions for executive audiences.",
+    "Hands-on engineer who enjoys mentoring, building reliable systems and collaborating "
+    "with product, design and operations partners.",
+    "Client-focused leader with experience in healthcare, finance and technology organizations, "
+    "known for adaptability, teamwork and critical thinking.",
+]
+_ROLES = [
+    "Senior Data Analyst", "Data Analyst", "Business Analyst", "Software Engineer",
+    "Senior Software Engineer", "Lead Developer", "Project Manager", "Marketing Manager",
+    "Marketing Coordinator", "Finance Specialist", "Operations Manager", "Director of Operations",
+    "HR Coordinator", "Sales Manager", "Product Manager", "Principal Engineer",
+]
+_EMPLOYERS = [
+    "Regional Health System", "Fintech Co", "Retail Corp", "Consulting LLC", "State Government",
+    "Beauty Brand", "Community Programs", "Logistics Partners", "University Medical Center",
+    "Media Group", "Real Estate Trust", "Manufacturing Inc",
+]
+_BULLETS = [
+    "Built excel and tableau dashboards used by 40 managers for weekly performance reviews",
+    "Wrote sql queries and python scripts against the claims warehouse to automate reporting",
+    "Led a team of 6 developers delivering react and node.js services with agile and scrum",
+    "Managed a $2M budget and negotiated vendor contracts, reducing costs by 18%",
+    "Mentored junior analysts and coordinated onboarding for new hires across three offices",
+    "Implemented CI/CD pipelines with Docker and Kubernetes, cutting release time in half",
+    "Developed forecasting models in python and r; presented results to the executive team",
+    "Oversaw waterfall and agile project delivery for a portfolio of 12 client engagements",
+    "Launched e-commerce and social media campaigns that grew online revenue 35%",
+    "Administered salesforce crm, cleaned pipeline data and trained the sales organization",
+    "Partnered with finance on budget planning, variance analysis and quarterly forecasts",
+    "Designed process improvement initiatives that reduced claim processing time by 22%",
+    "Drove strategic planning sessions with directors and translated goals into roadmaps",
+    "Supported hr with compensation benchmarking, benefits enrollment and policy updates",
+    "Maintained java and javascript services, wrote api.py integrations and fixed production issues",
+    "Collaborated with product and design on user research, experiments and feature launches",
+    "Prepared power bi reports for clinical operations and tracked quality metrics",
+    "Coordinated pmp-certified project managers and reported status to the steering committee",
+]
+_SKILL_LINES = [
+    "SKILLS: python, sql, excel, tableau, power bi, r, statistics, data visualization",
+    "SKILLS: javascript, react, node, java, docker, aws, git, agile, scrum",
+    "SKILLS: project management, budgeting, vendor management, waterfall, agile, pmp",
+    "SKILLS: salesforce, crm, negotiation, presentation, social media, seo, google analytics",
+]
+_EDUCATION = [
+    "B.S. Computer Science, Georgia Tech",
+    "B.A. Economics, Howard University",
+    "M.S. Statistics, Emory University",
+    "MBA, Clark Atlanta University",
+    "B.S. Business Administration, Morehouse College",
+]
+
+
+def realistic_resumes(count: int = 40, seed: int = 2024):
+    """Full-length resumes (about 2.5-4.5k characters, 4-6 positions each), deterministic for a seed"""
+    rnd = random.Random(seed)
+    resumes = []
+    for index in range(count):
+        year = 2024
+        lines = [f"CANDIDATE {index + 1}", rnd.choice(_ROLES) + " | Atlanta, GA", "",
+                 "SUMMARY", rnd.choice(_SUMMARIES), "", "EXPERIENCE"]
+        for _ in range(rnd.randint(4, 6)):
+            start = year - rnd.randint(1, 4)
+            lines.append(f"{rnd.choice(_ROLES)}, {rnd.choice(_EMPLOYERS)} ({start} - {year})")
+            lines.extend(f"- {bullet}" for bullet in rnd.sample(_BULLETS, rnd.randint(5, 8)))
+            lines.append("")
+            year = start
+        lines.extend(["EDUCATION", f"{rnd.choice(_EDUCATION)}, {year - rnd.randint(0, 2)}", "",
+                      rnd.choice(_SKILL_LINES)])
+        resumes.append("\n".join(lines))
+    return resumes
@@ -0,0 +1,61 @@
+"""
+Job matcher scoring benchmark
+
+Reports ms per search for IntelligentJobMatcher scoring over a synthetic
+candidate set: building JobCandidateColumns (once per candidate set), scoring
+prebuilt columns, and scoring a plain job list (build + score). Not collected
+by pytest; run directly:
+
+    python backend/tests/performance/job_matcher_benchmark.py --jobs 20000
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from backend.ml.models.intelligent_job_matcher import IntelligentJobMatcher, JobCandidateColumns
+from backend.tests.test_intelligent_job_matcher_scoring import RESUME_ANALYSIS, _jobs, _params
+from backend.ml.models.resume_parser import ExperienceLevel
+
+
+def time_call(fn, rounds: int) -> str:
+    """Best and median milliseconds per call"""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return f"best {timings[0]:.1f} ms, median {timings[len(timings) // 2]:.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark IntelligentJobMatcher scoring')
+    parser.add_argument('--jobs', type=int, default=20000, help='Postings in the candidate set')
+    parser.add_argument('--rounds', type=int, default=20, help='Timed calls per measurement')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    matcher = IntelligentJobMatcher()
+    jobs = _jobs(random.Random(1), args.jobs)
+    params = _params(ExperienceLevel.MID)
+    candidates = JobCandidateColumns.build(jobs)
+
+    print(f"{args.jobs} postings x {args.rounds} rounds")
+    print(f"build candidate columns:  {time_call(lambda: JobCandidateColumns.build(jobs), args.rounds)}")
+    print(f"score prebuilt columns:   "
+          f"{time_call(lambda: matcher._score_job_columns(candidates, params, RESUME_ANALYSIS), args.rounds)}")
+    print(f"score + top 20 prebuilt:  "
+          f"{time_call(lambda: matcher._score_jobs(candidates, params, RESUME_ANALYSIS, top_k=20), args.rounds)}")
+    print(f"score + top 20 job list:  "
+          f"{time_call(lambda: matcher._score_jobs(jobs, params, RESUME_ANALYSIS, top_k=20), args.rounds)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Resume parser throughput benchmark
+
+Reports ms/resume for AdvancedResumeParser.parse_resume, once with the
+Aho-Corasick keyword scan and once with the substring fallback, against
+BaselineResumeParser (the per-analyzer substring/regex parser from before the
+single-pass keyword index, checked in next to this file). Runs on the short
+sample resumes and on full-length generated resumes. Not collected by pytest;
+run directly:
+
+    python backend/tests/performance/resume_parser_benchmark.py --rounds 200
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from backend.ml.models.resume_parser import AdvancedResumeParser
+from backend.tests.fixtures.resume_samples import SAMPLE_RESUMES, realistic_resumes
+from backend.tests.performance.baseline_resume_parser import BaselineResumeParser
+
+
+def time_parser(parser: AdvancedResumeParser, resumes, rounds: int) -> float:
+    """Mean milliseconds per parse_resume call over rounds passes"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for resume_text in resumes:
+            parser.parse_resume(resume_text)
+    return (time.perf_counter() - start) * 1000 / (rounds * len(resumes))
+
+
+def run_corpus(label: str, resumes, rounds: int, repeats: int):
+    fallback_parser = AdvancedResumeParser()
+    fallback_parser.keyword_index._automaton = None
+    parsers = {'baseline parser:   ': BaselineResumeParser(), 'substring fallback:': fallback_parser}
+    automaton_parser = AdvancedResumeParser()
+    if automaton_parser.keyword_index.uses_automaton:
+        parsers['aho-corasick scan: '] = automaton_parser
+
+    # Parsers take turns so machine noise hits them alike; each keeps its best repeat
+    best = {name: float('inf') for name in parsers}
+    for _ in range(repeats):
+        for name, parser in parsers.items():
+            best[name] = min(best[name], time_parser(parser, resumes, rounds))
+
+    average_length = sum(len(resume) for resume in resumes) // len(resumes)
+    print(f"{label}: {len(resumes)} resumes (avg {average_length} chars) x {rounds} rounds, best of {repeats}")
+    baseline_ms = best.pop('baseline parser:   ')
+    print(f"  baseline parser:    {baseline_ms:.3f} ms/resume")
+    if not automaton_parser.keyword_index.uses_automaton:
+        print("  aho-corasick scan:  skipped (pyahocorasick not installed)")
+    for name, ms in sorted(best.items()):
+        print(f"  {name} {ms:.3f} ms/resume ({baseline_ms / ms:.1f}x baseline)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark AdvancedResumeParser.parse_resume')
+    parser.add_argument('--rounds', type=int, default=200, help='Passes over the sample corpus')
+    parser.add_argument('--realistic', type=int, default=40, help='Full-length resumes to generate')
+    parser.add_argument('--repeats', type=int, default=5, help='Timed repeats per parser; the best is reported')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    run_corpus('sample resumes', SAMPLE_RESUMES, args.rounds, args.repeats)
+    realistic = realistic_resumes(args.realistic)
+    realistic_rounds = max(1, args.rounds * len(SAMPLE_RESUMES) // len(realistic))
+    run_corpus('full-length resumes', realistic, realistic_rounds, args.repeats)
+
+
+if __name__ == '__main__':
+    main()
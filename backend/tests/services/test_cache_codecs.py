@@ -0,0 +1,90 @@
+"""
+PayloadCodec: tagged msgpack/zstd payloads round-trip, legacy JSON/pickle/gzip
+entries still decode, and size/throughput stats are tracked.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import pickle
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+import backend.services.cache_codecs as codecs
+from backend.services.cache_codecs import PayloadCodec
+
+
+def _outlook(n_days: int = 90) -> dict:
+    return {
+        "user_id": 42,
+        "date": date(2026, 10, 16),
+        "balance_score": Decimal("71.5"),
+        "daily_cashflow": [
+            {"date": f"2026-10-{(i % 28) + 1:02d}", "closing_balance": 1500.0 + i, "balance_status": "healthy"}
+            for i in range(n_days)
+        ],
+    }
+
+
+class TestPayloadCodec:
+    def test_msgpack_zstd_matches_json_semantics_and_shrinks(self):
+        pytest.importorskip("msgpack")
+        pytest.importorskip("zstandard")
+        codec = PayloadCodec.for_config("json", compression=True)
+        data = _outlook()
+
+        payload = codec.encode(data)
+
+        assert payload[:3] == bytes((0, codecs.SERIALIZERS["msgpack"], codecs.COMPRESSORS["zstd"]))
+        assert codec.decode(payload) == json.loads(json.dumps(data, default=str))
+        assert len(payload) < len(json.dumps(data, default=str)) / 3
+
+        stats = codec.describe()
+        assert stats["encodes"] == 1 and stats["decodes"] == 1
+        assert stats["compressed_payloads"] == 1
+        assert stats["compression_ratio"] > 1
+
+    def test_msgpack_non_string_keys_read_back_like_json(self):
+        pytest.importorskip("msgpack")
+        codec = PayloadCodec.for_config("json", compression=False)
+        data = {"by_day": {1: 10.5, 2: 11.0}, 1.5: "x", True: [{None: 0}]}
+
+        payload = codec.encode(data)
+
+        assert payload[1] == codecs.SERIALIZERS["msgpack"]
+        assert codec.decode(payload) == json.loads(json.dumps(data))
+
+    def test_small_payloads_skip_compression(self):
+        codec = PayloadCodec.for_config("json", compression=True)
+        payload = codec.encode({"balance_score": 64})
+        assert payload[2] == codecs.COMPRESSORS["none"]
+        assert codec.decode(payload) == {"balance_score": 64}
+
+    def test_legacy_entries_still_decode(self):
+        json_codec = PayloadCodec.for_config("json", compression=True)
+        legacy_json = json.dumps(_outlook(), default=str).encode()
+        assert json_codec.decode(legacy_json) == json.loads(legacy_json)
+        assert json_codec.decode(gzip.compress(legacy_json)) == json.loads(legacy_json)
+
+        pickle_codec = PayloadCodec.for_config("pickle", compression=True)
+        template = {"created": datetime(2026, 1, 2, 3, 4)}
+        assert pickle_codec.decode(gzip.compress(pickle.dumps(template))) == template
+        assert pickle_codec.decode(pickle_codec.encode(template)) == template
+
+    def test_falls_back_to_json_and_gzip_without_optional_libs(self, monkeypatch):
+        monkeypatch.setattr(codecs, "msgpack", None)
+        monkeypatch.setattr(codecs, "zstandard", None)
+        monkeypatch.setattr(codecs, "lz4_frame", None)
+        codec = PayloadCodec.for_config("json", compression=True)
+
+        payload = codec.encode(_outlook())
+
+        assert (codec.serializer, codec.compressor) == ("json", "gzip")
+        assert payload[1:3] == bytes((codecs.SERIALIZERS["json"], codecs.COMPRESSORS["gzip"]))
+        assert codec.decode(payload)["user_id"] == 42
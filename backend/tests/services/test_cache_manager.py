@@ -0,0 +1,275 @@
+"""
+CacheManager tiers: L1 LRU in front of Redis, single-flight recompute on misses,
+and probabilistic early refresh for hot strategies.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+import backend.services.cache_manager as cache_module
+from backend.services.cache_manager import CacheManager, CacheStrategy, LocalLRUCache
+from backend.services.query_cache_manager import QueryCacheManager
+
+
+class FakeLock:
+    def __init__(self, server, name, blocking, blocking_timeout):
+        self.server, self.name = server, name
+        self.blocking, self.blocking_timeout = blocking, blocking_timeout
+
+    def acquire(self):
+        deadline = time.monotonic() + (self.blocking_timeout or 0)
+        while True:
+            with self.server.guard:
+                if self.name not in self.server.locks:
+                    self.server.locks.add(self.name)
+                    return True
+            if not self.blocking or time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+
+    def release(self):
+        with self.server.guard:
+            self.server.locks.discard(self.name)
+
+
+class FakePipeline:
+    def __init__(self, server):
+        self.server, self.ops = server, []
+
+    def __getattr__(self, name):
+        command = getattr(self.server, name)
+        return lambda *args: self.ops.append(lambda: command(*args))
+
+    def execute(self):
+        return [op() for op in self.ops]
+
+
+class FakeRedis:
+    """Just enough of redis.Redis for CacheManager, with a settable remaining TTL."""
+
+    def __init__(self):
+        self.data, self.ttls, self.locks = {}, {}, set()
+        self.guard = threading.Lock()
+        self.gets = 0
+
+    def get(self, key):
+        self.gets += 1
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+        self.ttls[key] = ttl * 1000
+
+    def mget(self, keys):
+        return [self.data.get(k) for k in keys]
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key) or 0) + 1
+        return self.data[key]
+
+    def pttl(self, key):
+        return self.ttls.get(key, -2)
+
+    def delete(self, *keys):
+        return sum(self.data.pop(k, None) is not None for k in keys)
+
+    def scan_iter(self, match, count=None):
+        from fnmatch import fnmatchcase
+        return [k for k in list(self.data) if fnmatchcase(k, match)]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def lock(self, name, timeout=None, blocking=True, blocking_timeout=None):
+        return FakeLock(self, name, blocking, blocking_timeout)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(CacheManager, "_initialize_redis", lambda self: None)
+    m = CacheManager(lock_timeout=1.0)
+    m.redis_client = FakeRedis()
+    yield m
+    m.executor.shutdown(wait=False)
+
+
+class TestLocalLRUCache:
+    def test_evicts_least_recently_used_and_expires(self, monkeypatch):
+        lru = LocalLRUCache(max_entries=2)
+        lru.set("a", 1, 60)
+        lru.set("b", 2, 60)
+        assert lru.get("a") == 1
+        lru.set("c", 3, 60)
+        assert lru.get("b") is cache_module._MISSING
+        assert lru.get("a") == 1
+
+        lru.set("d", None, 0)
+        assert lru.get("d") is cache_module._MISSING
+
+
+class TestTwoTierCache:
+    def test_l1_serves_repeat_reads_without_redis(self, cache):
+        cache.set(CacheStrategy.DAILY_OUTLOOK, "7", {"balance_score": 71}, {"date": "2026-10-16"})
+        gets_before = cache.redis_client.gets
+
+        for _ in range(5):
+            assert cache.get(CacheStrategy.DAILY_OUTLOOK, "7", {"date": "2026-10-16"}) == {"balance_score": 71}
+
+        assert cache.redis_client.gets == gets_before
+        tiers = cache.get_metrics()["tiers"]
+        assert tiers["l1"]["hits"] == 5
+        assert tiers["redis"]["hits"] == 0
+
+    def test_delete_and_pattern_invalidation_clear_l1(self, cache):
+        cache.set(CacheStrategy.USER_BALANCE_SCORE, "7", {"balance_score": 60})
+        cache.invalidate_by_pattern("user_balance_score:7*")
+        assert cache.get(CacheStrategy.USER_BALANCE_SCORE, "7") is None
+
+        cache.set(CacheStrategy.USER_BALANCE_SCORE, "8", {"balance_score": 60})
+        cache.delete(CacheStrategy.USER_BALANCE_SCORE, "8")
+        assert cache.get(CacheStrategy.USER_BALANCE_SCORE, "8") is None
+
+    def test_strategies_without_l1_go_to_redis(self, cache):
+        cache.set(CacheStrategy.USER_AGGREGATION, "7", {"n": 1})
+        cache.get(CacheStrategy.USER_AGGREGATION, "7")
+        assert cache.get_metrics()["tiers"]["redis"]["hits"] == 1
+        assert len(cache.l1_cache) == 0
+
+
+class TestRecomputeCoordination:
+    def test_concurrent_misses_compute_once(self, cache):
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(1)
+            return {"balance_score": 64}
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    cache.get_or_compute(CacheStrategy.USER_BALANCE_SCORE, "9", compute)
+                )
+            )
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert results == [{"balance_score": 64}] * 8
+
+    def test_waits_for_another_worker_holding_the_lock(self, cache):
+        key = cache._generate_cache_key(CacheStrategy.USER_AGGREGATION, "3")
+        cache.redis_client.locks.add(f"lock:{key}")
+
+        def other_worker():
+            time.sleep(0.05)
+            cache.redis_client.setex(key, 60, b'{"from": "other"}')
+            cache.redis_client.locks.discard(f"lock:{key}")
+
+        threading.Thread(target=other_worker).start()
+        value = cache.get_or_compute(CacheStrategy.USER_AGGREGATION, "3", lambda: {"from": "me"})
+
+        assert value == {"from": "other"}
+        assert cache.get_metrics()["lock_waits"] == 1
+
+    def test_hot_key_refreshes_before_expiry(self, cache, monkeypatch):
+        cache.l1_cache = None
+        cache.get_or_compute(CacheStrategy.DAILY_OUTLOOK, "5", lambda: {"v": 1})
+        key = cache._generate_cache_key(CacheStrategy.DAILY_OUTLOOK, "5")
+
+        # Plenty of TTL left: served as-is
+        monkeypatch.setattr(cache_module.random, "random", lambda: 0.5)
+        assert cache.get_or_compute(CacheStrategy.DAILY_OUTLOOK, "5", lambda: {"v": 2}) == {"v": 1}
+
+        # Nearly expired relative to recompute time: one caller refreshes
+        cache._recompute_seconds[CacheStrategy.DAILY_OUTLOOK] = 2.0
+        cache.redis_client.ttls[key] = 500
+        assert cache.get_or_compute(CacheStrategy.DAILY_OUTLOOK, "5", lambda: {"v": 2}) == {"v": 2}
+        assert cache.get_metrics()["early_refreshes"] == 1
+
+    def test_warm_cache_forces_recompute(self, cache):
+        cache.set(CacheStrategy.DAILY_OUTLOOK, "1", {"v": "old"})
+        results = cache.warm_cache(CacheStrategy.DAILY_OUTLOOK, lambda uid: {"v": f"new-{uid}"}, ["1", "2"])
+
+        assert results == {"1": True, "2": True}
+        assert cache.get(CacheStrategy.DAILY_OUTLOOK, "1") == {"v": "new-1"}
+
+    def test_cached_decorator_uses_stable_keys(self, cache):
+        class Service:
+            cache_manager = cache
+            calls = 0
+
+            @cache_module.cached(CacheStrategy.USER_AGGREGATION)
+            def aggregate(self, user_id):
+                Service.calls += 1
+                return {"user_id": user_id}
+
+        service = Service()
+        assert service.aggregate(4) == {"user_id": 4}
+        assert service.aggregate(4) == {"user_id": 4}
+        assert Service.calls == 1
+        assert any(k.startswith("user_aggregation:aggregate:") for k in cache.redis_client.data)
+
+
+class TestTagInvalidation:
+    def test_user_invalidation_is_one_incr_and_spares_other_users(self, cache):
+        for uid in ("7", "8"):
+            cache.set(CacheStrategy.DAILY_OUTLOOK, uid, {"u": uid}, {"date": "2026-10-16"})
+            cache.set(CacheStrategy.USER_BALANCE_SCORE, uid, {"u": uid})
+        writes_before = dict(cache.redis_client.data)
+
+        assert cache.invalidate_user_data(7) == 1
+
+        changed = {k for k in cache.redis_client.data if cache.redis_client.data[k] != writes_before.get(k)}
+        assert changed == {"cache_tag:user:7"}
+        assert cache.get(CacheStrategy.DAILY_OUTLOOK, "7", {"date": "2026-10-16"}) is None
+        assert cache.get(CacheStrategy.USER_BALANCE_SCORE, "7") is None
+        assert cache.get(CacheStrategy.USER_BALANCE_SCORE, "8") == {"u": "8"}
+        assert cache.get_metrics()["tag_invalidated_reads"] >= 1
+
+    def test_other_processes_see_invalidation_through_redis(self, cache):
+        cache.set(CacheStrategy.USER_AGGREGATION, "7", {"n": 1}, tags=["cohort:nyc"])
+        other = CacheManager.__new__(CacheManager)
+        other.__dict__.update(cache.__dict__)
+        other.l1_cache = None
+        other.metrics = cache._empty_metrics()
+
+        cache.invalidate_tags("cohort:nyc")
+        assert other.get(CacheStrategy.USER_AGGREGATION, "7") is None
+
+    def test_write_computed_before_invalidation_is_stale(self, cache):
+        def compute():
+            cache.invalidate_user_data(9)
+            return {"balance_score": 10}
+
+        assert cache.get_or_compute(CacheStrategy.USER_BALANCE_SCORE, "9", compute) == {"balance_score": 10}
+        cache.l1_cache.clear()
+        assert cache.get(CacheStrategy.USER_BALANCE_SCORE, "9") is None
+
+    def test_strategy_invalidation(self, cache):
+        cache.set(CacheStrategy.PEER_COMPARISON, "tier1:atlanta", {"p": 1})
+        cache.invalidate_strategy(CacheStrategy.PEER_COMPARISON)
+        assert cache.get(CacheStrategy.PEER_COMPARISON, "tier1:atlanta") is None
+
+    def test_query_cache_tags_work_with_str_payloads(self):
+        qcm = QueryCacheManager(FakeRedis())
+        qcm.set_cached_result("SELECT 1", {"rows": [1]}, {"user_id": 3}, tags=["user:3"])
+        assert qcm.get_cached_result("SELECT 1", {"user_id": 3}, tags=["user:3"]) == {"rows": [1]}
+
+        qcm.invalidate_tags("user:3")
+        assert qcm.get_cached_result("SELECT 1", {"user_id": 3}, tags=["user:3"]) is None
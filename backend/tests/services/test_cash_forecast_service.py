@@ -8,6 +8,8 @@ import os
 import sys
 import uuid
 from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
 
 import pytest
 from flask import Flask
@@ -19,7 +21,11 @@ from backend.models.database import db, init_database
 from backend.models.user_models import User
 from backend.models.vehicle_models import Vehicle
 import backend.services.cash_forecast_service as cash_forecast_service
-from backend.services.cash_forecast_service import build_forecast_for_user
+from backend.services.cash_forecast_service import (
+    build_forecast_for_user,
+    build_forecasts_for_users,
+)
+from backend.models.transaction_schedule import IncomeStream
 
 
 def _database_url() -> str | None:
@@ -255,3 +261,282 @@ class TestCashForecastService:
                 )
                 db.session.delete(user)
                 db.session.commit()
+
+    def test_build_forecasts_for_users_matches_single_user_path(
+        self, cash_forecast_app, monkeypatch
+    ):
+        """Batch NumPy engine returns the same rows as build_forecast_for_user, to the cent."""
+        monkeypatch.setattr(cash_forecast_service, "date", FixedForecastDate)
+        ext_ids = [str(uuid.uuid4()) for _ in range(3)]
+        emails = [f"cash_fc_batch_{eid[:12]}@example.com" for eid in ext_ids]
+        missing_id = str(uuid.uuid4())
+
+        with cash_forecast_app.app_context():
+            users = [
+                User(user_id=eid, email=email, password_hash="unused")
+                for eid, email in zip(ext_ids, emails)
+            ]
+            db.session.add_all(users)
+            db.session.flush()
+            db.session.execute(
+                text(
+                    """
+                    INSERT INTO user_profiles (
+                        email, current_balance, balance_last_updated, important_dates
+                    )
+                    VALUES
+                        (:e0, 1234.56, :updated_at, '{}'),
+                        (:e1, 150.01, :updated_at,
+                         '{"customEvents": [{"name": "trip", "date": "2026-06-20", "cost": 310.10}]}')
+                    """
+                ),
+                {"e0": emails[0], "e1": emails[1], "updated_at": datetime.utcnow()},
+            )
+            db.session.add_all(
+                [
+                    IncomeStream(
+                        user_id=users[0].id,
+                        label="Paycheck",
+                        amount=1812.37,
+                        frequency="biweekly",
+                        next_date=date(2026, 5, 15),
+                    ),
+                    IncomeStream(
+                        user_id=users[1].id,
+                        label="Salary",
+                        amount=2400.00,
+                        frequency="semimonthly",
+                        next_date=date(2026, 5, 15),
+                    ),
+                    Vehicle(
+                        user_id=users[1].id,
+                        year=2019,
+                        make="Ford",
+                        model="Focus",
+                        monthly_fuel_cost=97,
+                        monthly_payment=312.45,
+                    ),
+                ]
+            )
+            db.session.commit()
+
+            try:
+                batch = build_forecasts_for_users(ext_ids + [missing_id], days=120)
+                assert list(batch) == ext_ids + [missing_id]
+                for eid in ext_ids:
+                    single = build_forecast_for_user(eid, days=120)
+                    assert batch[eid].daily_cashflow == single.daily_cashflow
+                    assert batch[eid].monthly_summaries == single.monthly_summaries
+                    assert (
+                        batch[eid].relationship_cost_breakdown
+                        == single.relationship_cost_breakdown
+                    )
+                    assert batch[eid].balance_set == single.balance_set
+                assert batch[missing_id].daily_cashflow == []
+            finally:
+                uids = [u.id for u in users]
+                IncomeStream.query.filter(IncomeStream.user_id.in_(uids)).delete(
+                    synchronize_session=False
+                )
+                Vehicle.query.filter(Vehicle.user_id.in_(uids)).delete(
+                    synchronize_session=False
+                )
+                db.session.execute(
+                    text("DELETE FROM user_profiles WHERE email IN (:e0, :e1)"),
+                    {"e0": emails[0], "e1": emails[1]},
+                )
+                User.query.filter(User.user_id.in_(ext_ids)).delete(
+                    synchronize_session=False
+                )
+                db.session.commit()
+
+
+class _Column:
+    """Just enough of an SQLAlchemy column for the forecast queries"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __eq__(self, value):
+        return lambda row: getattr(row, self.name) == value
+
+    __hash__ = None
+
+    def in_(self, values):
+        values = set(values)
+        return lambda row: getattr(row, self.name) in values
+
+    def isnot(self, value):
+        return lambda row: getattr(row, self.name) is not value
+
+    def asc(self):
+        return self.name, False
+
+    def desc(self):
+        return self.name, True
+
+
+class _Query:
+    def __init__(self, rows):
+        self.rows = list(rows)
+
+    def filter(self, *predicates):
+        return _Query(r for r in self.rows if all(p(r) for p in predicates))
+
+    def filter_by(self, **values):
+        return _Query(
+            r for r in self.rows if all(getattr(r, k) == v for k, v in values.items())
+        )
+
+    def order_by(self, ordering):
+        name, reverse = ordering
+        return _Query(sorted(self.rows, key=lambda r: getattr(r, name), reverse=reverse))
+
+    def all(self):
+        return list(self.rows)
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+
+def _model(name, rows):
+    attrs = {
+        column: _Column(column)
+        for column in ("id", "user_id", "created_at", "tracked_person_id", "lead_id", "completed_at")
+    }
+    attrs["query"] = _Query(rows)
+    return type(name, (), attrs)
+
+
+def _row(**fields):
+    fields.setdefault("created_at", datetime(2026, 1, 5, 9, 0))
+    return SimpleNamespace(**fields)
+
+
+class TestVectorizedForecastInMemory:
+    """
+    The NumPy block engine against the per-user Decimal path on the same
+    in-memory schedule rows, so the equivalence is checked without a database.
+    """
+
+    @pytest.fixture
+    def schedules(self, monkeypatch):
+        svc = cash_forecast_service
+        monkeypatch.setattr(svc, "date", FixedForecastDate)
+
+        users = [
+            SimpleNamespace(id=1, user_id="u-1", email="one@example.com"),
+            SimpleNamespace(id=2, user_id="u-2", email=" Two@Example.com "),
+            SimpleNamespace(id=3, user_id="u-3", email="three@example.com"),
+        ]
+        profiles = {
+            "one@example.com": (Decimal("1234.56"), {}, True),
+            "two@example.com": (
+                Decimal("150.01"),
+                {"customEvents": [
+                    {"name": "trip", "date": "2026-06-20", "cost": 310.10},
+                    {"name": "Sam dinner", "date": "2026-05-30", "cost": 87.35},
+                ]},
+                True,
+            ),
+        }
+        streams = [
+            _row(user_id=1, is_active=True, amount="1812.37", frequency="biweekly", next_date=date(2026, 5, 15)),
+            _row(user_id=1, is_active=True, amount="99.99", frequency="weekly", next_date=date(2026, 5, 9)),
+            _row(user_id=1, is_active=False, amount="5000", frequency="monthly", next_date=date(2026, 5, 20)),
+            _row(user_id=2, is_active=True, amount="2400.00", frequency="semimonthly", next_date=date(2026, 5, 15)),
+            _row(user_id=3, is_active=True, amount="3100.10", frequency="monthly", next_date=date(2026, 4, 30)),
+        ]
+        recurring = [
+            _row(user_id=1, is_active=True, amount="1450.00", frequency="monthly", due_day=1),
+            _row(user_id=1, is_active=True, amount="310.33", frequency="quarterly", due_day=31,
+                 created_at=datetime(2025, 11, 30)),
+            _row(user_id=2, is_active=True, amount="129.00", frequency="annual", due_day=12,
+                 created_at=datetime(2025, 7, 1)),
+            _row(user_id=3, is_active=True, amount="0", frequency="monthly", due_day=3),
+        ]
+        scheduled = [
+            _row(user_id=2, is_active=True, amount="45.67", frequency="semimonthly", due_day=20,
+                 next_date=date(2026, 5, 20)),
+            _row(user_id=3, is_active=True, amount="600.05", frequency="biweekly", due_day=None,
+                 next_date=date(2026, 5, 22)),
+        ]
+        vehicles = [
+            _row(user_id=2, monthly_fuel_cost=97, monthly_payment=312.45, created_date=datetime(2025, 1, 1)),
+            _row(user_id=3, monthly_fuel_cost=61.3, monthly_payment=0, created_date=datetime(2025, 1, 1)),
+        ]
+        people = [
+            _row(id=10, user_id=2, is_archived=False, estimated_monthly_cost=210.5,
+                 nickname="Alex", card_type="person", emoji=None),
+            _row(id=11, user_id=2, is_archived=False, estimated_monthly_cost=None,
+                 nickname="Sam", card_type=None, emoji=" * "),
+            _row(id=12, user_id=3, is_archived=False, estimated_monthly_cost=0,
+                 nickname="Jo", card_type="pet", emoji=None),
+            _row(id=13, user_id=3, is_archived=True, estimated_monthly_cost=999,
+                 nickname="Old", card_type="person", emoji=None),
+        ]
+        assessments = [
+            _row(tracked_person_id=12, lead_id="lead-1", completed_at=datetime(2026, 3, 1)),
+            _row(tracked_person_id=12, lead_id=None, completed_at=datetime(2026, 4, 1)),
+        ]
+        leads = {"lead-1": _row(id="lead-1", total_annual_projection=4321)}
+
+        monkeypatch.setattr(svc, "IncomeStream", _model("IncomeStream", streams))
+        monkeypatch.setattr(svc, "RecurringExpense", _model("RecurringExpense", recurring))
+        monkeypatch.setattr(svc, "ScheduledExpense", _model("ScheduledExpense", scheduled))
+        monkeypatch.setattr(svc, "VibeTrackedPerson", _model("VibeTrackedPerson", people))
+        monkeypatch.setattr(svc, "VibePersonAssessment", _model("VibePersonAssessment", assessments))
+        monkeypatch.setattr(svc, "VibeCheckupsLead", _model("VibeCheckupsLead", leads.values()))
+        vehicle_model = _model("Vehicle", vehicles)
+        vehicle_model.created_date = _Column("created_date")
+        monkeypatch.setattr(svc, "Vehicle", vehicle_model)
+        user_model = _model("User", users)
+        monkeypatch.setattr(svc, "User", user_model)
+        monkeypatch.setattr(
+            svc,
+            "db",
+            SimpleNamespace(session=SimpleNamespace(
+                query=lambda model: model.query,
+                get=lambda model, key: leads.get(key),
+            )),
+        )
+        monkeypatch.setattr(
+            svc,
+            "_load_profile_balance_and_dates",
+            lambda email: profiles.get(email.strip().lower(), (Decimal("0"), {}, False)),
+        )
+        monkeypatch.setattr(
+            svc,
+            "_load_profiles_for_emails",
+            lambda emails: {
+                e.strip().lower(): profiles[e.strip().lower()]
+                for e in emails
+                if e.strip().lower() in profiles
+            },
+        )
+        return [u.user_id for u in users]
+
+    @pytest.mark.skipif(cash_forecast_service.np is None, reason="numpy not installed")
+    @pytest.mark.parametrize("days", [1, 45, 120])
+    def test_block_engine_matches_per_user_forecast(self, schedules, monkeypatch, days):
+        monkeypatch.setattr(cash_forecast_service, "FORECAST_BATCH_BLOCK_SIZE", 2)
+
+        batch = build_forecasts_for_users(schedules + ["u-missing"], days=days)
+
+        assert list(batch) == schedules + ["u-missing"]
+        for user_id in schedules:
+            single = build_forecast_for_user(user_id, days=days)
+            assert batch[user_id].daily_cashflow == single.daily_cashflow
+            assert batch[user_id].monthly_summaries == single.monthly_summaries
+            assert batch[user_id].relationship_cost_breakdown == single.relationship_cost_breakdown
+            assert batch[user_id].balance_set == single.balance_set
+        assert batch["u-missing"] == build_forecast_for_user("u-missing", days=days)
+
+    def test_rows_exercise_every_flow(self, schedules):
+        daily = build_forecast_for_user("u-2", days=120).daily_cashflow
+        rel = build_forecast_for_user("u-3", days=120).relationship_cost_breakdown
+
+        assert daily[0]["opening_balance"] == 150.01
+        assert any(row["balance_status"] == "danger" for row in daily)
+        assert [r["nickname"] for r in rel] == ["Jo"]
+        assert rel[0]["monthly_cost"] == 360.08
@@ -0,0 +1,210 @@
+"""
+ForecastStore: schedule edits are applied as deltas and closing balances carry
+forward from the first affected day without rebuilding from the database.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import uuid
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+import backend.services.cash_forecast_service as cash_forecast_service
+import backend.services.forecast_store as forecast_store_module
+from backend.services.cash_forecast_service import ForecastResult, classify_status
+from backend.models.database import db, init_database
+from backend.models.financial_setup import RecurringExpense
+from backend.models.user_models import User
+from backend.services.forecast_store import ForecastStore, ScheduleItem
+
+
+class FixedForecastDate(date):
+    @classmethod
+    def today(cls):
+        return cls(2026, 5, 11)
+
+
+def _flat_forecast(days: int, opening: float) -> ForecastResult:
+    start = FixedForecastDate.today()
+    daily = []
+    for i in range(days):
+        d0 = date.fromordinal(start.toordinal() + i)
+        daily.append(
+            {
+                "date": d0.isoformat(),
+                "opening_balance": opening,
+                "closing_balance": opening,
+                "net_change": 0.0,
+                "balance_status": classify_status(Decimal(str(opening))),
+            }
+        )
+    summaries = cash_forecast_service.generate_monthly_summaries(
+        daily, month_income_by_month={}, month_expense_by_month={}
+    )
+    return ForecastResult(daily, summaries, [], True)
+
+
+@pytest.fixture
+def store(monkeypatch):
+    monkeypatch.setattr(cash_forecast_service, "date", FixedForecastDate)
+    calls = []
+
+    def fake_build(user_id, days):
+        calls.append((user_id, days))
+        return _flat_forecast(days, 1500.0)
+
+    monkeypatch.setattr(forecast_store_module, "build_forecast_for_user", fake_build)
+    s = ForecastStore()
+    s._redis_checked = True  # local-only; no Redis in unit tests
+    s.build_calls = calls
+    return s
+
+
+class TestForecastStore:
+    def test_income_edit_carries_forward_without_rebuild(self, store):
+        store.get_forecast("u-1", days=30)
+        item = ScheduleItem(
+            kind="income",
+            amount=Decimal("250.00"),
+            frequency="weekly",
+            next_date=date(2026, 5, 15),
+        )
+        store.apply_schedule_change("u-1", None, item)
+        daily = store.get_forecast("u-1", days=30).daily_cashflow
+
+        assert len(store.build_calls) == 1
+        assert daily[3]["closing_balance"] == 1500.0
+        assert daily[4]["net_change"] == 250.0
+        assert daily[4]["closing_balance"] == 1750.0
+        assert daily[11]["closing_balance"] == 2000.0
+        assert daily[-1]["closing_balance"] == 1500.0 + 250.0 * 4
+        for prev, row in zip(daily, daily[1:]):
+            assert row["opening_balance"] == prev["closing_balance"]
+
+    def test_expense_change_replaces_old_occurrences(self, store):
+        store.get_forecast("u-2", days=30)
+        before = ScheduleItem(
+            kind="scheduled_expense",
+            amount=Decimal("1400.00"),
+            frequency="monthly",
+            next_date=date(2026, 6, 1),
+            due_day=1,
+        )
+        store.apply_schedule_change("u-2", None, before)
+        assert store.get_forecast("u-2", days=30).daily_cashflow[-1]["closing_balance"] == 100.0
+
+        after = ScheduleItem(
+            kind="scheduled_expense",
+            amount=Decimal("900.00"),
+            frequency="monthly",
+            next_date=date(2026, 6, 1),
+            due_day=1,
+        )
+        store.apply_schedule_change("u-2", before, after)
+        result = store.get_forecast("u-2", days=30)
+
+        june_first = result.daily_cashflow[21]
+        assert june_first["date"] == "2026-06-01"
+        assert june_first["net_change"] == -900.0
+        assert june_first["closing_balance"] == 600.0
+        assert june_first["balance_status"] == "warning"
+        june = [m for m in result.monthly_summaries if m["month"] == "2026-06"][0]
+        assert june["total_expenses"] == 900.0
+
+    def test_invalidate_forces_rebuild(self, store):
+        store.get_forecast("u-3", days=30)
+        store.invalidate("u-3")
+        store.get_forecast("u-3", days=30)
+        assert store.build_calls == [("u-3", 30), ("u-3", 30)]
+
+    def test_generation_match_does_not_outlive_ttl(self, store, monkeypatch):
+        monkeypatch.setattr(store, "_current_generation", lambda user_id: 7)
+        store.get_forecast("u-4", days=30)
+        store.get_forecast("u-4", days=30)
+        assert len(store.build_calls) == 1
+
+        store._entries["u-4"][30].loaded_at -= store.ttl_seconds
+        store.get_forecast("u-4", days=30)
+        assert len(store.build_calls) == 2
+
+
+@pytest.fixture
+def forecast_app():
+    url = os.environ.get("TEST_DATABASE_URL") or os.environ.get("DATABASE_URL")
+    if not url:
+        pytest.skip("DATABASE_URL or TEST_DATABASE_URL required for session listener tests.")
+    app = Flask(__name__)
+    app.config["TESTING"] = True
+    app.config["SECRET_KEY"] = "forecast-store-test-secret"
+    init_database(app)
+    return app
+
+
+class TestForecastInputListeners:
+    def _user(self) -> User:
+        ext_user_id = str(uuid.uuid4())
+        user = User(
+            user_id=ext_user_id,
+            email=f"forecast_store_{ext_user_id[:12]}@example.com",
+            password_hash="unused",
+        )
+        db.session.add(user)
+        db.session.commit()
+        return user
+
+    def _expense(self, user: User) -> RecurringExpense:
+        return RecurringExpense(
+            user_id=user.id,
+            name="Gym",
+            amount=Decimal("45.00"),
+            category="other",
+            frequency="monthly",
+            due_day=5,
+            is_active=True,
+        )
+
+    def test_committed_input_write_invalidates_owner(self, forecast_app, monkeypatch):
+        invalidated = []
+        monkeypatch.setattr(
+            forecast_store_module.forecast_store, "invalidate", invalidated.append
+        )
+        with forecast_app.app_context():
+            user = self._user()
+            try:
+                invalidated.clear()
+                row = self._expense(user)
+                db.session.add(row)
+                db.session.commit()
+                assert invalidated == [user.user_id]
+
+                invalidated.clear()
+                row.amount = Decimal("50.00")
+                db.session.rollback()
+                assert invalidated == []
+            finally:
+                db.session.delete(user)
+                db.session.commit()
+
+    def test_incremental_rows_are_not_invalidated(self, forecast_app, monkeypatch):
+        invalidated = []
+        monkeypatch.setattr(
+            forecast_store_module.forecast_store, "invalidate", invalidated.append
+        )
+        with forecast_app.app_context():
+            user = self._user()
+            try:
+                invalidated.clear()
+                row = self._expense(user)
+                db.session.add(row)
+                forecast_store_module.forecast_store.mark_incremental(row)
+                db.session.commit()
+                assert invalidated == []
+            finally:
+                db.session.delete(user)
+                db.session.commit()
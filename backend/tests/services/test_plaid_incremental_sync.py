@@ -0,0 +1,161 @@
+"""
+Cursor-based Plaid sync against a local fake /transactions/sync client:
+only deltas are applied, removals delete rows, and the cursor advances per page.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+from plaid import ApiException
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+from backend.models.database import db
+from backend.models.transaction import Transaction
+from backend.services.plaid_service import PlaidService
+from backend.services.transaction_ingest_service import sync_transactions_incremental
+
+
+def _txn(txn_id: str, amount: float, day: date, name: str = "Corner Store"):
+    return SimpleNamespace(
+        transaction_id=txn_id,
+        amount=amount,
+        date=day,
+        account_id="acct-1",
+        merchant_name=name,
+        name=name,
+        pending=False,
+        personal_finance_category=None,
+        category=["Food and Drink"],
+    )
+
+
+class FakePlaidClient:
+    """Serves scripted /transactions/sync pages keyed by the request cursor."""
+
+    def __init__(self, pages: dict, fail_once_on: str | None = None):
+        self.pages = pages
+        self.fail_once_on = fail_once_on
+        self.requests: list = []
+
+    def transactions_sync(self, request):
+        cursor = request.get("cursor") or ""
+        self.requests.append((cursor, request["count"]))
+        if self.fail_once_on is not None and cursor == self.fail_once_on:
+            self.fail_once_on = None
+            exc = ApiException(status=400, reason="Bad Request")
+            exc.body = json.dumps(
+                {"error_code": "TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION"}
+            )
+            raise exc
+        added, modified, removed, next_cursor, has_more = self.pages[cursor]
+        return SimpleNamespace(
+            added=added,
+            modified=modified,
+            removed=[SimpleNamespace(transaction_id=t) for t in removed],
+            next_cursor=next_cursor,
+            has_more=has_more,
+        )
+
+
+def _service(client: FakePlaidClient) -> PlaidService:
+    service = PlaidService.__new__(PlaidService)
+    service._client = client
+    return service
+
+
+@pytest.fixture
+def sync_app():
+    app = Flask(__name__)
+    app.config["TESTING"] = True
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db.init_app(app)
+    with app.app_context():
+        Transaction.__table__.create(db.engine)
+        yield app
+        db.session.remove()
+        Transaction.__table__.drop(db.engine)
+
+
+def _user(cursor=None):
+    return SimpleNamespace(
+        id=7,
+        plaid_access_token="access-sandbox-123",
+        plaid_sync_cursor=cursor,
+        plaid_last_synced_at=None,
+    )
+
+
+class TestIncrementalPlaidSync:
+    def test_initial_sync_streams_all_pages_and_stores_cursor(self, sync_app):
+        client = FakePlaidClient(
+            {
+                "": ([_txn("t1", 12.5, date(2026, 5, 1))], [], [], "c1", True),
+                "c1": ([_txn("t2", 40.0, date(2026, 5, 2))], [], [], "c2", False),
+            }
+        )
+        user = _user()
+        stats = sync_transactions_incremental(user, _service(client))
+
+        assert stats.pages == 2
+        assert stats.inserted == 2
+        assert user.plaid_sync_cursor == "c2"
+        assert user.plaid_last_synced_at is not None
+        assert Transaction.query.count() == 2
+
+    def test_steady_state_sync_applies_only_deltas_and_removals(self, sync_app):
+        client = FakePlaidClient(
+            {
+                "": (
+                    [_txn("t1", 12.5, date(2026, 5, 1)), _txn("t2", 40.0, date(2026, 5, 2))],
+                    [],
+                    [],
+                    "c1",
+                    False,
+                ),
+                "c1": (
+                    [_txn("t3", 5.0, date(2026, 5, 6))],
+                    [_txn("t1", 13.75, date(2026, 5, 1))],
+                    ["t2"],
+                    "c2",
+                    False,
+                ),
+            }
+        )
+        user = _user()
+        service = _service(client)
+        sync_transactions_incremental(user, service)
+
+        stats = sync_transactions_incremental(user, service)
+
+        assert client.requests[-1][0] == "c1"
+        assert (stats.inserted, stats.updated, stats.removed) == (1, 1, 1)
+        assert stats.changed_dates == {date(2026, 5, 1), date(2026, 5, 2), date(2026, 5, 6)}
+        ids = {t.plaid_transaction_id for t in Transaction.query.all()}
+        assert ids == {"t1", "t3"}
+        assert Transaction.query.filter_by(plaid_transaction_id="t1").one().amount == 13.75
+        assert user.plaid_sync_cursor == "c2"
+
+    def test_mutation_during_pagination_restarts_from_start_cursor(self, sync_app):
+        client = FakePlaidClient(
+            {
+                "c0": ([_txn("t1", 12.5, date(2026, 5, 1))], [], [], "c1", True),
+                "c1": ([_txn("t2", 40.0, date(2026, 5, 2))], [], [], "c2", False),
+            },
+            fail_once_on="c1",
+        )
+        user = _user(cursor="c0")
+        stats = sync_transactions_incremental(user, _service(client))
+
+        assert [c for c, _ in client.requests] == ["c0", "c1", "c0", "c1"]
+        assert Transaction.query.count() == 2
+        assert stats.inserted == 2
+        assert stats.unchanged == 1
+        assert user.plaid_sync_cursor == "c2"
@@ -0,0 +1,125 @@
+"""
+SQLiteEventSink: one WAL connection per process, schema set up once, events
+committed in batches by a writer thread, with flush and stats hooks.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+import backend.services.telemetry_service as telemetry_service
+from backend.services.sqlite_event_sink import SQLiteEventSink
+
+DDL = "CREATE TABLE IF NOT EXISTS events (id INTEGER PRIMARY KEY, name TEXT, n INTEGER)"
+INSERT = "INSERT INTO events (name, n) VALUES (?, ?)"
+
+
+def _rows(path, sql="SELECT name, n FROM events ORDER BY id"):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+class TestSQLiteEventSink:
+    def test_concurrent_events_are_committed_in_batches(self, tmp_path):
+        path = str(tmp_path / "bi.db")
+        sink = SQLiteEventSink(path, schema=[DDL], batch_size=50, flush_interval=60)
+
+        def produce(worker):
+            for i in range(100):
+                assert sink.enqueue(INSERT, (f"w{worker}", i))
+
+        threads = [threading.Thread(target=produce, args=(w,)) for w in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert sink.flush()
+
+        stats = sink.stats()
+        assert len(_rows(path)) == 400
+        assert stats["written"] == 400 and stats["queue_depth"] == 0
+        assert stats["batches"] <= 400 // 50 + 4
+        assert _rows(path, "PRAGMA journal_mode") == [("wal",)]
+        sink.close()
+
+    def test_flush_commits_partial_batch_and_keeps_order(self, tmp_path):
+        path = str(tmp_path / "bi.db")
+        sink = SQLiteEventSink(path, schema=[DDL], batch_size=1000, flush_interval=60)
+        for i in range(3):
+            sink.enqueue(INSERT, ("evt", i))
+
+        assert sink.flush()
+
+        assert _rows(path) == [("evt", 0), ("evt", 1), ("evt", 2)]
+        sink.close()
+
+    def test_full_queue_drops_and_failures_are_counted(self, tmp_path):
+        path = str(tmp_path / "bi.db")
+        sink = SQLiteEventSink(path, schema=[DDL], capacity=2, flush_interval=60)
+        sink._ensure_thread = lambda: None  # nothing drains the queue
+        assert sink.enqueue(INSERT, ("a", 1)) and sink.enqueue(INSERT, ("b", 2))
+        assert not sink.enqueue(INSERT, ("c", 3))
+        assert sink.stats()["dropped"] == 1
+
+        broken = SQLiteEventSink(path, schema=[DDL], flush_interval=60)
+        broken.enqueue("INSERT INTO missing_table VALUES (?)", (1,))
+        assert broken.flush()
+        assert broken.stats()["failed"] == 1
+        broken.close()
+
+    def test_bad_row_is_dropped_without_losing_its_batch(self, tmp_path):
+        path = str(tmp_path / "bi.db")
+        strict = "CREATE TABLE IF NOT EXISTS events (id INTEGER PRIMARY KEY, name TEXT NOT NULL, n INTEGER)"
+        sink = SQLiteEventSink(path, schema=[strict], batch_size=1000, flush_interval=60)
+        sink.enqueue(INSERT, ("a", 1))
+        sink.enqueue(INSERT, (None, 2))
+        sink.enqueue("INSERT INTO missing_table VALUES (?)", (3,))
+        sink.enqueue(INSERT, ("d", 4))
+
+        assert sink.flush()
+
+        assert _rows(path) == [("a", 1), ("d", 4)]
+        stats = sink.stats()
+        assert (stats["written"], stats["failed"], stats["batches"]) == (2, 2, 1)
+        sink.close()
+
+    def test_forked_child_starts_its_own_counts(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "bi.db")
+        sink = SQLiteEventSink(path, schema=[DDL], flush_interval=60)
+        sink.enqueue(INSERT, ("parent", 1))
+        assert sink.flush()
+        sink.close()
+        assert sink.stats()["written"] == 1
+
+        child_pid = sink._pid + 1
+        monkeypatch.setattr(os, "getpid", lambda: child_pid)
+        sink.enqueue(INSERT, ("child", 1))
+        assert sink.flush()
+
+        stats = sink.stats()
+        assert (stats["enqueued"], stats["written"], stats["batches"]) == (1, 1, 1)
+        assert _rows(path) == [("parent", 1), ("child", 1)]
+        sink.close()
+
+
+class TestTelemetryService:
+    def test_log_event_goes_through_the_sink(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "business_intelligence.db")
+        monkeypatch.setattr(telemetry_service, "_bi_db_path", lambda: path)
+
+        for _ in range(3):
+            telemetry_service.TelemetryService.log_event(
+                "u-1", "view", "financial_dashboard", metadata={"tab": "cash"}, user_tier="budget"
+            )
+        assert telemetry_service.TelemetryService.flush()
+
+        rows = _rows(path, "SELECT user_id, feature_name, metadata FROM feature_events")
+        assert rows == [("u-1", "financial_dashboard", '{"tab": "cash"}')] * 3
+        assert telemetry_service.TelemetryService.stats()["written"] == 3
@@ -0,0 +1,113 @@
+"""
+bulk_upsert_transactions: set-based Plaid ingestion reports inserted / updated /
+unchanged counts and the dates whose totals changed (SQLite upsert fallback).
+"""
+from __future__ import annotations
+
+import os
+import sys
+from datetime import date
+
+import pytest
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+from backend.models.database import db
+from backend.models.transaction import Transaction
+from backend.services.transaction_ingest_service import bulk_upsert_transactions
+
+
+def _row(txn_id: str, amount: float, day: date, **extra) -> dict:
+    row = {
+        "plaid_transaction_id": txn_id,
+        "amount": amount,
+        "merchant": "Corner Store",
+        "category": "FOOD_AND_DRINK",
+        "subcategory": None,
+        "date": day,
+        "is_debit": True,
+        "account_id": "acct-1",
+        "pending": False,
+    }
+    row.update(extra)
+    return row
+
+
+@pytest.fixture
+def ingest_app():
+    app = Flask(__name__)
+    app.config["TESTING"] = True
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db.init_app(app)
+    with app.app_context():
+        Transaction.__table__.create(db.engine)
+        yield app
+        db.session.remove()
+        Transaction.__table__.drop(db.engine)
+
+
+class TestBulkUpsertTransactions:
+    def test_first_sync_inserts_every_row(self, ingest_app):
+        rows = [
+            _row("t1", 12.5, date(2026, 5, 1)),
+            _row("t2", 40.0, date(2026, 5, 2)),
+        ]
+        stats = bulk_upsert_transactions(7, rows)
+        db.session.commit()
+
+        assert (stats.inserted, stats.updated, stats.unchanged) == (2, 0, 0)
+        assert stats.changed_dates == {date(2026, 5, 1), date(2026, 5, 2)}
+        assert Transaction.query.count() == 2
+
+    def test_resync_classifies_rows_and_reports_changed_dates(self, ingest_app):
+        bulk_upsert_transactions(
+            7,
+            [
+                _row("t1", 12.5, date(2026, 5, 1)),
+                _row("t2", 40.0, date(2026, 5, 2), pending=True),
+                _row("t3", 9.99, date(2026, 5, 3)),
+            ],
+        )
+        db.session.commit()
+
+        stats = bulk_upsert_transactions(
+            7,
+            [
+                _row("t1", 12.5, date(2026, 5, 1)),
+                _row("t2", 41.25, date(2026, 5, 4), pending=False),
+                _row("t3", 9.99, date(2026, 5, 3)),
+                _row("t4", 3.0, date(2026, 5, 5)),
+            ],
+            batch_size=2,
+        )
+        db.session.commit()
+
+        assert (stats.inserted, stats.updated, stats.unchanged) == (1, 1, 2)
+        assert stats.changed_dates == {
+            date(2026, 5, 2),
+            date(2026, 5, 4),
+            date(2026, 5, 5),
+        }
+        t2 = Transaction.query.filter_by(plaid_transaction_id="t2").one()
+        assert t2.amount == 41.25
+        assert t2.date == date(2026, 5, 4)
+        assert t2.pending is False
+        assert Transaction.query.count() == 4
+
+    def test_user_tags_survive_resync(self, ingest_app):
+        bulk_upsert_transactions(7, [_row("t1", 12.5, date(2026, 5, 1))])
+        db.session.commit()
+        Transaction.query.filter_by(plaid_transaction_id="t1").update(
+            {"user_tagged_stress_spending": True}
+        )
+        db.session.commit()
+
+        bulk_upsert_transactions(7, [_row("t1", 15.0, date(2026, 5, 1))])
+        db.session.commit()
+        db.session.expire_all()
+
+        t1 = Transaction.query.filter_by(plaid_transaction_id="t1").one()
+        assert t1.amount == 15.0
+        assert t1.user_tagged_stress_spending is True
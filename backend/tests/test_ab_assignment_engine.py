@@ -0,0 +1,245 @@
+"""
+ABAssignmentEngine: tests are cached in process, users are bucketed by a pure
+hash over cumulative weights, and assignment rows are written in batches.
+"""
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.analytics.ab_assignment_engine import (
+    ABAssignmentEngine, RiskAssignmentEngine, AssignmentSnapshot, bucket_for, cumulative_weights,
+)
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.connection = conn
+        self.db = conn.db
+        self._rows = []
+
+    def mogrify(self, template, args):
+        return (template.decode() % tuple(repr(a) for a in args)).encode()
+
+    def execute(self, sql, params=None):
+        sql = sql.decode() if isinstance(sql, bytes) else sql
+        self.db.statements.append(sql)
+        if 'FROM ab_tests' in sql:
+            self._rows = [self.db.test] if self.db.test else []
+        elif 'FROM ab_test_variants' in sql:
+            self._rows = list(self.db.variants)
+        elif 'FROM risk_ab_test_configs' in sql:
+            self._rows = [self.db.risk_config] if self.db.risk_config else []
+        elif 'COUNT(*) AS risk_users' in sql:
+            self._rows = [{'variant_id': v, 'risk_users': n} for v, n in self.db.risk_counts.items()]
+        elif sql.lstrip().startswith('SELECT user_id, variant_id'):
+            self._rows = [{'user_id': u, 'variant_id': v} for u, v in self.db.stored.items()]
+        elif sql.lstrip().startswith('SELECT variant_id FROM'):
+            user_id = params[1]
+            self._rows = [{'variant_id': self.db.stored[user_id]}] if user_id in self.db.stored else []
+        else:
+            self._rows = []
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeConnection:
+    encoding = 'UTF8'
+
+    def __init__(self, db):
+        self.db = db
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        if self.db.fail_commits:
+            raise RuntimeError("could not serialize access")
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.connections = 0
+        self.statements = []
+        self.stored = {}
+        self.test = {'status': 'active', 'end_date': datetime.now() + timedelta(days=7)}
+        self.variants = [
+            {'variant_id': 'a-control', 'traffic_percentage': 50.0},
+            {'variant_id': 'b-treatment', 'traffic_percentage': 50.0},
+        ]
+        self.risk_config = None
+        self.risk_counts = {}
+        self.fail_commits = False
+
+    def connect(self):
+        self.connections += 1
+        return FakeConnection(self)
+
+    def inserts(self):
+        return [sql for sql in self.statements if sql.lstrip().startswith('INSERT')]
+
+
+@pytest.fixture
+def db():
+    return FakeDatabase()
+
+
+def _engine(db, cls=ABAssignmentEngine, **kwargs):
+    engine = cls(connection_factory=db.connect, **kwargs)
+    engine._writer._ensure_thread = lambda: None  # flush explicitly in tests
+    return engine
+
+
+class TestBucketing:
+    def test_bucket_is_deterministic_and_salted_by_test(self):
+        assert bucket_for('t1', 'user-1') == bucket_for('t1', 'user-1')
+        assert 0 <= bucket_for('t1', 'user-1') < 100
+        assert bucket_for('t1', 'user-1') != bucket_for('t2', 'user-1')
+
+    def test_weights_are_respected(self):
+        snapshot = AssignmentSnapshot('t1', 'active', None, ('a', 'b', 'c'), cumulative_weights([10, 30, 60]))
+        counts = Counter(snapshot.variant_for(f'user-{i}') for i in range(20000))
+        assert abs(counts['a'] / 20000 - 0.10) < 0.02
+        assert abs(counts['b'] / 20000 - 0.30) < 0.02
+        assert abs(counts['c'] / 20000 - 0.60) < 0.02
+
+    def test_zero_weight_variants_are_never_picked(self):
+        snapshot = AssignmentSnapshot('t1', 'active', None, ('a', 'b'), cumulative_weights([0, 100]))
+        assert {snapshot.variant_for(f'user-{i}') for i in range(500)} == {'b'}
+
+
+class TestABAssignmentEngine:
+    def test_assign_is_served_from_cache_and_persisted_in_one_batch(self, db):
+        engine = _engine(db)
+        variants = {engine.assign('t1', f'user-{i}') for i in range(50)}
+        assert variants == {'a-control', 'b-treatment'}
+        # One snapshot load: test row, variants and the stored-assignment scan
+        assert db.connections == 1
+        assert engine.assign('t1', 'user-1') == engine.assign('t1', 'user-1')
+
+        assert engine.flush() == 50
+        inserts = db.inserts()
+        assert len(inserts) == 1
+        assert 'ON CONFLICT (test_id, user_id) DO NOTHING' in inserts[0]
+
+    def test_stored_assignments_stay_sticky(self, db):
+        probe = _engine(db)
+        hashed = probe.assign('t1', 'legacy-user')
+        other = 'a-control' if hashed == 'b-treatment' else 'b-treatment'
+        db.stored = {'legacy-user': other}
+
+        engine = _engine(db)
+        assert engine.assign('t1', 'legacy-user') == other
+        assert engine.flush() == 0
+
+    def test_invalidate_reloads_and_notifies(self, db):
+        engine = _engine(db)
+        seen = []
+        engine.subscribe(seen.append)
+        assert engine.assign('t1', 'user-1') is not None
+
+        db.test = {'status': 'paused', 'end_date': None}
+        engine.invalidate('t1')
+        assert seen == ['t1']
+        assert engine.assign('t1', 'user-2') is None
+        assert engine.stats()['snapshot_loads'] == 2
+
+    def test_expired_or_unknown_tests_are_not_assigned(self, db):
+        db.test = {'status': 'active', 'end_date': datetime.now() - timedelta(days=1)}
+        assert _engine(db).assign('t1', 'user-1') is None
+        db.test = None
+        assert _engine(db).assign('t1', 'user-1') is None
+
+    def test_bulk_assign_writes_synchronously(self, db):
+        engine = _engine(db)
+        users = [f'user-{i}' for i in range(2500)] + ['user-1']
+        assignments = engine.bulk_assign('t1', users, page_size=1000)
+
+        assert len(assignments) == 2500
+        assert assignments['user-7'] == engine.assign('t1', 'user-7')
+        assert len(db.inserts()) == 3  # pages of 1000
+        # Already persisted by the bulk pass
+        assert engine.flush() == 0
+
+    def test_failed_write_lets_the_next_assign_requeue(self, db):
+        engine = _engine(db)
+        variant = engine.assign('t1', 'user-1')
+        engine.assign('t1', 'user-1')
+
+        db.fail_commits = True
+        assert engine.flush() == 1
+        assert engine.stats()['write_failures'] == 1
+
+        db.fail_commits = False
+        assert engine.assign('t1', 'user-1') == variant
+        assert engine.flush() == 1
+        assert engine.stats()['writer']['written'] == 1
+
+    def test_full_buffer_drops_without_blocking(self, db):
+        engine = _engine(db)
+        engine._writer.capacity = 2
+        started = time.monotonic()
+        for i in range(5):
+            engine.assign('t1', f'user-{i}')
+
+        assert time.monotonic() - started < 0.2
+        assert engine.stats()['dropped'] == 3
+        assert engine._writer.max_wait == 0
+        # Dropped users were forgotten, so assigning them again queues their row
+        engine.flush()
+        engine.assign('t1', 'user-4')
+        assert engine.flush() == 1
+
+    def test_persist_now_writes_a_missing_assignment_synchronously(self, db):
+        engine = _engine(db)
+        expected = engine.snapshot('t1').variant_for('user-9')
+        statements = len(db.statements)
+
+        assert engine.persist_now('t1', 'user-9') == expected
+        inserts = [sql for sql in db.statements[statements:] if sql.lstrip().startswith('INSERT')]
+        assert len(inserts) == 1 and "'user-9'" in inserts[0]
+        # Remembered as stored, so assign() does not queue it again
+        engine.assign('t1', 'user-9')
+        assert engine.flush() == 0
+
+        db.test = {'status': 'paused', 'end_date': None}
+        engine.invalidate('t1')
+        assert engine.persist_now('t1', 'user-10') is None
+
+
+class TestRiskAssignmentEngine:
+    def test_fills_variants_before_hashing(self, db):
+        db.risk_config = {
+            'variants_config': '{"direct": {}, "supportive": {}}',
+            'status': 'active', 'end_date': None, 'minimum_risk_users_per_variant': 1,
+        }
+        engine = _engine(db, RiskAssignmentEngine)
+
+        assert engine.assign('r1', 'user-1', 0.8, 'high') == 'direct'
+        assert engine.assign('r1', 'user-2', 0.9, 'high') == 'supportive'
+        assert len(db.inserts()) == 2
+
+        db.risk_counts = {'direct': 1, 'supportive': 1}
+        db.stored = {'user-1': 'direct', 'user-2': 'supportive'}
+        connections = db.connections
+        for i in range(3, 30):
+            assert engine.assign('r1', f'user-{i}', 0.7, 'high') in ('direct', 'supportive')
+        # Balanced: one reload, then everything comes from memory
+        assert db.connections == connections + 1
+        assert engine.assign('r1', 'user-1', 0.8, 'high') == 'direct'
+        assert engine.assign('r1', 'user-2', 0.9, 'high') == 'supportive'
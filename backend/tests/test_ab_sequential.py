@@ -0,0 +1,82 @@
+"""
+Sequential A/B statistics: running sufficient statistics reproduce the batch
+numbers, and the mSPRT p-value stays valid under continuous peeking.
+"""
+import os
+import random
+import statistics
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.analytics.ab_sequential import (
+    VariantSummary, confidence_sequence, default_mixing_variance, fixed_horizon_p_value, msprt_p_value,
+)
+
+
+def _summary(values, users=None):
+    summary = VariantSummary(users=users or len(values))
+    for value in values:
+        summary.add(value, first_for_user=True)
+    return summary
+
+
+class TestVariantSummary:
+    def test_matches_batch_statistics(self):
+        rng = random.Random(7)
+        values = [rng.gauss(10, 3) for _ in range(500)]
+        summary = _summary(values, users=1000)
+
+        assert abs(summary.mean - statistics.mean(values)) < 1e-9
+        assert abs(summary.variance - statistics.variance(values)) < 1e-6
+        metrics = summary.metrics()
+        assert metrics['conversion_rate'] == 50.0
+        assert metrics['unique_conversions'] == 500
+
+    def test_repeat_events_do_not_count_as_new_converters(self):
+        summary = VariantSummary(users=10)
+        summary.add(1.0, first_for_user=True)
+        summary.add(2.0, first_for_user=False)
+        assert summary.converters == 1 and summary.value_count == 2 and summary.value_sum == 3.0
+
+
+class TestSequentialSignificance:
+    def test_detects_a_real_effect(self):
+        rng = random.Random(1)
+        control = _summary([rng.gauss(10, 2) for _ in range(2000)])
+        treatment = _summary([rng.gauss(11, 2) for _ in range(2000)])
+        tau_sq = default_mixing_variance(control, treatment, success_threshold=5)
+
+        assert msprt_p_value(control, treatment, tau_sq) < 0.001
+        lower, upper = confidence_sequence(control, treatment, tau_sq)
+        assert lower < -1.0 + 0.3 and upper > -1.0 - 0.3 and upper < 0
+
+    def test_peeking_under_the_null_keeps_false_positives_near_alpha(self):
+        rng = random.Random(3)
+        false_positives_msprt = 0
+        false_positives_fixed = 0
+        experiments = 100
+        for _ in range(experiments):
+            control, treatment = VariantSummary(), VariantSummary()
+            running_min = 1.0
+            fixed_rejected = False
+            tau_sq = None
+            for look in range(1, 31):
+                for _ in range(50):
+                    control.add(rng.gauss(5, 1), first_for_user=True)
+                    treatment.add(rng.gauss(5, 1), first_for_user=True)
+                tau_sq = tau_sq or default_mixing_variance(control, treatment)
+                running_min = min(running_min, msprt_p_value(control, treatment, tau_sq))
+                fixed_rejected = fixed_rejected or fixed_horizon_p_value(control, treatment) < 0.05
+            false_positives_msprt += running_min < 0.05
+            false_positives_fixed += fixed_rejected
+
+        assert false_positives_msprt / experiments <= 0.08
+        # The naive test, read at every look, rejects far more often
+        assert false_positives_fixed > false_positives_msprt
+
+    def test_small_samples_are_not_significant(self):
+        control = _summary([1.0])
+        treatment = _summary([5.0])
+        assert msprt_p_value(control, treatment, 1.0) == 1.0
+        assert confidence_sequence(control, treatment, 1.0) == (0.0, 0.0)
@@ -0,0 +1,121 @@
+"""
+ContentCache: bounded LRU with TTL, hit/miss stats, and disk/Redis-style shared
+stores that let a second process-local cache reuse another's entries.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import backend.utils.content_cache as content_cache
+from backend.utils.content_cache import ContentCache, DiskCacheStore, RedisCacheStore, content_hash
+
+
+class FlakyStore:
+    def get(self, key):
+        raise OSError("store down")
+
+    def set(self, key, payload):
+        raise OSError("store down")
+
+    def clear(self):
+        raise OSError("store down")
+
+
+def test_content_hash_matches_for_bytes_and_text():
+    assert content_hash('résumé') == content_hash('résumé'.encode('utf-8'))
+    assert content_hash(b'a') != content_hash(b'b')
+
+
+def test_lru_is_bounded_and_counts_hits_and_misses():
+    cache = ContentCache('test', max_entries=2, ttl_seconds=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)  # evicts 'b', the least recently used
+
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+    stats = cache.stats()
+    assert stats['entries'] == 2
+    assert stats['evictions'] == 1
+    assert (stats['hits'], stats['misses']) == (2, 1)
+    assert stats['hit_rate'] == pytest.approx(2 / 3)
+
+
+def test_expired_entries_are_misses(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(content_cache.time, 'monotonic', lambda: now[0])
+    cache = ContentCache('test', max_entries=10, ttl_seconds=5)
+    cache.set('a', 'text')
+    now[0] += 6
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+
+def test_get_or_compute_runs_compute_once():
+    cache = ContentCache('test', max_entries=10, ttl_seconds=60)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'parsed': True}
+
+    assert cache.get_or_compute('k', compute) == {'parsed': True}
+    assert cache.get_or_compute('k', compute) == {'parsed': True}
+    assert len(calls) == 1
+
+
+def test_disk_store_is_shared_between_caches(tmp_path):
+    writer = ContentCache('job_postings', store=DiskCacheStore(tmp_path, 'job_postings', 100, 3600))
+    reader = ContentCache('job_postings', store=DiskCacheStore(tmp_path, 'job_postings', 100, 3600))
+    writer.set('page-1', ['posting'])
+
+    assert reader.get('page-1') == ['posting']
+    assert reader.stats()['store_hits'] == 1
+    reader.clear()
+    assert writer.store.get('page-1') is None
+
+
+def test_disk_store_prunes_oldest_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(content_cache, '_DISK_PRUNE_INTERVAL', 1)
+    store = DiskCacheStore(tmp_path, 'job_postings', max_entries=3, ttl_seconds=3600)
+    for i in range(5):
+        store.set(f'k{i}', b'x')
+        os.utime(store._path(f'k{i}'), (1000 + i, 1000 + i))
+
+    assert sorted(path.stem for path in store.directory.glob('*.pkl')) == ['k2', 'k3', 'k4']
+
+
+def test_store_failures_degrade_to_local_cache():
+    cache = ContentCache('test', store=FlakyStore())
+    cache.set('a', 'text')
+    assert cache.get('a') == 'text'
+    assert cache.get('missing') is None
+    cache.clear()
+    assert cache.stats()['store_errors'] == 3
+
+
+def test_store_failures_are_logged_under_the_cache_namespace(caplog):
+    cache = ContentCache('job_postings', store=FlakyStore())
+    cache.set('a', 'text')
+
+    assert "Content cache 'job_postings' store write failed" in caplog.text
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, payload, ex=None):
+        self.data[key] = payload
+
+
+def test_redis_store_keys_use_the_given_prefix():
+    client = FakeRedis()
+    RedisCacheStore(client, 'job_postings', 60).set('k', b'x')
+    RedisCacheStore(client, 'resume_text', 60, key_prefix='resume_cache').set('k', b'y')
+
+    assert set(client.data) == {'content_cache:job_postings:k', 'resume_cache:resume_text:k'}
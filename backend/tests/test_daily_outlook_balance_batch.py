@@ -0,0 +1,166 @@
+"""
+Batch balance scoring: one query per pillar for a block of users, windowed
+streaks, and the same pillar math as the per-user path.
+"""
+import json
+import os
+import sys
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import backend.services.daily_outlook_service as outlook_module
+from backend.services.daily_outlook_service import DailyOutlookService
+
+
+class ScriptedCursor:
+    """Returns canned rows per query, matched on a fragment of the SQL."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.executed = []
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+        for fragment, rows in self.responses.items():
+            if fragment in sql:
+                self._rows = rows
+                return
+        self._rows = []
+
+    def fetchall(self):
+        return self._rows
+
+
+class ScriptedConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.closed = False
+
+    def cursor(self):
+        return self._cursor
+
+    def close(self):
+        self.closed = True
+
+
+FINANCIAL_INFO = {
+    'currentSavings': 12000,
+    'monthlyIncome': 3000,
+    'annualIncome': 60000,
+    'studentLoans': 5000,
+    'creditCardDebt': 1000,
+    'monthlyExpenses': {'rent': 1200, 'groceries': 300},
+}
+
+
+@pytest.fixture
+def cursor(monkeypatch):
+    cur = ScriptedCursor({
+        'FROM users u': [
+            {'user_id': 1, 'financial_info': json.dumps(FINANCIAL_INFO),
+             'goals': json.dumps({'careerGoals': ['promotion']})},
+            {'user_id': 2, 'financial_info': None, 'goals': None},
+        ],
+        'FROM user_mood_data': [{'user_id': 1, 'avg_mood': Decimal('4.5')}],
+        'FROM weekly_checkins': [
+            {'user_id': 1, 'avg_physical': Decimal('3.2'),
+             'avg_meditation': Decimal('45'), 'avg_relationship': Decimal('8.1')},
+        ],
+        'FROM user_relationship_status': [
+            {'user_id': 1, 'status': 'married', 'satisfaction_score': 9},
+        ],
+        'FROM daily_outlooks': [{'user_id': 1, 'streak_count': 4}],
+    })
+    monkeypatch.setattr(outlook_module, 'get_pg_connection', lambda: ScriptedConnection(cur))
+    return cur
+
+
+class TestPillarScorers:
+    def test_financial_matches_indicator_rules(self):
+        # 4 months of savings (+10), 10% debt-to-income (+15), 50% savings rate (+15)
+        assert DailyOutlookService._score_financial(json.dumps(FINANCIAL_INFO)) == 90.0
+        assert DailyOutlookService._score_financial(FINANCIAL_INFO) == 90.0
+        assert DailyOutlookService._score_financial(None) == 50.0
+
+    def test_wellness_accepts_decimal_averages(self):
+        score = DailyOutlookService._score_wellness(
+            Decimal('4.5'),
+            {'avg_physical': Decimal('3.2'), 'avg_meditation': Decimal('45'),
+             'avg_relationship': Decimal('8.1')},
+        )
+        assert score == pytest.approx(50 + (87.5 - 50) * 0.4 + 15 + 5 + 10)
+        assert DailyOutlookService._score_wellness(None, None) == pytest.approx(50.0)
+
+    def test_relationship_and_career_defaults(self):
+        assert DailyOutlookService._score_relationship(None) == 50.0
+        assert DailyOutlookService._score_relationship(
+            {'status': 'dating', 'satisfaction_score': 5}) == pytest.approx(4 * 11.11 + 5)
+        assert DailyOutlookService._score_career(json.dumps({'education': ['mba']})) == 60.0
+
+
+class TestBatchBalanceScores:
+    def test_one_query_per_pillar_for_the_whole_block(self, cursor):
+        service = DailyOutlookService()
+        results = service.calculate_balance_scores_for_users([1, 2, 3], date(2026, 10, 17))
+
+        assert len(cursor.executed) == 5
+        assert all(params[0] == [1, 2, 3] for _, params in cursor.executed)
+        assert set(results) == {1, 2, 3}
+
+        first = results[1]
+        assert first['streak_count'] == 4
+        assert first['individual_scores'].financial_score == 90.0
+        assert first['individual_scores'].career_score == 70.0
+        assert first['weights'] == service.WEIGHT_CONFIGURATIONS[
+            outlook_module.RelationshipStatus.MARRIED].to_dict()
+
+        second = results[2]
+        assert second['streak_count'] == 0
+        assert second['balance_score'] == 50
+        assert second['weights'] == service.WEIGHT_CONFIGURATIONS[
+            outlook_module.RelationshipStatus.SINGLE_CAREER_FOCUSED].to_dict()
+
+    def test_primed_scores_short_circuit_per_user_queries(self, cursor):
+        service = DailyOutlookService()
+        service.prime_balance_scores([1], date(2026, 10, 17))
+        cursor.executed.clear()
+
+        balance_score, scores = service.calculate_balance_score(1)
+        weights = service.calculate_dynamic_weights(1)
+
+        assert cursor.executed == []
+        assert balance_score == service._prefetched[1]['balance_score']
+        assert scores.relationship_score == pytest.approx(8 * 11.11 + 10)
+        assert weights == service._prefetched[1]['weights']
+
+
+class TestStreaks:
+    def test_batch_streak_runs_up_to_the_day_before_the_outlook(self, cursor):
+        DailyOutlookService().calculate_balance_scores_for_users([1, 2], date(2026, 10, 17))
+
+        sql, params = next((sql, params) for sql, params in cursor.executed if 'FROM daily_outlooks' in sql)
+        assert 'ROW_NUMBER()' in sql
+        assert params == ([1, 2], date(2026, 10, 16), date(2026, 10, 16))
+
+    def test_primed_streak_skips_the_database(self, cursor):
+        service = DailyOutlookService()
+        service.prime_balance_scores([1, 2], date(2026, 10, 17))
+        cursor.executed.clear()
+
+        assert service.get_outlook_streak(1, date(2026, 10, 17)) == 4
+        assert service.get_outlook_streak(2, date(2026, 10, 17)) == 0
+        assert cursor.executed == []
+
+    def test_unprimed_streak_is_one_windowed_query(self, cursor):
+        service = DailyOutlookService()
+
+        assert service.get_outlook_streak(1, date(2026, 10, 17)) == 4
+        assert service.calculate_streak_count(2, date(2026, 10, 16)) == 0
+        assert len(cursor.executed) == 2
+        assert all('ROW_NUMBER()' in sql for sql, _ in cursor.executed)
+        assert cursor.executed[0][1] == ([1], date(2026, 10, 16), date(2026, 10, 16))
@@ -0,0 +1,223 @@
+"""
+Sharded nightly outlook generation: pending users are chunked into a chord,
+each chunk bulk-saves its outlooks, and the callback aggregates chunk stats.
+"""
+import os
+import sys
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import backend.tasks.daily_outlook_tasks as tasks
+
+
+class FakeContentService:
+    saved_batches = []
+    primed = []
+
+    def __init__(self):
+        self.daily_outlook_service = SimpleNamespace(
+            prime_balance_scores=lambda user_ids, target_date: FakeContentService.primed.append(
+                (list(user_ids), target_date)
+            )
+        )
+
+    def generate_daily_outlook(self, user_id, save=True):
+        assert save is False
+        if user_id == 13:
+            raise ValueError("no profile")
+        return {'user_id': user_id, 'balance_score': 70}
+
+    def _save_daily_outlooks_bulk(self, outlooks):
+        FakeContentService.saved_batches.append([o['user_id'] for o in outlooks])
+        return len(outlooks)
+
+
+@pytest.fixture
+def fake_content_service(monkeypatch):
+    FakeContentService.saved_batches = []
+    FakeContentService.primed = []
+    monkeypatch.setattr(tasks, 'DailyOutlookContentService', FakeContentService)
+    return FakeContentService
+
+
+class TestDailyOutlookFanOut:
+    def test_dispatch_skips_existing_and_chunks_pending_users(self, monkeypatch):
+        monkeypatch.setattr(tasks, '_get_active_user_ids', lambda: list(range(1, 11)))
+        fake_db = MagicMock()
+        fake_db.session.query.return_value.filter.return_value.all.return_value = [
+            SimpleNamespace(user_id=2), SimpleNamespace(user_id=5)
+        ]
+        monkeypatch.setattr(tasks, 'db', fake_db)
+        dispatched = {}
+
+        def fake_chord(header):
+            dispatched['chunks'] = [sig.args[0] for sig in header]
+            return lambda callback: SimpleNamespace(id='chord-1')
+
+        monkeypatch.setattr(tasks, 'chord', fake_chord)
+
+        summary = tasks._dispatch_outlook_chunks('task-1', date(2026, 10, 17), False, 3)
+
+        assert dispatched['chunks'] == [[1, 3, 4], [6, 7, 8], [9, 10]]
+        assert summary['skipped_count'] == 2
+        assert summary['pending_count'] == 8
+        assert summary['chunk_count'] == 3
+        assert summary['aggregate_task_id'] == 'chord-1'
+        assert fake_db.session.query.call_count == 1
+
+    def test_chunk_bulk_saves_and_reports_failures(self, fake_content_service):
+        stats = tasks.generate_daily_outlook_chunk.run([11, 12, 13], '2026-10-17')
+
+        assert fake_content_service.primed == [([11, 12, 13], date(2026, 10, 17))]
+        assert fake_content_service.saved_batches == [[11, 12]]
+        assert stats['generated_count'] == 2
+        assert stats['failed_count'] == 1
+        assert 'user 13' in stats['errors'][0]
+
+    def test_chunk_that_saves_nothing_is_retried(self, fake_content_service, monkeypatch):
+        monkeypatch.setattr(FakeContentService, '_save_daily_outlooks_bulk', lambda self, outlooks: 0)
+        chunk_task = tasks.generate_daily_outlook_chunk
+        retries = []
+
+        def fake_retry(countdown=None, **kwargs):
+            retries.append(countdown)
+            return RuntimeError('retry scheduled')
+
+        monkeypatch.setattr(chunk_task, 'retry', fake_retry)
+
+        with pytest.raises(RuntimeError, match='retry scheduled'):
+            chunk_task.run([11, 12], '2026-10-17')
+        assert retries == [60]
+
+    def test_chunk_reports_every_user_failed_once_retries_run_out(self, fake_content_service, monkeypatch):
+        monkeypatch.setattr(FakeContentService, '_save_daily_outlooks_bulk', lambda self, outlooks: 0)
+        monkeypatch.setattr(tasks.generate_daily_outlook_chunk, 'max_retries', 0)
+
+        stats = tasks.generate_daily_outlook_chunk.run([11, 12, 13], '2026-10-17')
+
+        assert stats['generated_count'] == 0
+        assert stats['failed_count'] == 3
+        assert 'Failed to save any of 2 outlooks' in stats['errors'][0]
+
+    def test_aggregate_sums_chunk_stats(self):
+        summary = {'total_users': 10, 'skipped_count': 2, 'task_id': 't'}
+        results = tasks.aggregate_daily_outlook_chunks.run(
+            [
+                {'generated_count': 3, 'failed_count': 0, 'errors': [], 'duration_seconds': 1.5},
+                {'generated_count': 4, 'failed_count': 1, 'errors': ['boom'], 'duration_seconds': 2.0},
+            ],
+            summary,
+        )
+
+        assert results['generated_count'] == 7
+        assert results['failed_count'] == 1
+        assert results['errors'] == ['boom']
+        assert results['max_chunk_seconds'] == 2.0
+        assert results['success'] is False
+
+    def test_wrapper_reports_dispatch_when_fanned_out(self, monkeypatch):
+        monkeypatch.setattr(tasks, 'generate_daily_outlooks_batch', lambda *args: {
+            'skipped_count': 2, 'pending_count': 8, 'chunk_count': 3,
+            'generated_count': 0, 'aggregate_task_id': 'chord-1',
+        })
+
+        result = tasks.generate_daily_outlooks.run('2026-10-17')
+
+        assert result['status'] == 'dispatched'
+        assert result['dispatched_chunks'] == 3
+        assert result['scheduled_users'] == 8
+        assert result['aggregate_task_id'] == 'chord-1'
+        assert 'generated_count' not in result
+
+
+class FakeOutlookCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, params=None):
+        self.conn.statements.append(sql)
+
+
+class FakeOutlookConnection:
+    def __init__(self):
+        self.statements = []
+        self.written = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = False
+
+    def cursor(self):
+        return FakeOutlookCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class TestBulkOutlookSave:
+    def _outlook(self, user_id, streak_count=1):
+        return {
+            'user_id': user_id, 'date': date(2026, 10, 17), 'balance_score': 70,
+            'financial_weight': 25, 'wellness_weight': 25, 'relationship_weight': 25,
+            'career_weight': 25, 'primary_insight': 'x', 'quick_actions': [],
+            'encouragement_message': 'y', 'surprise_element': 'z', 'streak_count': streak_count,
+        }
+
+    def test_bad_row_falls_back_to_row_by_row_saves(self, monkeypatch):
+        import backend.services.daily_outlook_content_service as content_module
+
+        conn = FakeOutlookConnection()
+
+        def fake_execute_values(cursor, sql, rows, page_size=100):
+            if any(row[0] == 13 for row in rows):
+                raise ValueError('value too long for type')
+            conn.written.extend(row[0] for row in rows)
+
+        monkeypatch.setattr(content_module, 'get_pg_connection', lambda: conn)
+        monkeypatch.setattr(content_module.psycopg2.extras, 'execute_values', fake_execute_values)
+        service = content_module.DailyOutlookContentService.__new__(
+            content_module.DailyOutlookContentService
+        )
+        outlooks = [self._outlook(11), self._outlook(13), self._outlook(12)]
+        del outlooks[2]['streak_count']  # fails while building its row
+        outlooks.append(self._outlook(14))
+
+        saved = service._save_daily_outlooks_bulk(outlooks)
+
+        assert saved == 2
+        assert conn.written == [11, 14]
+        assert conn.rollbacks == 1
+        assert conn.statements.count('ROLLBACK TO SAVEPOINT daily_outlook_row') == 2
+        assert conn.commits == 1
+        assert conn.closed
+
+    def test_single_save_runs_the_shared_upsert(self, monkeypatch):
+        import backend.services.daily_outlook_content_service as content_module
+
+        conn = FakeOutlookConnection()
+        calls = []
+
+        def fake_execute_values(cursor, sql, rows, page_size=100):
+            calls.append((sql, rows))
+
+        monkeypatch.setattr(content_module, 'get_pg_connection', lambda: conn)
+        monkeypatch.setattr(content_module.psycopg2.extras, 'execute_values', fake_execute_values)
+        service = content_module.DailyOutlookContentService.__new__(
+            content_module.DailyOutlookContentService
+        )
+
+        assert service._save_daily_outlook(self._outlook(11, streak_count=4)) is True
+        [(sql, rows)] = calls
+        assert sql is content_module.DailyOutlookContentService._UPSERT_DAILY_OUTLOOK_SQL
+        assert rows[0][0] == 11 and rows[0][11] == 4
+        assert conn.commits == 1 and conn.closed
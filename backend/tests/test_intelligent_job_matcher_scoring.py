@@ -0,0 +1,188 @@
+"""
+IntelligentJobMatcher columnar scoring: the vectorized component and overall
+scores must equal the per-job _calculate_*_score methods, top-K selection
+must match a stable sort of every job, and candidate columns built once per
+search must score like the plain job list.
+"""
+import os
+import random
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+ijm = pytest.importorskip('backend.ml.models.intelligent_job_matcher')
+from backend.ml.models.resume_parser import ExperienceLevel, FieldType  # noqa: E402
+
+TITLES = ['Senior Data Analyst', 'Data Analyst', 'Lead Engineer', 'Director of Ops',
+          'VP Sales', 'Head of Data', 'Principal Engineer', 'Specialist', 'Associate']
+LOCATIONS = ['Atlanta, GA', 'Houston', 'Remote', 'Seattle', 'Washington DC Metro']
+REQUIREMENTS = [['Python', 'SQL'], ['Excel'], [], ['python', 'sql', 'analytics', 'tableau']]
+RESUME_ANALYSIS = SimpleNamespace(field_analysis=SimpleNamespace(primary_field=FieldType.DATA_ANALYSIS))
+
+
+@pytest.fixture(scope='module')
+def matcher():
+    return ijm.IntelligentJobMatcher()
+
+
+def _jobs(rnd, count):
+    jobs = []
+    for i in range(count):
+        salary = None
+        if rnd.random() > 0.15:
+            salary = ijm.SalaryRange(rnd.randint(40, 200) * 1000, rnd.randint(40, 220) * 1000)
+        jobs.append(ijm.JobPosting(
+            id=str(i), title=rnd.choice(TITLES), company='Co', location=rnd.choice(LOCATIONS),
+            salary_range=salary, requirements=rnd.choice(REQUIREMENTS),
+            field=rnd.choice(['Data Analysis', 'Marketing']), remote_work=rnd.random() < 0.4,
+            company_tier=rnd.choice(list(ijm.CompanyTier)),
+            company_size=rnd.choice(['', '1000+ employees', 'Fortune 100', '50']),
+            glassdoor_rating=rnd.choice([None, 3.2, 4.5, 2.9])
+        ))
+    return jobs
+
+
+def _params(level, current_salary=80000):
+    return ijm.SearchParameters(
+        current_salary=current_salary, target_salary_min=95000,
+        primary_field=FieldType.DATA_ANALYSIS, experience_level=level,
+        skills=['python', 'SQL'], locations=['Atlanta', 'Washington DC']
+    )
+
+
+def _scalar_scores(matcher, job, params):
+    components = (
+        matcher._calculate_salary_improvement_score(job, params),
+        matcher._calculate_skills_alignment_score(job, params),
+        matcher._calculate_career_progression_score(job, params, RESUME_ANALYSIS),
+        matcher._calculate_company_stability_score(job),
+        matcher._calculate_location_compatibility_score(job, params),
+        matcher._calculate_growth_potential_score(job, RESUME_ANALYSIS),
+    )
+    salary, skills, career, company, location, growth = components
+    overall = (salary * 0.35 + skills * 0.25 + career * 0.20 +
+               company * 0.10 + location * 0.05 + growth * 0.05)
+    return overall, components
+
+
+@pytest.mark.parametrize('level', [ExperienceLevel.ENTRY, ExperienceLevel.MID, ExperienceLevel.SENIOR])
+def test_vectorized_scores_match_scalar_methods(matcher, level):
+    jobs = _jobs(random.Random(7), 300)
+    params = _params(level)
+    scored = matcher._score_jobs(jobs, params, RESUME_ANALYSIS)
+
+    expected = sorted(((job, *_scalar_scores(matcher, job, params)) for job in jobs),
+                      key=lambda item: item[1], reverse=True)
+    assert [score.job.id for score in scored] == [job.id for job, _, _ in expected]
+    for score, (job, overall, components) in zip(scored, expected):
+        assert score.overall_score == pytest.approx(overall, abs=1e-12)
+        assert (score.salary_improvement_score, score.skills_alignment_score,
+                score.career_progression_score, score.company_stability_score,
+                score.location_compatibility_score, score.growth_potential_score) == components
+        assert score.recommendations == matcher._generate_job_recommendations(job, params)
+        assert score.risk_factors == matcher._identify_job_risk_factors(job, params)
+
+
+@pytest.mark.parametrize('top_k', [0, 1, 5, 17, 1000])
+def test_top_k_matches_prefix_of_full_ranking(matcher, top_k):
+    # Few distinct feature values, so many ties straddle the cut-off
+    jobs = _jobs(random.Random(11), 200)
+    params = _params(ExperienceLevel.MID)
+    full = matcher._score_jobs(jobs, params, RESUME_ANALYSIS)
+    top = matcher._score_jobs(jobs, params, RESUME_ANALYSIS, top_k=top_k)
+    assert [score.job.id for score in top] == [score.job.id for score in full[:top_k]]
+
+
+def test_unscorable_jobs_are_skipped(matcher):
+    jobs = _jobs(random.Random(3), 10)
+    jobs[2].title = None
+    jobs[5].location = None
+    scored = matcher._score_jobs(jobs, _params(ExperienceLevel.MID), RESUME_ANALYSIS)
+    assert {score.job.id for score in scored} == {job.id for job in jobs} - {'2', '5'}
+
+
+def test_salary_threshold_and_statistics_cover_all_eligible_jobs(matcher):
+    jobs = _jobs(random.Random(5), 120)
+    params = _params(ExperienceLevel.MID)
+    columns = matcher._score_job_columns(jobs, params, RESUME_ANALYSIS)
+    eligible = matcher._salary_threshold_mask(columns, params)
+
+    expected = [
+        job for job, overall in zip(jobs, columns.overall)
+        if (job.salary_range and (job.salary_range.midpoint - params.current_salary) / params.current_salary
+            >= params.min_salary_increase) or (not job.salary_range and overall >= 0.7)
+    ]
+    assert [jobs[i].id for i in eligible.nonzero()[0]] == [job.id for job in expected]
+
+    stats = matcher._calculate_search_statistics(columns, eligible, params)
+    assert stats['total_jobs'] == len(expected)
+    assert stats['remote_opportunities'] == sum(job.remote_work for job in expected)
+
+
+def test_prebuilt_candidate_columns_score_like_the_job_list(matcher):
+    jobs = _jobs(random.Random(13), 150)
+    candidates = ijm.JobCandidateColumns.build(jobs)
+    assert len(candidates.titles.values) == len(set(job.title for job in jobs))
+
+    for level in (ExperienceLevel.ENTRY, ExperienceLevel.SENIOR):
+        params = _params(level, current_salary=70000 if level == ExperienceLevel.ENTRY else 120000)
+        from_list = matcher._score_job_columns(jobs, params, RESUME_ANALYSIS)
+        from_columns = matcher._score_job_columns(candidates, params, RESUME_ANALYSIS)
+        assert from_columns.jobs is jobs
+        assert np.array_equal(from_columns.overall, from_list.overall, equal_nan=True)
+        assert np.array_equal(from_columns.valid, from_list.valid)
+
+
+def test_distinct_column_scores_each_value_once_and_marks_failures():
+    column = ijm.DistinctColumn.encode(['Atlanta', None, 'Remote', 'Atlanta', None])
+    calls = []
+
+    def score(location):
+        calls.append(location)
+        return 1.0 if 'atlanta' in location.lower() else 0.0
+
+    scores = column.score(score)
+    assert calls == ['Atlanta', None, 'Remote']
+    assert scores[[0, 2, 3]].tolist() == [1.0, 0.0, 1.0]
+    assert np.isnan(scores[[1, 4]]).all()
+    assert ijm.DistinctColumn.encode([]).score(score).shape == (0,)
+
+
+def test_search_candidates_are_built_once_per_search(matcher, monkeypatch):
+    searches = []
+
+    def fake_search(params):
+        searches.append(params)
+        return _jobs(random.Random(17), 40)
+
+    monkeypatch.setattr(matcher, '_search_jobs', fake_search)
+    matcher.search_cache.clear()
+    params = _params(ExperienceLevel.MID)
+
+    first = matcher._search_job_candidates(params)
+    assert matcher._search_job_candidates(_params(ExperienceLevel.MID)) is first
+    assert len(searches) == 1
+
+    matcher._search_job_candidates(_params(ExperienceLevel.MID, current_salary=90000))
+    assert len(searches) == 1  # current salary only affects scoring, not the search
+    matcher._search_job_candidates(_params(ExperienceLevel.SENIOR))
+    assert len(searches) == 2
+
+
+def test_column_scores_come_from_the_scalar_methods(matcher, monkeypatch):
+    jobs = _jobs(random.Random(17), 120)
+    params = _params(ExperienceLevel.MID)
+    monkeypatch.setattr(matcher, '_calculate_company_stability_score', lambda job: 0.123)
+    monkeypatch.setattr(matcher, '_calculate_skills_alignment_score',
+                        lambda job, params: 0.9 if job.requirements else 0.1)
+
+    scored = matcher._score_jobs(jobs, params, RESUME_ANALYSIS)
+
+    assert scored
+    for score in scored:
+        assert score.company_stability_score == pytest.approx(0.123)
+        assert score.skills_alignment_score == pytest.approx(0.9 if score.job.requirements else 0.1)
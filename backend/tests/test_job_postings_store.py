@@ -0,0 +1,146 @@
+"""
+JobPostingsStore: multi-field/multi-MSA queries with the salary window and keyset
+cursor bound as SQL parameters, pagination that visits every row exactly once, and
+the shared TTL cache (no PostgreSQL needed: the connection evaluates the bound
+parameters against in-memory rows).
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.utils.job_postings_store import (
+    JobPostingsQuery, JobPostingsStore, _page_sql, fetch_job_postings_page
+)
+
+
+def _row(id, field, msa, salary_min, salary_max, title=None, is_active=True):
+    return {
+        'id': id, 'title': title or f'Role {id}', 'company': 'Acme',
+        'career_field': field, 'msa_code': msa, 'location': 'Atlanta, GA',
+        'salary_min': salary_min, 'salary_max': salary_max,
+        'seniority_level': 'mid', 'advancement_trajectory': '', 'is_active': is_active,
+    }
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.result = []
+
+    def execute(self, sql, params):
+        self.conn.executed.append((sql, params))
+        rows = [
+            row for row in self.conn.rows
+            if row['is_active']
+            and row['career_field'] in params['career_fields']
+            and row['msa_code'] in params['msa_codes']
+            and ('salary_midpoint_min' not in params
+                 or (row['salary_min'] + row['salary_max']) // 2 >= params['salary_midpoint_min'])
+            and ('salary_midpoint_max' not in params
+                 or (row['salary_min'] + row['salary_max']) // 2 <= params['salary_midpoint_max'])
+            and ('after_salary_max' not in params
+                 or row['salary_max'] < params['after_salary_max']
+                 or (row['salary_max'] == params['after_salary_max']
+                     and (row['title'], row['id']) > (params['after_title'], params['after_id'])))
+        ]
+        rows.sort(key=lambda row: (-row['salary_max'], row['title'], row['id']))
+        self.result = rows[:params['limit']]
+
+    def fetchall(self):
+        return self.result
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = []
+        self.closes = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def close(self):
+        self.closes += 1
+
+
+def _rows():
+    rows = [_row(i, 'Technology', '12060', 80000 + i * 1000, 100000 + (i % 4) * 5000) for i in range(1, 13)]
+    rows += [
+        _row(20, 'Technology', '26420', 90000, 110000),
+        _row(21, 'Sales', '12060', 90000, 110000),
+        _row(22, 'Technology', '12060', 90000, 130000, is_active=False),
+    ]
+    return rows
+
+
+def test_page_sql_binds_fields_msas_salary_window_and_cursor():
+    query = JobPostingsQuery.build(['Technology', 'Technology', ''], ['26420', '12060'], 90000, 110000)
+    sql, params = _page_sql(query, (105000, 'Role 3', 3), 50)
+
+    assert query.career_fields == ('Technology',)
+    assert query.msa_codes == ('12060', '26420')
+    assert 'career_field = ANY(%(career_fields)s)' in sql
+    assert 'msa_code = ANY(%(msa_codes)s)' in sql
+    assert '(salary_min + salary_max) / 2 >= %(salary_midpoint_min)s' in sql
+    assert 'ORDER BY salary_max DESC, title, id' in sql
+    assert params['msa_codes'] == ['12060', '26420']
+    assert (params['after_salary_max'], params['after_title'], params['after_id']) == (105000, 'Role 3', 3)
+    assert params['limit'] == 50
+
+
+def test_keyset_pages_cover_every_matching_row_once():
+    conn = FakeConnection(_rows())
+    store = JobPostingsStore(connection_factory=lambda: conn)
+    query = JobPostingsQuery.build(['Technology'], ['12060', '26420'])
+
+    paged = list(store.iter_rows(query, page_size=5))
+    unpaged = fetch_job_postings_page(query, limit=100, connection_factory=lambda: conn).rows
+
+    assert [row['id'] for row in paged] == [row['id'] for row in unpaged]
+    assert len(paged) == 13  # 12 in Atlanta, 1 in Houston; inactive and Sales rows excluded
+    assert len({row['id'] for row in paged}) == len(paged)
+    assert conn.closes == len(conn.executed)
+
+
+def test_salary_window_is_applied_by_the_query():
+    conn = FakeConnection(_rows())
+    store = JobPostingsStore(connection_factory=lambda: conn)
+
+    rows = store.search(JobPostingsQuery.build(['Technology'], ['12060'], 95000, 100000))
+
+    midpoints = [(row['salary_min'] + row['salary_max']) // 2 for row in rows]
+    assert rows and all(95000 <= midpoint <= 100000 for midpoint in midpoints)
+
+
+def test_max_rows_caps_the_fetch():
+    conn = FakeConnection(_rows())
+    store = JobPostingsStore(connection_factory=lambda: conn)
+
+    rows = store.search(JobPostingsQuery.build(['Technology'], ['12060']), max_rows=4)
+
+    assert len(rows) == 4
+    assert len(conn.executed) == 1
+
+
+def test_repeated_searches_hit_the_cache_until_cleared():
+    conn = FakeConnection(_rows())
+    store = JobPostingsStore(connection_factory=lambda: conn)
+
+    first = store.search(JobPostingsQuery.build(['Technology'], ['12060', '26420'], 90000, 120000))
+    second = store.search(JobPostingsQuery.build(['Technology'], ['26420', '12060'], 90000, 120000))
+    assert first == second
+    assert len(conn.executed) == 1
+    assert store.stats()['hits'] == 1
+
+    store.clear()
+    store.search(JobPostingsQuery.build(['Technology'], ['12060', '26420'], 90000, 120000))
+    assert len(conn.executed) == 2
+
+
+def test_empty_query_skips_the_database():
+    conn = FakeConnection(_rows())
+    store = JobPostingsStore(connection_factory=lambda: conn)
+
+    assert store.search(JobPostingsQuery.build(['Technology'], [])) == []
+    assert conn.executed == []
@@ -0,0 +1,154 @@
+"""
+PGConnectionPool: bounded reuse behind get_pg_connection, health-checked checkout,
+fork ownership and per-pool metrics (no PostgreSQL needed: connections are fakes).
+"""
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import psycopg2.extensions
+
+import backend.utils.pg_pool as pg_pool
+from backend.utils.pg_pool import PGConnectionPool, PoolTimeoutError
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, params=None):
+        if self.conn.broken:
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+        self.conn.executed.append(sql)
+        self.conn.status = psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, dsn):
+        self.dsn = dsn
+        self.closed = 0
+        self.broken = False
+        self.autocommit = False
+        self.cursor_factory = None
+        self.executed = []
+        self.rollbacks = 0
+        self.status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return self.status
+
+    def commit(self):
+        self.status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def opened():
+    return []
+
+
+@pytest.fixture
+def make_pool(opened):
+    def factory(**kwargs):
+        def connect(dsn):
+            conn = FakeConnection(dsn)
+            opened.append(conn)
+            return conn
+        return PGConnectionPool('postgresql://app:secret@db/mingus', connect=connect, **kwargs)
+    return factory
+
+
+class TestCheckout:
+    def test_close_returns_connection_for_reuse(self, make_pool, opened):
+        pool = make_pool(maxconn=2)
+
+        first = pool.getconn()
+        cursor = first.cursor()
+        cursor.execute("UPDATE users SET tier = 'pro'")
+        first.close()
+        second = pool.getconn()
+
+        assert len(opened) == 1 and second._conn is opened[0]
+        # The open transaction left behind by the first caller was rolled back
+        assert opened[0].rollbacks == 1
+        assert first.closed and not second.closed
+
+    def test_cursor_factory_is_reset_between_checkouts(self, make_pool):
+        pool = make_pool()
+        conn = pool.getconn(cursor_factory='dict-cursor')
+        assert conn.cursor_factory == 'dict-cursor'
+        conn.cursor_factory = 'custom'
+        conn.close()
+
+        assert pool.getconn().cursor_factory is None
+
+    def test_waits_for_a_slot_then_times_out(self, make_pool):
+        pool = make_pool(maxconn=1, timeout=0.05)
+        held = pool.getconn()
+
+        with pytest.raises(PoolTimeoutError):
+            pool.getconn()
+
+        releaser = threading.Timer(0.01, held.close)
+        pool.timeout = 2
+        releaser.start()
+        conn = pool.getconn()
+        releaser.join()
+
+        metrics = pool.metrics()
+        assert conn.closed == 0
+        assert metrics['timeouts'] == 1 and metrics['waits'] == 1
+        assert metrics['in_use'] == 1 and metrics['size'] == 1
+        assert 'secret' not in metrics['dsn']
+
+    def test_stale_connections_are_replaced(self, make_pool, opened):
+        pool = make_pool(health_check_idle=0)
+        conn = pool.getconn()
+        conn.close()
+        opened[0].broken = True
+
+        replacement = pool.getconn()
+
+        assert replacement._conn is opened[1] and opened[0].closed
+        assert pool.metrics()['health_check_failures'] == 1
+
+    def test_dropped_proxy_returns_its_slot(self, make_pool):
+        pool = make_pool(maxconn=1, timeout=0.05)
+        pool.getconn()  # never closed by the caller
+        assert pool.getconn().closed == 0
+
+
+class TestProcessRegistry:
+    def test_get_pg_connection_requires_database_url(self, monkeypatch):
+        monkeypatch.delenv('DATABASE_URL', raising=False)
+        with pytest.raises(RuntimeError, match='DATABASE_URL is required'):
+            pg_pool.get_pg_connection()
+
+    def test_pools_are_per_process(self, monkeypatch):
+        monkeypatch.setenv('DATABASE_URL', 'postgresql://db/mingus')
+        monkeypatch.setattr(pg_pool, '_pools', {})
+        monkeypatch.setattr(pg_pool, '_inherited', [])
+        parent = pg_pool.get_pool()
+        assert pg_pool.get_pool() is parent
+
+        monkeypatch.setattr(pg_pool.os, 'getpid', lambda: parent.pid + 1)
+        child = pg_pool.get_pool()
+
+        assert child is not parent and pg_pool._inherited == [parent]
+        assert pg_pool.get_pool_metrics().keys() == {'postgresql://db/mingus'}
@@ -0,0 +1,116 @@
+"""
+RateLimiter: sliding-window-counter and token-bucket checks with O(1) state per
+key, all-or-nothing batched checks, and the same behaviour on Redis and in memory.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import backend.utils.rate_limiting as rate_limiting
+from backend.utils.rate_limiting import RateLimiter
+
+LIMITS = {
+    'burst': {'requests': 3, 'window': 60},
+    'hourly': {'requests': 5, 'window': 3600},
+}
+
+
+class FakeClock:
+    def __init__(self, now=1_800_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiting.time, 'time', fake.time)
+    return fake
+
+
+def _limiters():
+    limiters = [('memory', lambda algorithm: RateLimiter(algorithm=algorithm, limits=LIMITS))]
+    try:
+        import fakeredis
+        import lupa  # noqa: F401  (fakeredis needs it for EVAL)
+        limiters.append((
+            'redis',
+            lambda algorithm: RateLimiter(fakeredis.FakeRedis(), algorithm=algorithm, limits=LIMITS),
+        ))
+    except ImportError:
+        pass
+    return limiters
+
+
+@pytest.fixture(params=_limiters(), ids=lambda p: p[0])
+def make_limiter(request):
+    return request.param[1]
+
+
+class TestSlidingWindow:
+    def test_blocks_at_limit_and_keeps_existing_api(self, make_limiter, clock):
+        limiter = make_limiter('sliding_window')
+
+        assert [limiter.is_allowed('ip-1', 'burst') for _ in range(4)] == [True, True, True, False]
+        assert limiter.get_remaining_requests('ip-1', 'burst') == 0
+        assert limiter.get_remaining_requests('ip-2', 'burst') == 3
+
+    def test_previous_window_decays(self, make_limiter, clock):
+        limiter = make_limiter('sliding_window')
+        clock.now = 1_800_000_040.0  # 40s into a 60s window
+        for _ in range(3):
+            limiter.is_allowed('ip-1', 'burst')
+
+        # 30s into the next window the previous count is weighted by half
+        clock.now += 50
+        assert limiter.get_remaining_requests('ip-1', 'burst') == 1
+        assert limiter.is_allowed('ip-1', 'burst')
+        assert not limiter.is_allowed('ip-1', 'burst')
+
+    def test_batched_check_is_all_or_nothing(self, make_limiter, clock):
+        limiter = make_limiter('sliding_window')
+        for _ in range(3):
+            assert all(r.allowed for r in limiter.check_many('u-7', ['burst', 'hourly']).values())
+
+        results = limiter.check_many('u-7', ['burst', 'hourly'])
+
+        assert not results['burst'].allowed and not results['hourly'].allowed
+        assert results['hourly'].remaining == 2
+        assert results['burst'].retry_after > 0
+
+
+class TestTokenBucket:
+    def test_bursts_then_refills_evenly(self, make_limiter, clock):
+        limiter = make_limiter('token_bucket')
+        assert [limiter.is_allowed('ip-1', 'burst') for _ in range(4)] == [True, True, True, False]
+
+        clock.now += 20  # one token per 20s
+        assert limiter.is_allowed('ip-1', 'burst')
+        assert not limiter.is_allowed('ip-1', 'burst')
+
+
+class TestLocalFallback:
+    def test_memory_is_bounded_per_key_and_overall(self, clock):
+        limiter = RateLimiter(limits=LIMITS, max_local_keys=100)
+        for _ in range(50):
+            limiter.is_allowed('hot-key', 'burst')
+        for i in range(1000):
+            limiter.is_allowed(f'bot-{i}', 'burst')
+
+        assert len(limiter._local.entries) == 100
+        assert all(len(state) == 3 for state in limiter._local.entries.values())
+
+    def test_redis_errors_fall_back_to_memory(self, clock):
+        class BrokenRedis:
+            def register_script(self, source):
+                def run(keys, args):
+                    raise rate_limiting.RedisError("down")
+                return run
+
+        limiter = RateLimiter(BrokenRedis(), limits=LIMITS)
+        assert [limiter.is_allowed('ip-1', 'burst') for _ in range(4)] == [True, True, True, False]
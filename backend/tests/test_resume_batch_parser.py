@@ -0,0 +1,126 @@
+"""
+ResumeBatchParser: per-file results from a process pool, with per-file time
+limits, crash isolation and batch deadlines (fake parsers, no PDF libraries).
+"""
+import os
+import signal
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import backend.utils.resume_batch_parser as resume_batch_parser
+from backend.utils.resume_batch_parser import ResumeBatchParser
+
+pytestmark = pytest.mark.skipif(not hasattr(signal, 'setitimer'), reason="needs POSIX interval timers")
+
+
+class FakeParser:
+    """Parses by file name: 'slow*' sleeps, 'nap*' takes 0.3s, 'crash*' kills the worker, 'stuck*' ignores SIGALRM"""
+
+    def parse_resume_from_bytes(self, file_bytes, file_name, location="New York"):
+        if file_name.startswith('nap'):
+            time.sleep(0.3)
+        if file_name.startswith('slow'):
+            time.sleep(30)
+        if file_name.startswith('crash'):
+            os._exit(1)
+        if file_name.startswith('stuck'):
+            signal.signal(signal.SIGALRM, signal.SIG_IGN)
+            time.sleep(30)
+        return {
+            'success': True,
+            'parsed_data': {'size': len(file_bytes), 'location': location},
+            'advanced_analytics': {}
+        }
+
+
+def fake_parser_factory():
+    return FakeParser()
+
+
+@pytest.fixture
+def batch_parser():
+    parser = ResumeBatchParser(max_workers=2, file_timeout_seconds=1,
+                               file_memory_mb=0, parser_factory=fake_parser_factory)
+    yield parser
+    parser.shutdown()
+
+
+def _by_name(results):
+    return {result['file_name']: result for result in results}
+
+
+def test_every_file_gets_one_result(batch_parser):
+    files = [(f'resume{i}.txt', b'x' * i) for i in range(7)]
+    results = list(batch_parser.parse_batch(files, location='Atlanta'))
+
+    assert sorted(result['index'] for result in results) == list(range(7))
+    for result in results:
+        assert result['success']
+        assert result['parsed_data'] == {'size': result['index'], 'location': 'Atlanta'}
+
+
+def test_slow_file_times_out_without_blocking_others(batch_parser):
+    files = [('slow.pdf', b''), ('a.txt', b'a'), ('b.txt', b'b')]
+    results = _by_name(batch_parser.parse_batch(files))
+
+    assert not results['slow.pdf']['success']
+    assert 'time limit' in results['slow.pdf']['error']
+    assert results['a.txt']['success'] and results['b.txt']['success']
+
+
+def test_worker_crash_is_attributed_to_its_file(batch_parser):
+    files = [('crash.docx', b''), ('a.txt', b'a'), ('b.txt', b'b'), ('c.txt', b'c')]
+    results = _by_name(batch_parser.parse_batch(files))
+
+    assert not results['crash.docx']['success']
+    assert all(results[name]['success'] for name in ('a.txt', 'b.txt', 'c.txt'))
+    # The pool is rebuilt for the next batch
+    assert list(batch_parser.parse_batch([('d.txt', b'd')]))[0]['success']
+
+
+def test_hung_worker_is_killed(batch_parser, monkeypatch):
+    monkeypatch.setattr(resume_batch_parser, 'HARD_TIMEOUT_GRACE_SECONDS', 0.5)
+    files = [('stuck.pdf', b''), ('a.txt', b'a')]
+    results = _by_name(batch_parser.parse_batch(files))
+
+    assert 'time limit' in results['stuck.pdf']['error']
+    assert results['a.txt']['success']
+
+
+def test_files_past_deadline_are_deferred(batch_parser):
+    files = [(f'resume{i}.txt', b'') for i in range(3)]
+    results = list(batch_parser.parse_batch(files, deadline_seconds=0))
+
+    assert [result['index'] for result in results] == [0, 1, 2]
+    assert all(result['deferred'] and not result['success'] for result in results)
+
+
+def test_concurrent_batches_share_the_worker_slots(batch_parser, monkeypatch):
+    # Hard timeout 1.2s: a file queued behind another batch's 0.3s files
+    # would be killed as hung if its clock started at submission
+    monkeypatch.setattr(resume_batch_parser, 'HARD_TIMEOUT_GRACE_SECONDS', 0.2)
+    results = {}
+    peak = []
+
+    def run(name):
+        files = [(f'nap-{name}-{i}.txt', b'x') for i in range(4)]
+        results[name] = list(batch_parser.parse_batch(files))
+
+    threads = [threading.Thread(target=run, args=(name,)) for name in 'abc']
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        peak.append(len(batch_parser._slot_futures))
+        time.sleep(0.01)
+
+    assert max(peak) <= batch_parser.max_workers
+    for name in 'abc':
+        assert len(results[name]) == 4
+        assert all(result['success'] for result in results[name])
+    # Every slot was handed back
+    assert all(batch_parser._slots.acquire(blocking=False) for _ in range(batch_parser.max_workers))
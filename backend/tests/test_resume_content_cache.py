@@ -0,0 +1,43 @@
+"""
+Resume caches: one process-wide ContentCache per namespace, and the format
+handler serving repeat uploads of the same bytes from the text cache.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import backend.utils.resume_content_cache as resume_content_cache
+from backend.utils.content_cache import ContentCache
+
+
+def test_resume_caches_are_shared_per_namespace(monkeypatch):
+    monkeypatch.setattr(resume_content_cache, '_caches', {})
+    monkeypatch.setattr(resume_content_cache, 'RESUME_CACHE_BACKEND', 'memory')
+
+    text_cache = resume_content_cache.get_resume_cache(resume_content_cache.RESUME_TEXT_NAMESPACE)
+
+    assert resume_content_cache.get_resume_cache('resume_text') is text_cache
+    assert text_cache.max_entries == resume_content_cache.RESUME_CACHE_MAX_ENTRIES
+    assert text_cache.ttl_seconds == resume_content_cache.RESUME_CACHE_TTL_SECONDS
+    assert set(resume_content_cache.resume_cache_stats()) == {'resume_text'}
+
+
+def test_format_handler_reuses_extracted_text(tmp_path, monkeypatch):
+    from backend.utils.resume_format_handler import ResumeFormatHandler
+
+    handler = ResumeFormatHandler()
+    handler.text_cache = ContentCache('resume_text')
+    resume = tmp_path / 'resume.txt'
+    resume.write_text('Senior Data Analyst with SQL and Python')
+
+    assert handler.extract_text_from_file(str(resume)) == 'Senior Data Analyst with SQL and Python'
+
+    def fail(_path):
+        raise AssertionError("extraction should be served from the cache")
+
+    monkeypatch.setattr(handler, '_extract_from_txt', fail)
+    copy = tmp_path / 'copy.txt'
+    copy.write_bytes(resume.read_bytes())
+    assert handler.extract_text_from_file(str(copy)) == 'Senior Data Analyst with SQL and Python'
+    assert handler.text_cache.stats()['hits'] == 1
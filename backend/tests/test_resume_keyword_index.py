@@ -0,0 +1,93 @@
+"""
+ResumeKeywordIndex: the Aho-Corasick scan must report exactly what the substring
+and regex fallback reports (terms present, skills, years, job titles), and
+AdvancedResumeParser must return what the pre-index parser returned.
+"""
+import dataclasses
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.ml.models import resume_keyword_index
+from backend.ml.models.resume_keyword_index import ResumeKeywordIndex
+from backend.tests.fixtures.resume_samples import SAMPLE_RESUMES, realistic_resumes
+
+TABLES = {
+    'tech': ['python', 'sql', 'r', 'it', 'data', 'machine learning', 'excel', 'power bi', 'node'],
+    'leadership': ['lead', 'led', 'team', 'managed', 'budget', 'strategic planning'],
+    'process': ['agile', 'team', 'budget', 'data'],
+}
+TERMS = list(dict.fromkeys(term for terms in TABLES.values() for term in terms))
+
+EDGE_CASES = [
+    '',
+    'node.js, react.js and foo.jsx; a.com.net x.py',
+    'senior  manager lead - team data / analyst vp sales hr manager',
+    '1999-2005 2019 120190 2024. 1899 2100',
+    'javascript java sql,python power bi powerbi',
+    'senior software engineer software engineer data analyst senior data analyst '
+    'lead developer principal engineer chief officer director operations',
+    'managerial leadership teamwork',
+]
+
+
+def _texts():
+    return [' '.join(text.lower().split()) for text in SAMPLE_RESUMES] + EDGE_CASES
+
+
+def _fallback_index():
+    index = ResumeKeywordIndex(TABLES)
+    index._automaton = None
+    return index
+
+
+@pytest.mark.parametrize('text', _texts())
+def test_fallback_matches_regex_definitions(text):
+    hits = _fallback_index().scan(text)
+    assert set(hits.term_counts) == {term for term in TERMS if term in text}
+    assert hits.years == [int(year) for year in resume_keyword_index.YEAR_PATTERN.findall(text)]
+    assert len(hits.job_titles) <= resume_keyword_index.MAX_JOB_TITLES
+
+
+@pytest.mark.parametrize('text', _texts())
+def test_automaton_scan_matches_fallback(text):
+    pytest.importorskip('ahocorasick')
+    index = ResumeKeywordIndex(TABLES)
+    assert index.uses_automaton
+    expected = _fallback_index().scan(text)
+    hits = index.scan(text)
+
+    assert set(hits.term_counts) == set(expected.term_counts)
+    assert hits.table_hits == expected.table_hits
+    assert list(hits.skills.items()) == list(expected.skills.items())
+    assert hits.years == expected.years
+    assert hits.job_titles == expected.job_titles
+
+
+def test_matches_are_grouped_by_table_in_table_order():
+    hits = _fallback_index().scan('team sql python budget')
+    assert hits.matches('tech') == ['python', 'sql']
+    assert hits.matches('leadership') == ['team', 'budget']
+    assert hits.matches('process') == ['team', 'budget']
+    assert hits.count('process') == 2
+    assert hits.matches('missing') == [] and hits.count('missing') == 0
+    assert hits.has('sql') and not hits.has('excel')
+
+
+def test_parser_matches_pre_index_parser():
+    pytest.importorskip('spacy')
+    pytest.importorskip('sklearn')
+    from backend.ml.models.resume_parser import AdvancedResumeParser
+    from backend.tests.performance.baseline_resume_parser import BaselineResumeParser
+
+    baseline = BaselineResumeParser()
+    fallback = AdvancedResumeParser()
+    fallback.keyword_index._automaton = None
+    parsers = [AdvancedResumeParser(), fallback]
+    for text in SAMPLE_RESUMES + realistic_resumes(20) + EDGE_CASES:
+        expected = dataclasses.asdict(baseline.parse_resume(text))
+        for parser in parsers:
+            assert dataclasses.asdict(parser.parse_resume(text)) == expected
@@ -0,0 +1,205 @@
+"""
+BufferedTelemetryWriter: submits never touch the database, rows are written in
+multi-row INSERT batches on size/time triggers, overflow is counted, and bad rows
+are dead-lettered without losing the rest of the batch.
+"""
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from backend.analytics.telemetry_writer import BufferedTelemetryWriter, DROP_NEWEST
+
+TABLES = {
+    'api_performance': ('endpoint', 'method', 'response_time', 'status_code'),
+    'error_logs': ('error_type', 'error_message'),
+}
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.connection = conn
+
+    def mogrify(self, template, args):
+        return (template.decode() % tuple(repr(a) for a in args)).encode()
+
+    def execute(self, sql, params=None):
+        if self.connection.db.fail:
+            raise RuntimeError("connection refused")
+        sql = sql.decode() if isinstance(sql, bytes) else sql
+        statements = self.connection.statements
+        if sql.startswith('SAVEPOINT '):
+            self.connection.savepoints[sql.split()[1]] = len(statements)
+        elif sql.startswith('ROLLBACK TO SAVEPOINT '):
+            del statements[self.connection.savepoints[sql.split()[-1]]:]
+        elif sql.startswith('INSERT') and 'poison' in sql:
+            raise ValueError("invalid input syntax for type double precision")
+        elif not sql.startswith('RELEASE '):
+            statements.append(sql)
+
+
+class FakeConnection:
+    encoding = 'UTF8'
+
+    def __init__(self, db):
+        self.db = db
+        self.statements = []
+        self.savepoints = {}
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.db.committed.extend(self.statements)
+        self.statements = []
+
+    def rollback(self):
+        self.statements = []
+
+    def close(self):
+        pass
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.committed = []
+        self.connections = 0
+        self.fail = False
+
+    def connect(self):
+        self.connections += 1
+        return FakeConnection(self)
+
+
+@pytest.fixture
+def db():
+    return FakeDatabase()
+
+
+def _row(i):
+    return (f'/api/v1/outlook/{i}', 'GET', 12.5, 200)
+
+
+class TestBufferedTelemetryWriter:
+    def test_submit_is_buffered_and_flushed_as_one_insert_per_table(self, db):
+        writer = BufferedTelemetryWriter(TABLES, db.connect, batch_size=100, flush_interval=60)
+        for i in range(5):
+            assert writer.submit('api_performance', _row(i))
+        writer.submit('error_logs', ('TimeoutError', 'upstream timed out'))
+
+        assert db.connections == 0
+        assert writer.flush() == 6
+
+        assert db.connections == 1
+        assert len(db.committed) == 2
+        api_insert = next(sql for sql in db.committed if 'api_performance' in sql)
+        assert api_insert.startswith('INSERT INTO api_performance (endpoint, method, response_time, status_code) VALUES')
+        assert api_insert.count("'GET'") == 5
+        assert writer.stats()['written'] == 6
+        writer.close()
+
+    def test_background_thread_flushes_on_batch_size(self, db):
+        writer = BufferedTelemetryWriter(TABLES, db.connect, batch_size=10, flush_interval=60)
+        for i in range(10):
+            writer.submit('api_performance', _row(i))
+
+        deadline = time.monotonic() + 2
+        while writer.stats()['written'] < 10 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert writer.stats()['written'] == 10 and writer.stats()['batches'] == 1
+        writer.close()
+
+    def test_full_buffer_drops_and_counts(self, db):
+        writer = BufferedTelemetryWriter(TABLES, db.connect, capacity=3, flush_interval=60)
+        writer._ensure_thread = lambda: None  # keep the background writer out of it
+        for i in range(5):
+            assert writer.submit('api_performance', _row(i))
+
+        stats = writer.stats()
+        assert stats['buffered'] == 3 and stats['dropped_by_table'] == {'api_performance': 2}
+        writer.flush()
+        # Ring buffer: the oldest rows were overwritten
+        assert "'/api/v1/outlook/0'" not in db.committed[0]
+        assert "'/api/v1/outlook/4'" in db.committed[0]
+
+        newest = BufferedTelemetryWriter(TABLES, db.connect, capacity=1, overflow=DROP_NEWEST)
+        newest._ensure_thread = lambda: None
+        assert newest.submit('error_logs', ('A', 'first'))
+        assert not newest.submit('error_logs', ('B', 'second'))
+        assert newest.stats()['dropped'] == 1
+
+    def test_backpressure_waits_for_the_writer(self, db):
+        writer = BufferedTelemetryWriter(TABLES, db.connect, capacity=2, flush_interval=60, max_wait=2)
+        writer._ensure_thread = lambda: None
+        writer.submit('api_performance', _row(0))
+        writer.submit('api_performance', _row(1))
+
+        drainer = threading.Timer(0.05, writer.flush)
+        drainer.start()
+        assert writer.submit('api_performance', _row(2))
+        drainer.join()
+
+        stats = writer.stats()
+        assert stats['dropped'] == 0 and stats['backpressure_waits'] == 1
+
+    def test_failed_batches_are_counted(self, db):
+        writer = BufferedTelemetryWriter(TABLES, db.connect, flush_interval=60)
+        writer._ensure_thread = lambda: None
+        db.fail = True
+        writer.submit('error_logs', ('DBError', 'boom'))
+
+        writer.flush()
+
+        stats = writer.stats()
+        assert stats['failed_batches'] == 1 and stats['rows_failed'] == 1
+        assert db.committed == []
+
+    def test_failed_rows_are_handed_to_on_failure(self, db):
+        failed = []
+        writer = BufferedTelemetryWriter(TABLES, db.connect, flush_interval=60,
+                                         on_failure=lambda table, rows: failed.append((table, rows)))
+        writer._ensure_thread = lambda: None
+        db.fail = True
+        writer.submit('error_logs', ('DBError', 'boom'))
+        writer.submit('api_performance', _row(1))
+
+        writer.flush()
+
+        assert sorted(failed) == [('api_performance', [_row(1)]), ('error_logs', [('DBError', 'boom')])]
+
+    def test_bad_row_is_dead_lettered_and_the_rest_commits(self, db):
+        failed = []
+        writer = BufferedTelemetryWriter(TABLES, db.connect, flush_interval=60,
+                                         on_failure=lambda table, rows: failed.append((table, rows)))
+        writer._ensure_thread = lambda: None
+        for i in range(3):
+            writer.submit('api_performance', _row(i))
+        writer.submit('error_logs', ('DBError', 'boom'))
+        writer.submit('error_logs', ('DBError', 'poison'))
+
+        writer.flush()
+
+        committed = '\n'.join(db.committed)
+        assert "'/api/v1/outlook/2'" in committed and "'boom'" in committed
+        assert 'poison' not in committed
+        # api_performance went in as one INSERT; error_logs was retried row by row
+        assert len(db.committed) == 2
+        assert failed == [('error_logs', [('DBError', 'poison')])]
+        assert writer.dead_letters(clear=True) == [('error_logs', ('DBError', 'poison'))]
+        assert writer.dead_letters() == []
+
+        stats = writer.stats()
+        assert stats['written'] == 4 and stats['rows_failed'] == 1
+        assert stats['batches'] == 1 and stats['failed_batches'] == 0
+
+    def test_rejects_unknown_tables_and_bad_rows(self, db):
+        writer = BufferedTelemetryWriter(TABLES, db.connect)
+        with pytest.raises(ValueError):
+            writer.submit('users', ('x',))
+        with pytest.raises(ValueError):
+            writer.submit('error_logs', ('only-one',))
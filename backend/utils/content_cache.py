@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Content Cache
+
+Bounded in-process LRU caches with TTL and hit/miss/eviction stats, keyed by
+whatever the caller chooses (typically a SHA-256 of the content). An optional
+shared store sits behind a cache: Redis for every worker on every host, or a
+directory on disk for the workers of one host. Values in the shared store are
+pickled, so point it only at a Redis instance or directory the application
+itself controls.
+
+Domain modules own their namespaces and store configuration; see
+resume_content_cache for the resume pipeline's caches.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+try:
+    from redis.exceptions import RedisError
+except ImportError:
+    RedisError = Exception
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 3600
+
+# Disk stores check their size every this many writes
+_DISK_PRUNE_INTERVAL = 64
+
+
+def content_hash(content: Union[bytes, str]) -> str:
+    """SHA-256 hex digest of bytes, or of a string's UTF-8 encoding"""
+    if isinstance(content, str):
+        content = content.encode('utf-8', 'surrogatepass')
+    return hashlib.sha256(content).hexdigest()
+
+
+class RedisCacheStore:
+    """Shared store on Redis; entries expire after ttl_seconds"""
+
+    def __init__(self, client, namespace: str, ttl_seconds: int, key_prefix: str = 'content_cache'):
+        self.client = client
+        self.prefix = f'{key_prefix}:{namespace}:'
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, payload: bytes):
+        self.client.set(self.prefix + key, payload, ex=self.ttl_seconds)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + '*', count=500))
+        if keys:
+            self.client.delete(*keys)
+
+
+class DiskCacheStore:
+    """Shared store of one file per entry; oldest files are pruned past max_entries"""
+
+    def __init__(self, directory: Union[str, Path], namespace: str,
+                 max_entries: int, ttl_seconds: int):
+        self.directory = Path(directory) / namespace
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._writes = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f'{key}.pkl'
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_seconds:
+                path.unlink()
+                return None
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, payload: bytes):
+        path = self._path(key)
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+        self._writes += 1
+        if self._writes % _DISK_PRUNE_INTERVAL == 0:
+            self._prune()
+
+    def _prune(self):
+        entries = []
+        for path in self.directory.glob('*.pkl'):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+        excess = len(entries) - self.max_entries
+        if excess > 0:
+            for _, path in sorted(entries)[:excess]:
+                path.unlink(missing_ok=True)
+
+    def clear(self):
+        for path in self.directory.glob('*.pkl'):
+            path.unlink(missing_ok=True)
+
+
+class ContentCache:
+    """
+    Bounded LRU with TTL in front of an optional shared store.
+
+    Local entries hold the cached objects themselves, so callers must treat
+    returned values as read-only. A store hit is unpickled once and promoted
+    into the local LRU. Store errors are logged and count as misses.
+
+    Args:
+        namespace: Name used in stats, log lines and store keys
+        max_entries: Bound on the in-process LRU
+        ttl_seconds: Lifetime of local entries
+        store: RedisCacheStore, DiskCacheStore or None for in-process only
+    """
+
+    def __init__(self, namespace: str, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl_seconds: int = DEFAULT_TTL_SECONDS, store=None):
+        self.namespace = namespace
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.store = store
+        self._entries: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'store_hits': 0, 'misses': 0, 'sets': 0, 'evictions': 0, 'store_errors': 0}
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if now < expires_at:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return value
+                del self._entries[key]
+
+        value = self._store_get(key)
+        with self._lock:
+            if value is None:
+                self._stats['misses'] += 1
+                return None
+            self._stats['hits'] += 1
+            self._stats['store_hits'] += 1
+            self._put_local(key, value, now)
+        return value
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._stats['sets'] += 1
+            self._put_local(key, value, time.monotonic())
+        if self.store is not None:
+            try:
+                self.store.set(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+            except (RedisError, OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+                self._store_error('write', e)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Cached value for key, computing and storing it on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    def _put_local(self, key: str, value: Any, now: float):
+        self._entries[key] = (now + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def _store_get(self, key: str) -> Optional[Any]:
+        if self.store is None:
+            return None
+        try:
+            payload = self.store.get(key)
+            return pickle.loads(payload) if payload is not None else None
+        except (RedisError, OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            self._store_error('read', e)
+            return None
+
+    def _store_error(self, operation: str, error: Exception):
+        with self._lock:
+            self._stats['store_errors'] += 1
+        logger.warning(f"Content cache '{self.namespace}' store {operation} failed: {error}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.store is not None:
+            try:
+                self.store.clear()
+            except (RedisError, OSError) as e:
+                self._store_error('clear', e)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['backend'] = type(self.store).__name__ if self.store is not None else 'memory'
+        return stats
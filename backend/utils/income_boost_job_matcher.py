@@ -15,9 +15,6 @@ This module provides comprehensive job matching functionality that focuses on:
 import json
 import logging
 import requests
-import psycopg2
-import psycopg2.extras
-import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any, Union
 from dataclasses import dataclass, asdict
@@ -26,6 +23,8 @@ import asyncio
 import aiohttp
 from concurrent.futures import ThreadPoolExecutor
 import re
+from backend.utils.pg_pool import get_pg_connection
+from backend.utils.job_postings_store import JobPostingsQuery, get_job_postings_store
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -160,24 +159,11 @@ class SearchCriteria:
     equity_required: bool
     min_company_rating: float = 3.0
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    db_url = os.environ.get('DATABASE_URL')
-    if not db_url:
-        raise RuntimeError(
-            "DATABASE_URL is required. SQLite is not supported."
-        )
-    conn = psycopg2.connect(db_url)
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 def _resolve_bls_career_field(criteria: SearchCriteria) -> Optional[str]:
     return BLS_CAREER_FIELD_BY_ENUM.get(criteria.career_field)
 
-def _resolve_msa_code(criteria: SearchCriteria) -> Optional[str]:
-    if criteria.preferred_msas:
-        return str(criteria.preferred_msas[0])
-    return None
+def _resolve_msa_codes(criteria: SearchCriteria) -> List[str]:
+    return [str(msa) for msa in criteria.preferred_msas or [] if msa]
 
 def _job_posting_row_to_opportunity(row: Dict[str, Any], job_board: JobBoard) -> JobOpportunity:
     salary_min = row.get("salary_min")
@@ -219,23 +205,15 @@ def _job_posting_row_to_opportunity(row: Dict[str, Any], job_board: JobBoard) ->
         work_life_balance_score=0.0,
     )
 
-def _query_job_postings(career_field: str, msa_code: str) -> List[Dict[str, Any]]:
-    conn = get_pg_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        '''
-        SELECT id, title, company, career_field, msa_code,
-               city || ', ' || state AS location,
-               salary_min, salary_max, seniority_level, advancement_trajectory
-        FROM job_postings
-        WHERE career_field = %s AND msa_code = %s AND is_active = true
-        ORDER BY salary_max DESC, title
-        ''',
-        (career_field, msa_code),
-    )
-    rows = cursor.fetchall()
-    conn.close()
-    return [dict(row) for row in rows]
+def _query_job_postings(
+    career_fields: List[str],
+    msa_codes: List[str],
+    salary_midpoint_min: Optional[int] = None,
+    salary_midpoint_max: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Active postings for any of the fields and MSAs, through the shared result cache."""
+    query = JobPostingsQuery.build(career_fields, msa_codes, salary_midpoint_min, salary_midpoint_max)
+    return get_job_postings_store().search(query)
 
 class IncomeBoostJobMatcher:
     """
@@ -352,13 +330,12 @@ class IncomeBoostJobMatcher:
         glassdoor_jobs = await self._search_glassdoor(criteria, target_salary_min, target_salary_max)
         all_jobs.extend(glassdoor_jobs)
         
-        # Filter and score jobs
+        # Score jobs; the board searches already applied the salary window in SQL
         filtered_jobs = []
         for job in all_jobs:
-            if self._meets_salary_criteria(job, criteria, target_salary_min, target_salary_max):
-                scored_job = self.multi_dimensional_scoring(job, criteria)
-                if scored_job.overall_score >= 70:  # Minimum score threshold
-                    filtered_jobs.append(scored_job)
+            scored_job = self.multi_dimensional_scoring(job, criteria)
+            if scored_job.overall_score >= 70:  # Minimum score threshold
+                filtered_jobs.append(scored_job)
         
         # Sort by overall score and salary increase potential
         filtered_jobs.sort(key=lambda x: (x.overall_score, x.salary_increase_potential), reverse=True)
@@ -675,31 +652,29 @@ class IncomeBoostJobMatcher:
         
         return (job.salary_median - criteria.current_salary) / criteria.current_salary
     
-    def _meets_salary_criteria(self, job: JobOpportunity, criteria: SearchCriteria, 
-                              min_salary: int, max_salary: int) -> bool:
-        """Check if job meets salary criteria"""
-        if not job.salary_median:
-            return True  # Include if no salary data
-        
-        return min_salary <= job.salary_median <= max_salary
-    
     async def _search_job_postings(
         self,
         criteria: SearchCriteria,
         job_board: JobBoard,
+        min_salary: Optional[int] = None,
+        max_salary: Optional[int] = None,
     ) -> List[JobOpportunity]:
-        """Query seeded job_postings rows by BLS career field and CBSA code."""
+        """Query job_postings rows by BLS career field and every preferred CBSA code.
+
+        Rows are limited in SQL to postings whose salary midpoint lies in
+        [min_salary, max_salary]. The boards share one cached result set.
+        """
         career_field = _resolve_bls_career_field(criteria)
-        msa_code = _resolve_msa_code(criteria)
-        if not career_field or not msa_code:
+        msa_codes = _resolve_msa_codes(criteria)
+        if not career_field or not msa_codes:
             return []
         try:
-            rows = _query_job_postings(career_field, msa_code)
+            rows = _query_job_postings([career_field], msa_codes, min_salary, max_salary)
         except Exception as exc:
             logger.warning(
-                "Could not query job_postings for field=%s msa=%s: %s",
+                "Could not query job_postings for field=%s msas=%s: %s",
                 career_field,
-                msa_code,
+                msa_codes,
                 exc,
             )
             return []
@@ -707,15 +682,15 @@ class IncomeBoostJobMatcher:
 
     async def _search_indeed(self, criteria: SearchCriteria, min_salary: int, max_salary: int) -> List[JobOpportunity]:
         """Search Indeed for jobs via job_postings seed data."""
-        return await self._search_job_postings(criteria, JobBoard.INDEED)
+        return await self._search_job_postings(criteria, JobBoard.INDEED, min_salary, max_salary)
 
     async def _search_linkedin(self, criteria: SearchCriteria, min_salary: int, max_salary: int) -> List[JobOpportunity]:
         """Search LinkedIn for jobs via job_postings seed data."""
-        return await self._search_job_postings(criteria, JobBoard.LINKEDIN)
+        return await self._search_job_postings(criteria, JobBoard.LINKEDIN, min_salary, max_salary)
 
     async def _search_glassdoor(self, criteria: SearchCriteria, min_salary: int, max_salary: int) -> List[JobOpportunity]:
         """Search Glassdoor for jobs via job_postings seed data."""
-        return await self._search_job_postings(criteria, JobBoard.GLASSDOOR)
+        return await self._search_job_postings(criteria, JobBoard.GLASSDOOR, min_salary, max_salary)
     
     def _get_glassdoor_data(self, company_name: str) -> Optional[Dict]:
         """Get company data from Glassdoor"""
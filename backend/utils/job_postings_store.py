@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Job Postings Query Layer
+
+Reads active job_postings rows for the job matchers. A query takes any number of
+BLS career fields and MSA codes at once, so a search that spans several metros
+costs one round-trip instead of one per pair. An optional salary window on the
+posting midpoint ((salary_min + salary_max) / 2) is applied in SQL, so rows
+outside it are never fetched.
+
+Rows come back in (salary_max DESC, title, id) order, which follows
+ix_job_postings_field_msa_active_salary. Pages are keyset-paginated. The cursor
+is the (salary_max, title, id) of the last row, so page N costs the same as
+page 1 however large the table grows.
+
+A short-TTL result cache sits in front of the database. IncomeBoostJobMatcher,
+ThreeTierJobSelector and the job_matching_api endpoints all read through it,
+and it lives at module level. The three job-board searches inside one
+salary_focused_search therefore share one query. Repeated searches within the
+TTL skip PostgreSQL entirely.
+
+Environment:
+    JOB_POSTINGS_PAGE_SIZE          Rows per keyset page (default 200)
+    JOB_POSTINGS_MAX_RESULTS        Cap on rows fetched for one search (default 1000)
+    JOB_POSTINGS_CACHE_TTL_SECONDS  Lifetime of cached pages (default 60)
+    JOB_POSTINGS_CACHE_MAX_ENTRIES  Bound on cached pages per process (default 512)
+"""
+
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from backend.utils.pg_pool import get_pg_connection
+from backend.utils.content_cache import ContentCache
+
+logger = logging.getLogger(__name__)
+
+JOB_POSTINGS_PAGE_SIZE = int(os.environ.get('JOB_POSTINGS_PAGE_SIZE', '200'))
+JOB_POSTINGS_MAX_RESULTS = int(os.environ.get('JOB_POSTINGS_MAX_RESULTS', '1000'))
+JOB_POSTINGS_CACHE_TTL_SECONDS = int(os.environ.get('JOB_POSTINGS_CACHE_TTL_SECONDS', '60'))
+JOB_POSTINGS_CACHE_MAX_ENTRIES = int(os.environ.get('JOB_POSTINGS_CACHE_MAX_ENTRIES', '512'))
+
+# (salary_max, title, id) of the last row on a page
+KeysetCursor = Tuple[int, str, int]
+
+_SELECT_COLUMNS = '''
+    SELECT id, title, company, career_field, msa_code,
+           city || ', ' || state AS location,
+           salary_min, salary_max, seniority_level, advancement_trajectory
+    FROM job_postings
+'''
+
+
+@dataclass(frozen=True)
+class JobPostingsQuery:
+    """
+    One job_postings search.
+
+    Args:
+        career_fields: BLS career field names, matched with = ANY
+        msa_codes: CBSA codes, matched with = ANY
+        salary_midpoint_min: Lowest accepted (salary_min + salary_max) / 2
+        salary_midpoint_max: Highest accepted (salary_min + salary_max) / 2
+    """
+    career_fields: Tuple[str, ...]
+    msa_codes: Tuple[str, ...]
+    salary_midpoint_min: Optional[int] = None
+    salary_midpoint_max: Optional[int] = None
+
+    @classmethod
+    def build(cls, career_fields: Iterable[str], msa_codes: Iterable[str],
+              salary_midpoint_min: Optional[int] = None,
+              salary_midpoint_max: Optional[int] = None) -> 'JobPostingsQuery':
+        """Query with duplicates and blanks dropped and values sorted, so equal searches share a cache key"""
+        return cls(
+            career_fields=tuple(sorted({str(field) for field in career_fields if field})),
+            msa_codes=tuple(sorted({str(code) for code in msa_codes if code})),
+            salary_midpoint_min=salary_midpoint_min,
+            salary_midpoint_max=salary_midpoint_max,
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.career_fields or not self.msa_codes
+
+
+@dataclass(frozen=True)
+class JobPostingsPage:
+    """One keyset page; next_cursor is None on the last page"""
+    rows: Tuple[Dict[str, Any], ...]
+    next_cursor: Optional[KeysetCursor]
+
+
+def _page_sql(query: JobPostingsQuery, after: Optional[KeysetCursor],
+              limit: int) -> Tuple[str, Dict[str, Any]]:
+    """SELECT for one page, with every filter bound as a parameter"""
+    clauses = [
+        'career_field = ANY(%(career_fields)s)',
+        'msa_code = ANY(%(msa_codes)s)',
+        'is_active = true',
+    ]
+    params: Dict[str, Any] = {
+        'career_fields': list(query.career_fields),
+        'msa_codes': list(query.msa_codes),
+        'limit': limit,
+    }
+    if query.salary_midpoint_min is not None:
+        clauses.append('(salary_min + salary_max) / 2 >= %(salary_midpoint_min)s')
+        params['salary_midpoint_min'] = query.salary_midpoint_min
+    if query.salary_midpoint_max is not None:
+        clauses.append('(salary_min + salary_max) / 2 <= %(salary_midpoint_max)s')
+        params['salary_midpoint_max'] = query.salary_midpoint_max
+    if after is not None:
+        # salary_max sorts descending and (title, id) ascending, so the
+        # keyset predicate is spelled out rather than one row comparison
+        clauses.append(
+            '(salary_max < %(after_salary_max)s OR '
+            '(salary_max = %(after_salary_max)s AND (title, id) > (%(after_title)s, %(after_id)s)))'
+        )
+        params.update(after_salary_max=after[0], after_title=after[1], after_id=after[2])
+
+    sql = (
+        _SELECT_COLUMNS
+        + '    WHERE ' + '\n      AND '.join(clauses)
+        + '\n    ORDER BY salary_max DESC, title, id\n    LIMIT %(limit)s\n'
+    )
+    return sql, params
+
+
+def fetch_job_postings_page(query: JobPostingsQuery, after: Optional[KeysetCursor] = None,
+                            limit: int = JOB_POSTINGS_PAGE_SIZE,
+                            connection_factory: Callable[[], Any] = get_pg_connection) -> JobPostingsPage:
+    """One page of matching postings, straight from PostgreSQL"""
+    if query.is_empty:
+        return JobPostingsPage(rows=(), next_cursor=None)
+
+    limit = max(1, limit)
+    sql, params = _page_sql(query, after, limit)
+    conn = connection_factory()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        rows = tuple(dict(row) for row in cursor.fetchall())
+    finally:
+        conn.close()
+
+    next_cursor = None
+    if len(rows) == limit:
+        last = rows[-1]
+        next_cursor = (last['salary_max'], last['title'], last['id'])
+    return JobPostingsPage(rows=rows, next_cursor=next_cursor)
+
+
+class JobPostingsStore:
+    """
+    Cached, keyset-paginated reads of job_postings.
+
+    Pages are cached by query, cursor and page size for ttl_seconds. Cached
+    rows are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, ttl_seconds: int = JOB_POSTINGS_CACHE_TTL_SECONDS,
+                 max_entries: int = JOB_POSTINGS_CACHE_MAX_ENTRIES,
+                 connection_factory: Callable[[], Any] = get_pg_connection):
+        self.cache = ContentCache('job_postings', max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.connection_factory = connection_factory
+
+    @staticmethod
+    def _cache_key(query: JobPostingsQuery, after: Optional[KeysetCursor], limit: int) -> str:
+        return json.dumps([
+            query.career_fields, query.msa_codes,
+            query.salary_midpoint_min, query.salary_midpoint_max,
+            after, limit,
+        ])
+
+    def page(self, query: JobPostingsQuery, after: Optional[KeysetCursor] = None,
+             limit: int = JOB_POSTINGS_PAGE_SIZE) -> JobPostingsPage:
+        """One page of matching postings, from the cache when it is fresh"""
+        return self.cache.get_or_compute(
+            self._cache_key(query, after, limit),
+            lambda: fetch_job_postings_page(query, after, limit, self.connection_factory),
+        )
+
+    def iter_rows(self, query: JobPostingsQuery, max_rows: int = JOB_POSTINGS_MAX_RESULTS,
+                  page_size: int = JOB_POSTINGS_PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """Matching rows in (salary_max DESC, title, id) order, at most max_rows of them"""
+        remaining = max_rows
+        after = None
+        while remaining > 0:
+            page = self.page(query, after, min(page_size, remaining))
+            yield from page.rows
+            remaining -= len(page.rows)
+            if page.next_cursor is None:
+                return
+            after = page.next_cursor
+
+    def search(self, query: JobPostingsQuery, max_rows: int = JOB_POSTINGS_MAX_RESULTS) -> List[Dict[str, Any]]:
+        """All matching rows up to max_rows"""
+        return list(self.iter_rows(query, max_rows))
+
+    def clear(self):
+        self.cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+
+_store: Optional[JobPostingsStore] = None
+_store_lock = threading.Lock()
+
+
+def get_job_postings_store() -> JobPostingsStore:
+    """Process-wide store, so every job matcher shares one result cache"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = JobPostingsStore()
+        return _store
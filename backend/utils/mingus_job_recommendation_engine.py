@@ -22,9 +22,6 @@ Performance targets:
 import asyncio
 import json
 import logging
-import psycopg2
-import psycopg2.extras
-import os
 import time
 import hashlib
 from datetime import datetime, timedelta
@@ -34,6 +31,7 @@ from enum import Enum
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import aiohttp
 from functools import lru_cache
+from backend.utils.pg_pool import get_pg_connection
 
 # Import existing components
 from .advanced_resume_parser import AdvancedResumeParser, IncomePotential, LeadershipIndicator
@@ -367,12 +365,6 @@ class UserAnalytics:
     satisfaction_score: Optional[float]
     conversion_events: List[Dict[str, Any]]
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class MingusJobRecommendationEngine:
     """
     Central orchestration engine for the complete resume-to-recommendation workflow.
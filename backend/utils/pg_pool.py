@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+PostgreSQL Connection Pool
+
+One process-wide pool per DATABASE_URL behind the `get_pg_connection()` name the
+services, APIs and analytics modules already use. Callers keep their existing
+pattern (`conn = get_pg_connection(); ...; conn.close()`): close() hands the
+connection back to the pool instead of tearing down the socket.
+
+- Fork-safe: pools are owned by the PID that created them. A gunicorn or Celery
+  prefork child never reuses (or closes) sockets inherited from its parent; it
+  lazily builds its own pool on first use.
+- Health-checked checkout: closed connections are discarded, and connections that
+  sat idle longer than PG_POOL_HEALTHCHECK_IDLE are probed with SELECT 1.
+- Metrics per pool: checkouts, wait time for a free slot, checkout latency,
+  in-use / idle counts, timeouts and failed health checks.
+
+Environment:
+    PG_POOL_MIN                 Connections kept open when idle (default 1)
+    PG_POOL_MAX                 Hard cap on connections per process (default 10)
+    PG_POOL_TIMEOUT             Seconds to wait for a free connection (default 10)
+    PG_POOL_HEALTHCHECK_IDLE    Idle seconds before a checkout is probed (default 30)
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+try:
+    import psycopg2
+    import psycopg2.extensions
+    import psycopg2.extras
+except ImportError:
+    psycopg2 = None
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(RuntimeError):
+    """No connection became available within the checkout timeout"""
+
+
+def _env_number(name: str, default, cast=int):
+    try:
+        return cast(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid {name}={os.environ.get(name)!r}; using {default}")
+        return default
+
+
+def _redact(dsn: str) -> str:
+    """DSN with any password removed, for logs and metric labels"""
+    try:
+        parts = urlsplit(dsn)
+    except ValueError:
+        return "<dsn>"
+    if not parts.password:
+        return dsn
+    netloc = parts.netloc.rsplit("@", 1)[-1]
+    return urlunsplit(parts._replace(netloc=f"{parts.username}:***@{netloc}"))
+
+
+def _default_connect(dsn: str):
+    if psycopg2 is None:
+        raise RuntimeError("psycopg2 is required for PostgreSQL connections")
+    return psycopg2.connect(dsn)
+
+
+@dataclass
+class PoolStats:
+    """Running counters for one pool"""
+    checkouts: int = 0
+    checkins: int = 0
+    timeouts: int = 0
+    connections_opened: int = 0
+    connections_closed: int = 0
+    health_checks: int = 0
+    health_check_failures: int = 0
+    waits: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    checkout_seconds: float = 0.0
+    max_checkout_seconds: float = 0.0
+    max_in_use: int = 0
+
+
+class PooledConnection:
+    """
+    Proxy for a pooled psycopg2 connection
+
+    Everything (cursor(), commit(), rollback(), cursor_factory, autocommit, ...)
+    is delegated to the real connection. close() returns it to the pool, and
+    `with conn:` commits or rolls back like psycopg2 without closing.
+    """
+
+    __slots__ = ("_pool", "_conn", "__weakref__")
+
+    def __init__(self, pool: "PGConnectionPool", conn):
+        object.__setattr__(self, "_pool", pool)
+        object.__setattr__(self, "_conn", conn)
+
+    def _raw(self):
+        conn = self._conn
+        if conn is None:
+            if psycopg2 is not None:
+                raise psycopg2.InterfaceError("connection already closed")
+            raise RuntimeError("connection already closed")
+        return conn
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._raw(), name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._raw(), name, value)
+
+    @property
+    def closed(self) -> int:
+        conn = self._conn
+        return 1 if conn is None else conn.closed
+
+    def close(self):
+        """Return the connection to the pool (safe to call more than once)"""
+        conn = self._conn
+        if conn is None:
+            return
+        object.__setattr__(self, "_conn", None)
+        self._pool.putconn(conn)
+
+    def __enter__(self):
+        self._raw().__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._raw().__exit__(exc_type, exc, tb)
+
+    def __del__(self):
+        # Call sites that skip close() on an error path must not leak a slot
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class PGConnectionPool:
+    """
+    Thread-safe bounded pool of psycopg2 connections for one DSN
+
+    Args:
+        dsn: PostgreSQL connection string
+        minconn: Idle connections kept open on checkin
+        maxconn: Maximum connections open at once (in use + idle)
+        timeout: Seconds a checkout waits for a free connection
+        health_check_idle: Probe connections idle at least this many seconds
+        connect: Factory taking the DSN (defaults to psycopg2.connect)
+    """
+
+    def __init__(self, dsn: str, minconn: int = 1, maxconn: int = 10,
+                 timeout: float = 10.0, health_check_idle: float = 30.0,
+                 connect: Optional[Callable[[str], Any]] = None):
+        if maxconn < 1 or minconn < 0 or minconn > maxconn:
+            raise ValueError(f"Invalid pool bounds: min={minconn} max={maxconn}")
+        self.dsn = dsn
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.health_check_idle = health_check_idle
+        self.pid = os.getpid()
+        self._connect = connect or _default_connect
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._in_use = 0
+        self._opening = 0
+        self._closed = False
+        # RLock: PooledConnection.__del__ may check in from a GC run inside a locked section
+        self._cond = threading.Condition(threading.RLock())
+        self.stats = PoolStats()
+
+    @property
+    def size(self) -> int:
+        return len(self._idle) + self._in_use + self._opening
+
+    # ------------------------------------------------------------------
+    # Checkout / checkin
+    # ------------------------------------------------------------------
+
+    def getconn(self, cursor_factory=None) -> PooledConnection:
+        """Check out a healthy connection, waiting up to `timeout` for a free slot"""
+        started = time.monotonic()
+        deadline = started + self.timeout
+        waited = 0.0
+        while True:
+            conn, idle_since = None, None
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                if not self._idle and self.size >= self.maxconn:
+                    wait_started = time.monotonic()
+                    while not self._idle and self.size >= self.maxconn:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.stats.timeouts += 1
+                            raise PoolTimeoutError(
+                                f"No PostgreSQL connection available after {self.timeout}s "
+                                f"({self._in_use}/{self.maxconn} in use)"
+                            )
+                        self._cond.wait(remaining)
+                    waited += time.monotonic() - wait_started
+                if self._idle:
+                    conn, idle_since = self._idle.pop()
+                    self._in_use += 1
+                else:
+                    self._opening += 1
+
+            if conn is None:
+                conn = self._open()
+            elif not self._healthy(conn, idle_since):
+                self._discard(conn)
+                continue
+            break
+
+        elapsed = time.monotonic() - started
+        with self._cond:
+            stats = self.stats
+            stats.checkouts += 1
+            stats.checkout_seconds += elapsed
+            stats.max_checkout_seconds = max(stats.max_checkout_seconds, elapsed)
+            if waited:
+                stats.waits += 1
+                stats.wait_seconds += waited
+                stats.max_wait_seconds = max(stats.max_wait_seconds, waited)
+            stats.max_in_use = max(stats.max_in_use, self._in_use)
+        if cursor_factory is not None:
+            conn.cursor_factory = cursor_factory
+        return PooledConnection(self, conn)
+
+    def putconn(self, conn):
+        """Return a raw connection; broken or surplus connections are closed"""
+        if os.getpid() != self.pid:
+            # Inherited from the parent: park it, never reset or close it here
+            with self._cond:
+                self._in_use -= 1
+                self._idle.append((conn, time.monotonic()))
+            return
+        reusable = self._reset(conn)
+        with self._cond:
+            self._in_use -= 1
+            self.stats.checkins += 1
+            keep = reusable and not self._closed
+            if keep:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+        if not keep:
+            self._close_quietly(conn)
+
+    def _open(self):
+        try:
+            conn = self._connect(self.dsn)
+        except Exception:
+            with self._cond:
+                self._opening -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._opening -= 1
+            self._in_use += 1
+            self.stats.connections_opened += 1
+        return conn
+
+    def _discard(self, conn):
+        with self._cond:
+            self._in_use -= 1
+            self._cond.notify()
+        self._close_quietly(conn)
+
+    def _close_quietly(self, conn):
+        try:
+            if not conn.closed:
+                conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self.stats.connections_closed += 1
+
+    def _healthy(self, conn, idle_since: float) -> bool:
+        if conn.closed:
+            return False
+        if time.monotonic() - idle_since < self.health_check_idle:
+            return True
+        with self._cond:
+            self.stats.health_checks += 1
+        try:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT 1")
+            finally:
+                cursor.close()
+            conn.rollback()
+            return True
+        except Exception as e:
+            logger.info(f"Discarding stale PostgreSQL connection to {_redact(self.dsn)}: {e}")
+            with self._cond:
+                self.stats.health_check_failures += 1
+            return False
+
+    @staticmethod
+    def _reset(conn) -> bool:
+        """Put a returned connection back into a clean state; False if unusable"""
+        if conn.closed:
+            return False
+        try:
+            if psycopg2 is not None:
+                status = conn.get_transaction_status()
+                if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                    return False
+                if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            else:
+                conn.rollback()
+            if conn.autocommit:
+                conn.autocommit = False
+            conn.cursor_factory = None
+            return True
+        except Exception:
+            return False
+
+    # ------------------------------------------------------------------
+    # Lifecycle / metrics
+    # ------------------------------------------------------------------
+
+    def close(self):
+        """Close idle connections and refuse new checkouts"""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._cond.notify_all()
+        if os.getpid() == self.pid:
+            for conn in idle:
+                self._close_quietly(conn)
+
+    def trim(self):
+        """Close idle connections above minconn"""
+        with self._cond:
+            surplus = []
+            while len(self._idle) > self.minconn:
+                surplus.append(self._idle.popleft()[0])
+        for conn in surplus:
+            self._close_quietly(conn)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = self.stats
+            return {
+                "dsn": _redact(self.dsn),
+                "pid": self.pid,
+                "min": self.minconn,
+                "max": self.maxconn,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "size": self.size,
+                "max_in_use": stats.max_in_use,
+                "checkouts": stats.checkouts,
+                "checkins": stats.checkins,
+                "timeouts": stats.timeouts,
+                "connections_opened": stats.connections_opened,
+                "connections_closed": stats.connections_closed,
+                "health_checks": stats.health_checks,
+                "health_check_failures": stats.health_check_failures,
+                "waits": stats.waits,
+                "avg_wait_ms": round(stats.wait_seconds / stats.waits * 1000, 3) if stats.waits else 0,
+                "max_wait_ms": round(stats.max_wait_seconds * 1000, 3),
+                "avg_checkout_ms": round(stats.checkout_seconds / stats.checkouts * 1000, 3) if stats.checkouts else 0,
+                "max_checkout_ms": round(stats.max_checkout_seconds * 1000, 3),
+            }
+
+
+# ----------------------------------------------------------------------
+# Process-wide registry
+# ----------------------------------------------------------------------
+
+_pools: Dict[str, PGConnectionPool] = {}
+_pools_lock = threading.Lock()
+# Connections inherited across fork are kept referenced, never closed: closing
+# (or garbage-collecting) them in the child would terminate the parent's session.
+_inherited: List[PGConnectionPool] = []
+
+
+def _after_fork_in_child():
+    global _pools_lock
+    _pools_lock = threading.Lock()
+    _inherited.extend(_pools.values())
+    _pools.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def get_pool(dsn: Optional[str] = None) -> PGConnectionPool:
+    """The current process's pool for dsn (DATABASE_URL by default)"""
+    dsn = dsn or os.environ.get('DATABASE_URL')
+    if not dsn:
+        raise RuntimeError(
+            "DATABASE_URL is required. SQLite is not supported."
+        )
+    pool = _pools.get(dsn)
+    if pool is not None and pool.pid == os.getpid():
+        return pool
+    with _pools_lock:
+        pool = _pools.get(dsn)
+        if pool is not None and pool.pid != os.getpid():
+            # Forked without the at-fork hook having run
+            _inherited.append(_pools.pop(dsn))
+            pool = None
+        if pool is None:
+            pool = _pools[dsn] = PGConnectionPool(
+                dsn,
+                minconn=_env_number('PG_POOL_MIN', 1),
+                maxconn=_env_number('PG_POOL_MAX', 10),
+                timeout=_env_number('PG_POOL_TIMEOUT', 10.0, float),
+                health_check_idle=_env_number('PG_POOL_HEALTHCHECK_IDLE', 30.0, float),
+            )
+        return pool
+
+
+def get_pg_connection() -> PooledConnection:
+    """Get PostgreSQL database connection (pooled; close() returns it to the pool)"""
+    cursor_factory = psycopg2.extras.RealDictCursor if psycopg2 is not None else None
+    return get_pool().getconn(cursor_factory=cursor_factory)
+
+
+def get_pool_metrics() -> Dict[str, Dict[str, Any]]:
+    """Metrics for every pool owned by this process, keyed by redacted DSN"""
+    return {_redact(dsn): pool.metrics() for dsn, pool in list(_pools.items())
+            if pool.pid == os.getpid()}
+
+
+def close_all_pools():
+    """Close this process's pools (e.g. from a shutdown or worker_process_shutdown hook)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
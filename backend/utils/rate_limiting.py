@@ -2,53 +2,292 @@
 """
 Rate Limiting Utility
 
-Simple rate limiter for testing purposes
+Sliding-window-counter and token-bucket rate limiting. With a Redis client the
+checks run as atomic Lua scripts, so every gunicorn worker enforces the same
+counters; without one (or while Redis is unreachable) an in-process fallback
+applies the same algorithms. Either way each key costs O(1) memory: two window
+counters or one bucket, never a list of timestamps.
 """
 
+import logging
+import math
+import threading
 import time
-from typing import Dict, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import redis
+    from redis.exceptions import RedisError
+except ImportError:
+    redis = None
+    RedisError = Exception
+
+logger = logging.getLogger(__name__)
+
+SLIDING_WINDOW = 'sliding_window'
+TOKEN_BUCKET = 'token_bucket'
+
+# Sliding window counter across several limits at once; all-or-nothing.
+# KEYS: current/previous window counter per limit
+# ARGV: now_ms, cost, then limit, window_ms per limit
+# Returns: allowed flag, then remaining, reset_ms per limit
+_SLIDING_WINDOW_LUA = """
+local now = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+local n = #KEYS / 2
+local allowed = 1
+local estimates = {}
+for i = 1, n do
+    local limit = tonumber(ARGV[1 + 2 * i])
+    local window = tonumber(ARGV[2 + 2 * i])
+    local current = tonumber(redis.call('GET', KEYS[2 * i - 1]) or '0')
+    local previous = tonumber(redis.call('GET', KEYS[2 * i]) or '0')
+    local weight = (window - (now % window)) / window
+    local estimate = previous * weight + current
+    estimates[i] = estimate
+    if estimate + cost > limit then
+        allowed = 0
+    end
+end
+local result = {allowed}
+for i = 1, n do
+    local limit = tonumber(ARGV[1 + 2 * i])
+    local window = tonumber(ARGV[2 + 2 * i])
+    local used = estimates[i]
+    if allowed == 1 and cost > 0 then
+        redis.call('INCRBY', KEYS[2 * i - 1], cost)
+        redis.call('PEXPIRE', KEYS[2 * i - 1], window * 2)
+        used = used + cost
+    end
+    result[#result + 1] = math.max(0, math.floor(limit - used))
+    result[#result + 1] = window - (now % window)
+end
+return result
+"""
+
+# Token bucket across several limits at once; all-or-nothing.
+# KEYS: one hash (tokens, ts) per limit
+# ARGV: now_ms, cost, then capacity, refill_window_ms per limit
+_TOKEN_BUCKET_LUA = """
+local now = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+local n = #KEYS
+local allowed = 1
+local levels = {}
+for i = 1, n do
+    local capacity = tonumber(ARGV[1 + 2 * i])
+    local window = tonumber(ARGV[2 + 2 * i])
+    local state = redis.call('HMGET', KEYS[i], 'tokens', 'ts')
+    local tokens = tonumber(state[1])
+    local ts = tonumber(state[2])
+    if tokens == nil then
+        tokens = capacity
+        ts = now
+    end
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * capacity / window)
+    levels[i] = tokens
+    if tokens < cost then
+        allowed = 0
+    end
+end
+local result = {allowed}
+for i = 1, n do
+    local capacity = tonumber(ARGV[1 + 2 * i])
+    local window = tonumber(ARGV[2 + 2 * i])
+    local tokens = levels[i]
+    if allowed == 1 and cost > 0 then
+        tokens = tokens - cost
+        redis.call('HSET', KEYS[i], 'tokens', tostring(tokens), 'ts', now)
+        redis.call('PEXPIRE', KEYS[i], window)
+    end
+    result[#result + 1] = math.floor(tokens)
+    result[#result + 1] = math.ceil((capacity - tokens) * window / capacity)
+end
+return result
+"""
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of one limit check"""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float  # seconds until the limit fully resets / refills
+
+    @property
+    def retry_after(self) -> float:
+        return 0.0 if self.allowed else self.reset_after
+
+
+class _LocalState:
+    """In-process fallback with the same algorithms and O(1) state per key"""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self.entries: "OrderedDict[str, list]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _entry(self, key: str, default: list) -> list:
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = default
+            # Bot traffic with random keys can't grow memory past max_keys
+            while len(self.entries) > self.max_keys:
+                self.entries.popitem(last=False)
+        else:
+            self.entries.move_to_end(key)
+        return entry
+
+    def sliding_window(self, keys: List[str], limits: List[Tuple[int, int]],
+                       now_ms: int, cost: int) -> List[RateLimitResult]:
+        with self.lock:
+            states, estimates = [], []
+            for key, (limit, window_ms) in zip(keys, limits):
+                # [window index, current count, previous count]
+                state = self._entry(key, [now_ms // window_ms, 0, 0])
+                index = now_ms // window_ms
+                if index != state[0]:
+                    state[2] = state[1] if index == state[0] + 1 else 0
+                    state[0], state[1] = index, 0
+                weight = (window_ms - now_ms % window_ms) / window_ms
+                states.append(state)
+                estimates.append(state[2] * weight + state[1])
+            allowed = all(est + cost <= limit for est, (limit, _) in zip(estimates, limits))
+            results = []
+            for state, est, (limit, window_ms) in zip(states, estimates, limits):
+                if allowed and cost > 0:
+                    state[1] += cost
+                    est += cost
+                results.append(RateLimitResult(allowed, limit, max(0, math.floor(limit - est)),
+                                               (window_ms - now_ms % window_ms) / 1000.0))
+            return results
+
+    def token_bucket(self, keys: List[str], limits: List[Tuple[int, int]],
+                     now_ms: int, cost: int) -> List[RateLimitResult]:
+        with self.lock:
+            states, levels = [], []
+            for key, (capacity, window_ms) in zip(keys, limits):
+                # [tokens, last refill ms]
+                state = self._entry(key, [float(capacity), now_ms])
+                tokens = min(capacity, state[0] + max(0, now_ms - state[1]) * capacity / window_ms)
+                states.append(state)
+                levels.append(tokens)
+            allowed = all(tokens >= cost for tokens in levels)
+            results = []
+            for state, tokens, (capacity, window_ms) in zip(states, levels, limits):
+                if allowed and cost > 0:
+                    tokens -= cost
+                    state[0], state[1] = tokens, now_ms
+                results.append(RateLimitResult(allowed, capacity, math.floor(tokens),
+                                               math.ceil((capacity - tokens) * window_ms / capacity) / 1000.0))
+            return results
 
 
 class RateLimiter:
-    """Simple rate limiter for testing"""
-    
-    def __init__(self):
-        self.requests = {}
+    """
+    Rate limiter with Redis-backed atomic checks and an in-memory fallback
+
+    Args:
+        redis_client: Redis client; None keeps counters in this process only
+        algorithm: 'sliding_window' (weighted two-window counter) or 'token_bucket'
+            (burst up to 'requests', refilled evenly over 'window')
+        limits: Overrides/additions to the default limit table
+        key_prefix: Namespace for Redis keys
+        max_local_keys: Bound on keys tracked by the in-memory fallback
+    """
+
+    def __init__(self, redis_client=None, algorithm: str = SLIDING_WINDOW,
+                 limits: Optional[Dict[str, Dict[str, int]]] = None,
+                 key_prefix: str = 'rate_limit:', max_local_keys: int = 100000):
+        if algorithm not in (SLIDING_WINDOW, TOKEN_BUCKET):
+            raise ValueError(f"Unknown rate limit algorithm: {algorithm}")
+        self.algorithm = algorithm
+        self.key_prefix = key_prefix
         self.limits = {
             'default': {'requests': 100, 'window': 3600},  # 100 requests per hour
             'api': {'requests': 1000, 'window': 3600},    # 1000 requests per hour
             'user': {'requests': 50, 'window': 3600}      # 50 requests per hour per user
         }
-    
+        self.limits.update(limits or {})
+        self.redis = redis_client
+        self._script = None
+        if redis_client is not None:
+            source = _SLIDING_WINDOW_LUA if algorithm == SLIDING_WINDOW else _TOKEN_BUCKET_LUA
+            self._script = redis_client.register_script(source)
+        self._local = _LocalState(max_local_keys)
+
+    @classmethod
+    def from_url(cls, redis_url: str, **kwargs) -> 'RateLimiter':
+        """Build a limiter on a Redis URL, falling back to in-memory if unreachable"""
+        client = None
+        if redis is not None:
+            try:
+                client = redis.Redis.from_url(redis_url, socket_timeout=1)
+                client.ping()
+            except RedisError as e:
+                logger.warning(f"Rate limiter Redis unavailable ({e}); using in-memory limits")
+                client = None
+        return cls(redis_client=client, **kwargs)
+
+    def _limit(self, limit_type: str) -> Tuple[int, int]:
+        config = self.limits.get(limit_type, self.limits['default'])
+        return int(config['requests']), int(config['window']) * 1000
+
+    def _redis_keys(self, key: str, limit_types: List[str], now_ms: int) -> List[str]:
+        keys = []
+        for limit_type in limit_types:
+            # Hash tag keeps all of a key's limits in one cluster slot for the script
+            base = f"{self.key_prefix}{{{key}}}:{limit_type}"
+            if self.algorithm == TOKEN_BUCKET:
+                keys.append(base)
+            else:
+                _, window_ms = self._limit(limit_type)
+                index = now_ms // window_ms
+                keys.extend([f"{base}:{index}", f"{base}:{index - 1}"])
+        return keys
+
+    def check_many(self, key: str, limit_types: Iterable[str],
+                   cost: int = 1) -> Dict[str, RateLimitResult]:
+        """
+        Check (and consume from) several limits for one key in a single round trip.
+
+        The request is admitted only if every limit has room; nothing is consumed
+        otherwise, so a rejected call never eats into the other limits.
+        """
+        limit_types = list(dict.fromkeys(limit_types))
+        limits = [self._limit(limit_type) for limit_type in limit_types]
+        now_ms = int(time.time() * 1000)
+
+        if self._script is not None:
+            args = [now_ms, cost]
+            for limit, window_ms in limits:
+                args.extend([limit, window_ms])
+            try:
+                reply = self._script(keys=self._redis_keys(key, limit_types, now_ms), args=args)
+                allowed = bool(reply[0])
+                return {
+                    limit_type: RateLimitResult(allowed, limit, int(reply[1 + 2 * i]),
+                                                int(reply[2 + 2 * i]) / 1000.0)
+                    for i, (limit_type, (limit, _)) in enumerate(zip(limit_types, limits))
+                }
+            except RedisError as e:
+                logger.warning(f"Rate limiter Redis error ({e}); using in-memory limits")
+
+        local_keys = [f"{limit_type}:{key}" for limit_type in limit_types]
+        check = self._local.sliding_window if self.algorithm == SLIDING_WINDOW else self._local.token_bucket
+        return dict(zip(limit_types, check(local_keys, limits, now_ms, cost)))
+
+    def check(self, key: str, limit_type: str = 'default', cost: int = 1) -> RateLimitResult:
+        """Check and consume one limit, returning remaining/reset details"""
+        return self.check_many(key, [limit_type], cost)[limit_type]
+
     def is_allowed(self, key: str, limit_type: str = 'default') -> bool:
         """Check if request is allowed"""
-        current_time = time.time()
-        limit_config = self.limits.get(limit_type, self.limits['default'])
-        
-        if key not in self.requests:
-            self.requests[key] = []
-        
-        # Clean old requests outside window
-        window_start = current_time - limit_config['window']
-        self.requests[key] = [req_time for req_time in self.requests[key] if req_time > window_start]
-        
-        # Check if under limit
-        if len(self.requests[key]) < limit_config['requests']:
-            self.requests[key].append(current_time)
-            return True
-        
-        return False
-    
+        return self.check(key, limit_type).allowed
+
     def get_remaining_requests(self, key: str, limit_type: str = 'default') -> int:
         """Get remaining requests for key"""
-        current_time = time.time()
-        limit_config = self.limits.get(limit_type, self.limits['default'])
-        
-        if key not in self.requests:
-            return limit_config['requests']
-        
-        # Clean old requests
-        window_start = current_time - limit_config['window']
-        self.requests[key] = [req_time for req_time in self.requests[key] if req_time > window_start]
-        
-        return max(0, limit_config['requests'] - len(self.requests[key]))
+        return self.check(key, limit_type, cost=0).remaining
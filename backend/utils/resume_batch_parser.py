@@ -0,0 +1,306 @@
+"""
+Batch Resume Parser
+Fans uploaded resume files out to a bounded process pool and yields per-file
+results as they complete, with per-file time and memory limits
+"""
+
+import os
+import time
+import signal
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; memory limits are skipped
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = int(os.environ.get('RESUME_BATCH_WORKERS', min(4, os.cpu_count() or 1)))
+DEFAULT_FILE_TIMEOUT_SECONDS = float(os.environ.get('RESUME_BATCH_FILE_TIMEOUT_SECONDS', '30'))
+DEFAULT_FILE_MEMORY_MB = int(os.environ.get('RESUME_BATCH_FILE_MEMORY_MB', '512'))
+
+# Extra time the parent allows past the in-worker alarm before it kills the pool
+HARD_TIMEOUT_GRACE_SECONDS = 5.0
+
+
+class FileTimeoutError(BaseException):
+    """
+    Raised inside a worker when a file exceeds its time limit.
+
+    Derives from BaseException so the parser's own ``except Exception``
+    handlers cannot swallow it.
+    """
+
+
+def _default_parser_factory():
+    from .resume_format_handler import AdvancedResumeParserWithFormats
+    return AdvancedResumeParserWithFormats()
+
+
+# Per-worker state, set once by _init_worker and reused for every file
+_worker_parser = None
+
+
+def _address_space_bytes() -> int:
+    """Current virtual memory size of this process (Linux), or 0 if unknown"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _init_worker(parser_factory: Callable[[], Any], file_memory_mb: int):
+    """Build the warm parser, then cap the worker's address space above it"""
+    global _worker_parser
+    _worker_parser = parser_factory()
+
+    if file_memory_mb and resource is not None:
+        baseline = _address_space_bytes()
+        if baseline:
+            limit = baseline + file_memory_mb * 1024 * 1024
+            _, hard = resource.getrlimit(resource.RLIMIT_AS)
+            if hard != resource.RLIM_INFINITY:
+                limit = min(limit, hard)
+            resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _raise_file_timeout(signum, frame):
+    raise FileTimeoutError()
+
+
+def _parse_in_worker(index: int, file_name: str, file_bytes: bytes, location: str,
+                     timeout_seconds: float) -> Tuple[int, Dict[str, Any]]:
+    """Parse one file on the worker's warm parser under an interval timer"""
+    started = time.perf_counter()
+    signal.signal(signal.SIGALRM, _raise_file_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout_seconds)
+    try:
+        result = _worker_parser.parse_resume_from_bytes(file_bytes, file_name, location)
+    except FileTimeoutError:
+        result = _error_result(f'Parsing exceeded the {timeout_seconds:g}s time limit')
+    except MemoryError:
+        result = _error_result('Parsing exceeded the per-file memory limit')
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+    result['processing_time'] = round(time.perf_counter() - started, 3)
+    return index, result
+
+
+def _error_result(error: str) -> Dict[str, Any]:
+    return {
+        'success': False,
+        'error': error,
+        'parsed_data': {},
+        'advanced_analytics': {}
+    }
+
+
+class ResumeBatchParser:
+    """
+    Bounded process pool of warm AdvancedResumeParserWithFormats workers.
+
+    Each worker builds its parser once and handles one file at a time. Every
+    file runs under a SIGALRM timer, and the worker's address space is capped
+    at its post-startup size plus ``file_memory_mb``. The pool is reused
+    across batches. If a worker hangs past the timer, the pool is rebuilt and
+    the other in-flight files are resubmitted. If a worker dies (OOM kill,
+    segfault), every file it may have been parsing is rerun alone, and only a
+    file that crashes on its own is reported as failed.
+
+    Submissions from every batch share one semaphore with ``max_workers``
+    slots, so concurrent batches never queue files behind each other inside
+    the executor. A submitted file therefore starts immediately, and its
+    time since submission is its parse time.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS,
+                 file_timeout_seconds: float = DEFAULT_FILE_TIMEOUT_SECONDS,
+                 file_memory_mb: int = DEFAULT_FILE_MEMORY_MB,
+                 parser_factory: Callable[[], Any] = _default_parser_factory):
+        self.max_workers = max(1, max_workers)
+        self.file_timeout_seconds = file_timeout_seconds
+        self.file_memory_mb = file_memory_mb
+        self.parser_factory = parser_factory
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        # One slot per worker, shared by every batch using this parser
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        # Futures holding a slot, mapped to the executor they were submitted to
+        self._slot_futures: Dict[Any, ProcessPoolExecutor] = {}
+
+    def _submit(self, executor: ProcessPoolExecutor, block: bool, *args):
+        """Submit one file if a worker slot is free (waiting up to 1s if block), else None"""
+        acquired = self._slots.acquire(timeout=1.0) if block else self._slots.acquire(blocking=False)
+        if not acquired:
+            return None
+        try:
+            future = executor.submit(_parse_in_worker, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._slot_futures[future] = executor
+        future.add_done_callback(self._release_slot)
+        return future
+
+    def _release_slot(self, future):
+        """Free a future's slot once: when it finishes or when its pool is killed"""
+        with self._lock:
+            if self._slot_futures.pop(future, None) is None:
+                return
+        self._slots.release()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker,
+                    initargs=(self.parser_factory, self.file_memory_mb),
+                )
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        """Kill a hung or broken pool; the next batch step starts a fresh one"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+            doomed = [future for future, owner in self._slot_futures.items() if owner is executor]
+        # Futures on a killed pool may never complete; do not let them hold slots
+        for future in doomed:
+            self._release_slot(future)
+        processes = list((getattr(executor, '_processes', None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.kill()
+
+    def parse_batch(self, files: Sequence[Tuple[str, bytes]], location: str = "New York",
+                    deadline_seconds: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Parse (file_name, file_bytes) pairs, yielding one result per file in
+        completion order.
+
+        Each result is the parse_resume_from_bytes dictionary plus ``index``,
+        ``file_name`` and ``processing_time``. Files are handed out one per
+        idle worker. Once ``deadline_seconds`` has passed, no new files are
+        started; the remaining files are yielded with ``deferred: True`` so the
+        caller can resubmit them.
+        """
+        batch_started = time.monotonic()
+        pending = list(range(len(files)))
+        pending.reverse()
+        # Files that were in flight when a worker died. Each is rerun alone, so
+        # a second crash is attributable to that file.
+        suspects = set()
+        in_flight: Dict[Any, Tuple[int, float]] = {}
+        hard_timeout = self.file_timeout_seconds + HARD_TIMEOUT_GRACE_SECONDS
+
+        def tag(index: int, result: Dict[str, Any]) -> Dict[str, Any]:
+            result['index'] = index
+            result['file_name'] = files[index][0]
+            result.setdefault('processing_time', 0.0)
+            return result
+
+        while pending or in_flight:
+            if deadline_seconds is not None and time.monotonic() - batch_started >= deadline_seconds:
+                while pending:
+                    result = _error_result('Batch time limit reached before this file was parsed; resubmit it')
+                    result['deferred'] = True
+                    yield tag(pending.pop(), result)
+
+            executor = self._get_executor()
+            try:
+                while pending:
+                    index = pending[-1]
+                    if index in suspects and in_flight:
+                        break
+                    file_name, file_bytes = files[index]
+                    # Wait for a slot only when this batch has nothing running
+                    future = self._submit(executor, not in_flight, index, file_name, file_bytes,
+                                          location, self.file_timeout_seconds)
+                    if future is None:
+                        break
+                    pending.pop()
+                    in_flight[future] = (index, time.monotonic())
+                    if index in suspects:
+                        break
+            except BrokenProcessPool:
+                self._requeue(in_flight, pending, suspects)
+                self._discard_executor(executor)
+                continue
+
+            if not in_flight:
+                continue
+
+            done, _ = wait(list(in_flight), timeout=1.0, return_when=FIRST_COMPLETED)
+            pool_broken = False
+            for future in done:
+                index, _ = in_flight.pop(future)
+                try:
+                    _, result = future.result()
+                except BrokenProcessPool:
+                    pool_broken = True
+                    if index not in suspects:
+                        suspects.add(index)
+                        pending.append(index)
+                        continue
+                    logger.error(f"Worker died parsing {files[index][0]}")
+                    result = _error_result('Parser worker crashed on this file')
+                except Exception as e:
+                    logger.error(f"Error parsing {files[index][0]} in batch: {e}")
+                    result = _error_result(f'Error parsing file: {str(e)}')
+                yield tag(index, result)
+
+            if pool_broken:
+                self._requeue(in_flight, pending, suspects)
+                self._discard_executor(executor)
+                continue
+
+            now = time.monotonic()
+            hung = [future for future, (_, submitted) in in_flight.items()
+                    if now - submitted > hard_timeout and not future.done()]
+            if hung:
+                # The alarm did not fire (stuck in C code); kill the pool and
+                # rerun the other in-flight files on a fresh one
+                for future in hung:
+                    index, _ = in_flight.pop(future)
+                    logger.error(f"Killing parser pool: {files[index][0]} ignored its time limit")
+                    yield tag(index, _error_result(
+                        f'Parsing exceeded the {self.file_timeout_seconds:g}s time limit'))
+                pending.extend(index for index, _ in in_flight.values())
+                in_flight.clear()
+                self._discard_executor(executor)
+
+    @staticmethod
+    def _requeue(in_flight: Dict[Any, Tuple[int, float]], pending: List[int], suspects: set):
+        """Move files still in flight on a dead pool back to the queue as suspects"""
+        for index, _ in in_flight.values():
+            suspects.add(index)
+            pending.append(index)
+        in_flight.clear()
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+_batch_parser: Optional[ResumeBatchParser] = None
+_batch_parser_lock = threading.Lock()
+
+
+def get_batch_parser() -> ResumeBatchParser:
+    """Process-wide batch parser, so warm workers survive between requests"""
+    global _batch_parser
+    with _batch_parser_lock:
+        if _batch_parser is None:
+            _batch_parser = ResumeBatchParser()
+        return _batch_parser
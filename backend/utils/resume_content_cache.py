@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Resume Content Cache
+
+Content-addressed caches for the resume pipeline. The SHA-256 of the uploaded
+file bytes maps to the extracted text, and the SHA-256 of the text plus the
+parser version maps to the parsed analysis. Re-uploading a resume skips
+extraction and parsing. Rerunning recommendations with a different salary or
+location skips them too; only the downstream matching is recomputed.
+
+The caches are content_cache.ContentCache instances; this module picks their
+shared store from RESUME_CACHE_BACKEND and keeps one per namespace.
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Dict
+
+try:
+    import redis
+    from redis.exceptions import RedisError
+except ImportError:
+    redis = None
+    RedisError = Exception
+
+from .content_cache import ContentCache, DiskCacheStore, RedisCacheStore
+
+logger = logging.getLogger(__name__)
+
+RESUME_TEXT_NAMESPACE = 'resume_text'
+RESUME_ANALYSIS_NAMESPACE = 'resume_analysis'
+
+# 'memory' (default), 'redis' or 'disk'
+RESUME_CACHE_BACKEND = os.environ.get('RESUME_CACHE_BACKEND', 'memory')
+RESUME_CACHE_DIR = os.environ.get('RESUME_CACHE_DIR', '/tmp/mingus_resume_cache')
+RESUME_CACHE_MAX_ENTRIES = int(os.environ.get('RESUME_CACHE_MAX_ENTRIES', '1024'))
+RESUME_CACHE_TTL_SECONDS = int(os.environ.get('RESUME_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+
+_caches: Dict[str, ContentCache] = {}
+_caches_lock = threading.Lock()
+_redis_client = None
+_redis_checked = False
+
+
+def _shared_redis_client():
+    """Redis client from REDIS_URL, or None if redis is missing or unreachable"""
+    global _redis_client, _redis_checked
+    if not _redis_checked:
+        _redis_checked = True
+        if redis is not None:
+            try:
+                client = redis.Redis.from_url(
+                    os.environ.get('REDIS_URL', 'redis://localhost:6379/0'), socket_timeout=1
+                )
+                client.ping()
+                _redis_client = client
+            except RedisError as e:
+                logger.warning(f"Resume cache Redis unavailable ({e}); using in-process caches only")
+    return _redis_client
+
+
+def _build_store(namespace: str):
+    if RESUME_CACHE_BACKEND == 'redis':
+        client = _shared_redis_client()
+        if client is None:
+            return None
+        return RedisCacheStore(client, namespace, RESUME_CACHE_TTL_SECONDS, key_prefix='resume_cache')
+    if RESUME_CACHE_BACKEND == 'disk':
+        try:
+            return DiskCacheStore(RESUME_CACHE_DIR, namespace, RESUME_CACHE_MAX_ENTRIES * 10,
+                                  RESUME_CACHE_TTL_SECONDS)
+        except OSError as e:
+            logger.warning(f"Resume cache directory unavailable ({e}); using in-process caches only")
+    return None
+
+
+def get_resume_cache(namespace: str) -> ContentCache:
+    """Process-wide cache for a namespace, backed per RESUME_CACHE_BACKEND"""
+    with _caches_lock:
+        cache = _caches.get(namespace)
+        if cache is None:
+            cache = ContentCache(namespace, max_entries=RESUME_CACHE_MAX_ENTRIES,
+                                 ttl_seconds=RESUME_CACHE_TTL_SECONDS, store=_build_store(namespace))
+            _caches[namespace] = cache
+        return cache
+
+
+def resume_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every resume cache created in this process"""
+    with _caches_lock:
+        caches = dict(_caches)
+    return {namespace: cache.stats() for namespace, cache in caches.items()}
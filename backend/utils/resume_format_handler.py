@@ -8,6 +8,8 @@ import logging
 from typing import Optional, Dict, Any
 from pathlib import Path
 from .advanced_resume_parser import AdvancedResumeParser
+from .content_cache import content_hash
+from .resume_content_cache import RESUME_TEXT_NAMESPACE, get_resume_cache
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +18,7 @@ class ResumeFormatHandler:
     
     def __init__(self):
         self.supported_formats = ['.pdf', '.docx', '.doc', '.txt']
+        self.text_cache = get_resume_cache(RESUME_TEXT_NAMESPACE)
     
     def extract_text_from_file(self, file_path: str) -> Optional[str]:
         """
@@ -35,16 +38,26 @@ class ResumeFormatHandler:
                 return None
             
             file_extension = file_path.suffix.lower()
+            if file_extension not in self.supported_formats:
+                logger.error(f"Unsupported file format: {file_extension}")
+                return None
+            
+            # Same bytes, same extension: reuse the text extracted last time
+            cache_key = f"{content_hash(file_path.read_bytes())}{file_extension}"
+            cached_text = self.text_cache.get(cache_key)
+            if cached_text is not None:
+                return cached_text
             
             if file_extension == '.txt':
-                return self._extract_from_txt(file_path)
+                text = self._extract_from_txt(file_path)
             elif file_extension == '.pdf':
-                return self._extract_from_pdf(file_path)
-            elif file_extension in ['.docx', '.doc']:
-                return self._extract_from_docx(file_path)
+                text = self._extract_from_pdf(file_path)
             else:
-                logger.error(f"Unsupported file format: {file_extension}")
-                return None
+                text = self._extract_from_docx(file_path)
+            
+            if text:
+                self.text_cache.set(cache_key, text)
+            return text
                 
         except Exception as e:
             logger.error(f"Error extracting text from file {file_path}: {str(e)}")
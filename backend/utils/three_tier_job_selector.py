@@ -12,9 +12,6 @@ opportunities into three distinct tiers based on risk/reward profiles:
 
 import json
 import logging
-import psycopg2
-import psycopg2.extras
-import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any, Union
 from dataclasses import dataclass, asdict
@@ -25,6 +22,7 @@ from concurrent.futures import ThreadPoolExecutor
 import re
 import random
 from collections import defaultdict
+from backend.utils.pg_pool import get_pg_connection
 
 # Import existing job matching components
 from .income_boost_job_matcher import (
@@ -36,12 +34,6 @@ from .income_boost_job_matcher import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def get_pg_connection():
-    """Get PostgreSQL database connection"""
-    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-    conn.cursor_factory = psycopg2.extras.RealDictCursor
-    return conn
-
 class JobTier(Enum):
     """Job recommendation tiers based on risk/reward profile"""
     CONSERVATIVE = "conservative"
@@ -0,0 +1,27 @@
+"""Per-user Plaid /transactions/sync cursor (incremental sync watermark)
+
+Revision ID: 073_plaid_sync_cursor
+Revises: 001_create_checkin_todo_tables
+Create Date: 2026-10-16
+
+Stores the last committed /transactions/sync cursor so each sync fetches only
+added, modified and removed transactions since the previous run.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "073_plaid_sync_cursor"
+down_revision = "001_create_checkin_todo_tables"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("users", sa.Column("plaid_sync_cursor", sa.Text(), nullable=True))
+    op.add_column("users", sa.Column("plaid_last_synced_at", sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("users", "plaid_last_synced_at")
+    op.drop_column("users", "plaid_sync_cursor")
@@ -0,0 +1,36 @@
+"""Composite search index on job_postings
+
+Revision ID: 074_job_postings_search_index
+Revises: 073_plaid_sync_cursor
+Create Date: 2026-10-16
+
+Job searches filter on career_field, msa_code and is_active and page through
+results by salary_max. This index serves all four columns, so the planner no
+longer reads every active posting for a field and metro and then sorts them.
+It replaces ix_job_postings_career_field_msa_code, which is its prefix.
+"""
+from alembic import op
+
+
+revision = "074_job_postings_search_index"
+down_revision = "073_plaid_sync_cursor"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_job_postings_field_msa_active_salary",
+        "job_postings",
+        ["career_field", "msa_code", "is_active", "salary_max"],
+    )
+    op.drop_index("ix_job_postings_career_field_msa_code", table_name="job_postings")
+
+
+def downgrade():
+    op.create_index(
+        "ix_job_postings_career_field_msa_code",
+        "job_postings",
+        ["career_field", "msa_code"],
+    )
+    op.drop_index("ix_job_postings_field_msa_active_salary", table_name="job_postings")
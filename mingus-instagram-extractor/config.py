@@ -35,6 +35,12 @@ DOWNLOAD_OUTPUT_DIR = Path("output")
 DOWNLOAD_DELAY = 2.0  # Seconds between downloads for rate limiting
 DOWNLOAD_TIMEOUT = 300  # 5 minutes timeout per download
 MAX_RETRIES = 3  # Maximum retry attempts for failed downloads
+DOWNLOAD_WORKERS = 4  # Concurrent download workers
+DEFAULT_DOMAIN_CONCURRENCY = 2  # Concurrent downloads per domain unless overridden
+DOMAIN_CONCURRENCY = {
+    'instagram.com': 2,
+}
+DOWNLOAD_MANIFEST_NAME = 'download_manifest.jsonl'  # Stored under <output>/metadata/
 
 # Content categories for organization
 CONTENT_CATEGORIES = [
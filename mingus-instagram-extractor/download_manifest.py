@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Download Manifest
+
+Persistent, append-only record of completed and failed downloads so an
+interrupted run resumes where it stopped, plus a content-hash index used to
+dedupe identical media downloaded from different URLs.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+
+STATUS_COMPLETED = 'completed'
+STATUS_FAILED = 'failed'
+
+
+def file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Hash a file's contents without loading it into memory."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DownloadManifest:
+    """
+    JSON-lines manifest keyed by URL.
+
+    Every state change is appended and flushed immediately, so a crash loses at
+    most the item in flight; the last line for a URL wins on load. compact()
+    rewrites the file with one line per URL.
+    """
+
+    def __init__(self, manifest_path: Path):
+        self.path = Path(manifest_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self._by_hash: Dict[str, str] = {}
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn final line from a crash mid-write
+                    continue
+                self._index(entry)
+
+    def _index(self, entry: Dict):
+        self._entries[entry['url']] = entry
+        sha256 = entry.get('sha256')
+        if entry.get('status') == STATUS_COMPLETED and sha256 and not entry.get('duplicate_of'):
+            self._by_hash.setdefault(sha256, entry.get('file_path'))
+
+    def _append(self, entry: Dict):
+        entry['updated_at'] = datetime.now().isoformat()
+        with self._lock:
+            self._index(entry)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+    def get(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            return self._entries.get(url)
+
+    def completed_entry(self, url: str) -> Optional[Dict]:
+        """The completed entry for url, if its file is still on disk."""
+        entry = self.get(url)
+        if not entry or entry.get('status') != STATUS_COMPLETED:
+            return None
+        file_path = entry.get('file_path')
+        if not file_path or not Path(file_path).exists():
+            return None
+        return entry
+
+    def attempts(self, url: str) -> int:
+        entry = self.get(url)
+        return entry.get('attempts', 0) if entry else 0
+
+    def claim_hash(self, sha256: str, file_path: str) -> Optional[str]:
+        """
+        Register file_path as the canonical copy of sha256.
+
+        Returns the path of an existing copy when one is already registered
+        and still on disk, else None.
+        """
+        with self._lock:
+            existing = self._by_hash.get(sha256)
+            if existing and existing != file_path and Path(existing).exists():
+                return existing
+            self._by_hash[sha256] = file_path
+            return None
+
+    def record_completed(self, url: str, file_path: str, sha256: str,
+                         file_size: int, duplicate_of: Optional[str] = None,
+                         **extra):
+        self._append({
+            'url': url,
+            'status': STATUS_COMPLETED,
+            'file_path': file_path,
+            'sha256': sha256,
+            'file_size': file_size,
+            'duplicate_of': duplicate_of,
+            'attempts': self.attempts(url) + 1,
+            **extra,
+        })
+
+    def record_failed(self, url: str, error_message: str, **extra):
+        self._append({
+            'url': url,
+            'status': STATUS_FAILED,
+            'error': error_message,
+            'attempts': self.attempts(url) + 1,
+            **extra,
+        })
+
+    def compact(self):
+        """Rewrite the manifest with only the latest entry per URL."""
+        with self._lock:
+            tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for entry in self._entries.values():
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+
+    def summary(self) -> Dict[str, int]:
+        with self._lock:
+            statuses = [entry.get('status') for entry in self._entries.values()]
+        return {
+            'completed': statuses.count(STATUS_COMPLETED),
+            'failed': statuses.count(STATUS_FAILED),
+            'unique_media': len(self._by_hash),
+        }
@@ -13,10 +13,13 @@ import os
 import shutil
 import subprocess
 import sys
+import threading
 import time
 import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import urlparse
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 import requests
@@ -35,7 +38,12 @@ except ImportError:
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from config import LOG_LEVEL, LOG_FORMAT, CONTENT_CATEGORIES, MAX_VIDEO_HEIGHT
+from config import (
+    LOG_LEVEL, LOG_FORMAT, CONTENT_CATEGORIES, MAX_VIDEO_HEIGHT,
+    DOWNLOAD_DELAY, MAX_RETRIES, DOWNLOAD_WORKERS, DOMAIN_CONCURRENCY,
+    DEFAULT_DOMAIN_CONCURRENCY, DOWNLOAD_MANIFEST_NAME
+)
+from download_manifest import DownloadManifest, file_sha256
 from processors.content_processor import ContentProcessor
 from progress_reporter import ProgressReporter, DownloadLogger
 
@@ -131,7 +139,7 @@ class ToolChecker:
 class InstagramDownloader:
     """Main Instagram content downloader class."""
     
-    def __init__(self, output_dir: str = "output"):
+    def __init__(self, output_dir: str = "output", max_workers: int = DOWNLOAD_WORKERS):
         # Setup logging
         self.download_logger = DownloadLogger()
         self.logger = self.download_logger.get_logger()
@@ -144,20 +152,29 @@ class InstagramDownloader:
         # Create output directory structure
         self._create_output_structure()
         
+        # Completed/failed items survive restarts so runs resume where they stopped
+        self.manifest = DownloadManifest(self.output_dir / 'metadata' / DOWNLOAD_MANIFEST_NAME)
+        self.max_workers = max(1, max_workers)
+        
         # Download statistics
         self.stats = {
             'total_items': 0,
             'successful_downloads': 0,
             'failed_downloads': 0,
             'skipped_downloads': 0,
+            'resumed_downloads': 0,
+            'deduplicated_downloads': 0,
             'total_size_bytes': 0,
             'categories': {},
             'content_types': {}
         }
         
-        # Rate limiting
-        self.last_download_time = 0
-        self.download_delay = 2.0  # 2 seconds between downloads
+        # Rate limiting: spacing between download starts and a cap on
+        # concurrent downloads, both per domain
+        self.download_delay = DOWNLOAD_DELAY
+        self._next_download_time: Dict[str, float] = {}
+        self._domain_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._rate_lock = threading.Lock()
     
     def _create_output_structure(self):
         """Create the output directory structure."""
@@ -203,17 +220,37 @@ class InstagramDownloader:
             self.logger.error(f"Error loading URLs from JSON: {e}")
             return []
     
-    def _rate_limit(self):
-        """Implement rate limiting for Instagram respect."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_download_time
-        
-        if time_since_last < self.download_delay:
-            sleep_time = self.download_delay - time_since_last
-            self.logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
+    @staticmethod
+    def _domain(url: str) -> str:
+        """Rate-limiting key for a URL (host without www. or port)."""
+        host = (urlparse(url).hostname or '').lower()
+        return host[4:] if host.startswith('www.') else host
+    
+    def _domain_semaphore(self, domain: str) -> threading.BoundedSemaphore:
+        """Per-domain concurrency slots (DOMAIN_CONCURRENCY in config)."""
+        with self._rate_lock:
+            slots = self._domain_slots.get(domain)
+            if slots is None:
+                limit = DOMAIN_CONCURRENCY.get(domain, DEFAULT_DOMAIN_CONCURRENCY)
+                slots = threading.BoundedSemaphore(max(1, limit))
+                self._domain_slots[domain] = slots
+            return slots
+    
+    def _rate_limit(self, domain: str = ''):
+        """Implement rate limiting for Instagram respect.
+        
+        Reserves the next start slot for the domain under the lock, then sleeps
+        outside it so workers on other domains are not held up.
+        """
+        with self._rate_lock:
+            current_time = time.time()
+            slot = max(current_time, self._next_download_time.get(domain, 0.0))
+            self._next_download_time[domain] = slot + self.download_delay
+        
+        sleep_time = slot - current_time
+        if sleep_time > 0:
+            self.logger.debug(f"Rate limiting {domain}: sleeping for {sleep_time:.2f} seconds")
             time.sleep(sleep_time)
-        
-        self.last_download_time = time.time()
     
     def _generate_unique_filename(self, url: str, category: str, content_type: str, 
                                 extension: str) -> str:
@@ -359,11 +396,21 @@ class InstagramDownloader:
         return validation_result.get('valid', False)
     
     def download_content(self, item: ContentItem) -> DownloadResult:
-        """Download a single content item."""
-        self.logger.info(f"Downloading: {item.url}")
+        """Download a single content item and record it in the manifest."""
+        domain = self._domain(item.url)
+        with self._domain_semaphore(domain):
+            self._rate_limit(domain)
+            result = self._download_content(item)
         
-        # Rate limiting
-        self._rate_limit()
+        if result.success:
+            self._record_completed(item, result)
+        else:
+            self.manifest.record_failed(item.url, result.error_message or "Unknown error",
+                                        category=item.category)
+        return result
+    
+    def _download_content(self, item: ContentItem) -> DownloadResult:
+        self.logger.info(f"Downloading: {item.url}")
         
         # Determine content type directory
         content_type_dir = 'videos' if item.content_type == 'video' else 'images'
@@ -401,14 +448,76 @@ class InstagramDownloader:
         
         return result
     
+    def _record_completed(self, item: ContentItem, result: DownloadResult):
+        """Hash the downloaded file, dedupe identical media and update the manifest."""
+        try:
+            sha256 = file_sha256(result.file_path)
+        except OSError as e:
+            self.logger.warning(f"Could not hash {result.file_path}: {e}")
+            sha256 = None
+        
+        duplicate_of = self.manifest.claim_hash(sha256, result.file_path) if sha256 else None
+        if duplicate_of:
+            self.logger.info(f"Identical media already downloaded: {duplicate_of}")
+            result.file_path = self._reuse_duplicate(result.file_path, duplicate_of)
+            result.metadata = {**(result.metadata or {}), 'duplicate_of': duplicate_of}
+        
+        self.manifest.record_completed(
+            item.url, result.file_path, sha256, result.file_size or 0,
+            duplicate_of=duplicate_of, category=item.category
+        )
+    
+    def _reuse_duplicate(self, file_path: str, existing: str) -> str:
+        """
+        Share storage between file_path and the first copy of the same media.
+
+        The first copy is never touched. Within one category directory the new
+        download is removed and existing is reused. A copy in another category
+        stays at its own path, as a hard link to existing where the filesystem
+        allows, so each category keeps a complete set of files.
+        """
+        new_path, existing_path = Path(file_path), Path(existing)
+        try:
+            if new_path.parent == existing_path.parent:
+                new_path.unlink()
+                return existing
+            link_path = new_path.with_name(new_path.name + '.link')
+            os.link(existing_path, link_path)
+            os.replace(link_path, new_path)
+        except OSError as e:
+            self.logger.warning(f"Could not share storage with {existing}, keeping {file_path}: {e}")
+        return file_path
+    
+    def _download_worker(self, item: ContentItem) -> DownloadResult:
+        """Run one download on a pool worker; never raises."""
+        self.progress_reporter.start_item(f"{item.category} - {item.content_type}")
+        try:
+            return self.download_content(item)
+        except Exception as e:
+            self.logger.exception(f"Unexpected error downloading {item.url}")
+            self.manifest.record_failed(item.url, str(e), category=item.category)
+            return DownloadResult(success=False, error_message=f"Unexpected error: {e}")
+    
+    def _resumed_result(self, entry: Dict) -> DownloadResult:
+        """Rebuild a successful result from a completed manifest entry."""
+        return DownloadResult(
+            success=True,
+            file_path=entry['file_path'],
+            file_size=entry.get('file_size'),
+            metadata={'resumed': True, 'sha256': entry.get('sha256'),
+                      'duplicate_of': entry.get('duplicate_of')}
+        )
+    
     def download_all_content(self, items: List[ContentItem]) -> Dict[str, Any]:
-        """Download all content items and return comprehensive results."""
+        """Download all content items and return comprehensive results.
+        
+        Items already completed in the manifest are resumed rather than
+        re-downloaded; items that failed MAX_RETRIES times are not retried.
+        The rest are spread over a pool of max_workers download workers.
+        """
         self.logger.info(f"Starting download of {len(items)} content items")
         self.stats['total_items'] = len(items)
         
-        # Initialize progress reporting
-        self.progress_reporter.start_download_session(len(items))
-        
         results = {
             'successful': [],
             'failed': [],
@@ -416,79 +525,116 @@ class InstagramDownloader:
             'statistics': self.stats
         }
         
-        for i, item in enumerate(items, 1):
-            self.logger.info(f"Processing item {i}/{len(items)}: {item.category}")
-            
-            # Update progress
-            self.progress_reporter.update_progress(
-                item_name=f"{item.category} - {item.content_type}",
-                category=item.category,
-                content_type=item.content_type
-            )
-            
-            # Skip if already downloaded (check for existing files)
-            content_type_dir = 'videos' if item.content_type == 'video' else 'images'
-            category_dir = self.output_dir / content_type_dir / item.category
-            
-            # Check if we already have this content
-            existing_files = list(category_dir.glob("*"))
-            if existing_files and self._is_duplicate_content(item, existing_files):
-                self.logger.info(f"Skipping duplicate content: {item.url}")
+        pending = []
+        seen_urls = set()
+        existing_files: Dict[Path, List[Path]] = {}
+        for item in items:
+            # Same URL listed twice: download it once
+            if item.url in seen_urls:
                 results['skipped'].append(item)
                 self.stats['skipped_downloads'] += 1
-                self.progress_reporter.mark_skipped(
-                    item_name=f"{item.category} - {item.content_type}",
-                    category=item.category
-                )
                 continue
+            seen_urls.add(item.url)
             
-            # Download the content
-            result = self.download_content(item)
-            
-            if result.success:
+            entry = self.manifest.completed_entry(item.url)
+            if entry:
                 results['successful'].append({
                     'item': item,
-                    'result': result
+                    'result': self._resumed_result(entry)
                 })
-                self.stats['successful_downloads'] += 1
-                self.stats['total_size_bytes'] += result.file_size or 0
-                
-                # Update category and content type stats
-                self.stats['categories'][item.category] = self.stats['categories'].get(item.category, 0) + 1
-                self.stats['content_types'][item.content_type] = self.stats['content_types'].get(item.content_type, 0) + 1
-                
-                # Update progress with success
-                self.progress_reporter.update_progress(
-                    success=True,
-                    file_size=result.file_size or 0,
-                    category=item.category,
-                    content_type=item.content_type
-                )
-                
-                self.progress_reporter.log_success(
-                    f"Downloaded {item.content_type}",
-                    item_url=item.url,
-                    file_size=result.file_size or 0
-                )
-            else:
+                self.stats['resumed_downloads'] += 1
+                continue
+            
+            entry = self.manifest.get(item.url)
+            if entry and entry.get('status') == 'failed' and entry.get('attempts', 0) >= MAX_RETRIES:
                 results['failed'].append({
                     'item': item,
-                    'result': result
+                    'result': DownloadResult(
+                        success=False,
+                        error_message=f"{entry.get('error')} (gave up after {entry['attempts']} attempts)"
+                    )
                 })
                 self.stats['failed_downloads'] += 1
+                continue
+            
+            # Content downloaded before the manifest existed
+            content_type_dir = 'videos' if item.content_type == 'video' else 'images'
+            category_dir = self.output_dir / content_type_dir / item.category
+            if category_dir not in existing_files:
+                existing_files[category_dir] = list(category_dir.glob("*"))
+            if existing_files[category_dir] and self._is_duplicate_content(item, existing_files[category_dir]):
+                self.logger.info(f"Skipping duplicate content: {item.url}")
+                results['skipped'].append(item)
+                self.stats['skipped_downloads'] += 1
+                continue
+            
+            pending.append(item)
+        
+        if self.stats['resumed_downloads']:
+            self.logger.info(f"Resuming: {self.stats['resumed_downloads']} items already downloaded")
+        
+        # Initialize progress reporting
+        self.progress_reporter.start_download_session(len(pending))
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, max(1, len(pending))),
+                                thread_name_prefix="download") as executor:
+            futures = {executor.submit(self._download_worker, item): item for item in pending}
+            
+            for future in as_completed(futures):
+                item = futures[future]
+                result = future.result()
                 
-                # Update progress with failure
-                self.progress_reporter.update_progress(
-                    success=False,
-                    category=item.category,
-                    content_type=item.content_type
-                )
-                
-                self.progress_reporter.log_error(
-                    f"Failed to download: {result.error_message}",
-                    item_url=item.url,
-                    category=item.category
-                )
+                if result.success:
+                    results['successful'].append({
+                        'item': item,
+                        'result': result
+                    })
+                    self.stats['successful_downloads'] += 1
+                    if result.metadata and result.metadata.get('duplicate_of'):
+                        self.stats['deduplicated_downloads'] += 1
+                    else:
+                        self.stats['total_size_bytes'] += result.file_size or 0
+                    
+                    # Update category and content type stats
+                    self.stats['categories'][item.category] = self.stats['categories'].get(item.category, 0) + 1
+                    self.stats['content_types'][item.content_type] = self.stats['content_types'].get(item.content_type, 0) + 1
+                    
+                    # Update progress with success
+                    self.progress_reporter.update_progress(
+                        item_name=f"{item.category} - {item.content_type}",
+                        success=True,
+                        file_size=result.file_size or 0,
+                        category=item.category,
+                        content_type=item.content_type
+                    )
+                    
+                    self.progress_reporter.log_success(
+                        f"Downloaded {item.content_type}",
+                        item_url=item.url,
+                        file_size=result.file_size or 0
+                    )
+                else:
+                    results['failed'].append({
+                        'item': item,
+                        'result': result
+                    })
+                    self.stats['failed_downloads'] += 1
+                    
+                    # Update progress with failure
+                    self.progress_reporter.update_progress(
+                        item_name=f"{item.category} - {item.content_type}",
+                        success=False,
+                        category=item.category,
+                        content_type=item.content_type
+                    )
+                    
+                    self.progress_reporter.log_error(
+                        f"Failed to download: {result.error_message}",
+                        item_url=item.url,
+                        category=item.category
+                    )
+        
+        self.manifest.compact()
         
         # Generate final report
         self._generate_download_report(results)
@@ -662,6 +808,8 @@ def main():
     print(f"   Successful: {stats['successful_downloads']}")
     print(f"   Failed: {stats['failed_downloads']}")
     print(f"   Skipped: {stats['skipped_downloads']}")
+    print(f"   Resumed from manifest: {stats['resumed_downloads']}")
+    print(f"   Deduplicated: {stats['deduplicated_downloads']}")
     print(f"   Total size: {stats['total_size_bytes'] / (1024*1024):.1f} MB")
     print(f"   Mingus CSV: {csv_path}")
 
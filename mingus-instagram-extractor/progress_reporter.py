@@ -7,10 +7,11 @@ Provides real-time progress reporting, statistics tracking, and comprehensive lo
 
 import logging
 import sys
+import threading
 import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, is_dataclass
 import json
 from pathlib import Path
 
@@ -26,6 +27,7 @@ class ProgressStats:
     total_size_bytes: int = 0
     start_time: float = 0
     current_item: str = ""
+    in_flight: int = 0
     categories: Dict[str, int] = None
     content_types: Dict[str, int] = None
     
@@ -66,6 +68,20 @@ class ProgressStats:
         remaining_items = self.total_items - self.completed_items
         return avg_time_per_item * remaining_items
     
+    @property
+    def items_per_minute(self) -> float:
+        """Completed items per minute across all workers."""
+        if self.elapsed_time <= 0:
+            return 0.0
+        return self.completed_items / self.elapsed_time * 60
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Download throughput across all workers."""
+        if self.elapsed_time <= 0:
+            return 0.0
+        return self.total_size_bytes / self.elapsed_time
+
     @property
     def total_size_mb(self) -> float:
         """Get total size in MB."""
@@ -80,6 +96,8 @@ class ProgressReporter:
         self.stats = ProgressStats()
         self.last_update_time = 0
         self.update_interval = 5.0  # Update every 5 seconds
+        # Download workers report concurrently
+        self._lock = threading.Lock()
         
     def start_download_session(self, total_items: int):
         """Start a new download session."""
@@ -91,6 +109,11 @@ class ProgressReporter:
                        file_size: int = 0, category: str = "", 
                        content_type: str = ""):
         """Update progress with new information."""
+        with self._lock:
+            self._update_progress(item_name, success, file_size, category, content_type)
+    
+    def _update_progress(self, item_name: str, success: bool, file_size: int,
+                         category: str, content_type: str):
         current_time = time.time()
         
         # Update current item
@@ -100,6 +123,7 @@ class ProgressReporter:
         # Update counters
         if success is not None:
             self.stats.completed_items += 1
+            self.stats.in_flight = max(0, self.stats.in_flight - 1)
             if success:
                 self.stats.successful_downloads += 1
                 self.stats.total_size_bytes += file_size
@@ -117,13 +141,21 @@ class ProgressReporter:
             self._print_progress_update()
             self.last_update_time = current_time
     
+    def start_item(self, item_name: str = ""):
+        """Record that a worker has started downloading an item."""
+        with self._lock:
+            self.stats.in_flight += 1
+            if item_name:
+                self.stats.current_item = item_name
+    
     def mark_skipped(self, item_name: str = "", category: str = ""):
         """Mark an item as skipped."""
-        self.stats.completed_items += 1
-        self.stats.skipped_downloads += 1
-        
-        if category:
-            self.stats.categories[category] = self.stats.categories.get(category, 0) + 1
+        with self._lock:
+            self.stats.completed_items += 1
+            self.stats.skipped_downloads += 1
+            
+            if category:
+                self.stats.categories[category] = self.stats.categories.get(category, 0) + 1
         
         self.logger.info(f"Skipped: {item_name}")
     
@@ -149,12 +181,31 @@ class ProgressReporter:
         print(f"   Skipped: {self.stats.skipped_downloads}")
         print(f"   Success rate: {self.stats.success_rate:.1f}%")
         print(f"   Total size: {self.stats.total_size_mb:.1f} MB")
+        print(f"   Throughput: {self.stats.items_per_minute:.1f} items/min, "
+              f"{self.stats.bytes_per_second / (1024*1024):.2f} MB/s")
+        print(f"   In flight: {self.stats.in_flight}")
         print(f"   Elapsed: {self._format_time(elapsed)}")
         print(f"   Remaining: {self._format_time(remaining)}")
         
         if self.stats.current_item:
             print(f"   Current: {self.stats.current_item}")
     
+    def snapshot(self) -> Dict[str, Any]:
+        """Point-in-time progress, throughput and ETA for external consumers."""
+        with self._lock:
+            return {
+                'total_items': self.stats.total_items,
+                'completed_items': self.stats.completed_items,
+                'successful_downloads': self.stats.successful_downloads,
+                'failed_downloads': self.stats.failed_downloads,
+                'skipped_downloads': self.stats.skipped_downloads,
+                'in_flight': self.stats.in_flight,
+                'items_per_minute': self.stats.items_per_minute,
+                'bytes_per_second': self.stats.bytes_per_second,
+                'elapsed_seconds': self.stats.elapsed_time,
+                'eta_seconds': self.stats.estimated_remaining_time,
+            }
+    
     def _format_time(self, seconds: float) -> str:
         """Format time in a human-readable way."""
         if seconds < 60:
@@ -179,6 +230,7 @@ class ProgressReporter:
         print(f"Success rate: {self.stats.success_rate:.1f}%")
         print(f"Total size downloaded: {self.stats.total_size_mb:.1f} MB")
         print(f"Total time: {self._format_time(self.stats.elapsed_time)}")
+        print(f"Throughput: {self.stats.items_per_minute:.1f} items/min")
         
         if self.stats.categories:
             print(f"\n📁 Category distribution:")
@@ -220,7 +272,7 @@ class ProgressReporter:
         # Save JSON report
         report_path = output_dir / 'metadata' / 'detailed_report.json'
         with open(report_path, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, indent=2, ensure_ascii=False)
+            json.dump(report_data, f, indent=2, ensure_ascii=False, default=_report_default)
         
         self.logger.info(f"Detailed report saved to: {report_path}")
         return report_path
@@ -262,6 +314,13 @@ class ProgressReporter:
         self.logger.info(f"✓ {success_message}{context_str}")
 
 
+def _report_default(value: Any) -> Any:
+    """JSON fallback for the ContentItem/DownloadResult dataclasses in download results."""
+    if is_dataclass(value):
+        return asdict(value)
+    return str(value)
+
+
 class DownloadLogger:
     """Enhanced logging for download operations."""
     
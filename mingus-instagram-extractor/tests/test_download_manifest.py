@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Download manifest resume and content-hash dedupe, driving
+InstagramDownloader.download_all_content with a fake downloader that writes
+files locally instead of calling yt-dlp.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from download_manifest import DownloadManifest, file_sha256
+from instagram_downloader import ContentItem, DownloadResult, InstagramDownloader
+
+
+class FakeFetcher:
+    """Stands in for _download_content: writes `media[url]` or fails for urls in `failing`"""
+
+    def __init__(self, downloader, media, failing=()):
+        self.downloader = downloader
+        self.media = media
+        self.failing = set(failing)
+        self.calls = []
+
+    def __call__(self, item):
+        self.calls.append(item.url)
+        if item.url in self.failing:
+            return DownloadResult(success=False, error_message="HTTP Error 429")
+        url_hash = hashlib.md5(item.url.encode()).hexdigest()[:8]
+        path = self.downloader.output_dir / 'images' / item.category / f"{item.category}_{url_hash}.jpg"
+        path.write_bytes(self.media[item.url])
+        return DownloadResult(success=True, file_path=str(path), file_size=path.stat().st_size)
+
+
+@pytest.fixture
+def make_downloader(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # DownloadLogger writes its log file to the working directory
+
+    def make(media, failing=()):
+        downloader = InstagramDownloader(output_dir=str(tmp_path / 'output'), max_workers=1)
+        downloader.download_delay = 0
+        fetcher = FakeFetcher(downloader, media, failing)
+        monkeypatch.setattr(downloader, '_download_content', fetcher)
+        return downloader, fetcher
+
+    return make
+
+
+def _items(*pairs):
+    return [ContentItem(url=url, category=category, content_type='image') for url, category in pairs]
+
+
+def _manifest_entries(downloader):
+    lines = downloader.manifest.path.read_text(encoding='utf-8').splitlines()
+    return {entry['url']: entry for entry in map(json.loads, lines)}
+
+
+MEDIA = {
+    'https://instagram.com/p/a': b'first post',
+    'https://instagram.com/p/b': b'second post',
+    'https://instagram.com/p/c': b'third post',
+}
+
+
+class TestResume:
+    def test_rerun_resumes_completed_items_and_retries_failures(self, make_downloader):
+        items = _items(*((url, 'faith') for url in MEDIA))
+        first, fetcher = make_downloader(MEDIA, failing={'https://instagram.com/p/b'})
+        first.download_all_content(items)
+        assert fetcher.calls == list(MEDIA)
+
+        # Interrupted mid-write: the torn last line is ignored on load
+        with open(first.manifest.path, 'a', encoding='utf-8') as f:
+            f.write('{"url": "https://instagram.com/p/c", "sta')
+
+        second, fetcher = make_downloader(MEDIA)
+        results = second.download_all_content(items)
+
+        assert fetcher.calls == ['https://instagram.com/p/b']
+        assert second.stats['resumed_downloads'] == 2
+        assert len(results['successful']) == 3 and results['failed'] == []
+        entry = _manifest_entries(second)['https://instagram.com/p/b']
+        assert entry['status'] == 'completed' and entry['attempts'] == 2
+
+    def test_completed_item_whose_file_was_removed_is_downloaded_again(self, make_downloader):
+        items = _items(('https://instagram.com/p/a', 'faith'))
+        first, _ = make_downloader(MEDIA)
+        first.download_all_content(items)
+        Path(_manifest_entries(first)['https://instagram.com/p/a']['file_path']).unlink()
+
+        second, fetcher = make_downloader(MEDIA)
+        second.download_all_content(items)
+
+        assert fetcher.calls == ['https://instagram.com/p/a']
+
+    def test_items_that_used_up_their_retries_are_not_retried(self, make_downloader, monkeypatch):
+        monkeypatch.setattr('instagram_downloader.MAX_RETRIES', 1)
+        items = _items(('https://instagram.com/p/a', 'faith'))
+        first, _ = make_downloader(MEDIA, failing={'https://instagram.com/p/a'})
+        first.download_all_content(items)
+
+        second, fetcher = make_downloader(MEDIA)
+        results = second.download_all_content(items)
+
+        assert fetcher.calls == []
+        assert 'gave up after 1 attempts' in results['failed'][0]['result'].error_message
+
+
+SAME_BYTES = {
+    'https://instagram.com/p/original': b'identical reel',
+    'https://instagram.com/p/repost': b'identical reel',
+}
+
+
+class TestDedupe:
+    def test_duplicate_in_another_category_is_hard_linked_not_deleted(self, make_downloader):
+        downloader, _ = make_downloader(SAME_BYTES)
+        downloader.download_all_content(_items(
+            ('https://instagram.com/p/original', 'faith'),
+            ('https://instagram.com/p/repost', 'work_life'),
+        ))
+
+        entries = _manifest_entries(downloader)
+        original = Path(entries['https://instagram.com/p/original']['file_path'])
+        repost = Path(entries['https://instagram.com/p/repost']['file_path'])
+        assert original.parent.name == 'faith' and repost.parent.name == 'work_life'
+        assert original.read_bytes() == repost.read_bytes() == b'identical reel'
+        assert os.path.samefile(original, repost)
+        assert entries['https://instagram.com/p/repost']['duplicate_of'] == str(original)
+        assert downloader.stats['deduplicated_downloads'] == 1
+
+    def test_duplicate_is_kept_as_a_copy_when_hard_links_fail(self, make_downloader, monkeypatch):
+        downloader, _ = make_downloader(SAME_BYTES)
+
+        def no_links(src, dst):
+            raise OSError(18, 'Invalid cross-device link')
+
+        monkeypatch.setattr(os, 'link', no_links)
+        downloader.download_all_content(_items(
+            ('https://instagram.com/p/original', 'faith'),
+            ('https://instagram.com/p/repost', 'work_life'),
+        ))
+
+        entries = _manifest_entries(downloader)
+        original = Path(entries['https://instagram.com/p/original']['file_path'])
+        repost = Path(entries['https://instagram.com/p/repost']['file_path'])
+        assert original.read_bytes() == repost.read_bytes() == b'identical reel'
+        assert not os.path.samefile(original, repost)
+        assert not list(repost.parent.glob('*.link'))
+
+    def test_duplicate_in_the_same_category_reuses_the_first_copy(self, make_downloader):
+        downloader, _ = make_downloader(SAME_BYTES)
+        downloader.download_all_content(_items(
+            ('https://instagram.com/p/original', 'faith'),
+            ('https://instagram.com/p/repost', 'faith'),
+        ))
+
+        entries = _manifest_entries(downloader)
+        original = entries['https://instagram.com/p/original']['file_path']
+        assert entries['https://instagram.com/p/repost']['file_path'] == original
+        assert [path.name for path in Path(original).parent.iterdir()] == [Path(original).name]
+
+    def test_resumed_duplicate_keeps_pointing_at_the_first_copy(self, make_downloader):
+        items = _items(
+            ('https://instagram.com/p/original', 'faith'),
+            ('https://instagram.com/p/repost', 'work_life'),
+        )
+        first, _ = make_downloader(SAME_BYTES)
+        first.download_all_content(items)
+
+        second, fetcher = make_downloader(SAME_BYTES)
+        results = second.download_all_content(items)
+
+        assert fetcher.calls == []
+        resumed = {entry['item'].url: entry['result'] for entry in results['successful']}
+        original = resumed['https://instagram.com/p/original'].file_path
+        assert resumed['https://instagram.com/p/repost'].metadata['duplicate_of'] == original
+
+
+class TestManifest:
+    def test_claim_hash_keeps_the_first_copy_on_disk(self, tmp_path):
+        manifest = DownloadManifest(tmp_path / 'manifest.jsonl')
+        first, second = tmp_path / 'first.jpg', tmp_path / 'second.jpg'
+        first.write_bytes(b'x')
+        second.write_bytes(b'x')
+        sha256 = file_sha256(str(first))
+
+        assert manifest.claim_hash(sha256, str(first)) is None
+        assert manifest.claim_hash(sha256, str(second)) == str(first)
+
+        first.unlink()
+        assert manifest.claim_hash(sha256, str(second)) is None
+
+    def test_compact_keeps_the_latest_entry_per_url(self, tmp_path):
+        manifest = DownloadManifest(tmp_path / 'manifest.jsonl')
+        manifest.record_failed('https://instagram.com/p/a', 'timeout')
+        manifest.record_completed('https://instagram.com/p/a', str(tmp_path / 'a.jpg'), 'abc', 10)
+        manifest.compact()
+
+        reloaded = DownloadManifest(tmp_path / 'manifest.jsonl')
+        assert len(manifest.path.read_text().splitlines()) == 1
+        assert reloaded.get('https://instagram.com/p/a')['attempts'] == 2
+        assert reloaded.summary() == {'completed': 1, 'failed': 0, 'unique_media': 1}
@@ -3,6 +3,8 @@
 import json
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # PRAW VERSION — restore when Reddit API approved
@@ -20,12 +22,15 @@ PRAW_AVAILABLE = (
     and bool(os.getenv("REDDIT_CLIENT_SECRET"))
 )
 
+from pipeline.model_client import TokenBucket
 from storage.db import (
     get_all_communities,
     get_communities,
+    get_communities_due_for_heat_check,
     insert_community,
     set_community_active,
     update_community_heat,
+    update_community_heat_many,
 )
 
 logger = logging.getLogger(__name__)
@@ -138,6 +143,28 @@ def _priority_tier(heat_score):
 
 _ZEROED_STATS = {"members": 0, "posts_per_day": 0, "growth_rate_3mo": 0}
 
+# One stats fetch = subreddit about + one /new listing page.
+_REQUESTS_PER_FETCH = 2
+_REDDIT_API_HOST = "oauth.reddit.com"
+
+_host_limiters = {}
+_host_limiters_lock = threading.Lock()
+
+
+def _host_limiter(host):
+    """Shared per-host token bucket (HEAT_CHECK_REQUESTS_PER_MINUTE / _BURST)."""
+    with _host_limiters_lock:
+        limiter = _host_limiters.get(host)
+        if limiter is None:
+            per_minute = float(os.getenv("HEAT_CHECK_REQUESTS_PER_MINUTE", "60"))
+            burst = float(os.getenv("HEAT_CHECK_REQUEST_BURST", "6"))
+            limiter = TokenBucket(
+                rate=per_minute / 60.0,
+                capacity=max(burst, _REQUESTS_PER_FETCH),
+            )
+            _host_limiters[host] = limiter
+        return limiter
+
 
 def fetch_subreddit_stats(subreddit_name):
     """Fetch community activity stats via PRAW."""
@@ -148,6 +175,7 @@ def fetch_subreddit_stats(subreddit_name):
         )
         return dict(_ZEROED_STATS)
 
+    _host_limiter(_REDDIT_API_HOST).acquire(_REQUESTS_PER_FETCH)
     try:
         reddit = _get_reddit()
         subreddit = reddit.subreddit(subreddit_name)
@@ -196,38 +224,62 @@ def compute_heat_score(stats_dict, primary_domain):
     return round(max(0.0, min(10.0, score)), 2)
 
 
-def run_heat_check():
-    """Refresh stats and heat scores for all active communities."""
-    communities = get_communities()
-    updated = []
+def _heat_check_one(community):
+    """Fetch stats and score one community; returns (community_id, stats) or None."""
+    name = community["name"]
+    try:
+        stats = fetch_subreddit_stats(name)
+        heat_score = compute_heat_score(
+            {**stats, "name": name},
+            community.get("primary_domain"),
+        )
+        logger.info(
+            "Heat check: r/%s score=%.2f tier=%s",
+            name,
+            heat_score,
+            _priority_tier(heat_score),
+        )
+        return (
+            community["id"],
+            {
+                **stats,
+                "heat_score": heat_score,
+                "priority_tier": _priority_tier(heat_score),
+            },
+        )
+    except Exception:
+        logger.exception("Heat check failed for r/%s", name)
+        return None
 
-    for community in communities:
-        name = community["name"]
-        try:
-            stats = fetch_subreddit_stats(name)
-            heat_score = compute_heat_score(
-                {**stats, "name": name},
-                community.get("primary_domain"),
-            )
-            row = update_community_heat(
-                community["id"],
-                {
-                    **stats,
-                    "heat_score": heat_score,
-                    "priority_tier": _priority_tier(heat_score),
-                },
-            )
-            updated.append(row)
-            logger.info(
-                "Heat check: r/%s score=%.2f tier=%s",
-                name,
-                heat_score,
-                _priority_tier(heat_score),
-            )
-        except Exception:
-            logger.exception("Heat check failed for r/%s", name)
 
-    return updated
+def run_heat_check(max_age_hours=None):
+    """Refresh stats and heat scores for active communities.
+
+    Stats are fetched on up to HEAT_CHECK_CONCURRENCY worker threads (shared
+    per-host rate limit) and all scores are written in one batched UPDATE.
+    With max_age_hours set, only communities whose last heat check is older
+    than that (or missing) are refreshed.
+    """
+    if max_age_hours:
+        communities = get_communities_due_for_heat_check(max_age_hours)
+    else:
+        communities = get_communities()
+    if not communities:
+        return []
+
+    workers = max(1, int(os.getenv("HEAT_CHECK_CONCURRENCY", "4")))
+    with ThreadPoolExecutor(
+        max_workers=min(workers, len(communities)),
+        thread_name_prefix="heat-check",
+    ) as executor:
+        results = list(executor.map(_heat_check_one, communities))
+
+    updates = [result for result in results if result is not None]
+    try:
+        return update_community_heat_many(updates)
+    except Exception:
+        logger.exception("Heat check write failed for %d communities", len(updates))
+        return []
 
 
 def get_ranked_communities(min_tier=None):
@@ -2,8 +2,19 @@
 
 import json
 import logging
+import re
+import threading
 from pathlib import Path
 
+# Optional C Aho-Corasick automaton; falls back to a compiled trie regex
+try:
+    import ahocorasick
+
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None  # type: ignore[assignment]
+    AHOCORASICK_AVAILABLE = False
+
 from storage import db
 
 logger = logging.getLogger(__name__)
@@ -33,12 +44,219 @@ PRIMARY_DOMAIN_TO_SIGNAL_DOMAIN = {
 _PRIORITY_RANK = {domain_id: idx for idx, domain_id in enumerate(DOMAIN_PRIORITY)}
 
 _SIGNALS_PATH = Path(__file__).parent.parent / "config" / "domain_signals.json"
-with _SIGNALS_PATH.open() as _signals_file:
-    _SIGNAL_DATA = json.load(_signals_file)
 
-DOMAIN_SIGNALS = _SIGNAL_DATA.get("domains", [])
+# Curly apostrophes from mobile keyboards would otherwise miss "can't", "I'm", ...
+_APOSTROPHES = str.maketrans({"’": "'", "‘": "'"})
+
+
+def _normalize(text: str) -> str:
+    """Lowercase, straighten apostrophes and collapse whitespace (incl. newlines)."""
+    return " ".join(text.lower().translate(_APOSTROPHES).split())
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+# ---------------------------------------------------------------------------
+# Compiled keyword library
+# ---------------------------------------------------------------------------
+
+def _trie_pattern(node: dict) -> str:
+    """Regex for a character trie, so shared prefixes are tested once."""
+    branches = []
+    optional = False
+    for char, child in sorted(node.items()):
+        if char == "":
+            optional = True
+            continue
+        branches.append(re.escape(char) + _trie_pattern(child))
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    return "(?:" + body + ")?" if optional else body
+
+
+class KeywordLibrary:
+    """
+    All domain keywords compiled once into a single multi-pattern matcher.
+
+    With pyahocorasick installed the keywords form an Aho-Corasick automaton
+    and each post is scanned once in C. Otherwise the keyword trie is emitted
+    as one regex with a zero-width lookahead, which reports every position
+    where some keyword starts; the trie is then walked from that position so
+    overlapping keywords ("rent" / "rent vs buy") are all found.
+
+    Either way a hit only counts when it starts and ends on a word boundary,
+    so "fired" no longer matches "misfired".
+    """
+
+    def __init__(self, domains: list):
+        self.domains = domains
+        # normalized keyword -> [(domain_id, original keyword, position in domain list)]
+        self.keyword_domains = {}
+        for domain in domains:
+            for idx, keyword in enumerate(domain.get("keywords", [])):
+                normalized = _normalize(keyword)
+                if normalized:
+                    self.keyword_domains.setdefault(normalized, []).append(
+                        (domain["domain_id"], keyword, idx)
+                    )
+
+        self._automaton = None
+        self._pattern = None
+        self._trie = {}
+        if not self.keyword_domains:
+            return
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for normalized in self.keyword_domains:
+                automaton.add_word(normalized, normalized)
+            automaton.make_automaton()
+            self._automaton = automaton
+        else:
+            for normalized in self.keyword_domains:
+                node = self._trie
+                for char in normalized:
+                    node = node.setdefault(char, {})
+                node[""] = {}
+            self._pattern = re.compile(r"(?<!\w)(?=" + _trie_pattern(self._trie) + r"(?!\w))")
+
+    def _found_with_automaton(self, text: str) -> set:
+        found = set()
+        last = len(text) - 1
+        for end, keyword in self._automaton.iter(text):
+            start = end - len(keyword) + 1
+            if start > 0 and _is_word_char(text[start - 1]):
+                continue
+            if end < last and _is_word_char(text[end + 1]):
+                continue
+            found.add(keyword)
+        return found
+
+    def _found_with_pattern(self, text: str) -> set:
+        found = set()
+        length = len(text)
+        for hit in self._pattern.finditer(text):
+            start = pos = hit.start()
+            node = self._trie
+            while node is not None:
+                if "" in node and (pos == length or not _is_word_char(text[pos])):
+                    found.add(text[start:pos])
+                if pos == length:
+                    break
+                node = node.get(text[pos])
+                pos += 1
+        return found
+
+    def match(self, text: str) -> dict:
+        """Return {domain_id: [matched keywords in library order]}."""
+        if self._automaton is not None:
+            found = self._found_with_automaton(_normalize(text))
+        elif self._pattern is not None:
+            found = self._found_with_pattern(_normalize(text))
+        else:
+            return {}
+        if not found:
+            return {}
+
+        hits = {}
+        for normalized in found:
+            for domain_id, keyword, idx in self.keyword_domains[normalized]:
+                hits.setdefault(domain_id, []).append((idx, keyword))
+        return {domain_id: [kw for _, kw in sorted(pairs)] for domain_id, pairs in hits.items()}
 
 
+_lock = threading.Lock()
+_library = None
+_signals_mtime = None
+DOMAIN_SIGNALS = []
+
+
+def reload_signals() -> KeywordLibrary:
+    """Rebuild the compiled library from domain_signals.json."""
+    global _library, _signals_mtime, DOMAIN_SIGNALS
+    with _lock:
+        mtime = _SIGNALS_PATH.stat().st_mtime_ns
+        with _SIGNALS_PATH.open() as signals_file:
+            data = json.load(signals_file)
+        domains = data.get("domains", [])
+        _library = KeywordLibrary(domains)
+        _signals_mtime = mtime
+        DOMAIN_SIGNALS = domains
+        logger.info(
+            "Keyword library compiled: %d keywords across %d domains",
+            len(_library.keyword_domains),
+            len(domains),
+        )
+        return _library
+
+
+def _current_library() -> KeywordLibrary:
+    if _library is None:
+        return reload_signals()
+    return _library
+
+
+def _reload_if_changed():
+    """Pick up edits made by another process (e.g. the dashboard)."""
+    try:
+        mtime = _SIGNALS_PATH.stat().st_mtime_ns
+    except OSError as exc:
+        logger.warning("Could not stat %s: %s", _SIGNALS_PATH, exc)
+        return
+    if mtime != _signals_mtime:
+        reload_signals()
+
+
+reload_signals()
+
+
+# ---------------------------------------------------------------------------
+# Community snapshot
+# ---------------------------------------------------------------------------
+
+_communities = None
+
+
+def refresh_communities(communities=None):
+    """Snapshot community heat/domain by lowercased name (one query per run)."""
+    global _communities
+    if communities is None:
+        communities = db.get_all_communities()
+    snapshot = {}
+    for community in communities:
+        name = (community.get("name") or "").lower()
+        if name and name not in snapshot:
+            snapshot[name] = {
+                "id": community.get("id"),
+                "primary_domain": community.get("primary_domain"),
+                "heat_score": float(community.get("heat_score") or 0),
+            }
+    _communities = snapshot
+    return snapshot
+
+
+def prepare_run():
+    """Call once per pipeline run: reload changed keywords and refresh communities."""
+    _reload_if_changed()
+    try:
+        refresh_communities()
+    except Exception as exc:
+        logger.warning("Community snapshot refresh failed: %s", exc)
+
+
+def get_community(name: str):
+    """Community id/primary_domain/heat_score from the run snapshot, or None."""
+    if _communities is None:
+        refresh_communities()
+    return _communities.get((name or "").lower())
+
+
+# ---------------------------------------------------------------------------
+# Matching
+# ---------------------------------------------------------------------------
+
 def _pick_best_domain(domain_hits):
     """Choose domain with most hits; break ties via DOMAIN_PRIORITY."""
     max_hits = max(len(keywords) for keywords in domain_hits.values())
@@ -58,27 +276,16 @@ def keyword_match(item: dict) -> dict | None:
     """
     title = item.get("title") or ""
     body = item.get("body") or ""
-    combined_text = f"{title} {body}".lower()
-
-    domain_hits = {}
-    for domain in DOMAIN_SIGNALS:
-        domain_id = domain["domain_id"]
-        matched = []
-        for keyword in domain.get("keywords", []):
-            if keyword.lower() in combined_text:
-                matched.append(keyword)
-        if matched:
-            domain_hits[domain_id] = matched
-
+    domain_hits = _current_library().match(f"{title} {body}")
     if not domain_hits:
         return None
 
     best_domain = _pick_best_domain(domain_hits)
     matched_keywords = domain_hits[best_domain]
 
-    community = db.get_community_by_name(item.get("subreddit", ""))
+    community = get_community(item.get("subreddit", ""))
     primary_domain = community.get("primary_domain") if community else None
-    heat_score = float(community.get("heat_score") or 0) if community else 0.0
+    heat_score = community.get("heat_score", 0.0) if community else 0.0
 
     mapped_primary = PRIMARY_DOMAIN_TO_SIGNAL_DOMAIN.get(primary_domain)
     domain_match_boost = 0.5 if mapped_primary == best_domain else 0.0
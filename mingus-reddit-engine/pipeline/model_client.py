@@ -0,0 +1,151 @@
+"""Shared, rate-limited model client for the scoring and reply stages."""
+
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, bursts up to `capacity`.
+
+    acquire() blocks until a token is available, so concurrent stage workers
+    share one request budget for the model API.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take `tokens`, sleeping as needed; returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    if waited:
+                        self.waits += 1
+                        self.wait_seconds += waited
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class AnthropicModelClient:
+    """Thin wrapper over one anthropic.Anthropic client shared by all workers."""
+
+    def __init__(self, api_key: str, limiter: TokenBucket | None = None):
+        import anthropic
+
+        self._client = anthropic.Anthropic(api_key=api_key)
+        self.limiter = limiter
+
+    def complete(self, model: str, system: str, user_message: str, max_tokens: int) -> str:
+        if self.limiter is not None:
+            self.limiter.acquire()
+        message = self._client.messages.create(
+            model=model,
+            max_tokens=max_tokens,
+            system=system,
+            messages=[{"role": "user", "content": user_message}],
+        )
+        return message.content[0].text
+
+
+class StubModelClient:
+    """
+    Offline stand-in (MODEL_CLIENT=stub): deterministic canned responses.
+
+    Scoring prompts get a JSON score derived from the post length; reply
+    prompts get a fixed reply. `latency` simulates API round trips.
+    """
+
+    def __init__(self, latency: float = 0.0, limiter: TokenBucket | None = None):
+        self.latency = latency
+        self.limiter = limiter
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def complete(self, model: str, system: str, user_message: str, max_tokens: int) -> str:
+        if self.limiter is not None:
+            self.limiter.acquire()
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if "pain_score" in system:
+            score = 6 + len(user_message) % 5
+            return json.dumps({
+                "pain_score": score,
+                "readiness_score": score,
+                "primary_domain": None,
+                "secondary_domain": None,
+                "city_signal": None,
+                "lead_magnet_match": None,
+                "summary": "Stub summary.",
+                "suggested_reply_angle": "Stub reply angle.",
+            })
+        return "That sounds stressful. What has helped you most so far?"
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def _limiter_from_env() -> TokenBucket:
+    per_minute = float(os.getenv("MODEL_REQUESTS_PER_MINUTE", "50"))
+    burst = float(os.getenv("MODEL_REQUEST_BURST", "5"))
+    return TokenBucket(rate=per_minute / 60.0, capacity=burst)
+
+
+def get_client():
+    """
+    Process-wide model client, or None when no API key is configured.
+
+    MODEL_CLIENT=stub selects StubModelClient for offline runs.
+    """
+    global _client
+    if _client is not None:
+        return _client
+    with _client_lock:
+        if _client is not None:
+            return _client
+        if os.getenv("MODEL_CLIENT", "").strip().lower() == "stub":
+            _client = StubModelClient(
+                latency=float(os.getenv("STUB_MODEL_LATENCY", "0")),
+                limiter=_limiter_from_env(),
+            )
+            return _client
+        api_key = os.getenv("ANTHROPIC_API_KEY", "").strip()
+        if not api_key:
+            return None
+        _client = AnthropicModelClient(api_key, limiter=_limiter_from_env())
+        return _client
+
+
+def set_client(client) -> None:
+    """Install a specific client (tests, offline tooling); None resets to env config."""
+    global _client
+    with _client_lock:
+        _client = client
+
+
+def limiter_stats() -> dict:
+    limiter = getattr(_client, "limiter", None)
+    if limiter is None:
+        return {"waits": 0, "wait_seconds": 0.0}
+    return {"waits": limiter.waits, "wait_seconds": round(limiter.wait_seconds, 2)}
@@ -3,8 +3,7 @@
 import logging
 import os
 
-import anthropic
-
+from pipeline import model_client
 from storage import db
 
 logger = logging.getLogger(__name__)
@@ -84,8 +83,8 @@ Return only the reply text. No preamble. No explanation."""
 
 def draft_reply(lead: dict) -> str | None:
     """Generate a community reply draft for a scored lead."""
-    api_key = os.getenv("ANTHROPIC_API_KEY", "").strip()
-    if not api_key:
+    client = model_client.get_client()
+    if client is None:
         logger.error("ANTHROPIC_API_KEY not set — skipping reply draft")
         return None
 
@@ -109,14 +108,7 @@ def draft_reply(lead: dict) -> str | None:
     model = os.getenv("SCORER_MODEL", "claude-haiku-3")
 
     try:
-        client = anthropic.Anthropic(api_key=api_key)
-        message = client.messages.create(
-            model=model,
-            max_tokens=300,
-            system=system_prompt,
-            messages=[{"role": "user", "content": user_message}],
-        )
-        return message.content[0].text.strip()
+        return client.complete(model, system_prompt, user_message, max_tokens=300).strip()
     except Exception:
         logger.exception("Anthropic API error during reply drafting")
         return None
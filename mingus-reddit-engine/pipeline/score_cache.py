@@ -0,0 +1,111 @@
+"""Persistent semantic score cache keyed by post content and scorer prompt version."""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+
+from storage import db
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(title: str, body: str) -> str:
+    """Hash of the post text, ignoring case and whitespace differences."""
+    text = " ".join(f"{title or ''}\n{body or ''}".lower().split())
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def prompt_version(*parts: str) -> str:
+    """Short fingerprint of everything that shapes the model's answer."""
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+class ScoreCache:
+    """
+    Read-through cache over the score_cache table.
+
+    Entries older than SCORE_CACHE_TTL_HOURS are ignored (0 disables the
+    cache). Entries are keyed by prompt version too, so editing the scorer
+    prompt or model makes old scores unreachable; purge() deletes them.
+    A read_only cache (dry runs) still serves hits but never writes or purges.
+    Database errors are logged and treated as misses so scoring never
+    depends on the cache being available.
+    """
+
+    def __init__(self, ttl_hours: float | None = None, purge_interval: float = 3600.0):
+        if ttl_hours is None:
+            ttl_hours = float(os.getenv("SCORE_CACHE_TTL_HOURS", "168"))
+        self.ttl_hours = ttl_hours
+        self.read_only = False
+        self.purge_interval = purge_interval
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        self.reset_stats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_hours > 0
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.stores = 0
+            self.errors = 0
+
+    def _count(self, field: str):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def get(self, key: str, version: str) -> dict | None:
+        if not self.enabled:
+            return None
+        try:
+            result = db.get_cached_score(key, version, self.ttl_hours)
+        except Exception as exc:
+            logger.warning("Score cache lookup failed: %s", exc)
+            self._count("errors")
+            return None
+        self._count("hits" if result is not None else "misses")
+        return result
+
+    def put(self, key: str, version: str, result: dict):
+        if not self.enabled or self.read_only:
+            return
+        try:
+            db.put_cached_score(key, version, result)
+        except Exception as exc:
+            logger.warning("Score cache write failed: %s", exc)
+            self._count("errors")
+            return
+        self._count("stores")
+
+    def purge(self, version: str, force: bool = False) -> int:
+        """Delete expired and stale-prompt entries, at most once per purge_interval."""
+        if not self.enabled or self.read_only:
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            if not force and self._last_purge and now - self._last_purge < self.purge_interval:
+                return 0
+            self._last_purge = now
+        try:
+            deleted = db.purge_score_cache(version, self.ttl_hours)
+        except Exception as exc:
+            logger.warning("Score cache purge failed: %s", exc)
+            return 0
+        if deleted:
+            logger.info("Score cache purge removed %d entries", deleted)
+        return deleted
+
+    def summary(self) -> str:
+        if not self.enabled:
+            return "cache off"
+        lookups = self.hits + self.misses
+        rate = (self.hits / lookups * 100) if lookups else 0.0
+        text = f"cache hits={self.hits} misses={self.misses} ({rate:.0f}%)"
+        if self.errors:
+            text += f" errors={self.errors}"
+        return text
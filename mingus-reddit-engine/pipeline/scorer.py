@@ -4,9 +4,7 @@ import json
 import logging
 import os
 
-import anthropic
-
-from storage import db
+from pipeline import matcher, model_client, score_cache
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +43,30 @@ Return ONLY valid JSON — no preamble, no explanation:
   "suggested_reply_angle": "one sentence"
 }}"""
 
+USER_MESSAGE_TEMPLATE = "{title}\n\n{body}"
+
+_cache = score_cache.ScoreCache()
+
+
+def _model() -> str:
+    return os.getenv("SCORER_MODEL", "claude-haiku-3")
+
+
+def _prompt_version() -> str:
+    """Changes whenever the prompt templates or scoring model change."""
+    return score_cache.prompt_version(_model(), SYSTEM_PROMPT_TEMPLATE, USER_MESSAGE_TEMPLATE)
+
+
+def prepare_run(dry_run: bool = False):
+    """Reset cache counters for a pipeline run and purge stale entries; dry runs only read the cache."""
+    _cache.reset_stats()
+    _cache.read_only = dry_run
+    _cache.purge(_prompt_version())
+
+
+def cache_summary() -> str:
+    return _cache.summary()
+
 
 def _parse_model_json(raw_text: str) -> dict | None:
     cleaned = raw_text.strip()
@@ -56,12 +78,39 @@ def _parse_model_json(raw_text: str) -> dict | None:
         return None
 
 
+def _score_with_model(system_prompt: str, user_message: str) -> dict | None:
+    client = model_client.get_client()
+    if client is None:
+        logger.error("ANTHROPIC_API_KEY not set — skipping semantic score")
+        return None
+
+    try:
+        raw = client.complete(_model(), system_prompt, user_message, max_tokens=500)
+        result = _parse_model_json(raw)
+        if not result:
+            return None
+    except Exception:
+        logger.exception("Anthropic API error during semantic scoring")
+        return None
+
+    try:
+        int(result["pain_score"])
+        int(result["readiness_score"])
+    except (KeyError, TypeError, ValueError):
+        logger.error("Scorer response missing valid pain/readiness scores")
+        return None
+    return result
+
+
 def semantic_score(match: dict) -> dict | None:
     """
     Score a keyword match via Anthropic and return a scored lead dict.
+
+    Model results are reused from the score cache when the same post text
+    was scored under the current prompt version (crossposts, re-scans).
     """
     item = match["item"]
-    community = db.get_community_by_name(item.get("subreddit", ""))
+    community = matcher.get_community(item.get("subreddit", ""))
 
     community_name = item.get("subreddit", "unknown")
     primary_domain = community.get("primary_domain") if community else "unknown"
@@ -72,39 +121,24 @@ def semantic_score(match: dict) -> dict | None:
         primary_domain=primary_domain,
         heat_score=heat_score,
     )
-    user_message = f"{item.get('title', '')}\n\n{item.get('body', '')}"
-
-    api_key = os.getenv("ANTHROPIC_API_KEY", "").strip()
-    if not api_key:
-        logger.error("ANTHROPIC_API_KEY not set — skipping semantic score")
-        return None
+    user_message = USER_MESSAGE_TEMPLATE.format(
+        title=item.get("title", ""), body=item.get("body", "")
+    )
 
-    model = os.getenv("SCORER_MODEL", "claude-haiku-3")
     composite_threshold = float(os.getenv("COMPOSITE_THRESHOLD", "6.5"))
     hot_lead_threshold = float(os.getenv("HOT_LEAD_THRESHOLD", "9.0"))
 
-    try:
-        client = anthropic.Anthropic(api_key=api_key)
-        message = client.messages.create(
-            model=model,
-            max_tokens=500,
-            system=system_prompt,
-            messages=[{"role": "user", "content": user_message}],
-        )
-        raw = message.content[0].text
-        result = _parse_model_json(raw)
-        if not result:
+    key = score_cache.content_hash(item.get("title", ""), item.get("body", ""))
+    version = _prompt_version()
+    result = _cache.get(key, version)
+    if result is None:
+        result = _score_with_model(system_prompt, user_message)
+        if result is None:
             return None
-    except Exception:
-        logger.exception("Anthropic API error during semantic scoring")
-        return None
+        _cache.put(key, version, result)
 
-    try:
-        pain_score = int(result["pain_score"])
-        readiness_score = int(result["readiness_score"])
-    except (KeyError, TypeError, ValueError):
-        logger.error("Scorer response missing valid pain/readiness scores")
-        return None
+    pain_score = int(result["pain_score"])
+    readiness_score = int(result["readiness_score"])
 
     base = (pain_score * 0.6) + (readiness_score * 0.4)
     composite = base + match["domain_match_boost"] + match["heat_boost"]
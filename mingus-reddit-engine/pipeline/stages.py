@@ -0,0 +1,78 @@
+"""Bounded-parallel pipeline stages with per-stage timing and queue-depth stats."""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class Stage:
+    """
+    One pipeline step with its own worker limit.
+
+    submit() hands work to a pool of `concurrency` threads and blocks once
+    `max_pending` items are waiting, so a slow stage applies backpressure to
+    the one feeding it. run() executes inline for cheap steps (matching,
+    batched inserts) while keeping the same stats.
+    """
+
+    def __init__(self, name: str, fn, concurrency: int = 1, max_pending: int | None = None):
+        self.name = name
+        self.fn = fn
+        self.concurrency = max(1, concurrency)
+        self._pool = None
+        self._slots = threading.BoundedSemaphore(max_pending or self.concurrency * 4)
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.max_depth = 0
+
+    def _call(self, *args):
+        started = time.perf_counter()
+        try:
+            return self.fn(*args)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            logger.exception("Pipeline stage %s failed", self.name)
+            return None
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.completed += 1
+                self.busy_seconds += elapsed
+
+    def run(self, *args):
+        with self._lock:
+            self.submitted += 1
+        return self._call(*args)
+
+    def submit(self, *args):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.concurrency, thread_name_prefix=f"pipeline-{self.name}"
+            )
+        self._slots.acquire()
+        with self._lock:
+            self.submitted += 1
+            self.max_depth = max(self.max_depth, self.submitted - self.completed)
+        future = self._pool.submit(self._call, *args)
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+
+    def summary(self) -> str:
+        avg_ms = (self.busy_seconds / self.completed * 1000) if self.completed else 0.0
+        text = f"{self.name} n={self.completed} avg={avg_ms:.0f}ms"
+        if self._pool is not None:
+            text += f" max_q={self.max_depth}/{self.concurrency}w"
+        if self.failed:
+            text += f" failed={self.failed}"
+        return text
@@ -24,6 +24,14 @@ def _load_signals() -> dict:
 
 def _save_signals(data: dict) -> None:
     _SIGNALS_PATH.write_text(json.dumps(data, indent=2))
+    # Recompile the matcher in this process; other processes (scheduler) pick
+    # the change up from the file mtime at the start of their next run.
+    try:
+        from pipeline import matcher
+
+        matcher.reload_signals()
+    except Exception as exc:
+        logger.warning("Keyword matcher reload failed: %s", exc)
 
 
 def _load_pending() -> dict:
@@ -3,6 +3,7 @@
 import argparse
 import logging
 import os
+import queue
 import sys
 import traceback
 import zoneinfo
@@ -96,40 +97,101 @@ def _imports():
 # Core pipeline step — matcher → scorer → store
 # ---------------------------------------------------------------------------
 
-def _process_items(items, db, matcher, scorer, reply_crafter, notifier, dry_run=False):
-    leads_scored = 0
-    leads_stored = 0
-    hot_leads = 0
-
-    for item in items:
-        match = matcher.keyword_match(item)
-        if match is None:
-            continue
-
-        lead = scorer.semantic_score(match)
-        if lead is None:
-            continue
-
-        leads_scored += 1
-
-        if dry_run:
-            print(
-                f"  [DRY RUN] would store: "
-                f"r/{item.get('subreddit')} | "
-                f"score={lead.get('composite_score')} | "
-                f"domain={lead.get('domain_id')}"
-            )
-            continue
+def _stage_concurrency(name, default):
+    return max(1, int(os.getenv(f"PIPELINE_{name}_CONCURRENCY", str(default))))
 
-        db.insert_lead(lead)
-        leads_stored += 1
-        reply_crafter.process_lead(lead)
 
+def _process_items(items, db, matcher, scorer, reply_crafter, notifier, dry_run=False):
+    """
+    Run items through match → score → store → reply → notify.
+
+    Matching runs inline; scoring, reply drafting and notifications each run on
+    their own bounded worker pool (PIPELINE_<STAGE>_CONCURRENCY), and scored
+    leads are inserted in batches of LEAD_INSERT_BATCH. Model calls from every
+    worker share one token-bucket limiter (see pipeline.model_client).
+
+    Returns (leads_scored, leads_stored, hot_leads, stage_report).
+    """
+    from pipeline import model_client
+    from pipeline.stages import Stage
+
+    # Reload edited keywords and snapshot community heat once per run
+    matcher.prepare_run()
+    scorer.prepare_run(dry_run=dry_run)
+
+    batch_size = max(1, int(os.getenv("LEAD_INSERT_BATCH", "25")))
+    match_stage = Stage("match", matcher.keyword_match)
+    score_stage = Stage("score", scorer.semantic_score, _stage_concurrency("SCORE", 4))
+    store_stage = Stage("store", db.insert_leads)
+    reply_stage = Stage("reply", reply_crafter.process_lead, _stage_concurrency("REPLY", 4))
+    notify_stage = Stage("notify", notifier.send_hot_lead_sms, _stage_concurrency("NOTIFY", 2))
+
+    scored = queue.Queue()
+    pending = []
+    counts = {"scored": 0, "stored": 0, "hot": 0}
+
+    def _after_reply(lead):
         if lead.get("is_hot_lead"):
-            hot_leads += 1
-            notifier.send_hot_lead_sms(lead)
+            notify_stage.submit(lead)
+
+    def _flush(final=False):
+        while True:
+            try:
+                item, lead = scored.get_nowait()
+            except queue.Empty:
+                break
+            if lead is None:
+                continue
+            counts["scored"] += 1
+            if dry_run:
+                print(
+                    f"  [DRY RUN] would store: "
+                    f"r/{item.get('subreddit')} | "
+                    f"score={lead.get('composite_score')} | "
+                    f"domain={lead.get('domain_id')}"
+                )
+                continue
+            pending.append(lead)
+
+        while len(pending) >= batch_size or (final and pending):
+            batch = pending[:batch_size]
+            del pending[:batch_size]
+            rows = store_stage.run(batch) or []
+            ids = {row["post_id"]: row["id"] for row in rows}
+            for lead in batch:
+                if lead.get("post_id") not in ids:
+                    continue  # already stored by an earlier run
+                lead = {**lead, "id": ids[lead["post_id"]]}
+                counts["stored"] += 1
+                if lead.get("is_hot_lead"):
+                    counts["hot"] += 1
+                reply_stage.submit(lead).add_done_callback(lambda _, lead=lead: _after_reply(lead))
+
+    futures = []
+    try:
+        for item in items:
+            match = match_stage.run(item)
+            if match is None:
+                continue
+            future = score_stage.submit(match)
+            future.add_done_callback(lambda f, item=item: scored.put((item, f.result())))
+            futures.append(future)
+            _flush()
+
+        for future in futures:
+            future.result()
+            _flush()
+        _flush(final=True)
+    finally:
+        score_stage.shutdown()
+        reply_stage.shutdown()
+        notify_stage.shutdown()
 
-    return leads_scored, leads_stored, hot_leads
+    limiter = model_client.limiter_stats()
+    stage_report = " | ".join(
+        stage.summary() for stage in (match_stage, score_stage, store_stage, reply_stage, notify_stage)
+    ) + f" | {scorer.cache_summary()} | model waits={limiter['waits']} ({limiter['wait_seconds']}s)"
+    return counts["scored"], counts["stored"], counts["hot"], stage_report
 
 
 # ---------------------------------------------------------------------------
@@ -141,10 +203,11 @@ def run_pipeline(dry_run=False):
     try:
         db, heat_map, reddit_listener, matcher, scorer, reply_crafter, notifier, _, _ = _imports()
 
-        # 1. Heat check
-        heat_map.run_heat_check()
-        communities = db.get_communities()
-        logger.info("Heat check complete: %d communities refreshed", len(communities))
+        # 1. Heat check (incremental: only communities older than HEAT_CHECK_MAX_AGE_HOURS)
+        refreshed = heat_map.run_heat_check(
+            max_age_hours=float(os.getenv("HEAT_CHECK_MAX_AGE_HOURS", "0")) or None
+        )
+        logger.info("Heat check complete: %d communities refreshed", len(refreshed))
 
         # 2. Listener
         result = reddit_listener.run_listener()
@@ -155,16 +218,17 @@ def run_pipeline(dry_run=False):
         )
 
         # 3. Match / score / store
-        leads_scored, leads_stored, hot_leads = _process_items(
+        leads_scored, leads_stored, hot_leads, stage_report = _process_items(
             result["items"], db, matcher, scorer, reply_crafter, notifier, dry_run=dry_run
         )
 
         # 4. Summary
         logger.info(
-            "PIPELINE COMPLETE | leads scored: %d | leads stored: %d | hot leads: %d",
+            "PIPELINE COMPLETE | leads scored: %d | leads stored: %d | hot leads: %d | %s",
             leads_scored,
             leads_stored,
             hot_leads,
+            stage_report,
         )
 
     except Exception:
@@ -203,12 +267,12 @@ def run_peak_scan():
             result["communities_scanned"],
         )
 
-        leads_scored, leads_stored, hot_leads = _process_items(
+        leads_scored, leads_stored, hot_leads, stage_report = _process_items(
             result["items"], db, matcher, scorer, reply_crafter, notifier
         )
         logger.info(
-            "Peak scan pipeline | scored: %d | stored: %d | hot: %d",
-            leads_scored, leads_stored, hot_leads,
+            "Peak scan pipeline | scored: %d | stored: %d | hot: %d | %s",
+            leads_scored, leads_stored, hot_leads, stage_report,
         )
 
     except Exception:
@@ -380,6 +444,12 @@ def _parse_args():
         action="store_true",
         help="Run a heat check now and exit",
     )
+    parser.add_argument(
+        "--max-age-hours",
+        type=float,
+        metavar="HOURS",
+        help="With --heat-check, only refresh communities last checked over HOURS ago",
+    )
     parser.add_argument(
         "--report",
         action="store_true",
@@ -421,9 +491,12 @@ def main():
     if args.heat_check:
         from intelligence import heat_map
         from storage import db
-        heat_map.run_heat_check()
+        refreshed = heat_map.run_heat_check(max_age_hours=args.max_age_hours)
         communities = db.get_communities()
-        print(f"Heat check complete: {len(communities)} communities active")
+        print(
+            f"Heat check complete: {len(refreshed)} refreshed, "
+            f"{len(communities)} communities active"
+        )
         return
 
     if args.generate_brief:
@@ -450,7 +523,7 @@ def main():
 
         items = fetch_community_content(community_row)
         print(f"Fetched {len(items)} items from r/{name}")
-        leads_scored, _, _ = _process_items(
+        leads_scored, _, _, _ = _process_items(
             items, db, matcher, scorer,
             reply_crafter=type("_NR", (), {"process_lead": staticmethod(lambda l: None)})(),
             notifier=type("_NR", (), {"send_hot_lead_sms": staticmethod(lambda l: None)})(),
@@ -4,7 +4,7 @@ import os
 from pathlib import Path
 
 from psycopg2 import pool
-from psycopg2.extras import Json, RealDictCursor
+from psycopg2.extras import Json, RealDictCursor, execute_values
 
 PGHOST = os.environ.get("PGHOST", "")
 PGPORT = os.environ.get("PGPORT", "5432")
@@ -203,6 +203,88 @@ def update_community_heat(community_id, stats_dict):
         release_connection(conn)
 
 
+def get_communities_due_for_heat_check(max_age_hours):
+    """Active communities never heat-checked or last checked over max_age_hours ago."""
+    conn = get_connection()
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(
+                """
+                SELECT * FROM communities
+                WHERE active = TRUE
+                  AND (
+                    last_heat_check IS NULL
+                    OR last_heat_check < NOW() - (%s || ' hours')::INTERVAL
+                  )
+                ORDER BY last_heat_check NULLS FIRST
+                """,
+                (max_age_hours,),
+            )
+            return cur.fetchall()
+    finally:
+        release_connection(conn)
+
+
+_HEAT_COLUMNS = (
+    "members",
+    "posts_per_day",
+    "growth_rate_3mo",
+    "peak_day",
+    "peak_hour_et",
+    "heat_score",
+    "priority_tier",
+)
+
+
+def update_community_heat_many(updates):
+    """
+    Apply many update_community_heat calls in one UPDATE ... FROM (VALUES ...).
+
+    `updates` is a list of (community_id, stats_dict); None stats keep the
+    stored value, as in update_community_heat.
+    """
+    if not updates:
+        return []
+    rows = [
+        (community_id, *(stats.get(col) for col in _HEAT_COLUMNS))
+        for community_id, stats in updates
+    ]
+    conn = get_connection()
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            updated = execute_values(
+                cur,
+                """
+                UPDATE communities AS c SET
+                    members = COALESCE(v.members, c.members),
+                    posts_per_day = COALESCE(v.posts_per_day, c.posts_per_day),
+                    growth_rate_3mo = COALESCE(v.growth_rate_3mo, c.growth_rate_3mo),
+                    peak_day = COALESCE(v.peak_day, c.peak_day),
+                    peak_hour_et = COALESCE(v.peak_hour_et, c.peak_hour_et),
+                    heat_score = COALESCE(v.heat_score, c.heat_score),
+                    priority_tier = COALESCE(v.priority_tier, c.priority_tier),
+                    last_heat_check = NOW()
+                FROM (VALUES %s) AS v(
+                    id, members, posts_per_day, growth_rate_3mo,
+                    peak_day, peak_hour_et, heat_score, priority_tier
+                )
+                WHERE c.id = v.id
+                RETURNING c.*
+                """,
+                rows,
+                template=(
+                    "(%s::uuid, %s::integer, %s::float, %s::float,"
+                    " %s::text, %s::integer, %s::float, %s::text)"
+                ),
+                page_size=len(rows),
+                fetch=True,
+            )
+        conn.commit()
+        return updated
+    finally:
+        release_connection(conn)
+
+
 def get_lead_by_post_id(post_id):
     conn = get_connection()
     try:
@@ -267,6 +349,115 @@ def insert_lead(d):
         release_connection(conn)
 
 
+_LEAD_COLUMNS = (
+    "platform", "post_id", "community_id", "author", "title", "body", "url",
+    "created_at", "domain_id", "matched_keywords", "pain_score",
+    "readiness_score", "composite_score", "ai_summary",
+    "suggested_reply_angle", "drafted_reply",
+)
+
+
+def insert_leads(leads):
+    """
+    Insert many leads in one multi-row INSERT.
+
+    Returns the rows actually inserted; posts already stored are skipped.
+    """
+    if not leads:
+        return []
+    rows = [
+        tuple(
+            Json(d.get(col)) if col == "matched_keywords" else d.get(col)
+            for col in _LEAD_COLUMNS
+        )
+        for d in leads
+    ]
+    conn = get_connection()
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            inserted = execute_values(
+                cur,
+                f"""
+                INSERT INTO leads ({", ".join(_LEAD_COLUMNS)})
+                VALUES %s
+                ON CONFLICT (post_id) DO NOTHING
+                RETURNING *
+                """,
+                rows,
+                page_size=len(rows),
+                fetch=True,
+            )
+        conn.commit()
+        return inserted
+    finally:
+        release_connection(conn)
+
+
+def get_cached_score(content_hash, prompt_version, ttl_hours):
+    """Cached scorer result for this content/prompt if younger than ttl_hours."""
+    conn = get_connection()
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(
+                """
+                UPDATE score_cache SET
+                    hits = hits + 1,
+                    last_hit_at = NOW()
+                WHERE content_hash = %s
+                  AND prompt_version = %s
+                  AND created_at >= NOW() - (%s || ' hours')::INTERVAL
+                RETURNING result
+                """,
+                (content_hash, prompt_version, ttl_hours),
+            )
+            row = cur.fetchone()
+        conn.commit()
+        return row["result"] if row else None
+    finally:
+        release_connection(conn)
+
+
+def put_cached_score(content_hash, prompt_version, result):
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO score_cache (content_hash, prompt_version, result)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (content_hash, prompt_version) DO UPDATE SET
+                    result = EXCLUDED.result,
+                    hits = 0,
+                    created_at = NOW(),
+                    last_hit_at = NULL
+                """,
+                (content_hash, prompt_version, Json(result)),
+            )
+        conn.commit()
+    finally:
+        release_connection(conn)
+
+
+def purge_score_cache(prompt_version, ttl_hours):
+    """Drop expired entries and entries written under an older scorer prompt."""
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                DELETE FROM score_cache
+                WHERE prompt_version <> %s
+                   OR created_at < NOW() - (%s || ' hours')::INTERVAL
+                """,
+                (prompt_version, ttl_hours),
+            )
+            deleted = cur.rowcount
+        conn.commit()
+        return deleted
+    finally:
+        release_connection(conn)
+
+
 def get_unnotified_leads(min_score=6.5):
     conn = get_connection()
     try:
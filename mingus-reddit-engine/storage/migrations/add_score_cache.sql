@@ -0,0 +1,13 @@
+-- Cache semantic scores by normalized post content and scorer prompt version
+-- Run: psql $DATABASE_URL -f storage/migrations/add_score_cache.sql
+
+CREATE TABLE IF NOT EXISTS score_cache (
+    content_hash TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    result JSONB NOT NULL,
+    hits INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT NOW(),
+    last_hit_at TIMESTAMP,
+    PRIMARY KEY (content_hash, prompt_version)
+);
+CREATE INDEX IF NOT EXISTS idx_score_cache_created ON score_cache(created_at);
@@ -98,6 +98,16 @@ CREATE TABLE IF NOT EXISTS signal_library_updates (
     date TIMESTAMP DEFAULT NOW()
 );
 
+CREATE TABLE IF NOT EXISTS score_cache (
+    content_hash TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    result JSONB NOT NULL,
+    hits INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT NOW(),
+    last_hit_at TIMESTAMP,
+    PRIMARY KEY (content_hash, prompt_version)
+);
+
 CREATE INDEX IF NOT EXISTS idx_leads_ig_handle ON leads(ig_handle);
 CREATE INDEX IF NOT EXISTS idx_leads_post_id ON leads(post_id);
 CREATE INDEX IF NOT EXISTS idx_leads_composite ON leads(composite_score DESC);
@@ -107,6 +117,7 @@ CREATE INDEX IF NOT EXISTS idx_leads_pipeline_stage ON leads(pipeline_stage);
 CREATE INDEX IF NOT EXISTS idx_leads_updated_at ON leads(updated_at DESC);
 CREATE INDEX IF NOT EXISTS idx_communities_heat ON communities(heat_score DESC);
 CREATE INDEX IF NOT EXISTS idx_communities_tier ON communities(priority_tier);
+CREATE INDEX IF NOT EXISTS idx_score_cache_created ON score_cache(created_at);
 
 -- IG import columns (idempotent on existing databases)
 ALTER TABLE leads ADD COLUMN IF NOT EXISTS source TEXT DEFAULT 'reddit';
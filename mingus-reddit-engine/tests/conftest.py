@@ -0,0 +1,101 @@
+"""
+Shared fixtures. storage.db opens a psycopg2 pool at import time, so the pool
+class is swapped for an in-memory fake before anything imports it. Tests get a
+`pg` recorder that captures statements and can script the rows they return.
+"""
+
+import sys
+from pathlib import Path
+
+import psycopg2.pool
+import pytest
+from psycopg2.extensions import adapt
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class FakeCursor:
+    def __init__(self, connection, recorder):
+        self.connection = connection
+        self.recorder = recorder
+        self.rowcount = 0
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def mogrify(self, template, args):
+        template = template.decode() if isinstance(template, bytes) else template
+        return (template % tuple(adapt(arg).getquoted().decode() for arg in args)).encode()
+
+    def execute(self, sql, params=None):
+        sql = sql.decode() if isinstance(sql, bytes) else sql
+        self.recorder.statements.append((sql, params))
+        self._rows = list(self.recorder.respond(sql, params))
+        self.rowcount = len(self._rows)
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeConnection:
+    encoding = "UTF8"
+
+    def __init__(self, recorder):
+        self.recorder = recorder
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self, self.recorder)
+
+    def commit(self):
+        self.recorder.commits += 1
+
+    def rollback(self):
+        pass
+
+
+class Recorder:
+    """Statements run through the fake pool, and an optional row responder"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.statements = []
+        self.commits = 0
+        self.checkouts = 0
+        self.responder = None
+
+    def respond(self, sql, params):
+        return self.responder(sql, params) if self.responder else []
+
+
+RECORDER = Recorder()
+
+
+class FakeThreadedConnectionPool:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def getconn(self):
+        RECORDER.checkouts += 1
+        return FakeConnection(RECORDER)
+
+    def putconn(self, conn):
+        pass
+
+
+psycopg2.pool.ThreadedConnectionPool = FakeThreadedConnectionPool
+
+
+@pytest.fixture
+def pg():
+    RECORDER.reset()
+    yield RECORDER
+    RECORDER.reset()
@@ -0,0 +1,115 @@
+"""
+Batched heat-check writes: the UPDATE ... FROM (VALUES ...) statement built by
+update_community_heat_many, and run_heat_check feeding it.
+"""
+
+import re
+
+import pytest
+
+from intelligence import heat_map
+from storage import db
+
+C1 = "0b6f7f5e-1d2c-4c39-9a51-9c8e3f0f6a01"
+C2 = "5d1c2b7a-8e44-4b8e-b3b2-0e7f1a2c3d02"
+C3 = "9a8b7c6d-5e4f-4a3b-8c2d-1e0f9a8b7c03"
+
+
+def _values_rows(sql):
+    """Rendered VALUES tuples of the batched UPDATE, one string per row"""
+    values = sql.split("FROM (VALUES ", 1)[1].split(") AS v(", 1)[0]
+    return re.findall(r"\(('[^']*'::uuid.*?::text)\)", values)
+
+
+def _update_statements(pg):
+    return [sql for sql, _ in pg.statements if "UPDATE communities AS c" in sql]
+
+
+def test_empty_input_skips_the_database(pg):
+    assert db.update_community_heat_many([]) == []
+    assert pg.statements == [] and pg.checkouts == 0
+
+
+def test_rows_are_cast_per_column_in_one_statement(pg):
+    pg.responder = lambda sql, params: [{"id": C1}, {"id": C2}] if "UPDATE" in sql else []
+
+    updated = db.update_community_heat_many([
+        (C1, {"members": 120000, "posts_per_day": 42.5, "growth_rate_3mo": 3.0,
+              "peak_day": "Monday", "peak_hour_et": 20, "heat_score": 8.25, "priority_tier": "high"}),
+        (C2, {"members": 900, "posts_per_day": 1.0, "growth_rate_3mo": 0.0,
+              "heat_score": 2.0, "priority_tier": "low"}),
+    ])
+
+    assert updated == [{"id": C1}, {"id": C2}]
+    [sql] = _update_statements(pg)
+    assert _values_rows(sql) == [
+        f"'{C1}'::uuid, 120000::integer, 42.5::float, 3.0::float,"
+        " 'Monday'::text, 20::integer, 8.25::float, 'high'::text",
+        f"'{C2}'::uuid, 900::integer, 1.0::float, 0.0::float,"
+        " NULL::text, NULL::integer, 2.0::float, 'low'::text",
+    ]
+    assert "WHERE c.id = v.id" in sql
+    assert pg.commits == 1
+
+
+def test_null_values_keep_the_stored_columns(pg):
+    db.update_community_heat_many([(C3, {"heat_score": None, "priority_tier": None})])
+
+    [sql] = _update_statements(pg)
+    assert _values_rows(sql) == [
+        f"'{C3}'::uuid, NULL::integer, NULL::float, NULL::float,"
+        " NULL::text, NULL::integer, NULL::float, NULL::text",
+    ]
+    for column in db._HEAT_COLUMNS:
+        assert f"{column} = COALESCE(v.{column}, c.{column})" in sql
+    assert "last_heat_check = NOW()" in sql
+
+
+@pytest.fixture
+def communities(pg, monkeypatch):
+    rows = [
+        {"id": C1, "name": "personalfinance", "primary_domain": "budgeting"},
+        {"id": C2, "name": "renters", "primary_domain": "housing"},
+        {"id": C3, "name": "brokenapi", "primary_domain": "mood"},
+    ]
+    pg.responder = lambda sql, params: (
+        rows if "FROM communities" in sql and "UPDATE" not in sql else [{"id": C1}, {"id": C2}]
+    )
+
+    def fake_stats(name):
+        if name == "brokenapi":
+            raise RuntimeError("429 Too Many Requests")
+        return {"members": 500_000, "posts_per_day": 50.0, "growth_rate_3mo": 20.0}
+
+    monkeypatch.setattr(heat_map, "fetch_subreddit_stats", fake_stats)
+    return rows
+
+
+def test_run_heat_check_writes_every_community_in_one_update(communities, pg):
+    refreshed = heat_map.run_heat_check()
+
+    assert refreshed == [{"id": C1}, {"id": C2}]
+    [sql] = _update_statements(pg)
+    rows = _values_rows(sql)
+    assert len(rows) == 2  # the failed fetch is left out, not written as zeros
+    assert rows[0].startswith(f"'{C1}'::uuid, 500000::integer, 50.0::float, 20.0::float,")
+    assert rows[0].endswith(" NULL::text, NULL::integer, 10.0::float, 'high'::text")
+    assert rows[1].startswith(f"'{C2}'::uuid")
+
+
+def test_run_heat_check_with_nothing_due_does_not_write(pg):
+    pg.responder = lambda sql, params: []
+
+    assert heat_map.run_heat_check(max_age_hours=6) == []
+    [(sql, params)] = pg.statements
+    assert "last_heat_check IS NULL" in sql and params == (6,)
+
+
+def test_run_heat_check_survives_a_failed_write(communities, pg):
+    def broken(sql, params):
+        if "UPDATE communities AS c" in sql:
+            raise RuntimeError("deadlock detected")
+        return communities
+
+    pg.responder = broken
+    assert heat_map.run_heat_check() == []
@@ -0,0 +1,137 @@
+"""
+Compiled keyword matcher vs the original per-keyword substring scan, on both
+the Aho-Corasick automaton and the regex-trie fallback.
+"""
+
+import importlib
+import random
+import re
+import sys
+
+import pytest
+
+from pipeline import matcher
+from pipeline.matcher import KeywordLibrary
+
+FILLER = (
+    "so i have been thinking about this for a while and honestly i do not "
+    "know who else to ask because everyone around me seems fine with it"
+).split()
+
+
+def old_scan(domains, text):
+    """The pre-compilation matcher: lowercase substring test per keyword."""
+    combined_text = text.lower()
+    domain_hits = {}
+    for domain in domains:
+        matched = [kw for kw in domain.get("keywords", []) if kw.lower() in combined_text]
+        if matched:
+            domain_hits[domain["domain_id"]] = matched
+    return domain_hits
+
+
+def corpus(domains, posts=300, seed=7):
+    """Posts mixing filler words with 0-4 library keywords, in varied case and punctuation."""
+    keywords = [kw for domain in domains for kw in domain["keywords"]]
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(posts):
+        words = rng.sample(FILLER, 8)
+        for keyword in rng.sample(keywords, rng.randint(0, 4)):
+            keyword = keyword.upper() if rng.random() < 0.2 else keyword
+            words.insert(rng.randint(0, len(words)), keyword + rng.choice(["", ",", ".", "?", "!"]))
+        texts.append(" ".join(words))
+    return texts
+
+
+@pytest.fixture(params=["automaton", "regex_trie"])
+def library(request, monkeypatch):
+    if request.param == "automaton":
+        pytest.importorskip("ahocorasick")
+    else:
+        monkeypatch.setattr(matcher, "AHOCORASICK_AVAILABLE", False)
+    lib = KeywordLibrary(matcher.DOMAIN_SIGNALS)
+    assert (lib._automaton is not None) == (request.param == "automaton")
+    return lib
+
+
+def _embedded_only(keyword, text):
+    """True if every occurrence of keyword in text is part of a longer word."""
+    keyword, text = keyword.lower(), text.lower()
+    return all(
+        (start > 0 and re.match(r"\w", text[start - 1]))
+        or (start + len(keyword) < len(text) and re.match(r"\w", text[start + len(keyword)]))
+        for start in (m.start() for m in re.finditer(re.escape(keyword), text))
+    )
+
+
+class TestAgainstOldScan:
+    def test_fixture_corpus_matches_old_scan(self, library):
+        texts = corpus(matcher.DOMAIN_SIGNALS)
+        differing = 0
+        for text in texts:
+            new, old = library.match(text), old_scan(matcher.DOMAIN_SIGNALS, text)
+            if new == old:
+                continue
+            differing += 1
+            # Only word-boundary rejections may differ; the new matcher never adds hits
+            for domain_id, old_keywords in old.items():
+                new_keywords = new.get(domain_id, [])
+                assert set(new_keywords) <= set(old_keywords)
+                for keyword in set(old_keywords) - set(new_keywords):
+                    assert _embedded_only(keyword, text), (keyword, text)
+            assert set(new) <= set(old)
+        assert differing < len(texts) // 10
+
+    def test_keywords_come_back_in_library_order(self, library):
+        text = "Retail therapy again, no savings, and an overdraft. I'm broke before payday."
+        expected = old_scan(matcher.DOMAIN_SIGNALS, text)
+        assert library.match(text) == expected
+        assert expected["financial_habits"] == [
+            "broke before payday", "no savings", "retail therapy", "overdraft",
+        ]
+
+    def test_overlapping_keywords_are_all_found(self, library):
+        text = "Rent keeps going up so rent vs buy is all I think about"
+        assert library.match(text)["housing"] == ["rent vs buy", "rent keeps going up"]
+
+
+class TestIntentionalDifferences:
+    def test_word_boundaries(self, library):
+        lib = KeywordLibrary([{"domain_id": "career_income", "keywords": ["fired", "rent"]}])
+        assert lib.match("the engine misfired while parents were away") == {}
+        assert old_scan(lib.domains, "the engine misfired while parents were away") != {}
+        assert lib.match("Got FIRED. Rent is due.") == {"career_income": ["fired", "rent"]}
+
+    def test_curly_apostrophes_and_line_breaks(self, library):
+        text = "I can’t stop\nspending and I  can't save"
+        assert library.match(text)["financial_habits"] == ["can't stop spending", "can't save"]
+
+
+def test_fallback_is_used_when_pyahocorasick_is_missing(monkeypatch):
+    monkeypatch.setitem(sys.modules, "ahocorasick", None)
+    try:
+        fallback = importlib.reload(matcher)
+        assert fallback.AHOCORASICK_AVAILABLE is False
+        lib = fallback.KeywordLibrary(fallback.DOMAIN_SIGNALS)
+        assert lib._automaton is None and lib._pattern is not None
+        text = "layoff risk is high and I need a budget"
+        assert lib.match(text) == old_scan(fallback.DOMAIN_SIGNALS, text)
+    finally:
+        monkeypatch.undo()
+        importlib.reload(matcher)
+
+
+def test_keyword_match_uses_the_community_snapshot(pg):
+    matcher.refresh_communities([
+        {"id": "c1", "name": "PersonalFinance", "primary_domain": "budgeting", "heat_score": 9.1},
+    ])
+    item = {"title": "Paycheck to paycheck", "body": "no savings at all", "subreddit": "personalfinance"}
+
+    result = matcher.keyword_match(item)
+
+    assert result["domain_id"] == "financial_habits"
+    assert result["matched_keywords"] == ["no savings", "paycheck to paycheck"]
+    assert (result["domain_match_boost"], result["heat_boost"]) == (0.5, 0.3)
+    assert matcher.keyword_match({"title": "nice weather", "subreddit": "personalfinance"}) is None
+    assert pg.statements == []
@@ -0,0 +1,150 @@
+"""
+_process_items end to end with the real matcher and scorer on StubModelClient:
+stage ordering, per-stage counts in the report, and the shared token bucket.
+"""
+
+import threading
+import time
+
+import pytest
+
+from pipeline import matcher, model_client, scorer
+from pipeline.model_client import StubModelClient, TokenBucket
+from scheduler.main import _process_items
+
+COMMUNITIES = [
+    {"id": "c1", "name": "personalfinance", "primary_domain": "budgeting", "heat_score": 9.0},
+]
+
+POSTS = [
+    ("p1", "Paycheck to paycheck", "no savings and the rent keeps going up"),
+    ("p2", "Nice weather today", "went for a walk"),
+    ("p3", "Layoff risk", "my whole team is worried about layoff risk"),
+    ("p4", "Broke before payday", "again, retail therapy is killing me"),
+    ("p5", "Overdraft fees", "third overdraft this month"),
+    ("p6", "Already stored", "paycheck to paycheck for years now"),
+    ("p7", "Weekend plans", "nothing planned"),
+]
+
+
+def _items():
+    return [
+        {"post_id": post_id, "title": title, "body": body, "subreddit": "personalfinance"}
+        for post_id, title, body in POSTS
+    ]
+
+
+class Events:
+    """Fake db / reply crafter / notifier recording the order stages touch each lead"""
+
+    def __init__(self, already_stored=()):
+        self.log = []
+        self.batches = []
+        self.already_stored = set(already_stored)
+        self._lock = threading.Lock()
+
+    def _record(self, stage, lead):
+        with self._lock:
+            self.log.append((stage, lead["post_id"]))
+
+    def insert_leads(self, leads):
+        self.batches.append([lead["post_id"] for lead in leads])
+        for lead in leads:
+            self._record("store", lead)
+        return [
+            {"post_id": lead["post_id"], "id": index}
+            for index, lead in enumerate(leads)
+            if lead["post_id"] not in self.already_stored
+        ]
+
+    def process_lead(self, lead):
+        assert "id" in lead
+        self._record("reply", lead)
+
+    def send_hot_lead_sms(self, lead):
+        assert lead["is_hot_lead"]
+        self._record("notify", lead)
+
+    def stages_for(self, post_id):
+        return [stage for stage, logged in self.log if logged == post_id]
+
+
+@pytest.fixture
+def pipeline_env(pg, monkeypatch):
+    pg.responder = lambda sql, params: COMMUNITIES if "FROM communities" in sql else []
+    monkeypatch.setenv("COMPOSITE_THRESHOLD", "0")
+    monkeypatch.setenv("HOT_LEAD_THRESHOLD", "9.0")
+    monkeypatch.setenv("LEAD_INSERT_BATCH", "2")
+    monkeypatch.setenv("PIPELINE_SCORE_CONCURRENCY", "3")
+    yield pg
+    model_client.set_client(None)
+
+
+def test_leads_flow_through_stages_in_order(pipeline_env):
+    client = StubModelClient()
+    model_client.set_client(client)
+    events = Events(already_stored={"p6"})
+
+    scored, stored, hot, report = _process_items(_items(), events, matcher, scorer, events, events)
+
+    matched = ["p1", "p3", "p4", "p5", "p6"]
+    assert client.calls == len(matched)
+    assert scored == len(matched)
+    assert sorted(post_id for batch in events.batches for post_id in batch) == matched
+    assert all(len(batch) <= 2 for batch in events.batches)
+
+    assert stored == 4
+    assert events.stages_for("p6") == ["store"]  # conflict on post_id: no reply, no notify
+    for post_id in ("p2", "p7"):
+        assert events.stages_for(post_id) == []
+    hot_ids = []
+    for post_id in ("p1", "p3", "p4", "p5"):
+        stages = events.stages_for(post_id)
+        assert stages[:2] == ["store", "reply"]
+        assert stages[2:] in ([], ["notify"])
+        if stages[2:]:
+            hot_ids.append(post_id)
+    assert hot == len(hot_ids)
+
+    assert f"match n={len(POSTS)} " in report
+    assert f"score n={len(matched)} " in report
+    assert f"store n={len(events.batches)} " in report
+    assert "reply n=4 " in report
+    assert f"notify n={hot} " in report
+    assert f"cache hits=0 misses={len(matched)}" in report
+
+
+def test_model_calls_share_the_token_bucket(pipeline_env):
+    rate, capacity = 40.0, 2
+    client = StubModelClient(limiter=TokenBucket(rate=rate, capacity=capacity))
+    model_client.set_client(client)
+    events = Events()
+
+    started = time.monotonic()
+    scored, _, _, report = _process_items(_items(), events, matcher, scorer, events, events)
+    elapsed = time.monotonic() - started
+
+    # Three score workers, but only `capacity` calls go out before the bucket refills
+    assert scored == client.calls == 5
+    assert elapsed >= (client.calls - capacity) / rate * 0.9
+    assert client.limiter.waits >= client.calls - capacity
+    assert f"model waits={client.limiter.waits} " in report
+
+
+def test_failing_stage_is_counted_and_does_not_stop_the_run(pipeline_env):
+    model_client.set_client(StubModelClient())
+    events = Events()
+
+    def flaky_reply(lead):
+        if lead["post_id"] == "p3":
+            raise RuntimeError("reply model down")
+        events.process_lead(lead)
+
+    class Crafter:
+        process_lead = staticmethod(flaky_reply)
+
+    _, stored, _, report = _process_items(_items(), events, matcher, scorer, Crafter, events)
+
+    assert stored == 5
+    assert "reply n=5 " in report and "failed=1" in report
+    assert "reply" not in events.stages_for("p3")
@@ -0,0 +1,132 @@
+"""
+ScoreCache over an in-memory score_cache table: hits, misses, prompt-version
+invalidation, purging, and dry runs that never write.
+"""
+
+import pytest
+
+from pipeline import matcher, model_client, score_cache, scorer
+from pipeline.model_client import StubModelClient
+from pipeline.score_cache import ScoreCache
+
+
+class ScoreTable:
+    """Answers the score_cache statements in storage.db from a dict"""
+
+    def __init__(self):
+        self.rows = {}
+
+    def __call__(self, sql, params):
+        if "INSERT INTO score_cache" in sql:
+            content_hash, version, result = params
+            self.rows[(content_hash, version)] = result.adapted
+            return []
+        if "UPDATE score_cache" in sql:
+            content_hash, version, _ = params
+            result = self.rows.get((content_hash, version))
+            return [{"result": result}] if result is not None else []
+        if "DELETE FROM score_cache" in sql:
+            version, _ = params
+            stale = [key for key in self.rows if key[1] != version]
+            for key in stale:
+                del self.rows[key]
+            return stale
+        if "FROM communities" in sql:
+            return [{"id": "c1", "name": "personalfinance", "primary_domain": "budgeting", "heat_score": 9.0}]
+        return []
+
+
+@pytest.fixture
+def table(pg):
+    pg.responder = ScoreTable()
+    return pg.responder
+
+
+def _writes(pg):
+    return [sql for sql, _ in pg.statements if "INSERT INTO score_cache" in sql or "DELETE FROM" in sql]
+
+
+def test_content_hash_ignores_case_and_whitespace():
+    assert score_cache.content_hash("Rent  Help", "I am\nbroke") == score_cache.content_hash("rent help", "i am broke")
+    assert score_cache.content_hash("rent help", "") != score_cache.content_hash("rent", "help me")
+
+
+def test_miss_then_hit(table):
+    cache = ScoreCache(ttl_hours=24)
+    key = score_cache.content_hash("title", "body")
+
+    assert cache.get(key, "v1") is None
+    cache.put(key, "v1", {"pain_score": 7})
+
+    assert cache.get(key, "v1") == {"pain_score": 7}
+    assert (cache.hits, cache.misses, cache.stores) == (1, 1, 1)
+    assert cache.summary() == "cache hits=1 misses=1 (50%)"
+
+
+def test_new_prompt_version_misses_and_purge_drops_old_entries(table, pg):
+    cache = ScoreCache(ttl_hours=24)
+    key = score_cache.content_hash("title", "body")
+    cache.put(key, "v1", {"pain_score": 7})
+
+    assert cache.get(key, "v2") is None
+    assert cache.purge("v2") == 1
+    assert table.rows == {}
+    assert cache.purge("v2") == 0  # throttled to once per purge_interval
+    assert len([sql for sql, _ in pg.statements if "DELETE FROM score_cache" in sql]) == 1
+
+
+def test_database_errors_count_as_misses(pg):
+    def broken(sql, params):
+        raise RuntimeError("connection reset")
+
+    pg.responder = broken
+    cache = ScoreCache(ttl_hours=24)
+
+    assert cache.get("key", "v1") is None
+    cache.put("key", "v1", {"pain_score": 7})
+    assert (cache.hits, cache.misses, cache.errors) == (0, 0, 2)
+
+
+def test_zero_ttl_disables_the_cache(table, pg):
+    cache = ScoreCache(ttl_hours=0)
+    cache.put("key", "v1", {"pain_score": 7})
+
+    assert cache.get("key", "v1") is None
+    assert cache.purge("v1", force=True) == 0
+    assert pg.statements == []
+    assert cache.summary() == "cache off"
+
+
+def test_read_only_cache_serves_hits_without_writing(table, pg):
+    cache = ScoreCache(ttl_hours=24)
+    cache.put("key", "v1", {"pain_score": 7})
+    cache.read_only = True
+    pg.statements.clear()
+
+    assert cache.get("key", "v1") == {"pain_score": 7}
+    cache.put("other", "v1", {"pain_score": 3})
+    assert cache.purge("v2", force=True) == 0
+    assert _writes(pg) == []
+    assert set(table.rows) == {("key", "v1")}
+
+
+def test_dry_run_scoring_leaves_the_cache_untouched(table, pg, monkeypatch):
+    monkeypatch.setenv("COMPOSITE_THRESHOLD", "0")
+    monkeypatch.setattr(scorer, "_cache", ScoreCache(ttl_hours=24))
+    client = StubModelClient()
+    model_client.set_client(client)
+    match = matcher.keyword_match({"post_id": "p1", "title": "Overdraft again", "subreddit": "personalfinance"})
+    try:
+        scorer.prepare_run(dry_run=True)
+        assert scorer.semantic_score(match) is not None
+        assert scorer.semantic_score(match) is not None
+        assert client.calls == 2
+        assert _writes(pg) == [] and table.rows == {}
+
+        scorer.prepare_run()
+        scorer.semantic_score(match)
+        scorer.semantic_score(match)
+        assert client.calls == 3
+        assert scorer.cache_summary() == "cache hits=1 misses=1 (50%)"
+    finally:
+        model_client.set_client(None)
@@ -21,6 +21,7 @@ from income_boost_job_matcher import (
     JobOpportunity, CompanyProfile, JobBoard
 )
 from job_board_apis import JobBoardAPIManager, CompanyDataAPIManager
+from backend.utils.job_postings_store import _page_sql
 
 class TestIncomeBoostJobMatcher(unittest.TestCase):
     """Test cases for IncomeBoostJobMatcher"""
@@ -238,26 +239,25 @@ class TestIncomeBoostJobMatcher(unittest.TestCase):
         potential = self.matcher._calculate_salary_increase_potential(no_salary_job, self.test_criteria)
         self.assertEqual(potential, 0.0)
     
-    def test_meets_salary_criteria(self):
-        """Test salary criteria filtering"""
-        # Test job within salary range
-        self.assertTrue(self.matcher._meets_salary_criteria(
-            self.test_job, self.test_criteria, 80000, 120000
-        ))
-        
-        # Test job below salary range
-        low_salary_job = self.test_job
-        low_salary_job.salary_median = 70000
-        self.assertFalse(self.matcher._meets_salary_criteria(
-            low_salary_job, self.test_criteria, 80000, 120000
-        ))
-        
-        # Test job above salary range
-        high_salary_job = self.test_job
-        high_salary_job.salary_median = 130000
-        self.assertFalse(self.matcher._meets_salary_criteria(
-            high_salary_job, self.test_criteria, 80000, 120000
-        ))
+    def test_salary_window_is_applied_in_sql(self):
+        """Test board searches push the salary window into the job_postings query"""
+        store = Mock()
+        store.search.return_value = [{
+            'id': 7, 'title': 'Senior Software Engineer', 'company': 'Test Company',
+            'career_field': 'Technology', 'msa_code': '12060', 'location': 'Atlanta, GA',
+            'salary_min': 90000, 'salary_max': 120000, 'seniority_level': 'senior',
+            'advancement_trajectory': '',
+        }]
+        with patch('income_boost_job_matcher.get_job_postings_store', return_value=store):
+            jobs = asyncio.run(self.matcher._search_indeed(self.test_criteria, 80000, 120000))
+        
+        query = store.search.call_args[0][0]
+        self.assertEqual((query.salary_midpoint_min, query.salary_midpoint_max), (80000, 120000))
+        sql, params = _page_sql(query, None, 10)
+        self.assertIn('(salary_min + salary_max) / 2 >= %(salary_midpoint_min)s', sql)
+        self.assertIn('(salary_min + salary_max) / 2 <= %(salary_midpoint_max)s', sql)
+        self.assertEqual((params['salary_midpoint_min'], params['salary_midpoint_max']), (80000, 120000))
+        self.assertEqual([job.salary_median for job in jobs], [105000])
     
     @patch('aiohttp.ClientSession')
     async def test_salary_focused_search(self, mock_session):